@@ -0,0 +1,417 @@
+#!/usr/bin/env python
+"""
+File Lock Service
+
+This module implements a cross-process lock store for the File Usage Tracker.
+Lock records live in a SQLite database opened in WAL mode, so every agent
+process on the machine sees the same locks and each acquire/release is a
+single small transaction instead of a rewrite of the whole tracker JSON file.
+
+The service provides:
+- Atomic read-modify-write of lock records across processes (BEGIN IMMEDIATE)
+- Shared read locks, reentrant write locks and priority preemption
+- Per-lock expiry, checked on the lock being requested
+- A blocking acquire with a timeout
+"""
+
+import os
+import time
+import sqlite3
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger("FileLockService")
+
+# Extra time allowed past the expected duration before a lock is considered stale
+STALE_LOCK_GRACE_SECONDS = 30
+
+# Priority difference needed for a workflow to preempt another workflow's lock
+PREEMPTION_PRIORITY_MARGIN = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_locks (
+    file_path TEXT PRIMARY KEY,
+    locked_by TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    acquired_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    process_id INTEGER,
+    expected_duration INTEGER,
+    workflow_id TEXT,
+    priority INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_file_locks_expires ON file_locks(expires_at);
+CREATE INDEX IF NOT EXISTS idx_file_locks_workflow ON file_locks(workflow_id);
+CREATE TABLE IF NOT EXISTS lock_readers (
+    file_path TEXT NOT NULL,
+    role TEXT NOT NULL,
+    PRIMARY KEY (file_path, role)
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteLockService:
+    """
+    Cross-process file lock store backed by a SQLite WAL database
+    """
+
+    # Bounds for the wait between attempts of a blocking acquire. Releases made
+    # in this process wake waiters immediately; releases made by other processes
+    # are picked up on the next attempt.
+    MIN_WAIT_INTERVAL = 0.001
+    MAX_WAIT_INTERVAL = 0.05
+
+    def __init__(self, db_path: str = "ai_managers/file_locks.db", busy_timeout: float = 5.0):
+        """
+        Initialize the lock service
+
+        Args:
+            db_path: Path to the SQLite database shared by all agent processes
+            busy_timeout: Seconds a transaction waits for another process's write lock
+        """
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._released = threading.Condition()
+        self.expired_lock_count = 0  # Stale locks removed by this process
+
+        db_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(db_dir, exist_ok=True)
+
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        logger.info(f"File lock service using {self.db_path}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's database connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        """Start a write transaction that excludes other writers across processes"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        return conn
+
+    def try_acquire(self, file_path: str, role: str, operation: str = "write",
+                    expected_duration: int = 60, workflow_id: Optional[str] = None,
+                    priority: int = 0) -> bool:
+        """
+        Attempt to take a lock on a file without waiting
+
+        Args:
+            file_path: Path to the file to lock
+            role: Role requesting the lock
+            operation: Type of operation ("read" or "write")
+            expected_duration: Expected duration in seconds
+            workflow_id: ID of the associated workflow
+            priority: Priority of the requesting workflow
+
+        Returns:
+            bool: True if lock granted, False if denied
+        """
+        now = time.time()
+        conn = self._transaction()
+        try:
+            row = conn.execute(
+                "SELECT * FROM file_locks WHERE file_path = ?", (file_path,)
+            ).fetchone()
+
+            if row is not None and row["expires_at"] < now:
+                logger.warning(f"Removing stale lock on {file_path} from {row['locked_by']}")
+                self._delete_lock(conn, file_path)
+                self.expired_lock_count += 1
+                row = None
+
+            if row is None:
+                self._insert_lock(conn, file_path, role, operation, expected_duration,
+                                  workflow_id, priority, now)
+                conn.execute("COMMIT")
+                logger.debug(f"Granted new lock on {file_path} to {role} for {operation}")
+                return True
+
+            # Allow multiple read operations
+            if operation == "read" and row["operation"] == "read":
+                conn.execute(
+                    "INSERT OR IGNORE INTO lock_readers (file_path, role) VALUES (?, ?)",
+                    (file_path, role)
+                )
+                conn.execute("COMMIT")
+                logger.debug(f"Granted shared read lock on {file_path} to {role}")
+                return True
+
+            # Reentrant lock: extend the existing lock for the same role
+            if row["locked_by"] == role:
+                duration = max(row["expected_duration"] or 0, expected_duration)
+                conn.execute(
+                    "UPDATE file_locks SET acquired_at = ?, expires_at = ?, expected_duration = ? "
+                    "WHERE file_path = ?",
+                    (now, now + duration + STALE_LOCK_GRACE_SECONDS, duration, file_path)
+                )
+                conn.execute("COMMIT")
+                logger.debug(f"Updated existing lock on {file_path} for {role}")
+                return True
+
+            # Higher priority workflows can preempt lower priority ones
+            if workflow_id and row["workflow_id"] and \
+                    priority > row["priority"] + PREEMPTION_PRIORITY_MARGIN:
+                logger.warning(f"Priority preemption: {role} ({priority}) preempting "
+                               f"{row['locked_by']} ({row['priority']}) for {file_path}")
+                self._delete_lock(conn, file_path)
+                self._insert_lock(conn, file_path, role, operation, expected_duration,
+                                  workflow_id, priority, now)
+                conn.execute("COMMIT")
+                return True
+
+            conn.execute("ROLLBACK")
+            logger.debug(f"Lock denied for {file_path}: already locked by {row['locked_by']}")
+            return False
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def acquire(self, file_path: str, role: str, operation: str = "write",
+                expected_duration: int = 60, workflow_id: Optional[str] = None,
+                priority: int = 0, timeout: Optional[float] = None) -> bool:
+        """
+        Take a lock on a file, waiting until it is available
+
+        Args:
+            file_path: Path to the file to lock
+            role: Role requesting the lock
+            operation: Type of operation ("read" or "write")
+            expected_duration: Expected duration in seconds
+            workflow_id: ID of the associated workflow
+            priority: Priority of the requesting workflow
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if lock granted, False if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        wait_interval = self.MIN_WAIT_INTERVAL
+
+        while True:
+            if self.try_acquire(file_path, role, operation, expected_duration, workflow_id, priority):
+                return True
+
+            if deadline is None:
+                wait_time = wait_interval
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"Timed out waiting for lock on {file_path}")
+                    return False
+                wait_time = min(wait_interval, remaining)
+
+            with self._released:
+                self._released.wait(wait_time)
+            wait_interval = min(wait_interval * 2, self.MAX_WAIT_INTERVAL)
+
+    def release(self, file_path: str, role: str) -> bool:
+        """
+        Release a lock on a file
+
+        Args:
+            file_path: Path to the file to unlock
+            role: Role releasing the lock
+
+        Returns:
+            bool: True if lock released, False otherwise
+        """
+        conn = self._transaction()
+        try:
+            row = conn.execute(
+                "SELECT locked_by, operation FROM file_locks WHERE file_path = ?", (file_path,)
+            ).fetchone()
+
+            if row is None:
+                conn.execute("ROLLBACK")
+                logger.warning(f"Cannot release lock on {file_path}: not locked")
+                return False
+
+            released = False
+            if row["operation"] == "read":
+                cursor = conn.execute(
+                    "DELETE FROM lock_readers WHERE file_path = ? AND role = ?", (file_path, role)
+                )
+                if cursor.rowcount:
+                    released = True
+                    remaining = conn.execute(
+                        "SELECT 1 FROM lock_readers WHERE file_path = ? LIMIT 1", (file_path,)
+                    ).fetchone()
+                    if remaining is None:
+                        conn.execute("DELETE FROM file_locks WHERE file_path = ?", (file_path,))
+            elif row["locked_by"] == role:
+                self._delete_lock(conn, file_path)
+                released = True
+
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if released:
+            logger.debug(f"Released lock on {file_path} for {role}")
+            with self._released:
+                self._released.notify_all()
+        else:
+            logger.warning(f"Cannot release lock on {file_path}: not owned by {role}")
+        return released
+
+    def release_workflow(self, workflow_id: str) -> int:
+        """
+        Release every lock held by a workflow
+
+        Args:
+            workflow_id: ID of the workflow whose locks should be released
+
+        Returns:
+            int: Number of locks released
+        """
+        conn = self._transaction()
+        try:
+            conn.execute(
+                "DELETE FROM lock_readers WHERE file_path IN "
+                "(SELECT file_path FROM file_locks WHERE workflow_id = ?)", (workflow_id,)
+            )
+            cursor = conn.execute("DELETE FROM file_locks WHERE workflow_id = ?", (workflow_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if cursor.rowcount:
+            with self._released:
+                self._released.notify_all()
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        """
+        Remove all locks that have passed their expiry time
+
+        Returns:
+            int: Number of stale locks removed
+        """
+        now = time.time()
+        conn = self._transaction()
+        try:
+            conn.execute(
+                "DELETE FROM lock_readers WHERE file_path IN "
+                "(SELECT file_path FROM file_locks WHERE expires_at < ?)", (now,)
+            )
+            cursor = conn.execute("DELETE FROM file_locks WHERE expires_at < ?", (now,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if cursor.rowcount:
+            self.expired_lock_count += cursor.rowcount
+            logger.warning(f"Removed {cursor.rowcount} stale locks")
+            with self._released:
+                self._released.notify_all()
+        return cursor.rowcount
+
+    def get_lock(self, file_path: str) -> Dict[str, Any]:
+        """
+        Get the current lock on a file
+
+        Args:
+            file_path: Path to the file to check
+
+        Returns:
+            Dict: Lock information if locked, empty dict if not
+        """
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT * FROM file_locks WHERE file_path = ? AND expires_at >= ?",
+            (file_path, time.time())
+        ).fetchone()
+        if row is None:
+            return {}
+        readers = None
+        if row["operation"] == "read":
+            readers = [r["role"] for r in conn.execute(
+                "SELECT role FROM lock_readers WHERE file_path = ?", (file_path,)
+            )]
+        return self._row_to_lock(row, readers)
+
+    def get_locks(self) -> Dict[str, Dict[str, Any]]:
+        """Get all current (non-expired) locks keyed by file path"""
+        conn = self._connection()
+        now = time.time()
+        readers: Dict[str, List[str]] = {}
+        for r in conn.execute(
+            "SELECT lr.file_path, lr.role FROM lock_readers lr "
+            "JOIN file_locks fl ON fl.file_path = lr.file_path WHERE fl.expires_at >= ?", (now,)
+        ):
+            readers.setdefault(r["file_path"], []).append(r["role"])
+
+        locks = {}
+        for row in conn.execute("SELECT * FROM file_locks WHERE expires_at >= ?", (now,)):
+            file_path = row["file_path"]
+            locks[file_path] = self._row_to_lock(row, readers.get(file_path))
+        return locks
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get lock counters
+
+        Returns:
+            Dict: Number of active locks across all processes and number of
+            stale locks removed by this process
+        """
+        conn = self._connection()
+        active = conn.execute(
+            "SELECT COUNT(*) FROM file_locks WHERE expires_at >= ?", (time.time(),)
+        ).fetchone()[0]
+        return {"active_locks": active, "expired_locks": self.expired_lock_count}
+
+    def close(self):
+        """Close this thread's database connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _insert_lock(self, conn: sqlite3.Connection, file_path: str, role: str, operation: str,
+                     expected_duration: int, workflow_id: Optional[str], priority: int, now: float):
+        """Insert a new lock record inside the current transaction"""
+        conn.execute(
+            "INSERT INTO file_locks (file_path, locked_by, operation, acquired_at, expires_at, "
+            "process_id, expected_duration, workflow_id, priority) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (file_path, role, operation, now, now + expected_duration + STALE_LOCK_GRACE_SECONDS,
+             os.getpid(), expected_duration, workflow_id, priority)
+        )
+        if operation == "read":
+            conn.execute(
+                "INSERT OR IGNORE INTO lock_readers (file_path, role) VALUES (?, ?)", (file_path, role)
+            )
+
+    def _delete_lock(self, conn: sqlite3.Connection, file_path: str):
+        """Delete a lock record and its readers inside the current transaction"""
+        conn.execute("DELETE FROM lock_readers WHERE file_path = ?", (file_path,))
+        conn.execute("DELETE FROM file_locks WHERE file_path = ?", (file_path,))
+
+    def _row_to_lock(self, row: sqlite3.Row, readers: Optional[List[str]]) -> Dict[str, Any]:
+        """Convert a lock row to the dict format used by the tracker JSON file"""
+        lock_entry = {
+            "locked_by": row["locked_by"],
+            "operation": row["operation"],
+            "timestamp": datetime.fromtimestamp(row["acquired_at"]).isoformat(),
+            "process_id": row["process_id"],
+            "expected_duration": row["expected_duration"],
+            "workflow_id": row["workflow_id"]
+        }
+        if readers is not None:
+            lock_entry["readers"] = readers
+        return lock_entry
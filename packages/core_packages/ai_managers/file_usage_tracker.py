@@ -16,6 +16,7 @@ The system allows:
 import os
 import json
 import time
+import heapq
 import threading
 import logging
 from datetime import datetime
@@ -30,6 +31,17 @@ except ImportError:
     SESSION_DETECTOR_AVAILABLE = False
     print("Session detector not available - conflict detection will be limited")
 
+# Import cross-process lock service
+try:
+    from file_lock_service import SQLiteLockService
+    LOCK_SERVICE_AVAILABLE = True
+except ImportError:
+    try:
+        from ai_managers.file_lock_service import SQLiteLockService
+        LOCK_SERVICE_AVAILABLE = True
+    except ImportError:
+        LOCK_SERVICE_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -46,10 +58,32 @@ class FileUsageTracker:
     Tracks file usage across parallel execution roles to prevent conflicts
     """
     
-    def __init__(self, tracker_path="ai_managers/file_usage_tracker.json"):
-        """Initialize the file usage tracker"""
+    # Longest wait between attempts of a blocking acquire on the JSON backend
+    LOCK_WAIT_INTERVAL = 0.05
+    
+    # Extra time allowed past the expected duration before a lock is considered stale
+    STALE_LOCK_GRACE_SECONDS = 30
+    
+    def __init__(self, tracker_path="ai_managers/file_usage_tracker.json", lock_service=None):
+        """
+        Initialize the file usage tracker
+        
+        Args:
+            tracker_path: Path to the tracker JSON file
+            lock_service: Optional cross-process lock store (e.g. SQLiteLockService).
+                When set, file locks are kept there instead of in the tracker JSON file.
+        """
         self.tracker_path = tracker_path
         self.lock = threading.Lock()  # Thread safety for JSON operations
+        self._lock_released = threading.Condition(self.lock)
+        self.lock_service = lock_service
+        
+        # Lock expirations as a min-heap of (monotonic deadline, file path). Entries
+        # are invalidated lazily: only the deadline in _lock_deadlines is current.
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._lock_deadlines: Dict[str, float] = {}
+        self.expired_lock_count = 0
+        
         self._load_tracker()
         
         # Ensure logs directory exists
@@ -81,6 +115,7 @@ class FileUsageTracker:
             if os.path.exists(self.tracker_path):
                 with open(self.tracker_path, 'r') as f:
                     self.tracker_data = json.load(f)
+                self._rebuild_expiry_heap()
                 logger.debug(f"Loaded tracker data from {self.tracker_path}")
             else:
                 self.tracker_data = {
@@ -98,6 +133,41 @@ class FileUsageTracker:
                 "last_updated": datetime.now().isoformat()
             }
     
+    def _rebuild_expiry_heap(self):
+        """Rebuild lock deadlines from the persisted lock timestamps"""
+        now_wall = datetime.now()
+        now_mono = time.monotonic()
+        self._expiry_heap = []
+        self._lock_deadlines = {}
+        
+        for file_path, lock_info in self.tracker_data["file_locks"].items():
+            try:
+                age = (now_wall - datetime.fromisoformat(lock_info["timestamp"])).total_seconds()
+            except Exception as e:
+                logger.error(f"Error checking lock expiration: {str(e)}")
+                age = 0
+            remaining = lock_info.get("expected_duration", 60) + self.STALE_LOCK_GRACE_SECONDS - age
+            self._lock_deadlines[file_path] = now_mono + remaining
+            self._expiry_heap.append((now_mono + remaining, file_path))
+        
+        heapq.heapify(self._expiry_heap)
+    
+    def _schedule_lock_expiry(self, file_path: str, expected_duration: int):
+        """Record (or move) the deadline after which a lock is considered stale"""
+        deadline = time.monotonic() + expected_duration + self.STALE_LOCK_GRACE_SECONDS
+        self._lock_deadlines[file_path] = deadline
+        heapq.heappush(self._expiry_heap, (deadline, file_path))
+        
+        # Drop superseded entries once they dominate the heap
+        if len(self._expiry_heap) > 2 * len(self._lock_deadlines) + 64:
+            self._expiry_heap = [(d, p) for p, d in self._lock_deadlines.items()]
+            heapq.heapify(self._expiry_heap)
+    
+    def _remove_lock(self, file_path: str):
+        """Remove a lock entry and forget its deadline"""
+        del self.tracker_data["file_locks"][file_path]
+        self._lock_deadlines.pop(file_path, None)
+    
     def _save_tracker(self):
         """Save tracker data to JSON file"""
         try:
@@ -310,6 +380,9 @@ class FileUsageTracker:
         Returns:
             Dict: Lock information if locked, empty dict if not
         """
+        if self.lock_service is not None:
+            return self.lock_service.get_lock(file_path)
+        
         with self.lock:
             self._cleanup_stale_locks()
             return self.tracker_data["file_locks"].get(file_path, {})
@@ -329,13 +402,19 @@ class FileUsageTracker:
         Returns:
             bool: True if lock granted, False if denied
         """
+        if self.lock_service is not None:
+            try:
+                return self.lock_service.try_acquire(
+                    file_path, role, operation, expected_duration, workflow_id,
+                    self._prepare_service_request(file_path, workflow_id)
+                )
+            except Exception as e:
+                logger.error(f"Error requesting file lock: {str(e)}")
+                return False
+        
         with self.lock:
             try:
-                # Auto-check for session conflicts if session detector is available
-                if self.session_detector and self.session_detector.has_conflicting_sessions():
-                    conflicts = self.session_detector.get_conflicting_sessions()
-                    logger.warning(f"Session conflicts detected while requesting file lock for {file_path}")
-                    self._handle_session_conflicts(conflicts)
+                self._check_session_conflicts(file_path)
                 
                 # Clean up any stale locks first
                 self._cleanup_stale_locks()
@@ -362,6 +441,7 @@ class FileUsageTracker:
                         current_lock["expected_duration"] = max(current_lock["expected_duration"], expected_duration)
                         current_lock["timestamp"] = datetime.now().isoformat()
                         self.tracker_data["file_locks"][file_path] = current_lock
+                        self._schedule_lock_expiry(file_path, current_lock["expected_duration"])
                         self._save_tracker()
                         logger.debug(f"Updated existing lock on {file_path} for {role}")
                         return True
@@ -392,6 +472,68 @@ class FileUsageTracker:
                 logger.error(f"Error requesting file lock: {str(e)}")
                 return False
     
+    def acquire_file_lock(self, file_path: str, role: str, operation: str = "write",
+                          expected_duration: int = 60, workflow_id: Optional[str] = None,
+                          timeout: Optional[float] = None) -> bool:
+        """
+        Request a lock on a file, waiting until it becomes available
+        
+        Args:
+            file_path: Path to the file to lock
+            role: Role requesting the lock
+            operation: Type of operation ("read" or "write")
+            expected_duration: Expected duration in seconds
+            workflow_id: ID of the associated workflow
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+            
+        Returns:
+            bool: True if lock granted, False if the timeout expired
+        """
+        if self.lock_service is not None:
+            try:
+                return self.lock_service.acquire(
+                    file_path, role, operation, expected_duration, workflow_id,
+                    self._prepare_service_request(file_path, workflow_id),
+                    timeout=timeout
+                )
+            except Exception as e:
+                logger.error(f"Error acquiring file lock: {str(e)}")
+                return False
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.request_file_lock(file_path, role, operation, expected_duration, workflow_id):
+            wait_time = self.LOCK_WAIT_INTERVAL
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"Timed out waiting for lock on {file_path}")
+                    return False
+                wait_time = min(wait_time, remaining)
+            with self._lock_released:
+                self._lock_released.wait(wait_time)
+        return True
+    
+    def _prepare_service_request(self, file_path: str, workflow_id: Optional[str]) -> int:
+        """
+        Check session conflicts and look up the workflow priority for a lock service request
+        
+        Both read tracker state, so they run under self.lock like the JSON backend;
+        the lock service itself is left to serialize the acquire.
+        
+        Returns:
+            int: Priority of the requesting workflow (0 without one)
+        """
+        with self.lock:
+            self._check_session_conflicts(file_path)
+            return self._get_workflow_priority(workflow_id) if workflow_id else 0
+    
+    def _check_session_conflicts(self, file_path: str):
+        """Auto-check for session conflicts if session detector is available (caller holds self.lock)"""
+        if self.session_detector and self.session_detector.has_conflicting_sessions():
+            conflicts = self.session_detector.get_conflicting_sessions()
+            logger.warning(f"Session conflicts detected while requesting file lock for {file_path}")
+            self._handle_session_conflicts(conflicts)
+    
     def _create_new_lock(self, file_path: str, role: str, operation: str,
                          expected_duration: int, workflow_id: Optional[str]):
         """Create a new lock entry"""
@@ -409,6 +551,7 @@ class FileUsageTracker:
             lock_entry["readers"] = [role]
             
         self.tracker_data["file_locks"][file_path] = lock_entry
+        self._schedule_lock_expiry(file_path, expected_duration)
         self._save_tracker()
     
     def _get_workflow_priority(self, workflow_id: str) -> int:
@@ -428,6 +571,13 @@ class FileUsageTracker:
         Returns:
             bool: True if lock released, False otherwise
         """
+        if self.lock_service is not None:
+            try:
+                return self.lock_service.release(file_path, role)
+            except Exception as e:
+                logger.error(f"Error releasing file lock: {str(e)}")
+                return False
+        
         with self.lock:
             try:
                 if file_path in self.tracker_data["file_locks"]:
@@ -440,18 +590,20 @@ class FileUsageTracker:
                             
                             # If no more readers, remove the lock
                             if not current_lock["readers"]:
-                                del self.tracker_data["file_locks"][file_path]
+                                self._remove_lock(file_path)
                             else:
                                 self.tracker_data["file_locks"][file_path] = current_lock
                                 
                             self._save_tracker()
+                            self._lock_released.notify_all()
                             logger.debug(f"Released read lock on {file_path} for {role}")
                             return True
                     
                     # Handle write locks (single owner)
                     elif current_lock["locked_by"] == role:
-                        del self.tracker_data["file_locks"][file_path]
+                        self._remove_lock(file_path)
                         self._save_tracker()
+                        self._lock_released.notify_all()
                         logger.info(f"Released lock on {file_path} for {role}")
                         return True
                     
@@ -467,29 +619,46 @@ class FileUsageTracker:
     
     def _cleanup_stale_locks(self):
         """Remove locks that have exceeded their expected duration"""
-        now = datetime.now()
+        now = time.monotonic()
         stale_locks = []
         
-        for file_path, lock_info in self.tracker_data["file_locks"].items():
-            try:
-                lock_time = datetime.fromisoformat(lock_info["timestamp"])
-                expected_duration = lock_info.get("expected_duration", 60)  # Default 60 seconds
-                
-                # Check if lock has expired
-                if (now - lock_time).total_seconds() > expected_duration + 30:  # Add 30s buffer
-                    stale_locks.append((file_path, lock_info["locked_by"]))
-            except Exception as e:
-                logger.error(f"Error checking lock expiration: {str(e)}")
+        # Only locks whose deadline has passed are examined
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            deadline, file_path = heapq.heappop(self._expiry_heap)
+            if self._lock_deadlines.get(file_path) != deadline:
+                continue  # Lock was released or renewed since this entry was pushed
+            if file_path in self.tracker_data["file_locks"]:
+                stale_locks.append((file_path, self.tracker_data["file_locks"][file_path]["locked_by"]))
+                self._remove_lock(file_path)
+            else:
+                del self._lock_deadlines[file_path]
         
-        # Remove stale locks
         for file_path, owner in stale_locks:
             logger.warning(f"Removing stale lock on {file_path} from {owner}")
-            del self.tracker_data["file_locks"][file_path]
         
         # Save if we removed any locks
         if stale_locks:
+            self.expired_lock_count += len(stale_locks)
+            self._lock_released.notify_all()
             self._save_tracker()
     
+    def get_lock_stats(self) -> Dict[str, int]:
+        """
+        Get lock counters
+        
+        Returns:
+            Dict: Number of active locks and number of locks expired as stale
+        """
+        if self.lock_service is not None:
+            return self.lock_service.get_stats()
+        
+        with self.lock:
+            self._cleanup_stale_locks()
+            return {
+                "active_locks": len(self.tracker_data["file_locks"]),
+                "expired_locks": self.expired_lock_count
+            }
+    
     def complete_workflow(self, workflow_id: str) -> bool:
         """
         Mark a workflow as completed and release all associated locks
@@ -508,14 +677,19 @@ class FileUsageTracker:
                     self.tracker_data["workflows"][workflow_id]["end_time"] = datetime.now().isoformat()
                     
                     # Release all associated locks
-                    associated_locks = []
-                    for file_path, lock_info in list(self.tracker_data["file_locks"].items()):
-                        if lock_info.get("workflow_id") == workflow_id:
-                            associated_locks.append(file_path)
-                            del self.tracker_data["file_locks"][file_path]
+                    if self.lock_service is not None:
+                        released_count = self.lock_service.release_workflow(workflow_id)
+                    else:
+                        released_count = 0
+                        for file_path, lock_info in list(self.tracker_data["file_locks"].items()):
+                            if lock_info.get("workflow_id") == workflow_id:
+                                released_count += 1
+                                self._remove_lock(file_path)
+                        if released_count:
+                            self._lock_released.notify_all()
                     
                     self._save_tracker()
-                    logger.info(f"Completed workflow {workflow_id} and released {len(associated_locks)} locks")
+                    logger.info(f"Completed workflow {workflow_id} and released {released_count} locks")
                     return True
                 
                 logger.warning(f"Cannot complete workflow {workflow_id}: not registered")
@@ -537,6 +711,8 @@ class FileUsageTracker:
     
     def get_file_locks(self) -> Dict[str, Any]:
         """Get all current file locks"""
+        if self.lock_service is not None:
+            return self.lock_service.get_locks()
         return self.tracker_data["file_locks"]
     
     def update_workflow_status(self, workflow_id: str, status: str) -> bool:
@@ -570,11 +746,31 @@ class FileUsageTracker:
 # Singleton instance
 _tracker_instance = None
 
-def get_file_usage_tracker() -> FileUsageTracker:
-    """Get the singleton instance of the FileUsageTracker"""
+def get_file_usage_tracker(backend: str = "json",
+                           lock_db_path: str = "ai_managers/file_locks.db") -> FileUsageTracker:
+    """
+    Get the singleton instance of the FileUsageTracker
+    
+    Args:
+        backend: Where file locks are stored - "json" keeps them in the tracker JSON
+            file (single process), "sqlite" uses the cross-process SQLiteLockService
+        lock_db_path: Database path used by the "sqlite" backend
+        
+    Returns:
+        FileUsageTracker: The shared tracker instance. The backend only applies
+        to the call that creates the instance.
+    """
     global _tracker_instance
     if _tracker_instance is None:
-        _tracker_instance = FileUsageTracker()
+        lock_service = None
+        if backend == "sqlite":
+            if LOCK_SERVICE_AVAILABLE:
+                lock_service = SQLiteLockService(lock_db_path)
+            else:
+                logger.warning("File lock service not available - falling back to JSON lock storage")
+        elif backend != "json":
+            logger.warning(f"Unknown file lock backend '{backend}' - using JSON lock storage")
+        _tracker_instance = FileUsageTracker(lock_service=lock_service)
     return _tracker_instance
 
 
@@ -44,6 +44,16 @@ except ImportError:
     FILE_TRACKER_AVAILABLE = False
     print("File usage tracking will be disabled (file_usage_tracker module not available)")
 
+# Import predictive allocator for forecast-based role admission
+try:
+    try:
+        from predictive_allocator import PredictiveAllocator
+    except ImportError:
+        from ai_managers.predictive_allocator import PredictiveAllocator
+    PREDICTIVE_ALLOCATOR_AVAILABLE = True
+except ImportError:
+    PREDICTIVE_ALLOCATOR_AVAILABLE = False
+
 class ParallelExecutionManager:
     """
     Specialized AI Manager that coordinates parallel execution of project roles
@@ -117,7 +127,7 @@ class ParallelExecutionManager:
         self.file_tracker = None
         if FILE_TRACKER_AVAILABLE:
             try:
-                self.file_tracker = get_file_usage_tracker()
+                self.file_tracker = get_file_usage_tracker(self.config.get("file_lock_backend", "json"))
                 self.logger.info("File usage tracking enabled")
             except Exception as e:
                 self.logger.error(f"Error initializing file usage tracker: {str(e)}")
@@ -144,6 +154,18 @@ class ParallelExecutionManager:
             self.ROLE_TASK_MANAGEMENT: {"cpu": 5, "memory": 10},
         }
         
+        # Admit roles from the forecast load plus the requirements of active roles
+        self.allocator = None
+        if PREDICTIVE_ALLOCATOR_AVAILABLE and self.config.get("predictive_admission", False):
+            self.allocator = PredictiveAllocator(
+                {role: {"resource_requirements": requirements}
+                 for role, requirements in self.role_resource_requirements.items()},
+                capacity={
+                    "cpu": self.resource_thresholds["cpu_percent"],
+                    "memory": self.resource_thresholds["memory_percent"]
+                }
+            )
+        
         # Agent folder mapping
         self.agent_folders = {}
         for i in range(1, 13):
@@ -186,6 +208,9 @@ class ParallelExecutionManager:
                 self.ROLE_TASK_MANAGEMENT: {"cpu": 5, "memory": 10},
             },
             "monitoring_interval": 5,  # seconds
+            "predictive_admission": False,  # Start roles from forecast load (needs predictive_allocator)
+            "file_lock_backend": "json",  # "sqlite" shares locks across processes
+            "file_lock_timeout": 30,  # seconds a script waits for its file lock
         }
         
         # Save default config
@@ -246,6 +271,9 @@ class ParallelExecutionManager:
                 self.current_resources["memory_percent"] = 50
                 self.current_resources["disk_percent"] = 50
             
+            if self.allocator:
+                self.allocator.observe(self.current_resources)
+            
             # Check if any thresholds are exceeded
             cpu_threshold = self.resource_thresholds.get("cpu_percent", 80)
             mem_threshold = self.resource_thresholds.get("memory_percent", 85)
@@ -294,6 +322,8 @@ class ParallelExecutionManager:
                 # Remove from active roles
                 if role_to_stop in self.active_roles:
                     self.active_roles.remove(role_to_stop)
+                if self.allocator:
+                    self.allocator.task_finished(role_to_stop)
     
     def _scale_up_roles(self):
         """Start additional roles when resources are available"""
@@ -312,12 +342,17 @@ class ParallelExecutionManager:
         
         # Check if we have enough resources for the highest priority inactive role
         for role in sorted_roles:
-            cpu_req = self.role_resource_requirements.get(role, {}).get("cpu", 0)
-            mem_req = self.role_resource_requirements.get(role, {}).get("memory", 0)
+            if self.allocator:
+                # Projected load, counting roles started since the last samples
+                available = self.allocator.admit(role)
+            else:
+                cpu_req = self.role_resource_requirements.get(role, {}).get("cpu", 0)
+                mem_req = self.role_resource_requirements.get(role, {}).get("memory", 0)
+                available = (self.current_resources["cpu_percent"] + cpu_req < self.resource_thresholds["cpu_percent"] and
+                             self.current_resources["memory_percent"] + mem_req < self.resource_thresholds["memory_percent"])
             
             # Check if there are enough resources available
-            if (self.current_resources["cpu_percent"] + cpu_req < self.resource_thresholds["cpu_percent"] and
-                self.current_resources["memory_percent"] + mem_req < self.resource_thresholds["memory_percent"]):
+            if available:
                 
                 # Start this role
                 self.logger.info(f"Starting role: {role}")
@@ -354,6 +389,8 @@ class ParallelExecutionManager:
         thread.start()
         self.role_threads[role] = thread
         self.active_roles.add(role)
+        if self.allocator:
+            self.allocator.task_started(role, role)
         self.logger.info(f"Started thread for role: {role}")
     
     def queue_task(self, role: str, task: Dict[str, Any]):
@@ -421,6 +458,9 @@ class ParallelExecutionManager:
                 thread.join(timeout=5.0)
         
         # Clear active roles
+        if self.allocator:
+            for role in self.active_roles:
+                self.allocator.task_finished(role)
         self.active_roles.clear()
         
         # Stop resource monitoring
@@ -861,11 +901,16 @@ class ParallelExecutionManager:
         """Run a Python script and return success/failure"""
         self.logger.info(f"Running script: {script_path}")
         
-        # Try to acquire file lock if file tracking is enabled
+        # Wait for the file lock if file tracking is enabled
+        locked = False
         if self.file_tracker and workflow_id:
             role = self._get_role_from_workflow_id(workflow_id)
-            if not self.file_tracker.request_file_lock(script_path, role or "unknown", "read", workflow_id=workflow_id):
-                self.logger.warning(f"Could not acquire file lock for {script_path}, it may be in use by another role")
+            locked = self.file_tracker.acquire_file_lock(
+                script_path, role or "unknown", "read", workflow_id=workflow_id,
+                timeout=self.config.get("file_lock_timeout", 30)
+            )
+            if not locked:
+                self.logger.warning(f"Timed out waiting for file lock on {script_path}, it may be in use by another role")
                 # We'll continue anyway but log the warning
         
         try:
@@ -876,7 +921,7 @@ class ParallelExecutionManager:
             )
             
             # Release file lock if we acquired one
-            if self.file_tracker and workflow_id:
+            if locked:
                 role = self._get_role_from_workflow_id(workflow_id)
                 self.file_tracker.release_file_lock(script_path, role or "unknown")
             
@@ -890,7 +935,7 @@ class ParallelExecutionManager:
                 
         except Exception as e:
             # Release file lock in case of exception
-            if self.file_tracker and workflow_id:
+            if locked:
                 role = self._get_role_from_workflow_id(workflow_id)
                 self.file_tracker.release_file_lock(script_path, role or "unknown")
                 
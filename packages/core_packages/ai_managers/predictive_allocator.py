@@ -0,0 +1,348 @@
+#!/usr/bin/env python
+"""
+Predictive Allocator for the Parallel Execution Manager
+
+This module decides whether there is room to start another role from a
+short-term forecast of system load rather than a snapshot. A snapshot reacts
+late: roles started together do not show in the CPU and memory readings until
+they have ramped up, so threshold checks keep starting roles and then overshoot.
+
+The allocator splits the load into the tasks it started and everything else:
+- each task type has a CPU and memory profile, learned from completed runs as
+  an exponentially weighted moving average that starts from the configured
+  resource_requirements
+- the background load is each sample less the profiles of the running tasks
+  (a task ramping up counts in proportion to its time since start); it is
+  forecast a few seconds ahead with Holt smoothing, a smoothed level plus a
+  smoothed trend
+- the projected load is the forecast background, plus the profiles of all
+  running tasks from the moment they start, plus a safety margin from the
+  forecast's recent error
+
+A role (a "task" below, with its role as the task type) is admitted only when
+the projected load plus its own profile fits in the capacity target. The
+Parallel Execution Manager uses it when scaling up roles, with each role's
+resource requirements as its profile.
+
+The allocator trades some sustained utilization for fewer overloads and
+shorter waits: it will not start a task that is expected to push the machine
+past capacity, while snapshot thresholds keep admitting work until the
+readings catch up and then overshoot.
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger("ParallelExecutionManager.Allocator")
+
+# Resources that are forecast and profiled, in percent of the machine
+RESOURCE_KEYS = ("cpu", "memory")
+
+# Usage the projected load plus new work may reach, in percent. The projection
+# already counts running tasks at their full profile, so it can aim at the
+# resource monitor's critical threshold rather than the snapshot thresholds
+DEFAULT_CAPACITY = {"cpu": 90, "memory": 90}
+
+# Seconds ahead the background load is forecast
+DEFAULT_HORIZON = 10.0
+
+# Seconds for a started task to reach its full load
+DEFAULT_RAMP_SECONDS = 5.0
+
+# Holt smoothing factors for the level and the trend
+DEFAULT_LEVEL_SMOOTHING = 0.5
+DEFAULT_TREND_SMOOTHING = 0.3
+
+# Forecast errors kept free as headroom
+DEFAULT_SAFETY_FACTOR = 0.25
+
+# Weight of the newest run in a task type's profile
+DEFAULT_PROFILE_SMOOTHING = 0.3
+
+
+class HoltForecaster:
+    """
+    Holt's linear smoothing of a series sampled at irregular times
+    """
+
+    def __init__(self, level_smoothing: float = DEFAULT_LEVEL_SMOOTHING,
+                 trend_smoothing: float = DEFAULT_TREND_SMOOTHING):
+        """
+        Initialize the forecaster
+
+        Args:
+            level_smoothing: Weight of a new sample in the level (alpha)
+            trend_smoothing: Weight of a new slope in the trend (beta), and of
+                             a new error in the deviation
+        """
+        self.alpha = level_smoothing
+        self.beta = trend_smoothing
+        self.level: Optional[float] = None
+        self.trend = 0.0  # Per second
+        self.deviation = 0.0  # Smoothed absolute error of the forecast of each sample
+        self.updated_at = 0.0
+
+    def update(self, value: float, timestamp: float):
+        """
+        Add a sample
+
+        Args:
+            value: Sampled value
+            timestamp: Time of the sample
+        """
+        if self.level is None:
+            self.level = value
+            self.updated_at = timestamp
+            return
+
+        elapsed = timestamp - self.updated_at
+        if elapsed <= 0:
+            return
+
+        predicted = self.level + self.trend * elapsed
+        self.deviation += self.beta * (abs(value - predicted) - self.deviation)
+        level = self.alpha * value + (1 - self.alpha) * predicted
+        self.trend = self.beta * (level - self.level) / elapsed + (1 - self.beta) * self.trend
+        self.level = level
+        self.updated_at = timestamp
+
+    def forecast(self, horizon: float) -> float:
+        """
+        Get the forecast value, clamped to 0-100
+
+        Args:
+            horizon: Seconds after the last sample
+
+        Returns:
+            float: Forecast value (0 before the first sample)
+        """
+        if self.level is None:
+            return 0.0
+        return max(0.0, min(100.0, self.level + self.trend * horizon))
+
+
+class TaskProfile:
+    """Learned CPU and memory usage of one task type"""
+
+    __slots__ = ("cpu", "memory", "duration", "runs")
+
+    def __init__(self, requirements: Dict[str, float]):
+        self.cpu = float(requirements.get("cpu", 0))
+        self.memory = float(requirements.get("memory", 0))
+        self.duration: Optional[float] = None
+        self.runs = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"cpu": self.cpu, "memory": self.memory, "duration": self.duration, "runs": self.runs}
+
+
+class PredictiveAllocator:
+    """
+    Admission control from learned task profiles and a forecast of the background load
+    """
+
+    def __init__(self, task_types: Optional[Dict[str, Dict[str, Any]]] = None,
+                 capacity: Optional[Dict[str, float]] = None,
+                 horizon: float = DEFAULT_HORIZON,
+                 ramp_seconds: float = DEFAULT_RAMP_SECONDS,
+                 level_smoothing: float = DEFAULT_LEVEL_SMOOTHING,
+                 trend_smoothing: float = DEFAULT_TREND_SMOOTHING,
+                 safety_factor: float = DEFAULT_SAFETY_FACTOR,
+                 profile_smoothing: float = DEFAULT_PROFILE_SMOOTHING):
+        """
+        Initialize the allocator
+
+        Args:
+            task_types: Task type configuration; resource_requirements seed the profiles
+            capacity: Usage the projected load plus new work may reach, in percent
+            horizon: Seconds ahead the background load is forecast
+            ramp_seconds: Seconds for a started task to reach its full load
+            level_smoothing: Holt smoothing factor for the level
+            trend_smoothing: Holt smoothing factor for the trend
+            safety_factor: Forecast errors kept free as headroom
+            profile_smoothing: Weight of the newest run in a task type's profile
+        """
+        self.task_types = task_types or {}
+        self.capacity = dict(DEFAULT_CAPACITY)
+        if capacity:
+            self.capacity.update(capacity)
+        self.horizon = horizon
+        self.ramp_seconds = ramp_seconds
+        self.safety_factor = safety_factor
+        self.profile_smoothing = profile_smoothing
+
+        self.lock = threading.Lock()
+        self.forecasters = {key: HoltForecaster(level_smoothing, trend_smoothing) for key in RESOURCE_KEYS}
+        self.profiles: Dict[str, TaskProfile] = {}
+        self.running: Dict[str, tuple] = {}  # task ID -> (task type, start time)
+
+        # Statistics
+        self.admitted = 0
+        self.deferred = 0
+
+    def _profile_for(self, task_type: str) -> TaskProfile:
+        """Get a task type's profile, creating it on first use (caller holds the lock)"""
+        profile = self.profiles.get(task_type)
+        if profile is None:
+            requirements = self.task_types.get(task_type, {}).get("resource_requirements", {})
+            profile = self.profiles[task_type] = TaskProfile(requirements)
+        return profile
+
+    def _task_load(self, now: Optional[float] = None) -> Dict[str, float]:
+        """
+        Total profile of the running tasks (caller holds the lock)
+
+        Args:
+            now: Current time, to count tasks still ramping up in proportion to
+                 their time since start (None to count them in full)
+        """
+        load = {key: 0.0 for key in RESOURCE_KEYS}
+        for task_type, started_at in self.running.values():
+            profile = self._profile_for(task_type)
+            share = 1.0
+            if now is not None and self.ramp_seconds > 0:
+                share = max(0.0, min(1.0, (now - started_at) / self.ramp_seconds))
+            load["cpu"] += profile.cpu * share
+            load["memory"] += profile.memory * share
+        return load
+
+    def observe(self, usage: Dict[str, float], timestamp: Optional[float] = None):
+        """
+        Add a system usage sample to the background forecast
+
+        Args:
+            usage: Usage with "cpu_percent" and "memory_percent"
+            timestamp: Time of the sample (defaults to now)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        with self.lock:
+            task_load = self._task_load(timestamp)
+            for key in RESOURCE_KEYS:
+                value = usage.get(f"{key}_percent")
+                if value is not None:
+                    self.forecasters[key].update(max(0.0, float(value) - task_load[key]), timestamp)
+
+    def record_run(self, task_type: str, cpu_percent: Optional[float] = None,
+                   memory_percent: Optional[float] = None, duration: Optional[float] = None):
+        """
+        Learn from a completed run of a task type
+
+        Args:
+            task_type: Type of the task
+            cpu_percent: Average CPU usage of the run, in percent of the machine
+            memory_percent: Peak memory usage of the run, in percent of the machine
+            duration: Run time in seconds
+        """
+        weight = self.profile_smoothing
+        with self.lock:
+            profile = self._profile_for(task_type)
+            if cpu_percent is not None:
+                profile.cpu += weight * (cpu_percent - profile.cpu)
+            if memory_percent is not None:
+                profile.memory += weight * (memory_percent - profile.memory)
+            if duration is not None:
+                profile.duration = duration if profile.duration is None else profile.duration + weight * (duration - profile.duration)
+            profile.runs += 1
+
+    def task_started(self, task_id: str, task_type: str, timestamp: Optional[float] = None):
+        """
+        Count a started task at its profile until it finishes
+
+        Args:
+            task_id: ID of the task
+            task_type: Type of the task
+            timestamp: Start time (defaults to now)
+        """
+        with self.lock:
+            self.running[task_id] = (task_type, time.time() if timestamp is None else timestamp)
+
+    def task_finished(self, task_id: str):
+        """
+        Stop counting a finished task
+
+        Args:
+            task_id: ID of the task
+        """
+        with self.lock:
+            self.running.pop(task_id, None)
+
+    def _projected_load(self) -> Dict[str, float]:
+        """Forecast background, running tasks and safety margin (caller holds the lock)"""
+        task_load = self._task_load()
+        return {
+            key: (self.forecasters[key].forecast(self.horizon) + task_load[key]
+                  + self.safety_factor * self.forecasters[key].deviation)
+            for key in RESOURCE_KEYS
+        }
+
+    def projected_load(self) -> Dict[str, float]:
+        """
+        Get the projected load: the forecast background load, the profiles of
+        the running tasks and the safety margin
+
+        Returns:
+            Dict[str, float]: Projected usage per resource, in percent
+        """
+        with self.lock:
+            return self._projected_load()
+
+    def has_headroom(self) -> bool:
+        """
+        Check whether the projected load is below capacity
+
+        Returns:
+            bool: True if any more work could start
+        """
+        load = self.projected_load()
+        return all(load[key] < self.capacity[key] for key in RESOURCE_KEYS)
+
+    def admit(self, task_type: str) -> bool:
+        """
+        Check whether a task of a type fits in the projected headroom
+
+        With no other task running, any task is admitted while the projected
+        load is below capacity, so a heavy task type is not held back forever
+        on an otherwise idle machine and its profile can still be learned.
+
+        Args:
+            task_type: Type of the task
+
+        Returns:
+            bool: True if the task can start now
+        """
+        with self.lock:
+            load = self._projected_load()
+            profile = self._profile_for(task_type)
+            demand = {"cpu": profile.cpu, "memory": profile.memory}
+
+            fits = all(load[key] + demand[key] <= self.capacity[key] for key in RESOURCE_KEYS)
+            if not fits and not self.running:
+                fits = all(load[key] < self.capacity[key] for key in RESOURCE_KEYS)
+
+            if fits:
+                self.admitted += 1
+            else:
+                self.deferred += 1
+            return fits
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get allocator statistics
+
+        Returns:
+            Dict[str, Any]: Background forecast, projected load, capacity, running
+                            tasks, profiles and admission counts
+        """
+        with self.lock:
+            return {
+                "background": {key: self.forecasters[key].forecast(self.horizon) for key in RESOURCE_KEYS},
+                "projected": self._projected_load(),
+                "capacity": dict(self.capacity),
+                "running": len(self.running),
+                "profiles": {task_type: profile.to_dict() for task_type, profile in self.profiles.items()},
+                "admitted": self.admitted,
+                "deferred": self.deferred
+            }
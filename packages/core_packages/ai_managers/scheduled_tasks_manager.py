@@ -17,6 +17,11 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 import importlib
 
+try:
+    from task_journal import TaskJournal
+except ImportError:
+    from ai_managers.task_journal import TaskJournal
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,6 +41,9 @@ class ScheduledTaskManager:
         self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.config_path = os.path.join(self.base_dir, config_path)
         
+        # Task changes are appended to a journal and compacted into the config file
+        self.journal = TaskJournal(self.config_path)
+        
         # Load tasks configuration
         self.tasks = self._load_tasks_config()
         
@@ -57,15 +65,11 @@ class ScheduledTaskManager:
         ]
     
     def _load_tasks_config(self) -> Dict[str, Any]:
-        """Load tasks configuration from file or create default"""
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, 'r') as f:
-                    tasks = json.load(f)
-                logger.info(f"Loaded tasks configuration from {self.config_path}")
-                return tasks
-            except Exception as e:
-                logger.error(f"Error loading tasks config: {e}")
+        """Load tasks configuration from file and journal or create default"""
+        tasks = self.journal.get_records()
+        if tasks:
+            logger.info(f"Loaded tasks configuration from {self.config_path}")
+            return tasks
         
         # Create default tasks configuration
         default_tasks = {
@@ -129,8 +133,7 @@ class ScheduledTaskManager:
         
         # Save default configuration
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(default_tasks, f, indent=2)
+            self.journal.reset(default_tasks)
             logger.info(f"Created default tasks configuration at {self.config_path}")
         except Exception as e:
             logger.error(f"Error creating default tasks config: {e}")
@@ -138,19 +141,40 @@ class ScheduledTaskManager:
         return default_tasks
     
     def _save_tasks_config(self):
-        """Save tasks configuration to file"""
+        """Save tasks configuration to file and empty the journal"""
         try:
             # Update last_run times in the configuration
             for task_id, last_run_time in self.last_run.items():
                 if task_id in self.tasks:
                     self.tasks[task_id]["last_run"] = last_run_time.isoformat() if last_run_time else None
             
-            with open(self.config_path, 'w') as f:
-                json.dump(self.tasks, f, indent=2)
+            self.journal.reset(self.tasks)
             logger.info(f"Saved tasks configuration to {self.config_path}")
         except Exception as e:
             logger.error(f"Error saving tasks config: {e}")
     
+    def _record_task_run(self, task_id: str, started_at: float, status: str, error: Optional[str] = None):
+        """Journal a task's last run time and add the run to the run history"""
+        try:
+            if status == "success":
+                last_run = self.last_run[task_id].isoformat()
+                self.tasks[task_id]["last_run"] = last_run
+                self.journal.update(task_id, {"last_run": last_run})
+            self.journal.record_run(task_id, started_at, status, finished_at=time.time(),
+                                    details={"error": error} if error else None)
+        except Exception as e:
+            logger.error(f"Error recording run of {task_id}: {e}")
+    
+    def get_run_history(self, task_id: Optional[str] = None, start: Optional[datetime.datetime] = None,
+                        end: Optional[datetime.datetime] = None, limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        """Get recorded task runs, newest first, optionally for one task and a time range"""
+        return self.journal.get_run_history(
+            task_id=task_id,
+            start=start.timestamp() if start else None,
+            end=end.timestamp() if end else None,
+            limit=limit
+        )
+    
     def should_run(self, task_id: str) -> bool:
         """Check if a task should be run based on its interval"""
         if task_id not in self.tasks:
@@ -196,6 +220,7 @@ class ScheduledTaskManager:
         
         task = self.tasks[task_id]
         logger.info(f"Running task: {task_id} - {task.get('description', 'No description')}")
+        started_at = time.time()
         
         try:
             # Run the specific task
@@ -222,15 +247,17 @@ class ScheduledTaskManager:
             # Update last run time
             if success:
                 self.last_run[task_id] = datetime.datetime.now()
-                self._save_tasks_config()
+                self._record_task_run(task_id, started_at, "success")
                 logger.info(f"Task completed successfully: {task_id}")
             else:
+                self._record_task_run(task_id, started_at, "failed")
                 logger.warning(f"Task failed: {task_id}")
             
             return success
             
         except Exception as e:
             logger.error(f"Error running task {task_id}: {str(e)}")
+            self._record_task_run(task_id, started_at, "error", error=str(e))
             return False
     
     def check_all_scheduled_tasks(self):
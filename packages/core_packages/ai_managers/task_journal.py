@@ -0,0 +1,393 @@
+#!/usr/bin/env python
+"""
+Task Journal
+
+This module implements incremental persistence for the schedulers
+(ClaudeTaskScheduler and ScheduledTaskManager). A scheduler's task file is the
+snapshot; each change to a task is appended as one line to a journal file next
+to it instead of rewriting the whole file. Once the journal grows past a
+threshold it is compacted: a new snapshot is written to a temporary file and
+atomically renamed over the old one, and the journal is emptied.
+
+Loading replays the journal over the snapshot. A line torn by a crash mid-write
+is dropped, and the snapshot is never left half-written.
+
+Run history is kept separately in a SQLite database indexed by task and start
+time, so runs can be queried by task and time range without loading the rest.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+from typing import Dict, List, Any, Optional, Callable
+
+logger = logging.getLogger("TaskJournal")
+
+# Journal entries appended before the snapshot is rewritten
+DEFAULT_COMPACT_EVERY = 1000
+
+# Run history older than this is pruned when the journal is compacted
+DEFAULT_HISTORY_RETENTION_DAYS = 90
+
+_HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_runs (
+    task_id TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    status TEXT NOT NULL,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_task_runs_task ON task_runs(task_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_task_runs_started ON task_runs(started_at);
+"""
+
+# Encoders between the task records and the snapshot file's own layout
+SnapshotEncoder = Callable[[Dict[str, Dict[str, Any]]], Any]
+SnapshotDecoder = Callable[[Any], Dict[str, Dict[str, Any]]]
+
+
+class RunHistory:
+    """
+    Run history store backed by a SQLite WAL database
+    """
+
+    def __init__(self, db_path: str, busy_timeout: float = 5.0):
+        """
+        Initialize the run history
+
+        Args:
+            db_path: Path to the SQLite database
+            busy_timeout: Seconds a write waits for another process's write lock
+        """
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+
+        db_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(db_dir, exist_ok=True)
+
+        self._connection().executescript(_HISTORY_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's database connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def record(self, task_id: str, started_at: float, status: str,
+               finished_at: Optional[float] = None, details: Optional[Dict[str, Any]] = None):
+        """
+        Record a task run
+
+        Args:
+            task_id: ID of the task
+            started_at: Start time (Unix timestamp)
+            status: Outcome of the run (e.g. "queued", "success", "failed", "skipped")
+            finished_at: End time (Unix timestamp, None if not known)
+            details: Extra information about the run
+        """
+        self._connection().execute(
+            "INSERT INTO task_runs (task_id, started_at, finished_at, status, details) VALUES (?, ?, ?, ?, ?)",
+            (task_id, started_at, finished_at, status, json.dumps(details) if details else None)
+        )
+
+    def query(self, task_id: Optional[str] = None, start: Optional[float] = None,
+              end: Optional[float] = None, limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        """
+        Get task runs, newest first
+
+        Args:
+            task_id: Only runs of this task (None for all tasks)
+            start: Only runs started at or after this time (Unix timestamp)
+            end: Only runs started before this time (Unix timestamp)
+            limit: Maximum number of runs (None for no limit)
+
+        Returns:
+            List[Dict[str, Any]]: Runs with task_id, started_at, finished_at, status and details
+        """
+        conditions = []
+        params: List[Any] = []
+        if task_id is not None:
+            conditions.append("task_id = ?")
+            params.append(task_id)
+        if start is not None:
+            conditions.append("started_at >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("started_at < ?")
+            params.append(end)
+
+        sql = "SELECT * FROM task_runs"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY started_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [
+            {
+                "task_id": row["task_id"],
+                "started_at": row["started_at"],
+                "finished_at": row["finished_at"],
+                "status": row["status"],
+                "details": json.loads(row["details"]) if row["details"] else None
+            }
+            for row in self._connection().execute(sql, params)
+        ]
+
+    def prune(self, before: float) -> int:
+        """
+        Delete runs started before a time
+
+        Args:
+            before: Cutoff time (Unix timestamp)
+
+        Returns:
+            int: Number of runs deleted
+        """
+        return self._connection().execute("DELETE FROM task_runs WHERE started_at < ?", (before,)).rowcount
+
+
+class TaskJournal:
+    """
+    Keyed task records persisted as a snapshot file plus an append-only journal
+    """
+
+    def __init__(self, snapshot_path: str,
+                 encode_snapshot: Optional[SnapshotEncoder] = None,
+                 decode_snapshot: Optional[SnapshotDecoder] = None,
+                 compact_every: int = DEFAULT_COMPACT_EVERY,
+                 fsync: bool = False,
+                 history_retention_days: float = DEFAULT_HISTORY_RETENTION_DAYS):
+        """
+        Initialize the journal and load the current records
+
+        Args:
+            snapshot_path: Path to the snapshot (the scheduler's task file)
+            encode_snapshot: Converts the records to the snapshot's JSON layout (default: the records dict)
+            decode_snapshot: Converts the snapshot's JSON layout to records (default: the records dict)
+            compact_every: Journal entries appended before the snapshot is rewritten
+            fsync: Whether to fsync each journal entry (survives power loss, not just process crashes)
+            history_retention_days: Days of run history kept when compacting
+        """
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path + ".journal"
+        self.encode_snapshot = encode_snapshot or (lambda records: records)
+        self.decode_snapshot = decode_snapshot or (lambda data: data)
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.history_retention_days = history_retention_days
+
+        self._lock = threading.Lock()
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.journal_entries = 0
+        self.loaded_snapshot = False
+
+        snapshot_dir = os.path.dirname(os.path.abspath(snapshot_path))
+        os.makedirs(snapshot_dir, exist_ok=True)
+
+        self._load()
+        self._journal_file = open(self.journal_path, "a", encoding="utf-8")
+
+        self.history = RunHistory(os.path.splitext(snapshot_path)[0] + ".history.db")
+
+    def _load(self):
+        """Load the snapshot and replay the journal over it"""
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, "r") as f:
+                    self.records = self.decode_snapshot(json.load(f))
+                self.loaded_snapshot = True
+            except Exception as e:
+                logger.error(f"Error loading snapshot {self.snapshot_path}: {e}")
+
+        if not os.path.exists(self.journal_path):
+            return
+
+        valid_length = 0
+        with open(self.journal_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash, the entry never completed
+                    logger.warning(f"Dropping incomplete entry at the end of {self.journal_path}")
+                    break
+                self._apply(entry)
+                self.journal_entries += 1
+                valid_length += len(line)
+
+        # Cut off a torn entry so later appends start on a fresh line
+        if valid_length < os.path.getsize(self.journal_path):
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(valid_length)
+
+    def _apply(self, entry: Dict[str, Any]):
+        """Apply a journal entry to the records"""
+        op = entry.get("op")
+        key = entry.get("key")
+        if op == "put":
+            self.records[key] = entry["record"]
+        elif op == "update":
+            # An update that lands after a delete must not bring back a partial record
+            if key in self.records:
+                self.records[key].update(entry["fields"])
+        elif op == "delete":
+            self.records.pop(key, None)
+        else:
+            logger.warning(f"Unknown journal operation: {op}")
+
+    def _append(self, entry: Dict[str, Any]):
+        """Apply an entry and append it to the journal (caller holds the lock)"""
+        self._apply(entry)
+        self._journal_file.write(json.dumps(entry) + "\n")
+        self._journal_file.flush()
+        if self.fsync:
+            os.fsync(self._journal_file.fileno())
+        self.journal_entries += 1
+
+        if self.journal_entries >= self.compact_every:
+            self._compact()
+
+    def get_records(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a copy of the current records
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Records by key
+        """
+        with self._lock:
+            return {key: dict(record) for key, record in self.records.items()}
+
+    def put(self, key: str, record: Dict[str, Any]):
+        """
+        Add or replace a record
+
+        Args:
+            key: Record key (task ID)
+            record: Full record
+        """
+        with self._lock:
+            self._append({"op": "put", "key": key, "record": record})
+
+    def update(self, key: str, fields: Dict[str, Any]):
+        """
+        Update some fields of a record
+
+        Args:
+            key: Record key (task ID)
+            fields: Fields to set
+
+        Returns:
+            bool: True if the record was updated, False if there is no such record
+        """
+        with self._lock:
+            if key not in self.records:
+                return False
+            self._append({"op": "update", "key": key, "fields": fields})
+            return True
+
+    def delete(self, key: str):
+        """
+        Delete a record
+
+        Args:
+            key: Record key (task ID)
+        """
+        with self._lock:
+            self._append({"op": "delete", "key": key})
+
+    def reset(self, records: Dict[str, Dict[str, Any]]):
+        """
+        Replace all records and write them as the new snapshot
+
+        Args:
+            records: Records by key
+        """
+        with self._lock:
+            self.records = {key: dict(record) for key, record in records.items()}
+            self._compact()
+
+    def compact(self):
+        """Write the records as a new snapshot and empty the journal"""
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the snapshot atomically and empty the journal (caller holds the lock)"""
+        temp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(self.encode_snapshot(self.records), f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.snapshot_path)
+        except Exception as e:
+            logger.error(f"Error writing snapshot {self.snapshot_path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        # Replaying entries already in the snapshot is harmless, so a crash
+        # before this truncate loses nothing
+        self._journal_file.seek(0)
+        self._journal_file.truncate()
+        self.journal_entries = 0
+        self.loaded_snapshot = True
+
+        if self.history_retention_days:
+            pruned = self.history.prune(time.time() - self.history_retention_days * 86400)
+            if pruned:
+                logger.info(f"Pruned {pruned} run history entries")
+
+        logger.debug(f"Compacted journal into {self.snapshot_path}")
+
+    def record_run(self, task_id: str, started_at: float, status: str,
+                   finished_at: Optional[float] = None, details: Optional[Dict[str, Any]] = None):
+        """
+        Record a task run in the run history
+
+        Args:
+            task_id: ID of the task
+            started_at: Start time (Unix timestamp)
+            status: Outcome of the run
+            finished_at: End time (Unix timestamp, None if not known)
+            details: Extra information about the run
+        """
+        try:
+            self.history.record(task_id, started_at, status, finished_at, details)
+        except sqlite3.Error as e:
+            logger.error(f"Error recording run of {task_id}: {e}")
+
+    def get_run_history(self, task_id: Optional[str] = None, start: Optional[float] = None,
+                        end: Optional[float] = None, limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        """
+        Get task runs, newest first
+
+        Args:
+            task_id: Only runs of this task (None for all tasks)
+            start: Only runs started at or after this time (Unix timestamp)
+            end: Only runs started before this time (Unix timestamp)
+            limit: Maximum number of runs (None for no limit)
+
+        Returns:
+            List[Dict[str, Any]]: Runs with task_id, started_at, finished_at, status and details
+        """
+        return self.history.query(task_id, start, end, limit)
+
+    def close(self):
+        """Compact the journal and close it"""
+        with self._lock:
+            if self._journal_file.closed:
+                return
+            self._compact()
+            self._journal_file.close()
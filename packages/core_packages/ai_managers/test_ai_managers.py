@@ -0,0 +1,300 @@
+"""
+Test Script for the AI Managers
+
+This script tests the file lock service shared by parallel agent processes,
+the lock expiry of the File Usage Tracker and the schedulers' task journal.
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import tempfile
+import subprocess
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, MODULE_DIR)
+
+from file_lock_service import SQLiteLockService
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Increments a shared counter file under the lock; a lost update means two
+# processes held the write lock at the same time
+CONTENDING_WORKER = """
+import sys, time
+module_dir, db_path, counter_path, role, rounds = sys.argv[1:]
+sys.path.insert(0, module_dir)
+from file_lock_service import SQLiteLockService
+
+service = SQLiteLockService(db_path)
+for _ in range(int(rounds)):
+    if not service.acquire(counter_path, role, timeout=30):
+        sys.exit(1)
+    with open(counter_path) as f:
+        value = int(f.read())
+    time.sleep(0.001)
+    with open(counter_path, "w") as f:
+        f.write(str(value + 1))
+    service.release(counter_path, role)
+"""
+
+# Reports whether a lock held by another process can be taken without waiting
+PROBING_WORKER = """
+import sys
+module_dir, db_path, file_path = sys.argv[1:]
+sys.path.insert(0, module_dir)
+from file_lock_service import SQLiteLockService
+
+print(SQLiteLockService(db_path).try_acquire(file_path, "probe"))
+"""
+
+
+def test_cross_process_locks():
+    """Test that two processes contending through SQLiteLockService exclude each other"""
+    print("\n=== Testing Cross-Process Locks ===")
+
+    test_dir = tempfile.mkdtemp(prefix="ai_managers_test_")
+    try:
+        db_path = os.path.join(test_dir, "file_locks.db")
+        counter_path = os.path.join(test_dir, "counter.txt")
+        with open(counter_path, "w") as f:
+            f.write("0")
+
+        # A lock held here is visible to another process
+        service = SQLiteLockService(db_path)
+        service.acquire(counter_path, "project_management")
+        probe = subprocess.run(
+            [sys.executable, "-c", PROBING_WORKER, MODULE_DIR, db_path, counter_path],
+            capture_output=True, text=True, timeout=60
+        )
+        if probe.stdout.strip() != "False":
+            print(f"❌ Expected the other process to be refused the lock, got {probe.stdout.strip()!r}")
+            return False
+        service.release(counter_path, "project_management")
+
+        print("✅ Lock held by one process refused to another")
+
+        # Two processes take turns on the counter
+        rounds = 100
+        workers = [
+            subprocess.Popen([sys.executable, "-c", CONTENDING_WORKER, MODULE_DIR, db_path,
+                              counter_path, role, str(rounds)])
+            for role in ("agent_simulations", "script_assessment")
+        ]
+        start = time.time()
+        exit_codes = [worker.wait(timeout=120) for worker in workers]
+        elapsed = time.time() - start
+
+        with open(counter_path) as f:
+            count = int(f.read())
+        if exit_codes != [0, 0] or count != 2 * rounds:
+            print(f"❌ Expected {2 * rounds} increments, got {count} (exit codes {exit_codes})")
+            return False
+
+        if service.get_stats()["active_locks"] != 0:
+            print(f"❌ Expected no locks left, got {service.get_stats()}")
+            return False
+
+        print(f"✅ {2 * rounds} locked increments from two processes without a lost update in {elapsed:.2f}s")
+        service.close()
+        return True
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def create_tracker(test_dir: str, grace: float = 0.4):
+    """
+    Create a JSON-backed FileUsageTracker whose locks expire quickly.
+
+    The tracker writes its log file relative to the working directory, so it
+    is imported and created inside test_dir. Session detection is left out
+    (the tracker runs without it), as importing session_detector records this
+    run in the shared active sessions file.
+    """
+    os.makedirs(os.path.join(test_dir, "logs"), exist_ok=True)
+    os.chdir(test_dir)
+    sys.modules.setdefault("session_detector", None)
+    from file_usage_tracker import FileUsageTracker
+
+    class FastExpiryTracker(FileUsageTracker):
+        STALE_LOCK_GRACE_SECONDS = grace
+
+    return FastExpiryTracker(tracker_path=os.path.join(test_dir, "file_usage_tracker.json"))
+
+
+def test_lock_expiry_heap():
+    """Test lock expiry through renewals, early releases and a rebuilt heap"""
+    print("\n=== Testing Lock Expiry Heap ===")
+
+    original_dir = os.getcwd()
+    test_dir = tempfile.mkdtemp(prefix="ai_managers_test_")
+    try:
+        tracker = create_tracker(test_dir)
+
+        # A renewed lock outlives its first deadline
+        tracker.request_file_lock("renewed.py", "agent_simulations", expected_duration=0)
+        time.sleep(0.2)
+        tracker.request_file_lock("renewed.py", "agent_simulations", expected_duration=0)
+        time.sleep(0.3)
+        if not tracker.check_file_lock("renewed.py"):
+            print("❌ Renewed lock expired at its original deadline")
+            return False
+        time.sleep(0.3)
+        if tracker.check_file_lock("renewed.py") or tracker.get_lock_stats()["expired_locks"] != 1:
+            print(f"❌ Expected the renewed lock to expire at its new deadline, got {tracker.get_lock_stats()}")
+            return False
+
+        print("✅ Renewed lock expired at its new deadline only")
+
+        # A lock released early leaves a stale entry that must not expire its successor
+        tracker.request_file_lock("released.py", "agent_simulations", expected_duration=0)
+        tracker.release_file_lock("released.py", "agent_simulations")
+        tracker.request_file_lock("released.py", "script_assessment", expected_duration=60)
+        time.sleep(0.5)
+        lock = tracker.check_file_lock("released.py")
+        if lock.get("locked_by") != "script_assessment" or tracker.get_lock_stats()["expired_locks"] != 1:
+            print(f"❌ Expected the new owner to keep the lock, got {lock} and {tracker.get_lock_stats()}")
+            return False
+
+        print("✅ Stale entry of an early release was skipped")
+
+        # Repeated renewals do not grow the heap without bound
+        for _ in range(1000):
+            tracker.request_file_lock("released.py", "script_assessment", expected_duration=60)
+        heap_bound = 2 * len(tracker._lock_deadlines) + 64
+        if len(tracker._expiry_heap) > heap_bound:
+            print(f"❌ Expected at most {heap_bound} heap entries, got {len(tracker._expiry_heap)}")
+            return False
+
+        print(f"✅ 1000 renewals left {len(tracker._expiry_heap)} heap entries")
+
+        # A tracker loaded from disk rebuilds deadlines from the lock timestamps
+        tracker.STALE_LOCK_GRACE_SECONDS = 60  # Nothing expires while the locks are taken
+        for i in range(200):
+            tracker.request_file_lock(f"stale_{i}.py", "gui_testing", expected_duration=0)
+        time.sleep(0.5)
+        reloaded = create_tracker(test_dir)
+        stats = reloaded.get_lock_stats()
+        if stats != {"active_locks": 1, "expired_locks": 200} or len(reloaded._expiry_heap) != 1:
+            print(f"❌ Expected only the long lock to survive a reload, got {stats} "
+                  f"and {len(reloaded._expiry_heap)} heap entries")
+            return False
+
+        print("✅ Reloaded tracker expired 200 stale locks and kept the live one")
+        return True
+    finally:
+        os.chdir(original_dir)
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_task_journal_recovery():
+    """Test that a task journal recovers from torn writes and interrupted compactions"""
+    print("\n=== Testing Task Journal Recovery ===")
+
+    from task_journal import TaskJournal
+
+    test_dir = tempfile.mkdtemp(prefix="ai_managers_test_")
+    try:
+        snapshot_path = os.path.join(test_dir, "tasks.json")
+        journal = TaskJournal(snapshot_path, compact_every=1000)
+        for i in range(3):
+            journal.put(f"task_{i}", {"name": f"Task {i}", "runs": 0})
+
+        # A crash mid-write leaves a partial last line
+        with open(journal.journal_path, "a") as f:
+            f.write('{"op": "put", "key": "task_3", "rec')
+        reopened = TaskJournal(snapshot_path, compact_every=1000)
+        with open(reopened.journal_path, "rb") as f:
+            content = f.read()
+        if sorted(reopened.get_records()) != ["task_0", "task_1", "task_2"] or not content.endswith(b"\n"):
+            print(f"❌ Expected the torn entry to be dropped and cut off, got {sorted(reopened.get_records())}")
+            return False
+
+        reopened.put("task_3", {"name": "Task 3", "runs": 0})
+        if "task_3" not in TaskJournal(snapshot_path, compact_every=1000).get_records():
+            print("❌ Entry appended after the torn one was not replayed")
+            return False
+
+        print("✅ Torn entry dropped and truncated; later appends replay")
+
+        # A crash after the snapshot rename but before the journal truncate replays
+        # entries the snapshot already holds
+        reopened.update("task_0", {"runs": 1})
+        reopened.delete("task_1")
+        with open(reopened.journal_path, "rb") as f:
+            uncompacted = f.read()
+        expected = reopened.get_records()
+        reopened.compact()
+        with open(reopened.journal_path, "wb") as f:
+            f.write(uncompacted)
+
+        records = TaskJournal(snapshot_path, compact_every=1000).get_records()
+        if records != expected:
+            print(f"❌ Expected {expected} after replaying over the new snapshot, got {records}")
+            return False
+
+        print("✅ Journal replayed over an already compacted snapshot gives the same records")
+
+        # An update journaled after a delete must not bring back a partial record
+        journal = TaskJournal(snapshot_path, compact_every=1000)
+        journal.delete("task_2")
+        if journal.update("task_2", {"runs": 5}):
+            print("❌ Update of a deleted task was accepted")
+            return False
+        with open(journal.journal_path, "a") as f:
+            f.write('{"op": "update", "key": "task_2", "fields": {"runs": 5}}\n')
+
+        records = TaskJournal(snapshot_path, compact_every=1000).get_records()
+        if "task_2" in records:
+            print(f"❌ Update after a delete brought the task back: {records['task_2']}")
+            return False
+
+        print("✅ Updates after a delete were ignored")
+        return True
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        ("Cross-Process Locks", test_cross_process_locks),
+        ("Lock Expiry Heap", test_lock_expiry_heap),
+        ("Task Journal Recovery", test_task_journal_recovery)
+    ]
+
+    success = True
+    results = []
+
+    print("=== AI Managers Tests ===\n")
+
+    for name, test_func in tests:
+        print(f"\n=== Running Test: {name} ===")
+        try:
+            test_success = test_func()
+            results.append((name, test_success))
+            if not test_success:
+                success = False
+        except Exception as e:
+            print(f"❌ Test failed with exception: {e}")
+            results.append((name, False))
+            success = False
+
+    print("\n=== Test Results ===")
+    for name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {name}")
+
+    return success
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -8,9 +8,12 @@ import os
 import json
 import logging
 import time
-from typing import List, Dict, Any, Optional
+import base64
+import hashlib
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 
-from cloud_storage.cloud_storage_module import CloudStorageProvider, CloudStorageConfig
+from cloud_storage.cloud_storage_module import CloudStorageProvider, CloudStorageConfig, DEFAULT_LIST_PAGE_SIZE
+from cloud_storage.retry_policy import RetryPolicy, is_transient_error
 
 # Set up logging
 logging.basicConfig(
@@ -24,8 +27,31 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Constants
-MAX_UPLOAD_RETRIES = 3
-RETRY_DELAY = 2  # seconds
+NOT_FOUND_ERROR_CODES = {'NoSuchKey', '404'}
+RETRYABLE_ERROR_CODES = {
+    'Throttling', 'ThrottlingException', 'SlowDown', 'RequestTimeout', 'RequestTimeTooSkewed',
+    'InternalError', 'ServiceUnavailable', '500', '502', '503', '504'
+}
+
+
+def is_retryable_s3_error(error: Exception) -> bool:
+    """
+    Check whether an S3 error is worth retrying.
+    
+    Args:
+        error: Exception raised by an S3 call
+        
+    Returns:
+        bool: True for throttling, server-side and connection errors
+    """
+    try:
+        from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, ReadTimeoutError
+    except ImportError:
+        return is_transient_error(error)
+    
+    if isinstance(error, ClientError):
+        return error.response.get('Error', {}).get('Code') in RETRYABLE_ERROR_CODES
+    return isinstance(error, (BotoConnectionError, ReadTimeoutError)) or is_transient_error(error)
 
 
 class AWSS3StorageProvider(CloudStorageProvider):
@@ -37,6 +63,9 @@ class AWSS3StorageProvider(CloudStorageProvider):
         self.s3_client = None
         self.authenticated = False
         
+        # Retries, budget and circuit breaker shared by all callers of this provider
+        self.retry_policy = RetryPolicy.from_config(config, is_retryable=is_retryable_s3_error)
+        
         # Validate configuration
         if not config.bucket_name:
             raise ValueError("Bucket name is required for AWS S3 provider")
@@ -99,9 +128,6 @@ class AWSS3StorageProvider(CloudStorageProvider):
             return False
         
         try:
-            # Import boto3 error types here to handle retries
-            from botocore.exceptions import ClientError
-            
             # Configure extra args for upload
             extra_args = {}
             
@@ -113,28 +139,15 @@ class AWSS3StorageProvider(CloudStorageProvider):
             if self.config.public_access:
                 extra_args['ACL'] = 'public-read'
             
-            # Retry logic
-            retries = 0
-            while retries < MAX_UPLOAD_RETRIES:
-                try:
-                    self.s3_client.upload_file(
-                        local_path,
-                        self.config.bucket_name,
-                        remote_path,
-                        ExtraArgs=extra_args
-                    )
-                    logger.info(f"Successfully uploaded {local_path} to S3://{self.config.bucket_name}/{remote_path}")
-                    return True
-                except ClientError as e:
-                    retries += 1
-                    if retries >= MAX_UPLOAD_RETRIES:
-                        logger.error(f"Upload failed after {MAX_UPLOAD_RETRIES} retries: {e}")
-                        return False
-                    
-                    logger.warning(f"Upload attempt {retries} failed: {e}. Retrying in {RETRY_DELAY} seconds...")
-                    time.sleep(RETRY_DELAY)
-            
-            return False
+            self.retry_policy.call(
+                self.s3_client.upload_file,
+                local_path,
+                self.config.bucket_name,
+                remote_path,
+                ExtraArgs=extra_args
+            )
+            logger.info(f"Successfully uploaded {local_path} to S3://{self.config.bucket_name}/{remote_path}")
+            return True
             
         except Exception as e:
             logger.error(f"Upload to S3 failed: {e}")
@@ -153,37 +166,45 @@ class AWSS3StorageProvider(CloudStorageProvider):
             # Ensure directory exists
             os.makedirs(os.path.dirname(local_path), exist_ok=True)
             
-            # Retry logic
-            retries = 0
-            while retries < MAX_UPLOAD_RETRIES:
-                try:
-                    self.s3_client.download_file(
-                        self.config.bucket_name,
-                        remote_path,
-                        local_path
-                    )
-                    logger.info(f"Successfully downloaded S3://{self.config.bucket_name}/{remote_path} to {local_path}")
-                    return True
-                except ClientError as e:
-                    error_code = e.response.get('Error', {}).get('Code')
-                    if error_code == 'NoSuchKey':
-                        logger.error(f"File not found in S3: {remote_path}")
-                        return False
-                    
-                    retries += 1
-                    if retries >= MAX_UPLOAD_RETRIES:
-                        logger.error(f"Download failed after {MAX_UPLOAD_RETRIES} retries: {e}")
-                        return False
-                    
-                    logger.warning(f"Download attempt {retries} failed: {e}. Retrying in {RETRY_DELAY} seconds...")
-                    time.sleep(RETRY_DELAY)
+            self.retry_policy.call(
+                self.s3_client.download_file,
+                self.config.bucket_name,
+                remote_path,
+                local_path
+            )
+            logger.info(f"Successfully downloaded S3://{self.config.bucket_name}/{remote_path} to {local_path}")
+            return True
             
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in NOT_FOUND_ERROR_CODES:
+                logger.error(f"File not found in S3: {remote_path}")
+            else:
+                logger.error(f"Download from S3 failed: {e}")
             return False
-            
         except Exception as e:
             logger.error(f"Download from S3 failed: {e}")
             return False
     
+    def _list_pages(self, prefix: str, page_size: int = DEFAULT_LIST_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Yield list_objects_v2 responses, sending each page request through the retry policy.
+        
+        Args:
+            prefix: Key prefix to list
+            page_size: Maximum keys per page
+            
+        Yields:
+            Dict[str, Any]: One listing response per page
+        """
+        request = {"Bucket": self.config.bucket_name, "Prefix": prefix, "MaxKeys": page_size}
+        while True:
+            page = self.retry_policy.call(self.s3_client.list_objects_v2, **request)
+            yield page
+            
+            if not page.get('IsTruncated'):
+                return
+            request["ContinuationToken"] = page['NextContinuationToken']
+    
     def list_files(self, prefix: str = None) -> List[str]:
         """List files in S3 bucket"""
         if not self.authenticated:
@@ -191,19 +212,11 @@ class AWSS3StorageProvider(CloudStorageProvider):
             return []
         
         try:
-            # If prefix is provided, append it to the configured prefix
-            s3_prefix = prefix or ""
-            
-            # List objects in bucket
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            pages = paginator.paginate(Bucket=self.config.bucket_name, Prefix=s3_prefix)
-            
             # Collect file paths
             result = []
-            for page in pages:
-                if 'Contents' in page:
-                    for obj in page['Contents']:
-                        result.append(obj['Key'])
+            for page in self._list_pages(prefix or ""):
+                for obj in page.get('Contents', []):
+                    result.append(obj['Key'])
             
             return result
             
@@ -211,6 +224,31 @@ class AWSS3StorageProvider(CloudStorageProvider):
             logger.error(f"List files in S3 failed: {e}")
             return []
     
+    def list_files_with_metadata(
+        self,
+        prefix: str = None,
+        page_size: int = DEFAULT_LIST_PAGE_SIZE
+    ) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+        """List files in S3 bucket with metadata from the listing itself, one page per request"""
+        if not self.authenticated:
+            logger.error("Not authenticated with AWS S3")
+            return
+        
+        try:
+            for page in self._list_pages(prefix or "", page_size):
+                yield [
+                    (obj['Key'], {
+                        "size": obj.get('Size', 0),
+                        "last_modified": obj['LastModified'].isoformat() if obj.get('LastModified') else '',
+                        "etag": obj.get('ETag', '').strip('"'),
+                        "storage_class": obj.get('StorageClass', '')
+                    })
+                    for obj in page.get('Contents', [])
+                ]
+                
+        except Exception as e:
+            logger.error(f"List files with metadata in S3 failed: {e}")
+    
     def delete_file(self, remote_path: str) -> bool:
         """Delete a file from S3"""
         if not self.authenticated:
@@ -219,7 +257,8 @@ class AWSS3StorageProvider(CloudStorageProvider):
         
         try:
             # Delete object
-            self.s3_client.delete_object(
+            self.retry_policy.call(
+                self.s3_client.delete_object,
                 Bucket=self.config.bucket_name,
                 Key=remote_path
             )
@@ -239,7 +278,8 @@ class AWSS3StorageProvider(CloudStorageProvider):
         
         try:
             # Check if object exists
-            self.s3_client.head_object(
+            self.retry_policy.call(
+                self.s3_client.head_object,
                 Bucket=self.config.bucket_name,
                 Key=remote_path
             )
@@ -257,7 +297,8 @@ class AWSS3StorageProvider(CloudStorageProvider):
         
         try:
             # Get object metadata
-            response = self.s3_client.head_object(
+            response = self.retry_policy.call(
+                self.s3_client.head_object,
                 Bucket=self.config.bucket_name,
                 Key=remote_path
             )
@@ -279,4 +320,102 @@ class AWSS3StorageProvider(CloudStorageProvider):
             
         except Exception as e:
             logger.error(f"Get metadata from S3 failed: {e}")
-            return {}
\ No newline at end of file
+            return {}
+    
+    def supports_multipart(self) -> bool:
+        """S3 supports multipart uploads and ranged GETs"""
+        return True
+    
+    def create_multipart_upload(self, remote_path: str) -> str:
+        """Start an S3 multipart upload"""
+        if not self.authenticated:
+            raise RuntimeError("Not authenticated with AWS S3")
+        
+        extra_args = {}
+        if self.config.encryption:
+            extra_args['ServerSideEncryption'] = 'AES256'
+        if self.config.public_access:
+            extra_args['ACL'] = 'public-read'
+        
+        response = self.retry_policy.call(
+            self.s3_client.create_multipart_upload,
+            Bucket=self.config.bucket_name,
+            Key=remote_path,
+            **extra_args
+        )
+        return response['UploadId']
+    
+    def upload_part(self, remote_path: str, upload_id: str, part_number: int, data: bytes, checksum: str) -> str:
+        """Upload one part of an S3 multipart upload and return its ETag"""
+        if not self.authenticated:
+            raise RuntimeError("Not authenticated with AWS S3")
+        
+        # S3 verifies the part against its Content-MD5 on receipt
+        response = self.retry_policy.call(
+            self.s3_client.upload_part,
+            Bucket=self.config.bucket_name,
+            Key=remote_path,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data,
+            ContentMD5=base64.b64encode(hashlib.md5(data).digest()).decode('ascii')
+        )
+        return response['ETag']
+    
+    def complete_multipart_upload(self, remote_path: str, upload_id: str, parts: List[Tuple[int, str]]) -> bool:
+        """Complete an S3 multipart upload"""
+        if not self.authenticated:
+            logger.error("Not authenticated with AWS S3")
+            return False
+        
+        try:
+            self.retry_policy.call(
+                self.s3_client.complete_multipart_upload,
+                Bucket=self.config.bucket_name,
+                Key=remote_path,
+                UploadId=upload_id,
+                MultipartUpload={
+                    'Parts': [
+                        {'PartNumber': part_number, 'ETag': etag}
+                        for part_number, etag in sorted(parts)
+                    ]
+                }
+            )
+            logger.info(f"Successfully completed multipart upload to S3://{self.config.bucket_name}/{remote_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Completing multipart upload to S3 failed: {e}")
+            return False
+    
+    def abort_multipart_upload(self, remote_path: str, upload_id: str) -> bool:
+        """Abort an S3 multipart upload and free its stored parts"""
+        if not self.authenticated:
+            logger.error("Not authenticated with AWS S3")
+            return False
+        
+        try:
+            self.retry_policy.call(
+                self.s3_client.abort_multipart_upload,
+                Bucket=self.config.bucket_name,
+                Key=remote_path,
+                UploadId=upload_id
+            )
+            return True
+            
+        except Exception as e:
+            logger.error(f"Aborting multipart upload to S3 failed: {e}")
+            return False
+    
+    def download_range(self, remote_path: str, offset: int, length: int) -> bytes:
+        """Download a byte range of an S3 object"""
+        if not self.authenticated:
+            raise RuntimeError("Not authenticated with AWS S3")
+        
+        response = self.retry_policy.call(
+            self.s3_client.get_object,
+            Bucket=self.config.bucket_name,
+            Key=remote_path,
+            Range=f"bytes={offset}-{offset + length - 1}"
+        )
+        return response['Body'].read()
@@ -8,10 +8,13 @@ import os
 import json
 import logging
 import time
-from typing import List, Dict, Any, Optional
+import base64
+import uuid
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 from datetime import datetime, timezone
 
-from cloud_storage.cloud_storage_module import CloudStorageProvider, CloudStorageConfig
+from cloud_storage.cloud_storage_module import CloudStorageProvider, CloudStorageConfig, DEFAULT_LIST_PAGE_SIZE
+from cloud_storage.retry_policy import RetryPolicy, is_transient_error
 
 # Set up logging
 logging.basicConfig(
@@ -25,8 +28,29 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Constants
-MAX_UPLOAD_RETRIES = 3
-RETRY_DELAY = 2  # seconds
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def is_retryable_azure_error(error: Exception) -> bool:
+    """
+    Check whether an Azure Blob Storage error is worth retrying.
+    
+    Args:
+        error: Exception raised by an Azure call
+        
+    Returns:
+        bool: True for throttling, server-side and connection errors
+    """
+    try:
+        from azure.core.exceptions import HttpResponseError, ServiceRequestError, ServiceResponseError
+    except ImportError:
+        return is_transient_error(error)
+    
+    if isinstance(error, (ServiceRequestError, ServiceResponseError)):
+        return True
+    if isinstance(error, HttpResponseError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return is_transient_error(error)
 
 
 class AzureBlobStorageProvider(CloudStorageProvider):
@@ -39,6 +63,9 @@ class AzureBlobStorageProvider(CloudStorageProvider):
         self.container_client = None
         self.authenticated = False
         
+        # Retries, budget and circuit breaker shared by all callers of this provider
+        self.retry_policy = RetryPolicy.from_config(config, is_retryable=is_retryable_azure_error)
+        
         # Validate configuration
         if not config.container_name:
             raise ValueError("Container name is required for Azure Blob Storage provider")
@@ -122,32 +149,16 @@ class AzureBlobStorageProvider(CloudStorageProvider):
             return False
         
         try:
-            # Import Azure exceptions
-            from azure.core.exceptions import ServiceError
-            
             # Get blob client
             blob_client = self.container_client.get_blob_client(remote_path)
             
-            # Retry logic
-            retries = 0
-            while retries < MAX_UPLOAD_RETRIES:
-                try:
-                    # Upload file
-                    with open(local_path, "rb") as data:
-                        blob_client.upload_blob(data, overwrite=True)
-                    
-                    logger.info(f"Successfully uploaded {local_path} to Azure Blob Storage: {remote_path}")
-                    return True
-                except ServiceError as e:
-                    retries += 1
-                    if retries >= MAX_UPLOAD_RETRIES:
-                        logger.error(f"Upload failed after {MAX_UPLOAD_RETRIES} retries: {e}")
-                        return False
-                    
-                    logger.warning(f"Upload attempt {retries} failed: {e}. Retrying in {RETRY_DELAY} seconds...")
-                    time.sleep(RETRY_DELAY)
+            def upload():
+                with open(local_path, "rb") as data:
+                    blob_client.upload_blob(data, overwrite=True)
             
-            return False
+            self.retry_policy.call(upload)
+            logger.info(f"Successfully uploaded {local_path} to Azure Blob Storage: {remote_path}")
+            return True
             
         except Exception as e:
             logger.error(f"Upload to Azure Blob Storage failed: {e}")
@@ -161,7 +172,7 @@ class AzureBlobStorageProvider(CloudStorageProvider):
         
         try:
             # Import Azure exceptions
-            from azure.core.exceptions import ResourceNotFoundError, ServiceError
+            from azure.core.exceptions import ResourceNotFoundError
             
             # Get blob client
             blob_client = self.container_client.get_blob_client(remote_path)
@@ -169,30 +180,17 @@ class AzureBlobStorageProvider(CloudStorageProvider):
             # Ensure directory exists
             os.makedirs(os.path.dirname(local_path), exist_ok=True)
             
-            # Retry logic
-            retries = 0
-            while retries < MAX_UPLOAD_RETRIES:
-                try:
-                    # Download file
-                    with open(local_path, "wb") as download_file:
-                        download_file.write(blob_client.download_blob().readall())
-                    
-                    logger.info(f"Successfully downloaded Azure Blob Storage: {remote_path} to {local_path}")
-                    return True
-                except ResourceNotFoundError:
-                    logger.error(f"Blob not found in Azure Storage: {remote_path}")
-                    return False
-                except ServiceError as e:
-                    retries += 1
-                    if retries >= MAX_UPLOAD_RETRIES:
-                        logger.error(f"Download failed after {MAX_UPLOAD_RETRIES} retries: {e}")
-                        return False
-                    
-                    logger.warning(f"Download attempt {retries} failed: {e}. Retrying in {RETRY_DELAY} seconds...")
-                    time.sleep(RETRY_DELAY)
+            def download():
+                with open(local_path, "wb") as download_file:
+                    blob_client.download_blob().readinto(download_file)
             
-            return False
+            self.retry_policy.call(download)
+            logger.info(f"Successfully downloaded Azure Blob Storage: {remote_path} to {local_path}")
+            return True
             
+        except ResourceNotFoundError:
+            logger.error(f"Blob not found in Azure Storage: {remote_path}")
+            return False
         except Exception as e:
             logger.error(f"Download from Azure Blob Storage failed: {e}")
             return False
@@ -207,18 +205,56 @@ class AzureBlobStorageProvider(CloudStorageProvider):
             # If prefix is provided, use it
             name_starts_with = prefix if prefix else None
             
-            # List blobs
-            blob_list = self.container_client.list_blobs(name_starts_with=name_starts_with)
-            
-            # Collect blob names
-            result = [blob.name for blob in blob_list]
+            # List and collect blob names; the pager sends its requests while iterating
+            def list_names():
+                return [blob.name for blob in self.container_client.list_blobs(name_starts_with=name_starts_with)]
             
-            return result
+            return self.retry_policy.call(list_names)
             
         except Exception as e:
             logger.error(f"List blobs in Azure Blob Storage failed: {e}")
             return []
     
+    def list_files_with_metadata(
+        self,
+        prefix: str = None,
+        page_size: int = DEFAULT_LIST_PAGE_SIZE
+    ) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+        """List blobs with their properties from the listing itself, one page per request"""
+        if not self.authenticated:
+            logger.error("Not authenticated with Azure Blob Storage")
+            return
+        
+        try:
+            blob_pages = self.container_client.list_blobs(
+                name_starts_with=prefix if prefix else None,
+                include=['metadata'],
+                results_per_page=page_size
+            ).by_page()
+            
+            for blob_page in blob_pages:
+                page = []
+                for blob in blob_page:
+                    metadata = {
+                        "size": blob.size,
+                        "content_type": blob.content_settings.content_type,
+                        "last_modified": blob.last_modified.isoformat() if blob.last_modified else '',
+                        "etag": (blob.etag or '').strip('"'),
+                        "created": blob.creation_time.isoformat() if blob.creation_time else '',
+                        "blob_type": blob.blob_type,
+                        "lease_state": blob.lease.state
+                    }
+                    
+                    # Add user-defined metadata
+                    if blob.metadata:
+                        metadata.update(blob.metadata)
+                    
+                    page.append((blob.name, metadata))
+                yield page
+                
+        except Exception as e:
+            logger.error(f"List blobs with metadata in Azure Blob Storage failed: {e}")
+    
     def delete_file(self, remote_path: str) -> bool:
         """Delete a blob from Azure Blob Storage"""
         if not self.authenticated:
@@ -230,7 +266,7 @@ class AzureBlobStorageProvider(CloudStorageProvider):
             blob_client = self.container_client.get_blob_client(remote_path)
             
             # Delete blob
-            blob_client.delete_blob()
+            self.retry_policy.call(blob_client.delete_blob)
             
             logger.info(f"Successfully deleted Azure Blob Storage: {remote_path}")
             return True
@@ -250,7 +286,7 @@ class AzureBlobStorageProvider(CloudStorageProvider):
             blob_client = self.container_client.get_blob_client(remote_path)
             
             # Check if blob exists
-            properties = blob_client.get_blob_properties()
+            properties = self.retry_policy.call(blob_client.get_blob_properties)
             return True
             
         except Exception:
@@ -267,13 +303,14 @@ class AzureBlobStorageProvider(CloudStorageProvider):
             blob_client = self.container_client.get_blob_client(remote_path)
             
             # Get blob properties
-            properties = blob_client.get_blob_properties()
+            properties = self.retry_policy.call(blob_client.get_blob_properties)
             
             # Extract metadata
             metadata = {
                 "size": properties.size,
                 "content_type": properties.content_settings.content_type,
                 "last_modified": properties.last_modified.isoformat() if properties.last_modified else '',
+                "etag": (properties.etag or '').strip('"'),
                 "created": properties.creation_time.isoformat() if properties.creation_time else '',
                 "blob_type": properties.blob_type,
                 "lease_state": properties.lease.state
@@ -287,4 +324,68 @@ class AzureBlobStorageProvider(CloudStorageProvider):
             
         except Exception as e:
             logger.error(f"Get metadata from Azure Blob Storage failed: {e}")
-            return {}
\ No newline at end of file
+            return {}
+    
+    def supports_multipart(self) -> bool:
+        """Block blobs support staged blocks and ranged downloads"""
+        return True
+    
+    def create_multipart_upload(self, remote_path: str) -> str:
+        """Start a staged block upload; the returned ID namespaces its block IDs"""
+        if not self.authenticated:
+            raise RuntimeError("Not authenticated with Azure Blob Storage")
+        
+        return uuid.uuid4().hex
+    
+    def _block_id(self, upload_id: str, part_number: int) -> str:
+        """Get the block ID of a part (all block IDs of a blob must have the same length)"""
+        return base64.b64encode(f"{upload_id}-{part_number:05d}".encode()).decode('ascii')
+    
+    def upload_part(self, remote_path: str, upload_id: str, part_number: int, data: bytes, checksum: str) -> str:
+        """Stage one block of a blob and return its block ID"""
+        if not self.authenticated:
+            raise RuntimeError("Not authenticated with Azure Blob Storage")
+        
+        block_id = self._block_id(upload_id, part_number)
+        blob_client = self.container_client.get_blob_client(remote_path)
+        
+        # validate_content has the service verify the block's MD5 on receipt
+        self.retry_policy.call(
+            blob_client.stage_block, block_id, data, length=len(data), validate_content=True
+        )
+        return block_id
+    
+    def complete_multipart_upload(self, remote_path: str, upload_id: str, parts: List[Tuple[int, str]]) -> bool:
+        """Commit the staged blocks of a blob"""
+        if not self.authenticated:
+            logger.error("Not authenticated with Azure Blob Storage")
+            return False
+        
+        try:
+            from azure.storage.blob import BlobBlock
+            
+            blob_client = self.container_client.get_blob_client(remote_path)
+            self.retry_policy.call(
+                blob_client.commit_block_list,
+                [BlobBlock(block_id=block_id) for _, block_id in sorted(parts)]
+            )
+            logger.info(f"Successfully committed {len(parts)} block(s) to Azure Blob Storage: {remote_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Committing blocks to Azure Blob Storage failed: {e}")
+            return False
+    
+    def abort_multipart_upload(self, remote_path: str, upload_id: str) -> bool:
+        """Abandon a staged block upload (uncommitted blocks are discarded by the service)"""
+        return True
+    
+    def download_range(self, remote_path: str, offset: int, length: int) -> bytes:
+        """Download a byte range of a blob"""
+        if not self.authenticated:
+            raise RuntimeError("Not authenticated with Azure Blob Storage")
+        
+        blob_client = self.container_client.get_blob_client(remote_path)
+        return self.retry_policy.call(
+            lambda: blob_client.download_blob(offset=offset, length=length).readall()
+        )
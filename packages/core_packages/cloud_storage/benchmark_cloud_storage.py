@@ -0,0 +1,162 @@
+"""
+Benchmark Script for Cloud Storage Module
+
+This script measures cloud storage operations against the mock provider with
+simulated per-call latency, so changes can be compared without a real cloud account.
+"""
+
+import os
+import time
+import json
+import shutil
+import tempfile
+import argparse
+from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+
+from cloud_storage.cloud_storage_module import CloudStorageManager, CloudStorageConfig
+from cloud_storage.sync_module import StorageSynchronizer, SyncConfig
+
+
+def create_mock_components(manager: CloudStorageManager, count: int):
+    """
+    Create components directly in the mock storage directory.
+
+    Args:
+        manager: Storage manager using the mock provider
+        count: Number of components to create
+    """
+    component_dir = os.path.join(manager.provider.storage_dir, manager.config.prefix)
+    shutil.rmtree(component_dir, ignore_errors=True)
+    os.makedirs(component_dir, exist_ok=True)
+
+    for i in range(count):
+        with open(os.path.join(component_dir, f"component_{i}.json"), 'w') as f:
+            json.dump({"id": i}, f)
+
+
+def benchmark_cloud_scan(file_count: int = 500, latency: float = 0.005, page_size: int = 100) -> Dict[str, Any]:
+    """
+    Compare a per-file metadata scan with the paged bulk listing.
+
+    Args:
+        file_count: Number of cloud components
+        latency: Simulated seconds per provider call
+        page_size: Components per listing page
+
+    Returns:
+        Dict[str, Any]: Round trips and elapsed time for each approach
+    """
+    config = CloudStorageConfig(provider="mock", prefix="benchmark_components")
+    manager = CloudStorageManager(config)
+    manager.authenticate()
+    create_mock_components(manager, file_count)
+
+    provider = manager.provider
+    provider.call_latency = latency
+
+    # Per-file metadata calls (one round trip per component)
+    manager.metadata_cache.clear()
+    provider.call_count = 0
+    start = time.perf_counter()
+    for component_id in manager.list_components():
+        manager.get_component_metadata(component_id)
+    per_file = {"round_trips": provider.call_count, "seconds": time.perf_counter() - start}
+
+    # Paged bulk listing used by the synchronizer
+    local_dir = tempfile.mkdtemp(prefix="cloud_scan_benchmark_")
+    try:
+        sync_config = SyncConfig(local_dir=local_dir, list_page_size=page_size)
+        synchronizer = StorageSynchronizer(manager, sync_config)
+        provider.call_count = 0
+        start = time.perf_counter()
+        cloud_files, _ = synchronizer._scan_and_compare({}, synchronizer._load_sync_state())
+        bulk = {"round_trips": provider.call_count, "seconds": time.perf_counter() - start}
+    finally:
+        shutil.rmtree(local_dir, ignore_errors=True)
+
+    shutil.rmtree(os.path.join(provider.storage_dir, config.prefix), ignore_errors=True)
+
+    return {
+        "benchmark": "cloud_scan",
+        "file_count": file_count,
+        "latency": latency,
+        "page_size": page_size,
+        "files_found": len(cloud_files),
+        "per_file_metadata": per_file,
+        "bulk_listing": bulk
+    }
+
+
+def benchmark_retry_policy(
+    request_count: int = 500,
+    error_rate: float = 0.2,
+    latency: float = 0.002,
+    workers: int = 5
+) -> Dict[str, Any]:
+    """
+    Run concurrent requests against a faulty mock provider through the retry policy.
+    
+    Args:
+        request_count: Number of metadata requests
+        error_rate: Fraction of simulated requests that fail transiently
+        latency: Maximum extra simulated latency per request in seconds
+        workers: Number of concurrent workers sharing the provider
+        
+    Returns:
+        Dict[str, Any]: Success count, elapsed time and retry policy statistics
+    """
+    config = CloudStorageConfig(
+        provider="mock",
+        prefix="benchmark_components",
+        max_workers=workers,
+        retry_base_delay=0.01,
+        retry_max_delay=0.2
+    )
+    manager = CloudStorageManager(config)
+    manager.authenticate()
+    create_mock_components(manager, 1)
+    manager.provider.set_fault_injection(error_rate=error_rate, latency=latency)
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda _: manager.provider.file_exists(f"{config.prefix}/component_0.json"),
+            range(request_count)
+        ))
+    elapsed = time.perf_counter() - start
+    
+    shutil.rmtree(os.path.join(manager.provider.storage_dir, config.prefix), ignore_errors=True)
+    
+    return {
+        "benchmark": "retry_policy",
+        "request_count": request_count,
+        "error_rate": error_rate,
+        "latency": latency,
+        "workers": workers,
+        "succeeded": sum(results),
+        "injected_faults": manager.provider.fault_count,
+        "seconds": elapsed,
+        "retry_stats": manager.get_retry_stats()
+    }
+
+
+BENCHMARKS = {
+    "cloud_scan": benchmark_cloud_scan,
+    "retry_policy": benchmark_retry_policy
+}
+
+
+def main():
+    """Run the selected benchmarks and print the results as JSON"""
+    parser = argparse.ArgumentParser(description="Cloud storage benchmarks")
+    parser.add_argument("benchmarks", nargs="*", default=list(BENCHMARKS),
+                        help="Benchmarks to run (default: all)")
+    args = parser.parse_args()
+
+    results = [BENCHMARKS[name]() for name in args.benchmarks]
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
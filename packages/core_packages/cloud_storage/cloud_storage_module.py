@@ -10,11 +10,23 @@ import json
 import logging
 import tempfile
 import time
+import shutil
+import hashlib
+import uuid
+import random
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Optional, Tuple, Union, Iterator
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
+from cloud_storage.transfer_engine import ChunkedTransferEngine
+from cloud_storage.metadata_cache import MetadataCache, DEFAULT_CACHE_SIZE, DEFAULT_CACHE_TTL
+from cloud_storage.operation_log import OperationLog, DEFAULT_LOG_CAPACITY
+from cloud_storage.retry_policy import (
+    RetryPolicy, TransientStorageError, DEFAULT_BASE_DELAY, DEFAULT_MAX_DELAY, DEFAULT_RETRY_BUDGET,
+    DEFAULT_BUDGET_REFILL_RATE, DEFAULT_FAILURE_THRESHOLD, DEFAULT_RESET_TIMEOUT
+)
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,6 +43,22 @@ MAX_WORKERS = 5
 DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB
 MAX_UPLOAD_RETRIES = 3
 RETRY_DELAY = 2  # seconds
+DEFAULT_LIST_PAGE_SIZE = 1000  # objects per listing page
+
+
+def default_cache_dir() -> str:
+    """
+    Get the per-user directory for local cloud storage state.
+    
+    Returns:
+        str: Cache directory under the user's cache location (temp dir without a home)
+    """
+    home = os.path.expanduser("~")
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    if not base:
+        base = os.path.join(home, ".cache") if home != "~" else tempfile.gettempdir()
+    return os.path.join(base, "GlowingGoldenGlobe", "cloud_storage")
+
 
 @dataclass
 class CloudStorageConfig:
@@ -44,6 +72,20 @@ class CloudStorageConfig:
     encryption: bool = True
     public_access: bool = False
     max_workers: int = MAX_WORKERS
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    transfer_session_dir: str = ".cloud_transfer_sessions"  # Relative to cache_dir
+    cache_dir: str = None  # Local state such as transfer sessions; defaults to default_cache_dir()
+    metadata_cache_size: int = DEFAULT_CACHE_SIZE
+    metadata_cache_ttl: float = DEFAULT_CACHE_TTL
+    operation_log_capacity: int = DEFAULT_LOG_CAPACITY
+    operation_log_path: str = "cloud_operations.log"  # Relative to cache_dir
+    max_retries: int = MAX_UPLOAD_RETRIES
+    retry_base_delay: float = DEFAULT_BASE_DELAY
+    retry_max_delay: float = DEFAULT_MAX_DELAY
+    retry_budget: float = DEFAULT_RETRY_BUDGET
+    retry_budget_refill_rate: float = DEFAULT_BUDGET_REFILL_RATE
+    circuit_failure_threshold: int = DEFAULT_FAILURE_THRESHOLD
+    circuit_reset_timeout: float = DEFAULT_RESET_TIMEOUT
 
 
 class CloudStorageProvider(ABC):
@@ -83,6 +125,53 @@ class CloudStorageProvider(ABC):
     def get_file_metadata(self, remote_path: str) -> Dict[str, Any]:
         """Get metadata for a file in cloud storage"""
         pass
+    
+    def list_files_with_metadata(
+        self,
+        prefix: str = None,
+        page_size: int = DEFAULT_LIST_PAGE_SIZE
+    ) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+        """
+        List files together with their metadata, one page at a time.
+        
+        Providers whose listing API already returns object metadata should
+        override this so a listing costs one round trip per page. The default
+        implementation falls back to one metadata call per file.
+        
+        Args:
+            prefix: Only list files starting with this prefix
+            page_size: Maximum number of files per page
+            
+        Yields:
+            List[Tuple[str, Dict[str, Any]]]: (remote path, metadata) pairs
+        """
+        files = self.list_files(prefix)
+        for start in range(0, len(files), page_size):
+            yield [(path, self.get_file_metadata(path)) for path in files[start:start + page_size]]
+    
+    def supports_multipart(self) -> bool:
+        """Whether the provider implements the multipart and ranged transfer methods below"""
+        return False
+    
+    def create_multipart_upload(self, remote_path: str) -> str:
+        """Start a multipart upload and return its upload ID"""
+        raise NotImplementedError
+    
+    def upload_part(self, remote_path: str, upload_id: str, part_number: int, data: bytes, checksum: str) -> str:
+        """Upload one part (1-based) with its SHA-256 checksum and return the provider's part ID"""
+        raise NotImplementedError
+    
+    def complete_multipart_upload(self, remote_path: str, upload_id: str, parts: List[Tuple[int, str]]) -> bool:
+        """Assemble uploaded parts, given as (part number, part ID), into the remote file"""
+        raise NotImplementedError
+    
+    def abort_multipart_upload(self, remote_path: str, upload_id: str) -> bool:
+        """Discard a multipart upload and its parts"""
+        raise NotImplementedError
+    
+    def download_range(self, remote_path: str, offset: int, length: int) -> bytes:
+        """Download a byte range of a file"""
+        raise NotImplementedError
 
 
 class MockCloudStorageProvider(CloudStorageProvider):
@@ -93,12 +182,64 @@ class MockCloudStorageProvider(CloudStorageProvider):
         self.storage_dir = os.path.join(tempfile.gettempdir(), "mock_cloud_storage")
         self.authenticated = False
         
+        # Simulated network round trip added to every provider call
+        self.call_latency = 0.0
+        self.call_count = 0
+        
+        # Fault injection: fraction of requests that fail transiently, and extra random latency
+        self.fault_error_rate = 0.0
+        self.fault_latency = 0.0
+        self.fault_count = 0
+        
+        # Retries, budget and circuit breaker shared by all callers of this provider
+        self.retry_policy = RetryPolicy.from_config(config)
+        
         # Create mock storage directory if it doesn't exist
         os.makedirs(self.storage_dir, exist_ok=True)
         logger.info(f"Mock cloud storage initialized at {self.storage_dir}")
     
+    def set_fault_injection(self, error_rate: float = 0.0, latency: float = 0.0):
+        """
+        Make simulated requests fail or slow down, to exercise the retry policy offline.
+        
+        Args:
+            error_rate: Probability (0-1) that a request raises a TransientStorageError
+            latency: Maximum extra latency in seconds, drawn uniformly per request
+        """
+        self.fault_error_rate = error_rate
+        self.fault_latency = latency
+    
+    def _round_trip(self):
+        """Account for one simulated request to the cloud service"""
+        self.call_count += 1
+        delay = self.call_latency
+        if self.fault_latency > 0:
+            delay += random.uniform(0, self.fault_latency)
+        if delay > 0:
+            time.sleep(delay)
+        
+        if self.fault_error_rate > 0 and random.random() < self.fault_error_rate:
+            self.fault_count += 1
+            raise TransientStorageError("Injected fault: service unavailable")
+    
+    def _request(self) -> bool:
+        """
+        Send one simulated request through the retry policy.
+        
+        Returns:
+            bool: True if the request succeeded, False once retries are exhausted
+        """
+        try:
+            self.retry_policy.call(self._round_trip)
+            return True
+        except Exception as e:
+            logger.error(f"Mock request failed: {e}")
+            return False
+    
     def authenticate(self) -> bool:
         """Mock authentication"""
+        if not self._request():
+            return False
         self.authenticated = True
         logger.info("Mock authentication successful")
         return True
@@ -109,12 +250,15 @@ class MockCloudStorageProvider(CloudStorageProvider):
             logger.error("Not authenticated")
             return False
         
+        if not self._request():
+            return False
+        
         try:
             target_path = os.path.join(self.storage_dir, remote_path)
             os.makedirs(os.path.dirname(target_path), exist_ok=True)
             
             with open(local_path, 'rb') as src_file, open(target_path, 'wb') as dst_file:
-                dst_file.write(src_file.read())
+                shutil.copyfileobj(src_file, dst_file, DEFAULT_CHUNK_SIZE)
             
             logger.info(f"Mock uploaded {local_path} to {remote_path}")
             return True
@@ -128,6 +272,9 @@ class MockCloudStorageProvider(CloudStorageProvider):
             logger.error("Not authenticated")
             return False
         
+        if not self._request():
+            return False
+        
         try:
             source_path = os.path.join(self.storage_dir, remote_path)
             
@@ -138,7 +285,7 @@ class MockCloudStorageProvider(CloudStorageProvider):
             os.makedirs(os.path.dirname(local_path), exist_ok=True)
             
             with open(source_path, 'rb') as src_file, open(local_path, 'wb') as dst_file:
-                dst_file.write(src_file.read())
+                shutil.copyfileobj(src_file, dst_file, DEFAULT_CHUNK_SIZE)
             
             logger.info(f"Mock downloaded {remote_path} to {local_path}")
             return True
@@ -152,11 +299,18 @@ class MockCloudStorageProvider(CloudStorageProvider):
             logger.error("Not authenticated")
             return []
         
+        if not self._request():
+            return []
+        
         try:
             result = []
             base_len = len(self.storage_dir) + 1
             
-            for root, _, files in os.walk(self.storage_dir):
+            for root, dirs, files in os.walk(self.storage_dir):
+                # Skip parts of unfinished multipart uploads
+                if root == self.storage_dir and ".multipart" in dirs:
+                    dirs.remove(".multipart")
+                
                 for file in files:
                     full_path = os.path.join(root, file)
                     rel_path = full_path[base_len:]
@@ -175,6 +329,9 @@ class MockCloudStorageProvider(CloudStorageProvider):
             logger.error("Not authenticated")
             return False
         
+        if not self._request():
+            return False
+        
         try:
             target_path = os.path.join(self.storage_dir, remote_path)
             
@@ -195,15 +352,30 @@ class MockCloudStorageProvider(CloudStorageProvider):
             logger.error("Not authenticated")
             return False
         
+        if not self._request():
+            return False
+        
         target_path = os.path.join(self.storage_dir, remote_path)
         return os.path.exists(target_path)
     
+    def _stat_metadata(self, stats: os.stat_result) -> Dict[str, Any]:
+        """Build mock metadata from file stats"""
+        return {
+            "size": stats.st_size,
+            "last_modified": time.ctime(stats.st_mtime),
+            "created": time.ctime(stats.st_ctime),
+            "etag": f"{stats.st_mtime_ns:x}-{stats.st_size:x}"
+        }
+    
     def get_file_metadata(self, remote_path: str) -> Dict[str, Any]:
         """Get metadata for a file in mock storage"""
         if not self.authenticated:
             logger.error("Not authenticated")
             return {}
         
+        if not self._request():
+            return {}
+        
         target_path = os.path.join(self.storage_dir, remote_path)
         
         if not os.path.exists(target_path):
@@ -211,15 +383,125 @@ class MockCloudStorageProvider(CloudStorageProvider):
             return {}
         
         try:
-            stats = os.stat(target_path)
-            return {
-                "size": stats.st_size,
-                "last_modified": time.ctime(stats.st_mtime),
-                "created": time.ctime(stats.st_ctime)
-            }
+            return self._stat_metadata(os.stat(target_path))
         except Exception as e:
             logger.error(f"Error getting mock file metadata: {e}")
             return {}
+    
+    def list_files_with_metadata(
+        self,
+        prefix: str = None,
+        page_size: int = DEFAULT_LIST_PAGE_SIZE
+    ) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+        """Mock paged listing with metadata, one simulated round trip per page"""
+        if not self.authenticated:
+            logger.error("Not authenticated")
+            return
+        
+        base_len = len(self.storage_dir) + 1
+        page = []
+        try:
+            for root, dirs, files in os.walk(self.storage_dir):
+                # Skip parts of unfinished multipart uploads
+                if root == self.storage_dir and ".multipart" in dirs:
+                    dirs.remove(".multipart")
+                
+                for file in files:
+                    full_path = os.path.join(root, file)
+                    rel_path = full_path[base_len:]
+                    
+                    if prefix and not rel_path.startswith(prefix):
+                        continue
+                    
+                    page.append((rel_path, self._stat_metadata(os.stat(full_path))))
+                    if len(page) >= page_size:
+                        if not self._request():
+                            return
+                        yield page
+                        page = []
+        except Exception as e:
+            logger.error(f"Mock list with metadata failed: {e}")
+        
+        if page and self._request():
+            yield page
+    
+    def supports_multipart(self) -> bool:
+        """Mock storage supports multipart uploads and ranged downloads"""
+        return True
+    
+    def _multipart_dir(self, upload_id: str) -> str:
+        """Get the directory holding the parts of a mock multipart upload"""
+        return os.path.join(self.storage_dir, ".multipart", upload_id)
+    
+    def create_multipart_upload(self, remote_path: str) -> str:
+        """Start a mock multipart upload"""
+        if not self.authenticated:
+            raise RuntimeError("Not authenticated")
+        
+        self.retry_policy.call(self._round_trip)
+        
+        upload_id = uuid.uuid4().hex
+        os.makedirs(self._multipart_dir(upload_id))
+        return upload_id
+    
+    def upload_part(self, remote_path: str, upload_id: str, part_number: int, data: bytes, checksum: str) -> str:
+        """Store one part of a mock multipart upload after verifying its checksum"""
+        if not self.authenticated:
+            raise RuntimeError("Not authenticated")
+        
+        self.retry_policy.call(self._round_trip)
+        
+        if hashlib.sha256(data).hexdigest() != checksum:
+            raise ValueError(f"Checksum mismatch for part {part_number} of {remote_path}")
+        
+        part_path = os.path.join(self._multipart_dir(upload_id), f"{part_number:05d}")
+        with open(part_path, 'wb') as f:
+            f.write(data)
+        return checksum
+    
+    def complete_multipart_upload(self, remote_path: str, upload_id: str, parts: List[Tuple[int, str]]) -> bool:
+        """Concatenate the parts of a mock multipart upload into the target file"""
+        if not self.authenticated:
+            logger.error("Not authenticated")
+            return False
+        
+        if not self._request():
+            return False
+        
+        try:
+            upload_dir = self._multipart_dir(upload_id)
+            target_path = os.path.join(self.storage_dir, remote_path)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            
+            with open(target_path, 'wb') as dst_file:
+                for part_number, _ in sorted(parts):
+                    with open(os.path.join(upload_dir, f"{part_number:05d}"), 'rb') as part_file:
+                        shutil.copyfileobj(part_file, dst_file, DEFAULT_CHUNK_SIZE)
+            
+            shutil.rmtree(upload_dir, ignore_errors=True)
+            logger.info(f"Mock completed multipart upload of {remote_path} ({len(parts)} parts)")
+            return True
+        except Exception as e:
+            logger.error(f"Mock multipart completion failed: {e}")
+            return False
+    
+    def abort_multipart_upload(self, remote_path: str, upload_id: str) -> bool:
+        """Discard a mock multipart upload"""
+        if not self._request():
+            return False
+        shutil.rmtree(self._multipart_dir(upload_id), ignore_errors=True)
+        return True
+    
+    def download_range(self, remote_path: str, offset: int, length: int) -> bytes:
+        """Read a byte range from mock storage"""
+        if not self.authenticated:
+            raise RuntimeError("Not authenticated")
+        
+        self.retry_policy.call(self._round_trip)
+        
+        with open(os.path.join(self.storage_dir, remote_path), 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
 
 
 class CloudStorageManager:
@@ -236,11 +518,35 @@ class CloudStorageManager:
         # Initialize ThreadPoolExecutor for parallel operations
         self.executor = ThreadPoolExecutor(max_workers=config.max_workers)
         
-        # Cache for file metadata
-        self.metadata_cache = {}
-        
-        # Track operations
-        self.operation_log = []
+        # Local state lives under the cache directory
+        cache_dir = config.cache_dir or default_cache_dir()
+        
+        # Chunked, resumable transfers for large files
+        self.transfer_engine = ChunkedTransferEngine(
+            self.provider,
+            chunk_size=config.chunk_size,
+            max_workers=config.max_workers,
+            session_dir=os.path.join(cache_dir, config.transfer_session_dir)
+        )
+        
+        # Bounded LRU/TTL cache for file metadata and component listings
+        self.metadata_cache = MetadataCache(config.metadata_cache_size, config.metadata_cache_ttl)
+        
+        # Track recent operations in memory; older ones spill to a rotating log file
+        self.operation_log = OperationLog(
+            config.operation_log_capacity,
+            os.path.join(cache_dir, config.operation_log_path) if config.operation_log_path else None
+        )
+    
+    @property
+    def _listing_key(self) -> str:
+        """Cache key of the component listing"""
+        return self.config.prefix + "/"
+    
+    def _invalidate_cache(self, remote_path: str):
+        """Drop cached metadata for a changed file, and the listing that contains it"""
+        self.metadata_cache.invalidate(remote_path)
+        self.metadata_cache.invalidate(self._listing_key)
     
     def _initialize_provider(self) -> CloudStorageProvider:
         """Initialize the appropriate cloud storage provider"""
@@ -284,7 +590,11 @@ class CloudStorageManager:
         remote_path = f"{self.config.prefix}/{component_id}"
         
         # Upload file
-        success = self.provider.upload_file(component_path, remote_path)
+        try:
+            success = self.transfer_engine.upload(component_path, remote_path)
+        except Exception as e:
+            logger.error(f"Upload of {component_id} failed: {e}")
+            success = False
         
         if success:
             # Log the operation
@@ -296,9 +606,8 @@ class CloudStorageManager:
                 "timestamp": time.time()
             })
             
-            # Clear metadata cache for this file
-            if remote_path in self.metadata_cache:
-                del self.metadata_cache[remote_path]
+            # Clear cached metadata for this file
+            self._invalidate_cache(remote_path)
         
         return success
     
@@ -324,7 +633,12 @@ class CloudStorageManager:
         os.makedirs(os.path.dirname(destination_path), exist_ok=True)
         
         # Download file
-        success = self.provider.download_file(remote_path, destination_path)
+        try:
+            size_hint = (self.metadata_cache.get(remote_path) or {}).get("size")
+            success = self.transfer_engine.download(remote_path, destination_path, size_hint)
+        except Exception as e:
+            logger.error(f"Download of {component_id} failed: {e}")
+            success = False
         
         if success:
             # Log the operation
@@ -338,13 +652,21 @@ class CloudStorageManager:
         
         return success
     
-    def list_components(self) -> List[str]:
+    def list_components(self, refresh: bool = False) -> List[str]:
         """
         List all model components in cloud storage.
         
+        Args:
+            refresh: Bypass the cached listing and query the provider
+        
         Returns:
             List[str]: List of component IDs
         """
+        # Check cache first
+        component_ids = None if refresh else self.metadata_cache.get(self._listing_key)
+        if component_ids is not None:
+            return list(component_ids)
+        
         # List files with prefix
         files = self.provider.list_files(self.config.prefix)
         
@@ -352,7 +674,37 @@ class CloudStorageManager:
         prefix_len = len(self.config.prefix) + 1
         component_ids = [f[prefix_len:] for f in files if f.startswith(self.config.prefix + "/")]
         
-        return component_ids
+        self.metadata_cache.put(self._listing_key, component_ids)
+        return list(component_ids)
+    
+    def list_components_with_metadata(
+        self,
+        page_size: int = DEFAULT_LIST_PAGE_SIZE
+    ) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+        """
+        List model components with their metadata, one page at a time.
+        
+        Args:
+            page_size: Maximum number of components per page
+            
+        Yields:
+            List[Tuple[str, Dict[str, Any]]]: (component ID, metadata) pairs
+        """
+        prefix = self.config.prefix + "/"
+        prefix_len = len(prefix)
+        
+        for page in self.provider.list_files_with_metadata(self.config.prefix, page_size):
+            components = []
+            for remote_path, metadata in page:
+                if not remote_path.startswith(prefix):
+                    continue
+                
+                # Listing metadata is as fresh as a metadata call, so cache it
+                if metadata:
+                    self.metadata_cache.put(remote_path, metadata)
+                components.append((remote_path[prefix_len:], metadata))
+            
+            yield components
     
     def delete_component(self, component_id: str) -> bool:
         """
@@ -379,9 +731,8 @@ class CloudStorageManager:
                 "timestamp": time.time()
             })
             
-            # Clear metadata cache for this file
-            if remote_path in self.metadata_cache:
-                del self.metadata_cache[remote_path]
+            # Clear cached metadata for this file
+            self._invalidate_cache(remote_path)
         
         return success
     
@@ -415,15 +766,16 @@ class CloudStorageManager:
         remote_path = f"{self.config.prefix}/{component_id}"
         
         # Check cache first
-        if remote_path in self.metadata_cache:
-            return self.metadata_cache[remote_path]
+        metadata = self.metadata_cache.get(remote_path)
+        if metadata is not None:
+            return metadata
         
         # Get metadata from provider
         metadata = self.provider.get_file_metadata(remote_path)
         
         # Cache metadata
         if metadata:
-            self.metadata_cache[remote_path] = metadata
+            self.metadata_cache.put(remote_path, metadata)
         
         return metadata
     
@@ -497,12 +849,36 @@ class CloudStorageManager:
         return results
     
     def get_operation_log(self) -> List[Dict[str, Any]]:
-        """Get the operation log"""
-        return self.operation_log
+        """Get the most recent operations (older ones are in the operation log file)"""
+        return self.operation_log.get_entries()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get metadata cache and operation log statistics.
+        
+        Returns:
+            Dict[str, Any]: Cache hit/miss/eviction counts and operation log sizes
+        """
+        stats = self.metadata_cache.get_stats()
+        stats["operation_log_entries"] = len(self.operation_log)
+        stats["operation_log_spilled"] = self.operation_log.spilled_count
+        return stats
+    
+    def get_retry_stats(self) -> Dict[str, Any]:
+        """
+        Get retry policy statistics of the provider.
+        
+        Returns:
+            Dict[str, Any]: Attempt, retry and rejection counts and the circuit state,
+                or an empty dict if the provider has no retry policy
+        """
+        retry_policy = getattr(self.provider, "retry_policy", None)
+        return retry_policy.get_stats() if retry_policy else {}
     
     def __del__(self):
         """Clean up resources"""
         self.executor.shutdown()
+        self.operation_log.close()
 
 
 # Factory function to create a CloudStorageManager with default testing configuration
@@ -132,7 +132,7 @@ class CloudDashboardIntegration:
         ttk.Button(
             list_frame, 
             text="Refresh List", 
-            command=self.refresh_component_list
+            command=lambda: self.refresh_component_list(force=True)
         ).pack(side=tk.BOTTOM, pady=5)
         
         # Operations frame
@@ -428,8 +428,14 @@ class CloudDashboardIntegration:
             self.parent.after(0, lambda: self.update_status("Connection error"))
             logger.error(error_msg)
     
-    def refresh_component_list(self):
-        """Refresh the list of components in cloud storage"""
+    def refresh_component_list(self, force: bool = False):
+        """
+        Refresh the list of components in cloud storage.
+        
+        Args:
+            force: Bypass the cached listing (the user's explicit refresh);
+                otherwise the cached listing is used while it is fresh
+        """
         if not self.storage_manager:
             messagebox.showinfo("Not Connected", "Please connect to a cloud provider first.")
             return
@@ -441,17 +447,19 @@ class CloudDashboardIntegration:
         self.update_status("Refreshing component list...")
         
         # Get components in background
-        self.add_task(self._refresh_list_task)
+        self.add_task(self._refresh_list_task, force)
     
-    def _refresh_list_task(self):
+    def _refresh_list_task(self, force: bool = False):
         """Background task for refreshing component list"""
         try:
-            # Get component list
-            components = self.storage_manager.list_components()
+            # Get component list (uploads and deletions already invalidate the cached listing)
+            components = self.storage_manager.list_components(refresh=force)
             
             # Update UI
+            cache_stats = self.get_cache_stats()
+            status = f"Found {len(components)} components (cache hit rate {cache_stats['hit_rate']:.0%})"
             self.parent.after(0, lambda: self._update_component_list(components))
-            self.parent.after(0, lambda: self.update_status(f"Found {len(components)} components"))
+            self.parent.after(0, lambda: self.update_status(status))
         except Exception as e:
             # Show error
             error_msg = f"Error refreshing component list: {e}"
@@ -459,6 +467,18 @@ class CloudDashboardIntegration:
             self.parent.after(0, lambda: self.update_status("Refresh error"))
             logger.error(error_msg)
     
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get metadata cache statistics of the connected storage manager.
+        
+        Returns:
+            Dict[str, Any]: Cache hit/miss/eviction counts and operation log sizes,
+                or an empty dict if not connected
+        """
+        if not self.storage_manager:
+            return {}
+        return self.storage_manager.get_cache_stats()
+    
     def _update_component_list(self, components):
         """Update the component listbox with retrieved components"""
         # Clear listbox
@@ -0,0 +1,124 @@
+"""
+Metadata Cache for Cloud Storage
+
+This module implements the bounded metadata cache used by the CloudStorageManager.
+Entries are evicted least-recently-used once the cache is full and expire after a
+time-to-live, so long-running sessions neither grow without bound nor serve
+arbitrarily old metadata.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+# Constants
+DEFAULT_CACHE_SIZE = 4096  # entries
+DEFAULT_CACHE_TTL = 300.0  # seconds
+
+_MISSING = object()
+
+
+class MetadataCache:
+    """Thread-safe LRU cache with a per-entry time-to-live"""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE, ttl: float = DEFAULT_CACHE_TTL):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries before the least recently used is evicted
+            ttl: Seconds an entry stays valid (0 or None to never expire)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        # key -> (expiry time, value), least recently used first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Any: The cached value, or default if absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any):
+        """
+        Add or replace a cached value.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: str):
+        """Remove a key from the cache"""
+        with self._lock:
+            if self._entries.pop(key, _MISSING) is not _MISSING:
+                self.invalidations += 1
+
+    def clear(self):
+        """Remove every entry from the cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, Any]: Entry count, limits, hit/miss counts and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
@@ -0,0 +1,84 @@
+"""
+Operation Log for Cloud Storage
+
+This module implements the fixed-capacity operation log used by the
+CloudStorageManager. The most recent operations are kept in an in-memory ring
+buffer; older entries are spilled as JSON lines to a rotating log file instead
+of accumulating in memory.
+"""
+
+import os
+import json
+import logging
+import threading
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import List, Dict, Any, Optional
+
+# Constants
+DEFAULT_LOG_CAPACITY = 1000  # entries kept in memory
+LOG_MAX_BYTES = 5 * 1024 * 1024  # 5MB per log file
+LOG_BACKUP_COUNT = 3
+
+
+class OperationLog:
+    """Ring buffer of recent operations that spills evicted entries to disk"""
+
+    def __init__(self, capacity: int = DEFAULT_LOG_CAPACITY, spill_path: Optional[str] = None):
+        """
+        Initialize the operation log.
+
+        Args:
+            capacity: Number of entries kept in memory
+            spill_path: Rotating log file for entries evicted from memory (None to drop them);
+                its directory is created on the first spill
+        """
+        self.entries = deque()
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.spilled_count = 0
+        self._lock = threading.Lock()
+        self._handler = None
+
+    def _get_handler(self) -> RotatingFileHandler:
+        """Open the spill file on first use"""
+        with self._lock:
+            if self._handler is None:
+                spill_dir = os.path.dirname(self.spill_path)
+                if spill_dir:
+                    os.makedirs(spill_dir, exist_ok=True)
+                self._handler = RotatingFileHandler(
+                    self.spill_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, delay=True
+                )
+                self._handler.setFormatter(logging.Formatter("%(message)s"))
+            return self._handler
+
+    def append(self, entry: Dict[str, Any]):
+        """
+        Record an operation, spilling the oldest entry if the buffer is full.
+
+        Args:
+            entry: Operation details
+        """
+        with self._lock:
+            self.entries.append(entry)
+            if len(self.entries) <= self.capacity:
+                return
+            evicted = self.entries.popleft()
+            self.spilled_count += 1
+
+        if self.spill_path:
+            self._get_handler().handle(logging.makeLogRecord({"msg": json.dumps(evicted, default=str)}))
+
+    def get_entries(self) -> List[Dict[str, Any]]:
+        """Get the operations still held in memory, oldest first"""
+        with self._lock:
+            return list(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def close(self):
+        """Close the spill file"""
+        if self._handler is not None:
+            self._handler.close()
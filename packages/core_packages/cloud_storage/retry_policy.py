@@ -0,0 +1,315 @@
+"""
+Retry Policy for Cloud Storage Providers
+
+This module implements the retry policy shared by the CloudStorageProvider
+implementations. It combines three mechanisms:
+
+- Exponential backoff with decorrelated jitter, so workers that fail together
+  do not retry together.
+- A token-bucket retry budget, so a throttled endpoint sees a bounded number
+  of retries per second however many workers share the provider.
+- A circuit breaker that rejects requests for a cool-down period after a run
+  of consecutive failures, then lets a single trial request through.
+
+Each provider instance owns one RetryPolicy, so all workers using the provider
+share its budget and circuit breaker.
+"""
+
+import time
+import random
+import logging
+import threading
+from typing import Dict, Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BASE_DELAY = 0.5  # seconds
+DEFAULT_MAX_DELAY = 20.0  # seconds
+DEFAULT_RETRY_BUDGET = 10  # retry tokens
+DEFAULT_BUDGET_REFILL_RATE = 1.0  # retry tokens per second
+DEFAULT_FAILURE_THRESHOLD = 5  # consecutive failures before the circuit opens
+DEFAULT_RESET_TIMEOUT = 30.0  # seconds the circuit stays open
+
+
+class TransientStorageError(Exception):
+    """A provider error that is expected to succeed on retry (throttling, timeouts)"""
+    pass
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is rejected because the provider's circuit is open"""
+    pass
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Default check for errors worth retrying.
+
+    Args:
+        error: Exception raised by a provider call
+
+    Returns:
+        bool: True if the call should be retried
+    """
+    return isinstance(error, (TransientStorageError, ConnectionError, TimeoutError))
+
+
+class RetryBudget:
+    """Token bucket limiting how many retries may be issued"""
+
+    def __init__(self, capacity: float = DEFAULT_RETRY_BUDGET, refill_rate: float = DEFAULT_BUDGET_REFILL_RATE):
+        """
+        Initialize the retry budget.
+
+        Args:
+            capacity: Maximum number of tokens (retries that can be issued in a burst)
+            refill_rate: Tokens added per second
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """
+        Take one retry token if available.
+
+        Returns:
+            bool: True if a retry may be issued
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class CircuitBreaker:
+    """Per-provider circuit breaker with closed, open and half-open states"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent.
+
+        Returns:
+            bool: False if the circuit is open (or a half-open trial is already running)
+        """
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self.trial_in_flight = False
+
+            # Half-open: let exactly one trial request through
+            if self.trial_in_flight:
+                return False
+            self.trial_in_flight = True
+            return True
+
+    def record_success(self):
+        """Record a successful request, closing the circuit"""
+        with self.lock:
+            if self.state != self.CLOSED:
+                logger.info("Circuit closed after successful trial request")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.trial_in_flight = False
+
+    def release_trial(self):
+        """Release a half-open trial without counting it as a success or a failure"""
+        with self.lock:
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        """Record a failed request, opening the circuit if the threshold is reached"""
+        with self.lock:
+            self.consecutive_failures += 1
+            self.trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(
+                        f"Circuit opened after {self.consecutive_failures} consecutive failure(s); "
+                        f"rejecting requests for {self.reset_timeout}s"
+                    )
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class RetryPolicy:
+    """Backoff, retry budget and circuit breaker applied to provider calls"""
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        budget: Optional[RetryBudget] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        is_retryable: Callable[[Exception], bool] = is_transient_error
+    ):
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_retries: Maximum retries per call (after the first attempt)
+            base_delay: Minimum backoff delay in seconds
+            max_delay: Maximum backoff delay in seconds
+            budget: Retry budget shared by all calls through this policy
+            breaker: Circuit breaker shared by all calls through this policy
+            is_retryable: Check for errors worth retrying
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+        self.is_retryable = is_retryable
+
+        # Statistics
+        self.stats = {
+            "calls": 0,
+            "attempts": 0,
+            "retries": 0,
+            "failures": 0,
+            "budget_exhausted": 0,
+            "circuit_rejections": 0
+        }
+        self.stats_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, is_retryable: Callable[[Exception], bool] = is_transient_error) -> "RetryPolicy":
+        """
+        Create a retry policy from a CloudStorageConfig.
+
+        Args:
+            config: Cloud storage configuration
+            is_retryable: Check for errors worth retrying
+
+        Returns:
+            RetryPolicy: The retry policy
+        """
+        return cls(
+            max_retries=config.max_retries,
+            base_delay=config.retry_base_delay,
+            max_delay=config.retry_max_delay,
+            budget=RetryBudget(config.retry_budget, config.retry_budget_refill_rate),
+            breaker=CircuitBreaker(config.circuit_failure_threshold, config.circuit_reset_timeout),
+            is_retryable=is_retryable
+        )
+
+    def _count(self, key: str):
+        """Increment a statistics counter"""
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def next_delay(self, previous_delay: float) -> float:
+        """
+        Get the next backoff delay using decorrelated jitter.
+
+        Args:
+            previous_delay: Previous delay in seconds
+
+        Returns:
+            float: Next delay in seconds
+        """
+        return min(self.max_delay, random.uniform(self.base_delay, previous_delay * 3))
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call a function, retrying transient errors.
+
+        Args:
+            func: Function performing one provider request
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Any: The function's return value
+
+        Raises:
+            CircuitOpenError: If the provider's circuit is open
+            Exception: The last error if it is not retryable or retries are exhausted
+        """
+        self._count("calls")
+        delay = self.base_delay
+        retries = 0
+
+        while True:
+            if not self.breaker.allow_request():
+                self._count("circuit_rejections")
+                raise CircuitOpenError("Circuit open: provider is failing, request rejected")
+
+            self._count("attempts")
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not self.is_retryable(e):
+                    # The request itself was bad, which says nothing about the provider's health
+                    self.breaker.release_trial()
+                    raise
+
+                self.breaker.record_failure()
+
+                if retries >= self.max_retries:
+                    self._count("failures")
+                    logger.error(f"Giving up after {retries} retries: {e}")
+                    raise
+
+                if not self.budget.try_acquire():
+                    self._count("budget_exhausted")
+                    self._count("failures")
+                    logger.error(f"Retry budget exhausted, not retrying: {e}")
+                    raise
+
+                delay = self.next_delay(delay)
+                retries += 1
+                self._count("retries")
+                logger.warning(f"Attempt {retries} failed: {e}. Retrying in {delay:.2f} seconds...")
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get retry statistics.
+
+        Returns:
+            Dict[str, Any]: Call, attempt and retry counts and the circuit state
+        """
+        with self.stats_lock:
+            stats = dict(self.stats)
+        stats["circuit_state"] = self.breaker.state
+        return stats
@@ -0,0 +1,298 @@
+"""
+Incremental Sync Index for Cloud Storage
+
+This module keeps a persistent per-file index for the StorageSynchronizer. Each
+local file is recorded with its (inode, mtime_ns, size) stat tuple and a content
+hash; the hash is only recomputed when the stat tuple changes. Files whose
+content hash differs from the hash recorded at their last successful sync make
+up the "dirty set", so unchanged files never have their contents re-read and
+touch-only changes (mtime moves, content identical) are not re-uploaded.
+
+The index is stored in a small SQLite database and every update is applied in
+a single transaction.
+"""
+
+import os
+import re
+import fnmatch
+import hashlib
+import logging
+import sqlite3
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Constants
+INDEX_FILENAME = ".cloud_sync_index.db"
+HASH_BLOCK_SIZE = 1024 * 1024  # 1MB
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS local_files (
+    path TEXT PRIMARY KEY,
+    inode INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    content_hash BLOB,
+    synced_hash BLOB
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS cloud_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_modified REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def hash_file(file_path: str) -> bytes:
+    """
+    Compute the content hash of a file.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        bytes: SHA-256 digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while True:
+            block = f.read(HASH_BLOCK_SIZE)
+            if not block:
+                break
+            digest.update(block)
+    return digest.digest()
+
+
+class SyncIndex:
+    """Persistent index of local and cloud file state for incremental sync"""
+
+    def __init__(self, index_path: str):
+        """
+        Initialize the sync index.
+
+        Args:
+            index_path: Path to the index database
+        """
+        self.index_path = index_path
+        self.conn = sqlite3.connect(index_path, check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+
+        # path -> (inode, mtime_ns, size, content_hash, synced_hash)
+        self.local_records: Dict[str, Tuple[int, int, int, Optional[bytes], Optional[bytes]]] = {}
+        # path -> (size, last_modified)
+        self.cloud_records: Dict[str, Tuple[int, float]] = {}
+
+        # Pending changes, written by commit()
+        self._changed_local: Set[str] = set()
+        self._removed_local: Set[str] = set()
+        self._cloud_changed = False
+
+        # Paths whose content differs from their last synced content
+        self.dirty: Set[str] = set()
+        self.hashed_count = 0
+
+        self._load()
+
+    def _load(self):
+        """Load the index into memory"""
+        for row in self.conn.execute(
+            "SELECT path, inode, mtime_ns, size, content_hash, synced_hash FROM local_files"
+        ):
+            self.local_records[row[0]] = row[1:]
+        for row in self.conn.execute("SELECT path, size, last_modified FROM cloud_files"):
+            self.cloud_records[row[0]] = row[1:]
+        logger.info(
+            f"Loaded sync index: {len(self.local_records)} local, {len(self.cloud_records)} cloud"
+        )
+
+    def scan(self, local_dir: str, file_patterns: List[str]) -> Dict[str, Tuple[int, float]]:
+        """
+        Scan a directory and update the dirty set.
+
+        Only files whose stat tuple changed since the last scan are hashed.
+
+        Args:
+            local_dir: Directory to scan
+            file_patterns: Filename patterns to include
+
+        Returns:
+            Dict[str, Tuple[int, float]]: Relative path to (size, mtime) of each file found
+        """
+        pattern_re = re.compile("|".join(fnmatch.translate(p) for p in file_patterns))
+        match = pattern_re.match
+        records = self.local_records
+        found = {}
+        self.dirty = set()
+        self.hashed_count = 0
+
+        stack = [(local_dir, "")]
+        while stack:
+            dir_path, rel_dir = stack.pop()
+            try:
+                entries = os.scandir(dir_path)
+            except OSError as e:
+                logger.error(f"Error scanning local directory {dir_path}: {e}")
+                continue
+
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    rel_path = rel_dir + name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, rel_path + os.sep))
+                            continue
+                        if name.startswith(".cloud_sync_") or not match(name):
+                            continue
+                        stats = entry.stat()
+                    except OSError as e:
+                        logger.error(f"Error scanning local file {entry.path}: {e}")
+                        continue
+
+                    found[rel_path] = (stats.st_size, stats.st_mtime)
+                    record = records.get(rel_path)
+
+                    if (record is not None and record[0] == stats.st_ino and
+                            record[1] == stats.st_mtime_ns and record[2] == stats.st_size):
+                        # Stat tuple unchanged - trust the recorded hash
+                        if record[3] != record[4]:
+                            self.dirty.add(rel_path)
+                        continue
+
+                    self._update_record(rel_path, entry.path, stats)
+
+        # Forget files that no longer exist
+        for rel_path in records.keys() - found.keys():
+            del records[rel_path]
+            self._changed_local.discard(rel_path)
+            self._removed_local.add(rel_path)
+
+        logger.info(
+            f"Scanned {len(found)} local file(s): {len(self.dirty)} dirty, {self.hashed_count} hashed"
+        )
+        return found
+
+    def _update_record(self, rel_path: str, full_path: str, stats: os.stat_result):
+        """Re-hash a file whose stat tuple changed and update its record"""
+        try:
+            content_hash = hash_file(full_path)
+        except OSError as e:
+            logger.error(f"Error hashing local file {full_path}: {e}")
+            content_hash = None
+        self.hashed_count += 1
+
+        record = self.local_records.get(rel_path)
+        synced_hash = record[4] if record is not None else None
+        self.local_records[rel_path] = (
+            stats.st_ino, stats.st_mtime_ns, stats.st_size, content_hash, synced_hash
+        )
+        self._changed_local.add(rel_path)
+        self._removed_local.discard(rel_path)
+
+        if content_hash is None or content_hash != synced_hash:
+            self.dirty.add(rel_path)
+
+    def get_dirty_paths(self) -> Set[str]:
+        """Get the paths whose content changed since their last sync"""
+        return set(self.dirty)
+
+    def is_dirty(self, rel_path: str) -> bool:
+        """Check whether a path changed since its last sync"""
+        return rel_path in self.dirty
+
+    def has_local(self, rel_path: str) -> bool:
+        """Check whether a path was present locally at the last scan"""
+        return rel_path in self.local_records
+
+    def mark_synced(self, rel_paths: List[str]):
+        """
+        Record that the current content of local files has been synced.
+
+        Args:
+            rel_paths: Relative paths that were uploaded successfully
+        """
+        for rel_path in rel_paths:
+            record = self.local_records.get(rel_path)
+            if record is None:
+                continue
+            self.local_records[rel_path] = record[:4] + (record[3],)
+            self._changed_local.add(rel_path)
+            self.dirty.discard(rel_path)
+
+    def record_local_file(self, rel_path: str, full_path: str):
+        """
+        Index a file written by the synchronizer and mark it as synced.
+
+        Args:
+            rel_path: Relative path of the file
+            full_path: Full local path of the file
+        """
+        try:
+            stats = os.stat(full_path)
+        except OSError as e:
+            logger.error(f"Error indexing local file {full_path}: {e}")
+            return
+        self._update_record(rel_path, full_path, stats)
+        self.mark_synced([rel_path])
+
+    def remove_local(self, rel_paths: List[str]):
+        """Remove local files from the index"""
+        for rel_path in rel_paths:
+            if self.local_records.pop(rel_path, None) is not None:
+                self._changed_local.discard(rel_path)
+                self._removed_local.add(rel_path)
+            self.dirty.discard(rel_path)
+
+    def get_cloud_records(self) -> Dict[str, Tuple[int, float]]:
+        """Get the cloud state recorded at the last sync as path -> (size, last_modified)"""
+        return self.cloud_records
+
+    def set_cloud_records(self, cloud_records: Dict[str, Tuple[int, float]]):
+        """
+        Replace the recorded cloud state.
+
+        Args:
+            cloud_records: Cloud path to (size, last_modified)
+        """
+        if cloud_records != self.cloud_records:
+            self.cloud_records = dict(cloud_records)
+            self._cloud_changed = True
+
+    def commit(self):
+        """Write all pending changes to disk in one transaction"""
+        if not (self._changed_local or self._removed_local or self._cloud_changed):
+            return
+
+        try:
+            with self.conn:
+                if self._removed_local:
+                    self.conn.executemany(
+                        "DELETE FROM local_files WHERE path = ?",
+                        [(p,) for p in self._removed_local]
+                    )
+                if self._changed_local:
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO local_files "
+                        "(path, inode, mtime_ns, size, content_hash, synced_hash) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        [(p,) + self.local_records[p] for p in self._changed_local]
+                    )
+                if self._cloud_changed:
+                    self.conn.execute("DELETE FROM cloud_files")
+                    self.conn.executemany(
+                        "INSERT INTO cloud_files (path, size, last_modified) VALUES (?, ?, ?)",
+                        [(p,) + tuple(r) for p, r in self.cloud_records.items()]
+                    )
+            logger.info(
+                f"Saved sync index: {len(self._changed_local)} updated, "
+                f"{len(self._removed_local)} removed"
+            )
+            self._changed_local.clear()
+            self._removed_local.clear()
+            self._cloud_changed = False
+        except Exception as e:
+            logger.error(f"Error saving sync index: {e}")
+
+    def close(self):
+        """Close the index database"""
+        self.conn.close()
@@ -9,11 +9,14 @@ import logging
 import time
 import json
 import fnmatch
-from typing import List, Dict, Any, Optional, Tuple
+import queue
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-from cloud_storage.cloud_storage_module import CloudStorageManager
+from cloud_storage.cloud_storage_module import CloudStorageManager, DEFAULT_LIST_PAGE_SIZE
+from cloud_storage.sync_index import SyncIndex, INDEX_FILENAME
 
 # Set up logging
 logging.basicConfig(
@@ -28,6 +31,8 @@ logger = logging.getLogger(__name__)
 
 # Constants
 MAX_WORKERS = 5
+LIST_PREFETCH_PAGES = 2  # cloud listing pages fetched ahead of comparison
+PREFETCH_PUT_TIMEOUT = 0.5  # seconds between checks that the listing is still wanted
 
 
 class SyncConfig:
@@ -40,7 +45,9 @@ class SyncConfig:
         delete_files: bool = False,
         overwrite: bool = True,
         file_patterns: List[str] = None,
-        max_workers: int = MAX_WORKERS
+        max_workers: int = MAX_WORKERS,
+        use_index: bool = True,
+        list_page_size: int = DEFAULT_LIST_PAGE_SIZE
     ):
         """
         Initialize synchronization configuration.
@@ -52,6 +59,9 @@ class SyncConfig:
             overwrite: Whether to overwrite existing files
             file_patterns: File patterns to include (e.g. ["*.blend", "*.fbx"])
             max_workers: Maximum number of worker threads for parallel operations
+            use_index: Whether to track local changes with the incremental sync index
+                instead of comparing modification times against .cloud_sync_state.json
+            list_page_size: Number of cloud files requested per listing page
         """
         self.local_dir = local_dir
         self.direction = direction
@@ -59,6 +69,8 @@ class SyncConfig:
         self.overwrite = overwrite
         self.file_patterns = file_patterns or ["*"]
         self.max_workers = max_workers
+        self.use_index = use_index
+        self.list_page_size = list_page_size
 
 
 class SyncResult:
@@ -74,6 +86,43 @@ class SyncResult:
         self.failed_downloads = []
         self.failed_deletions = []
         self.skipped_files = []
+        
+        # Transfer throughput, updated as each transfer completes
+        self.transferred_bytes = 0
+        self.transfer_seconds = 0.0
+        self.worker_stats: Dict[str, Dict[str, Any]] = {}
+        self._transfer_lock = threading.Lock()
+    
+    def record_transfer(self, worker: str, size: int, started: float, finished: float):
+        """
+        Record a completed transfer.
+        
+        Args:
+            worker: Name of the worker that performed the transfer
+            size: Bytes transferred
+            started: Transfer start time (time.perf_counter())
+            finished: Transfer end time (time.perf_counter())
+        """
+        with self._transfer_lock:
+            stats = self.worker_stats.setdefault(worker, {"files": 0, "bytes": 0, "busy_seconds": 0.0})
+            stats["files"] += 1
+            stats["bytes"] += size
+            stats["busy_seconds"] += finished - started
+            self.transferred_bytes += size
+    
+    def get_throughput(self) -> float:
+        """Get the overall transfer rate in bytes per second of wall-clock transfer time"""
+        if self.transfer_seconds <= 0:
+            return 0.0
+        return self.transferred_bytes / self.transfer_seconds
+    
+    def get_worker_throughput(self) -> Dict[str, float]:
+        """Get each worker's transfer rate in bytes per second of busy time"""
+        with self._transfer_lock:
+            return {
+                worker: stats["bytes"] / stats["busy_seconds"] if stats["busy_seconds"] > 0 else 0.0
+                for worker, stats in self.worker_stats.items()
+            }
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert results to dictionary"""
@@ -85,7 +134,9 @@ class SyncResult:
             "failed_uploads": self.failed_uploads,
             "failed_downloads": self.failed_downloads,
             "failed_deletions": self.failed_deletions,
-            "skipped_files": self.skipped_files
+            "skipped_files": self.skipped_files,
+            "transferred_bytes": self.transferred_bytes,
+            "throughput_bytes_per_second": self.get_throughput()
         }
     
     def to_json(self) -> str:
@@ -177,6 +228,11 @@ class StorageSynchronizer:
         
         # Initialize sync state file path
         self.state_file = os.path.join(config.local_dir, ".cloud_sync_state.json")
+        
+        # Initialize incremental sync index
+        self.index = None
+        if config.use_index:
+            self.index = SyncIndex(os.path.join(config.local_dir, INDEX_FILENAME))
     
     def synchronize(self, progress_callback=None) -> SyncResult:
         """
@@ -191,6 +247,17 @@ class StorageSynchronizer:
         # Log start of synchronization
         logger.info(f"Starting synchronization with direction={self.config.direction}")
         
+        # Remember where this run's results start
+        result_start = {
+            "uploaded": len(self.result.uploaded_files),
+            "downloaded": len(self.result.downloaded_files),
+            "deleted_local": len(self.result.deleted_local_files),
+            "deleted_cloud": len(self.result.deleted_cloud_files)
+        }
+        
+        # Load previous sync state
+        prev_state = self._load_sync_state()
+        
         # Update progress
         if progress_callback:
             progress_callback("Scanning local files...")
@@ -202,16 +269,9 @@ class StorageSynchronizer:
         if progress_callback:
             progress_callback("Scanning cloud files...")
         
-        # Get cloud files
-        cloud_files = self._scan_cloud_files()
-        
-        # Load previous sync state
-        prev_state = self._load_sync_state()
-        
-        # Determine files to upload, download, and delete
-        to_upload, to_download, to_delete_local, to_delete_cloud = self._compare_files(
-            local_files, cloud_files, prev_state
-        )
+        # Get cloud files page by page, comparing each page as it arrives
+        cloud_files, (to_upload, to_download, to_delete_local, to_delete_cloud) = \
+            self._scan_and_compare(local_files, prev_state)
         
         # Perform operations based on sync direction
         if self.config.direction in ["both", "upload"]:
@@ -219,7 +279,10 @@ class StorageSynchronizer:
             if progress_callback:
                 progress_callback(f"Uploading {len(to_upload)} file(s)...")
             
-            self._upload_files(to_upload, progress_callback)
+            self._upload_files(
+                to_upload, progress_callback,
+                {path: local_files[path].size for path in to_upload if path in local_files}
+            )
             
             # Delete cloud files
             if self.config.delete_files and to_delete_cloud:
@@ -233,7 +296,10 @@ class StorageSynchronizer:
             if progress_callback:
                 progress_callback(f"Downloading {len(to_download)} file(s)...")
             
-            self._download_files(to_download, progress_callback)
+            self._download_files(
+                to_download, progress_callback,
+                {path: cloud_files[path].size for path in to_download if path in cloud_files}
+            )
             
             # Delete local files
             if self.config.delete_files and to_delete_local:
@@ -243,7 +309,10 @@ class StorageSynchronizer:
                 self._delete_local_files(to_delete_local, progress_callback)
         
         # Save sync state
-        self._save_sync_state(local_files, cloud_files)
+        if self.index is not None:
+            self._update_index(cloud_files, result_start)
+        else:
+            self._save_sync_state(local_files, cloud_files)
         
         # Log completion
         logger.info(f"Synchronization completed: {self.result.get_summary_string()}")
@@ -263,6 +332,14 @@ class StorageSynchronizer:
         """
         local_files = {}
         
+        if self.index is not None:
+            # Only files whose stat tuple changed are re-hashed
+            scanned = self.index.scan(self.config.local_dir, self.config.file_patterns)
+            for rel_path, (size, last_modified) in scanned.items():
+                local_files[rel_path] = FileInfo(rel_path, size, last_modified)
+            logger.info(f"Found {len(local_files)} local file(s)")
+            return local_files
+        
         for root, _, files in os.walk(self.config.local_dir):
             for file in files:
                 # Skip the sync state file
@@ -295,52 +372,133 @@ class StorageSynchronizer:
         logger.info(f"Found {len(local_files)} local file(s)")
         return local_files
     
-    def _scan_cloud_files(self) -> Dict[str, FileInfo]:
+    def _prefetch_pages(
+        self,
+        pages: Iterator[List[Tuple[str, Dict[str, Any]]]]
+    ) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+        """
+        Fetch listing pages on a background thread so the next request is in
+        flight while the current page is being compared.
+        
+        If the consumer stops early (an exception, or the generator is closed),
+        the fetch thread stops at its next page instead of blocking on the full
+        queue.
+        
+        Args:
+            pages: Page iterator from the storage manager
+            
+        Yields:
+            List[Tuple[str, Dict[str, Any]]]: Listing pages in order
+        """
+        page_queue = queue.Queue(maxsize=LIST_PREFETCH_PAGES)
+        stop = threading.Event()
+        done = object()
+        
+        def put(item) -> bool:
+            """Queue an item unless the consumer has stopped"""
+            while not stop.is_set():
+                try:
+                    page_queue.put(item, timeout=PREFETCH_PUT_TIMEOUT)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def fetch():
+            try:
+                for page in pages:
+                    if not put(page):
+                        return
+            except Exception as e:
+                logger.error(f"Error listing cloud files: {e}")
+            finally:
+                put(done)
+        
+        threading.Thread(target=fetch, daemon=True).start()
+        
+        try:
+            while True:
+                page = page_queue.get()
+                if page is done:
+                    return
+                yield page
+        finally:
+            stop.set()
+    
+    def _scan_and_compare(
+        self,
+        local_files: Dict[str, FileInfo],
+        prev_state: Dict[str, Dict[str, FileInfo]]
+    ) -> Tuple[Dict[str, FileInfo], Tuple[List[str], List[str], List[str], List[str]]]:
         """
-        Scan cloud files.
+        Scan cloud files and compare them with local files page by page.
         
+        Args:
+            local_files: Local files
+            prev_state: Previous sync state
+            
         Returns:
-            Dict[str, FileInfo]: Dictionary of file paths to FileInfo objects
+            Tuple: Cloud files, and lists of files to upload, download, delete locally,
+            and delete in cloud
         """
         cloud_files = {}
+        actions = ([], [], [], [])
         
-        # Get component list
-        components = self.storage_manager.list_components()
+        for page in self._prefetch_pages(
+            self.storage_manager.list_components_with_metadata(self.config.list_page_size)
+        ):
+            for component_id, metadata in page:
+                # Check if file matches pattern
+                if not any(fnmatch.fnmatch(component_id, pattern) for pattern in self.config.file_patterns):
+                    continue
+                
+                cloud_file = self._make_cloud_file_info(component_id, metadata)
+                cloud_files[component_id] = cloud_file
+                self._compare_file(component_id, local_files.get(component_id), cloud_file, prev_state, actions)
         
-        for component_id in components:
-            # Check if file matches pattern
-            if not any(fnmatch.fnmatch(component_id, pattern) for pattern in self.config.file_patterns):
-                continue
-            
-            # Get metadata
-            metadata = self.storage_manager.get_component_metadata(component_id)
+        logger.info(f"Found {len(cloud_files)} cloud file(s)")
+        
+        # Local files that were not listed in the cloud
+        for path, local_file in local_files.items():
+            if path not in cloud_files:
+                self._compare_file(path, local_file, None, prev_state, actions)
+        
+        self._log_comparison(actions)
+        return cloud_files, actions
+    
+    def _make_cloud_file_info(self, component_id: str, metadata: Dict[str, Any]) -> FileInfo:
+        """
+        Create a FileInfo from cloud component metadata.
+        
+        Args:
+            component_id: Component ID
+            metadata: Component metadata
             
-            # Parse last modified timestamp
-            last_modified = metadata.get("last_modified")
-            if isinstance(last_modified, str):
+        Returns:
+            FileInfo: Cloud file information
+        """
+        # Parse last modified timestamp
+        last_modified = metadata.get("last_modified")
+        if isinstance(last_modified, str):
+            try:
+                # Try to parse ISO format
+                last_modified = datetime.fromisoformat(last_modified.replace('Z', '+00:00')).timestamp()
+            except ValueError:
+                # Try to parse ctime format
                 try:
-                    # Try to parse ISO format
-                    last_modified = datetime.fromisoformat(last_modified.replace('Z', '+00:00')).timestamp()
+                    last_modified = time.mktime(time.strptime(last_modified))
                 except ValueError:
-                    # Try to parse ctime format
-                    try:
-                        last_modified = time.mktime(time.strptime(last_modified))
-                    except ValueError:
-                        # Default to current time
-                        last_modified = time.time()
-            else:
-                # Default to current time
-                last_modified = time.time()
-            
-            # Create FileInfo
-            cloud_files[component_id] = FileInfo(
-                path=component_id,
-                size=metadata.get("size", 0),
-                last_modified=last_modified
-            )
+                    # Default to current time
+                    last_modified = time.time()
+        else:
+            # Default to current time
+            last_modified = time.time()
         
-        logger.info(f"Found {len(cloud_files)} cloud file(s)")
-        return cloud_files
+        return FileInfo(
+            path=component_id,
+            size=metadata.get("size", 0),
+            last_modified=last_modified
+        )
     
     def _load_sync_state(self) -> Dict[str, Dict[str, FileInfo]]:
         """
@@ -354,6 +512,13 @@ class StorageSynchronizer:
             "cloud": {}
         }
         
+        if self.index is not None:
+            for path, record in self.index.local_records.items():
+                state["local"][path] = FileInfo(path, record[2], record[1] / 1e9)
+            for path, (size, last_modified) in self.index.get_cloud_records().items():
+                state["cloud"][path] = FileInfo(path, size, last_modified)
+            return state
+        
         if os.path.exists(self.state_file):
             try:
                 with open(self.state_file, 'r') as f:
@@ -405,6 +570,40 @@ class StorageSynchronizer:
         except Exception as e:
             logger.error(f"Error saving sync state: {e}")
     
+    def _update_index(self, cloud_files: Dict[str, FileInfo], result_start: Dict[str, int]):
+        """
+        Record the outcome of this run in the sync index.
+        
+        Args:
+            cloud_files: Cloud files found at the start of the run
+            result_start: Lengths of the result lists before this run
+        """
+        uploaded = self.result.uploaded_files[result_start["uploaded"]:]
+        downloaded = self.result.downloaded_files[result_start["downloaded"]:]
+        deleted_local = self.result.deleted_local_files[result_start["deleted_local"]:]
+        deleted_cloud = self.result.deleted_cloud_files[result_start["deleted_cloud"]:]
+        
+        # Uploaded content is now in sync; refresh its cloud metadata
+        self.index.mark_synced(uploaded)
+        for path in uploaded:
+            metadata = self.storage_manager.get_component_metadata(path)
+            if metadata:
+                cloud_files[path] = self._make_cloud_file_info(path, metadata)
+        
+        # Downloaded files are indexed as synced
+        for path in downloaded:
+            self.index.record_local_file(path, os.path.join(self.config.local_dir, path))
+        
+        self.index.remove_local(deleted_local)
+        for path in deleted_cloud:
+            cloud_files.pop(path, None)
+        
+        self.index.set_cloud_records({
+            path: (file_info.size, file_info.last_modified)
+            for path, file_info in cloud_files.items()
+        })
+        self.index.commit()
+    
     def _compare_files(
         self,
         local_files: Dict[str, FileInfo],
@@ -422,46 +621,40 @@ class StorageSynchronizer:
         Returns:
             Tuple: Lists of files to upload, download, delete locally, and delete in cloud
         """
-        to_upload = []
-        to_download = []
-        to_delete_local = []
-        to_delete_cloud = []
+        actions = ([], [], [], [])
         
-        # Files in both local and cloud
-        common_files = set(local_files.keys()) & set(cloud_files.keys())
+        for path in set(local_files.keys()) | set(cloud_files.keys()):
+            self._compare_file(path, local_files.get(path), cloud_files.get(path), prev_state, actions)
         
-        # Files only in local
-        local_only = set(local_files.keys()) - set(cloud_files.keys())
+        self._log_comparison(actions)
+        return actions
+    
+    def _compare_file(
+        self,
+        path: str,
+        local_file: Optional[FileInfo],
+        cloud_file: Optional[FileInfo],
+        prev_state: Dict[str, Dict[str, FileInfo]],
+        actions: Tuple[List[str], List[str], List[str], List[str]]
+    ):
+        """
+        Decide what to do with a single file.
         
-        # Files only in cloud
-        cloud_only = set(cloud_files.keys()) - set(local_files.keys())
+        Args:
+            path: File path
+            local_file: Local file, or None if the file only exists in the cloud
+            cloud_file: Cloud file, or None if the file only exists locally
+            prev_state: Previous sync state
+            actions: Lists of files to upload, download, delete locally, and delete in cloud
+        """
+        to_upload, to_download, to_delete_local, to_delete_cloud = actions
         
         # Previous state for reference
         prev_local = prev_state.get("local", {})
         prev_cloud = prev_state.get("cloud", {})
         
-        # Compare common files
-        for path in common_files:
-            local_file = local_files[path]
-            cloud_file = cloud_files[path]
-            
-            # Skip if files are the same size and modified time
-            if (local_file.size == cloud_file.size and
-                abs(local_file.last_modified - cloud_file.last_modified) < 1):
-                continue
-            
-            # Determine which file is newer
-            if local_file.last_modified > cloud_file.last_modified:
-                # Local file is newer
-                if self.config.direction in ["both", "upload"]:
-                    to_upload.append(path)
-            else:
-                # Cloud file is newer
-                if self.config.direction in ["both", "download"]:
-                    to_download.append(path)
-        
         # Handle local-only files
-        for path in local_only:
+        if cloud_file is None:
             if path in prev_cloud:
                 # File was deleted in cloud
                 if self.config.direction in ["both", "download"] and self.config.delete_files:
@@ -470,9 +663,10 @@ class StorageSynchronizer:
                 # New local file
                 if self.config.direction in ["both", "upload"]:
                     to_upload.append(path)
+            return
         
         # Handle cloud-only files
-        for path in cloud_only:
+        if local_file is None:
             if path in prev_local:
                 # File was deleted locally
                 if self.config.direction in ["both", "upload"] and self.config.delete_files:
@@ -481,63 +675,147 @@ class StorageSynchronizer:
                 # New cloud file
                 if self.config.direction in ["both", "download"]:
                     to_download.append(path)
+            return
+        
+        # With the index, compare each side against the last sync instead of each other
+        if self.index is not None and path in prev_cloud:
+            prev_cloud_file = prev_cloud[path]
+            local_changed = self.index.is_dirty(path)
+            cloud_changed = (cloud_file.size != prev_cloud_file.size or
+                             abs(cloud_file.last_modified - prev_cloud_file.last_modified) >= 1)
+            
+            if not local_changed and not cloud_changed:
+                return
+            if local_changed and not cloud_changed:
+                if self.config.direction in ["both", "upload"]:
+                    to_upload.append(path)
+                return
+            if cloud_changed and not local_changed:
+                if self.config.direction in ["both", "download"]:
+                    to_download.append(path)
+                return
+            # Changed on both sides - fall back to the newer file
+        
+        # Skip if files are the same size and modified time
+        if (local_file.size == cloud_file.size and
+            abs(local_file.last_modified - cloud_file.last_modified) < 1):
+            return
         
+        # Determine which file is newer
+        if local_file.last_modified > cloud_file.last_modified:
+            # Local file is newer
+            if self.config.direction in ["both", "upload"]:
+                to_upload.append(path)
+        else:
+            # Cloud file is newer
+            if self.config.direction in ["both", "download"]:
+                to_download.append(path)
+    
+    def _log_comparison(self, actions: Tuple[List[str], List[str], List[str], List[str]]):
+        """Log the outcome of a comparison"""
+        to_upload, to_download, to_delete_local, to_delete_cloud = actions
         logger.info(
             f"Comparison results: {len(to_upload)} to upload, {len(to_download)} to download, "
             f"{len(to_delete_local)} to delete locally, {len(to_delete_cloud)} to delete in cloud"
         )
-        
-        return to_upload, to_download, to_delete_local, to_delete_cloud
     
-    def _upload_files(self, file_paths: List[str], progress_callback=None):
+    def _transfer_files(
+        self,
+        file_paths: List[str],
+        transfer_func,
+        succeeded: List[str],
+        failed: List[str],
+        verb: str,
+        file_sizes: Dict[str, int] = None,
+        progress_callback=None
+    ):
         """
-        Upload files to cloud.
+        Run transfers through a continuous bounded pipeline.
+        
+        Files are queued largest first and max_workers workers each take the next
+        file as soon as their current transfer finishes, so one large file never
+        holds back the others. Results are appended to the SyncResult as each
+        transfer completes.
         
         Args:
-            file_paths: List of file paths to upload
+            file_paths: Relative paths to transfer
+            transfer_func: Callable taking (relative path, local path) and returning success
+            succeeded: SyncResult list for successful transfers
+            failed: SyncResult list for failed transfers
+            verb: Past-tense verb used in log and progress messages
+            file_sizes: Optional relative path to size in bytes, used for scheduling and throughput
             progress_callback: Optional callback for progress updates
         """
         if not file_paths:
             return
         
-        # Create a local copy to avoid modification during iteration
-        files_to_upload = list(file_paths)
+        file_sizes = file_sizes or {}
+        work_queue = queue.Queue()
+        for path in sorted(file_paths, key=lambda p: file_sizes.get(p, 0), reverse=True):
+            work_queue.put(path)
         
-        # Process in batches
-        batch_size = min(self.config.max_workers, len(files_to_upload))
-        total_files = len(files_to_upload)
-        processed = 0
+        results = queue.Queue()
         
-        while files_to_upload:
-            # Get next batch
-            batch = files_to_upload[:batch_size]
-            files_to_upload = files_to_upload[batch_size:]
-            
-            # Submit upload tasks
-            future_to_path = {}
-            for path in batch:
-                local_path = os.path.join(self.config.local_dir, path)
-                future = self.executor.submit(self._upload_file, path, local_path)
-                future_to_path[future] = path
-            
-            # Process results
-            for future in future_to_path:
-                path = future_to_path[future]
+        def worker(name: str):
+            while True:
                 try:
-                    success = future.result()
+                    path = work_queue.get_nowait()
+                except queue.Empty:
+                    return
+                
+                # Every path taken gets a result, or the pipeline would wait for it forever
+                success = False
+                try:
+                    local_path = os.path.join(self.config.local_dir, path)
+                    started = time.perf_counter()
+                    try:
+                        success = transfer_func(path, local_path)
+                    except Exception as e:
+                        logger.error(f"Error transferring {path}: {e}")
+                        success = False
+                    finished = time.perf_counter()
                     
                     if success:
-                        self.result.uploaded_files.append(path)
-                    else:
-                        self.result.failed_uploads.append(path)
+                        self.result.record_transfer(name, file_sizes.get(path, 0), started, finished)
                 except Exception as e:
-                    logger.error(f"Error uploading {path}: {e}")
-                    self.result.failed_uploads.append(path)
+                    logger.error(f"Error recording transfer of {path}: {e}")
+                    success = False
+                finally:
+                    results.put((path, success))
+        
+        total_files = len(file_paths)
+        worker_count = min(self.config.max_workers, total_files)
+        pipeline_start = time.perf_counter()
+        base_seconds = self.result.transfer_seconds
+        
+        workers = [self.executor.submit(worker, f"worker-{i}") for i in range(worker_count)]
+        
+        for processed in range(1, total_files + 1):
+            path, success = results.get()
+            (succeeded if success else failed).append(path)
             
-            # Update progress
-            processed += len(batch)
+            self.result.transfer_seconds = base_seconds + time.perf_counter() - pipeline_start
             if progress_callback:
-                progress_callback(f"Uploaded {processed}/{total_files} file(s)...")
+                rate = self.result.get_throughput() / (1024 * 1024)
+                progress_callback(f"{verb} {processed}/{total_files} file(s) ({rate:.2f} MB/s)...")
+        
+        for future in workers:
+            future.result()
+    
+    def _upload_files(self, file_paths: List[str], progress_callback=None, file_sizes: Dict[str, int] = None):
+        """
+        Upload files to cloud.
+        
+        Args:
+            file_paths: List of file paths to upload
+            progress_callback: Optional callback for progress updates
+            file_sizes: Optional file path to size in bytes, used to start the largest files first
+        """
+        self._transfer_files(
+            file_paths, self._upload_file,
+            self.result.uploaded_files, self.result.failed_uploads,
+            "Uploaded", file_sizes, progress_callback
+        )
     
     def _upload_file(self, rel_path: str, local_path: str) -> bool:
         """
@@ -569,55 +847,20 @@ class StorageSynchronizer:
             logger.error(f"Error uploading {rel_path}: {e}")
             return False
     
-    def _download_files(self, file_paths: List[str], progress_callback=None):
+    def _download_files(self, file_paths: List[str], progress_callback=None, file_sizes: Dict[str, int] = None):
         """
         Download files from cloud.
         
         Args:
             file_paths: List of file paths to download
             progress_callback: Optional callback for progress updates
+            file_sizes: Optional file path to size in bytes, used to start the largest files first
         """
-        if not file_paths:
-            return
-        
-        # Create a local copy to avoid modification during iteration
-        files_to_download = list(file_paths)
-        
-        # Process in batches
-        batch_size = min(self.config.max_workers, len(files_to_download))
-        total_files = len(files_to_download)
-        processed = 0
-        
-        while files_to_download:
-            # Get next batch
-            batch = files_to_download[:batch_size]
-            files_to_download = files_to_download[batch_size:]
-            
-            # Submit download tasks
-            future_to_path = {}
-            for path in batch:
-                local_path = os.path.join(self.config.local_dir, path)
-                future = self.executor.submit(self._download_file, path, local_path)
-                future_to_path[future] = path
-            
-            # Process results
-            for future in future_to_path:
-                path = future_to_path[future]
-                try:
-                    success = future.result()
-                    
-                    if success:
-                        self.result.downloaded_files.append(path)
-                    else:
-                        self.result.failed_downloads.append(path)
-                except Exception as e:
-                    logger.error(f"Error downloading {path}: {e}")
-                    self.result.failed_downloads.append(path)
-            
-            # Update progress
-            processed += len(batch)
-            if progress_callback:
-                progress_callback(f"Downloaded {processed}/{total_files} file(s)...")
+        self._transfer_files(
+            file_paths, self._download_file,
+            self.result.downloaded_files, self.result.failed_downloads,
+            "Downloaded", file_sizes, progress_callback
+        )
     
     def _download_file(self, component_id: str, local_path: str) -> bool:
         """
@@ -9,10 +9,13 @@ import sys
 import logging
 import time
 import json
+import shutil
+import threading
 from typing import List, Dict, Any
 
 from cloud_storage.cloud_storage_module import CloudStorageManager, CloudStorageConfig
 from cloud_storage.sync_module import StorageSynchronizer, SyncConfig
+from cloud_storage.retry_policy import RetryPolicy, CircuitBreaker
 
 # Set up logging
 logging.basicConfig(
@@ -361,12 +364,523 @@ def test_synchronization():
     return True
 
 
+def test_incremental_sync_index():
+    """Test that the sync index skips unchanged and touch-only files"""
+    print("\n=== Testing Incremental Sync Index ===")
+    
+    # Create test directory
+    test_dir = "cloud_storage_test"
+    sync_dir = os.path.join(test_dir, "index_sync")
+    shutil.rmtree(sync_dir, ignore_errors=True)
+    os.makedirs(sync_dir, exist_ok=True)
+    
+    # Create test files
+    file_paths = create_test_files(sync_dir, count=5)
+    
+    # Create storage manager with mock provider
+    config = CloudStorageConfig(
+        provider="mock",
+        prefix="index_test_components"
+    )
+    manager = CloudStorageManager(config)
+    manager.authenticate()
+    
+    # Start from an empty cloud prefix
+    for component in manager.list_components():
+        manager.delete_component(component)
+    
+    sync_config = SyncConfig(
+        local_dir=sync_dir,
+        direction="both",
+        delete_files=True,
+        overwrite=True,
+        file_patterns=["*.json"]
+    )
+    
+    # Initial synchronization uploads everything
+    result = StorageSynchronizer(manager, sync_config).synchronize()
+    if len(result.uploaded_files) != len(file_paths):
+        print(f"❌ Expected {len(file_paths)} uploads, got {len(result.uploaded_files)}")
+        return False
+    
+    print("✅ Initial synchronization uploaded all files")
+    
+    # A second synchronization with a fresh synchronizer should find nothing to do
+    synchronizer = StorageSynchronizer(manager, sync_config)
+    result = synchronizer.synchronize()
+    summary = result.get_summary()
+    if summary["uploaded"] or summary["downloaded"] or synchronizer.index.hashed_count:
+        print(f"❌ Expected no transfers or hashing, got {result.get_summary_string()}, "
+              f"{synchronizer.index.hashed_count} hashed")
+        return False
+    
+    print("✅ Unchanged files were skipped without re-reading them")
+    
+    # Touch a file without changing its content
+    touched = file_paths[0]
+    os.utime(touched, (time.time() + 60, time.time() + 60))
+    
+    synchronizer = StorageSynchronizer(manager, sync_config)
+    result = synchronizer.synchronize()
+    if result.uploaded_files or synchronizer.index.hashed_count != 1:
+        print(f"❌ Touch-only change was re-uploaded: {result.get_summary_string()}")
+        return False
+    
+    print("✅ Touch-only change was not re-uploaded")
+    
+    # Change a file's content
+    modified = file_paths[1]
+    with open(modified, 'a') as f:
+        f.write("\n")
+    
+    result = StorageSynchronizer(manager, sync_config).synchronize()
+    if result.uploaded_files != [os.path.basename(modified)]:
+        print(f"❌ Expected only {os.path.basename(modified)} to upload, got {result.uploaded_files}")
+        return False
+    
+    print("✅ Modified file was uploaded")
+    
+    return True
+
+
+def test_chunked_transfer():
+    """Test that interrupted chunked transfers resume from the last completed part"""
+    print("\n=== Testing Chunked Transfer ===")
+    
+    # Create test directory
+    test_dir = "cloud_storage_test"
+    transfer_dir = os.path.join(test_dir, "chunked_transfer")
+    shutil.rmtree(transfer_dir, ignore_errors=True)
+    os.makedirs(transfer_dir, exist_ok=True)
+    
+    # Create a file spanning several chunks
+    chunk_size = 1024
+    source_path = os.path.join(transfer_dir, "large_model.bin")
+    content = os.urandom(chunk_size * 8 + 100)
+    with open(source_path, 'wb') as f:
+        f.write(content)
+    
+    # Create storage manager with mock provider and small chunks
+    config = CloudStorageConfig(
+        provider="mock",
+        prefix="chunked_test_components",
+        chunk_size=chunk_size,
+        max_workers=2,
+        cache_dir=os.path.abspath(transfer_dir),
+        transfer_session_dir="sessions"
+    )
+    manager = CloudStorageManager(config)
+    manager.authenticate()
+    provider = manager.provider
+    
+    def fail_after(method, allowed):
+        """Wrap a provider method so that it fails once it has been called allowed times"""
+        calls = []
+        
+        def wrapper(*args, **kwargs):
+            calls.append(args)
+            if len(calls) > allowed:
+                raise IOError("Simulated connection drop")
+            return method(*args, **kwargs)
+        
+        return wrapper, calls
+    
+    # Interrupt an upload after three parts
+    original_upload_part = provider.upload_part
+    provider.upload_part, _ = fail_after(original_upload_part, 3)
+    if manager.upload_component(source_path):
+        print("❌ Interrupted upload reported success")
+        return False
+    
+    # Resume: only the remaining parts should be sent
+    provider.upload_part, calls = fail_after(original_upload_part, 100)
+    if not manager.upload_component(source_path):
+        print("❌ Resumed upload failed")
+        return False
+    
+    sent_parts = sorted(args[2] for args in calls)
+    if len(sent_parts) != 9 - 3 or 1 in sent_parts:
+        print(f"❌ Expected 6 remaining parts to be uploaded, got {sent_parts}")
+        return False
+    
+    print("✅ Interrupted upload resumed from the last completed part")
+    
+    # Interrupt a download after four parts
+    download_path = os.path.join(transfer_dir, "downloaded", "large_model.bin")
+    original_download_range = provider.download_range
+    provider.download_range, _ = fail_after(original_download_range, 4)
+    if manager.download_component("large_model.bin", download_path):
+        print("❌ Interrupted download reported success")
+        return False
+    
+    provider.download_range, calls = fail_after(original_download_range, 100)
+    if not manager.download_component("large_model.bin", download_path):
+        print("❌ Resumed download failed")
+        return False
+    
+    if len(calls) != 9 - 4:
+        print(f"❌ Expected 5 remaining parts to be downloaded, got {len(calls)}")
+        return False
+    
+    with open(download_path, 'rb') as f:
+        if f.read() != content:
+            print("❌ Downloaded content does not match the original")
+            return False
+    
+    print("✅ Interrupted download resumed and content matches")
+    
+    # A download interrupted before the remote file was replaced starts over
+    os.remove(download_path)
+    provider.download_range, _ = fail_after(original_download_range, 4)
+    if manager.download_component("large_model.bin", download_path):
+        print("❌ Interrupted download reported success")
+        return False
+    
+    if not os.listdir(os.path.join(transfer_dir, "sessions")):
+        print("❌ Download session was not saved under cache_dir")
+        return False
+    
+    content = os.urandom(chunk_size * 8 + 100)
+    with open(source_path, 'wb') as f:
+        f.write(content)
+    if not manager.upload_component(source_path):
+        print("❌ Upload of the replacement file failed")
+        return False
+    
+    provider.download_range, calls = fail_after(original_download_range, 100)
+    if not manager.download_component("large_model.bin", download_path):
+        print("❌ Download of the replaced file failed")
+        return False
+    
+    with open(download_path, 'rb') as f:
+        if len(calls) != 9 or f.read() != content:
+            print(f"❌ Expected the replaced file to be downloaded in full, got {len(calls)} parts")
+            return False
+    
+    print("✅ Download of a replaced remote file started over")
+    
+    # Parallel batch uploads share the engine's part slots
+    batch_paths = []
+    for i in range(4):
+        batch_paths.append(os.path.join(transfer_dir, f"batch_model_{i}.bin"))
+        with open(batch_paths[-1], 'wb') as f:
+            f.write(os.urandom(chunk_size * 4))
+    
+    in_flight = [0]
+    peak = [0]
+    counter_lock = threading.Lock()
+    
+    def counting_upload_part(*args, **kwargs):
+        with counter_lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        try:
+            time.sleep(0.01)
+            return original_upload_part(*args, **kwargs)
+        finally:
+            with counter_lock:
+                in_flight[0] -= 1
+    
+    provider.upload_part = counting_upload_part
+    results = manager.batch_upload_components(batch_paths)
+    if not all(results.values()):
+        print(f"❌ Batch upload failed: {results}")
+        return False
+    
+    if peak[0] > config.max_workers:
+        print(f"❌ Expected at most {config.max_workers} parts in flight, got {peak[0]}")
+        return False
+    
+    print(f"✅ Parallel uploads kept {peak[0]} part(s) in flight")
+    
+    manager.delete_component("large_model.bin")
+    for path in batch_paths:
+        manager.delete_component(os.path.basename(path))
+    return True
+
+
+def test_transfer_pipeline():
+    """Test that a slow large upload does not hold back the other workers"""
+    print("\n=== Testing Transfer Pipeline ===")
+    
+    # Create test directory with one large and several small files
+    test_dir = "cloud_storage_test"
+    sync_dir = os.path.join(test_dir, "pipeline_sync")
+    shutil.rmtree(sync_dir, ignore_errors=True)
+    os.makedirs(sync_dir, exist_ok=True)
+    
+    with open(os.path.join(sync_dir, "large.bin"), 'wb') as f:
+        f.write(os.urandom(64 * 1024))
+    small_files = []
+    for i in range(8):
+        small_files.append(f"small_{i}.bin")
+        with open(os.path.join(sync_dir, small_files[-1]), 'wb') as f:
+            f.write(os.urandom(1024))
+    
+    # Create storage manager with mock provider
+    config = CloudStorageConfig(
+        provider="mock",
+        prefix="pipeline_test_components"
+    )
+    manager = CloudStorageManager(config)
+    manager.authenticate()
+    
+    for component in manager.list_components():
+        manager.delete_component(component)
+    
+    # Make transfer time proportional to file size
+    original_upload = manager.upload_component
+    
+    def slow_upload(component_path, component_id=None):
+        time.sleep(0.6 if component_id == "large.bin" else 0.02)
+        return original_upload(component_path, component_id)
+    
+    manager.upload_component = slow_upload
+    
+    sync_config = SyncConfig(
+        local_dir=sync_dir,
+        direction="upload",
+        file_patterns=["*.bin"],
+        max_workers=2
+    )
+    progress = []
+    result = StorageSynchronizer(manager, sync_config).synchronize(progress.append)
+    
+    if result.uploaded_files[-1] != "large.bin" or len(result.uploaded_files) != 9:
+        print(f"❌ Expected the large file to finish last, got {result.uploaded_files}")
+        return False
+    
+    files_per_worker = sorted(stats["files"] for stats in result.worker_stats.values())
+    if files_per_worker != [1, 8]:
+        print(f"❌ Expected one worker to take every small file, got {files_per_worker}")
+        return False
+    
+    print("✅ Small files kept flowing while the large file uploaded")
+    
+    expected_bytes = 64 * 1024 + 8 * 1024
+    if result.transferred_bytes != expected_bytes or result.get_throughput() <= 0:
+        print(f"❌ Expected {expected_bytes} bytes transferred, got {result.transferred_bytes}")
+        return False
+    
+    if not any("MB/s" in message for message in progress):
+        print(f"❌ Progress updates did not report throughput: {progress}")
+        return False
+    
+    print(f"✅ Throughput reported: {result.get_throughput():.0f} bytes/s")
+    
+    # A worker that fails after its transfer must still report the file
+    synchronizer = StorageSynchronizer(manager, sync_config)
+    
+    def broken_record_transfer(*args):
+        raise RuntimeError("record failed")
+    
+    synchronizer.result.record_transfer = broken_record_transfer
+    succeeded, failed = [], []
+    pipeline = threading.Thread(
+        target=synchronizer._transfer_files,
+        args=(small_files, lambda path, local_path: True, succeeded, failed, "Uploaded"),
+        daemon=True
+    )
+    pipeline.start()
+    pipeline.join(10)
+    if pipeline.is_alive() or sorted(failed) != sorted(small_files):
+        print(f"❌ Expected every file reported failed, got {failed} (still waiting: {pipeline.is_alive()})")
+        return False
+    
+    print("✅ Files whose worker raised outside the transfer were reported failed")
+    
+    return True
+
+
+def test_metadata_cache():
+    """Test the bounded metadata cache and the spilling operation log"""
+    print("\n=== Testing Metadata Cache ===")
+    
+    # Create test directory
+    test_dir = "cloud_storage_test"
+    cache_dir = os.path.join(test_dir, "metadata_cache")
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    file_paths = create_test_files(cache_dir, count=5)
+    
+    # Create storage manager with a small cache and operation log
+    config = CloudStorageConfig(
+        provider="mock",
+        prefix="cache_test_components",
+        metadata_cache_size=3,
+        operation_log_capacity=4,
+        cache_dir=os.path.abspath(cache_dir),
+        operation_log_path="operations.log"
+    )
+    manager = CloudStorageManager(config)
+    manager.authenticate()
+    provider = manager.provider
+    
+    for path in file_paths:
+        manager.upload_component(path)
+    
+    # Repeated metadata lookups are served from the cache
+    component_id = os.path.basename(file_paths[0])
+    manager.get_component_metadata(component_id)
+    provider.call_count = 0
+    manager.get_component_metadata(component_id)
+    manager.list_components()
+    manager.list_components()
+    if provider.call_count != 1:
+        print(f"❌ Expected 1 provider call for cached lookups, got {provider.call_count}")
+        return False
+    
+    print("✅ Cached metadata and listings were reused")
+    
+    # Uploading invalidates the cached metadata and listing
+    manager.upload_component(file_paths[0])
+    provider.call_count = 0
+    manager.get_component_metadata(component_id)
+    manager.list_components()
+    if provider.call_count != 2:
+        print(f"❌ Expected upload to invalidate the cache, got {provider.call_count} provider call(s)")
+        return False
+    
+    print("✅ Upload invalidated cached entries")
+    
+    # The cache never grows beyond its size limit
+    for path in file_paths:
+        manager.get_component_metadata(os.path.basename(path))
+    
+    stats = manager.get_cache_stats()
+    if stats["entries"] > 3 or stats["evictions"] == 0:
+        print(f"❌ Expected the cache to stay within 3 entries, got {stats}")
+        return False
+    
+    print(f"✅ Cache bounded: {stats['entries']} entries, {stats['evictions']} evictions, "
+          f"hit rate {stats['hit_rate']:.0%}")
+    
+    # The operation log keeps the latest entries and spills older ones to disk
+    log = manager.get_operation_log()
+    if len(log) != 4 or stats["operation_log_spilled"] != 2:
+        print(f"❌ Expected 4 entries in memory and 2 spilled, got {len(log)} and {stats['operation_log_spilled']}")
+        return False
+    
+    with open(os.path.join(cache_dir, "operations.log"), 'r') as f:
+        spilled = [json.loads(line) for line in f]
+    if [entry["operation"] for entry in spilled] != ["upload", "upload"]:
+        print(f"❌ Unexpected spilled entries: {spilled}")
+        return False
+    
+    print("✅ Operation log spilled older entries to disk")
+    
+    for path in file_paths:
+        manager.delete_component(os.path.basename(path))
+    return True
+
+
+def test_retry_policy():
+    """Test retries, the retry budget and the circuit breaker against injected faults"""
+    print("\n=== Testing Retry Policy ===")
+    
+    # Create test directory
+    test_dir = "cloud_storage_test"
+    retry_dir = os.path.join(test_dir, "retry_policy")
+    shutil.rmtree(retry_dir, ignore_errors=True)
+    os.makedirs(retry_dir, exist_ok=True)
+    
+    file_paths = create_test_files(retry_dir, count=3)
+    
+    # Create storage manager with fast retries
+    config = CloudStorageConfig(
+        provider="mock",
+        prefix="retry_test_components",
+        retry_base_delay=0.001,
+        retry_max_delay=0.01,
+        retry_budget=1000,
+        circuit_failure_threshold=1000
+    )
+    manager = CloudStorageManager(config)
+    manager.authenticate()
+    provider = manager.provider
+    
+    # Transient faults are retried until the request succeeds
+    provider.set_fault_injection(error_rate=0.3)
+    successes = sum(manager.upload_component(path) for path in file_paths for _ in range(10))
+    provider.set_fault_injection(error_rate=0.0)
+    
+    stats = manager.get_retry_stats()
+    if stats["retries"] == 0 or successes < 25:
+        print(f"❌ Expected injected faults to be retried, got {successes}/30 successes and {stats}")
+        return False
+    
+    print(f"✅ {successes}/30 uploads succeeded with {stats['retries']} retries")
+    
+    # An empty budget stops retries
+    config.retry_budget = 2
+    config.retry_budget_refill_rate = 0.0
+    manager = CloudStorageManager(config)
+    manager.authenticate()
+    manager.provider.set_fault_injection(error_rate=1.0)
+    for path in file_paths:
+        manager.upload_component(path)
+    
+    stats = manager.get_retry_stats()
+    if stats["retries"] != 2 or stats["budget_exhausted"] == 0:
+        print(f"❌ Expected the budget to allow exactly 2 retries, got {stats}")
+        return False
+    
+    print("✅ Retry budget limited retries")
+    
+    # Consecutive failures open the circuit, which then rejects requests without sending them
+    config.retry_budget = 0
+    config.circuit_failure_threshold = 3
+    config.circuit_reset_timeout = 60
+    manager = CloudStorageManager(config)
+    manager.authenticate()
+    provider = manager.provider
+    provider.set_fault_injection(error_rate=1.0)
+    for _ in range(3):
+        manager.component_exists("missing.json")
+    
+    calls_before = provider.call_count
+    manager.component_exists("missing.json")
+    stats = manager.get_retry_stats()
+    if stats["circuit_state"] != "open" or provider.call_count != calls_before:
+        print(f"❌ Expected the open circuit to reject the request, got {stats}")
+        return False
+    
+    print("✅ Circuit breaker opened and rejected requests")
+    
+    # A non-retryable error during the half-open trial neither closes nor reopens the circuit
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    policy = RetryPolicy(max_retries=0, breaker=breaker)
+    breaker.record_failure()
+    
+    def bad_request():
+        raise ValueError("Invalid key")
+    
+    try:
+        policy.call(bad_request)
+    except ValueError:
+        pass
+    
+    if breaker.state != CircuitBreaker.HALF_OPEN or not breaker.allow_request():
+        print(f"❌ Expected the circuit to stay half-open with the trial released, got {breaker.state}")
+        return False
+    
+    print("✅ Non-retryable error released the half-open trial without closing the circuit")
+    
+    return True
+
+
 def run_all_tests():
     """Run all tests"""
     tests = [
         ("Basic Operations", test_basic_operations),
         ("Batch Operations", test_batch_operations),
-        ("Synchronization", test_synchronization)
+        ("Synchronization", test_synchronization),
+        ("Incremental Sync Index", test_incremental_sync_index),
+        ("Chunked Transfer", test_chunked_transfer),
+        ("Transfer Pipeline", test_transfer_pipeline),
+        ("Metadata Cache", test_metadata_cache),
+        ("Retry Policy", test_retry_policy)
     ]
     
     success = True
@@ -0,0 +1,336 @@
+"""
+Streaming Transfer Engine for Cloud Storage
+
+This module moves large model files between local disk and cloud storage in
+fixed-size chunks. Each chunk is read, checksummed and sent on its own, and
+at most max_workers chunks are in flight across all transfers of an engine,
+so memory use is bounded by chunk_size * max_workers whatever the file size
+or number of concurrent transfers.
+
+Multipart sessions are persisted to a local session directory after every
+completed part. An interrupted transfer of the same file resumes at the first
+part that had not completed. A download resumes only while the remote object's
+size, ETag and modification time are unchanged.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Constants
+SESSION_VERSION = 1
+
+
+def chunk_checksum(data: bytes) -> str:
+    """
+    Compute the checksum of a chunk.
+
+    Args:
+        data: Chunk contents
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+class TransferSession:
+    """Persistent state of one multipart transfer"""
+
+    def __init__(self, path: str, data: Dict[str, Any]):
+        """
+        Initialize the session.
+
+        Args:
+            path: Path of the session file
+            data: Session data
+        """
+        self.path = path
+        self.data = data
+        self.lock = threading.Lock()
+
+    @property
+    def parts(self) -> Dict[str, Dict[str, Any]]:
+        """Completed parts keyed by part number (as a string, for JSON)"""
+        return self.data["parts"]
+
+    def complete_part(self, part_number: int, part_info: Dict[str, Any]):
+        """
+        Record a completed part and persist the session.
+
+        Args:
+            part_number: Part number (1-based)
+            part_info: Part checksum and provider part ID
+        """
+        with self.lock:
+            self.parts[str(part_number)] = part_info
+            self.save()
+
+    def save(self):
+        """Write the session to disk atomically"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f)
+        os.replace(tmp_path, self.path)
+
+    def delete(self):
+        """Remove the session file"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class ChunkedTransferEngine:
+    """Chunked, resumable, parallel transfers on top of a CloudStorageProvider"""
+
+    def __init__(self, provider, chunk_size: int, max_workers: int, session_dir: str):
+        """
+        Initialize the transfer engine.
+
+        Args:
+            provider: Cloud storage provider
+            chunk_size: Size of each part in bytes
+            max_workers: Maximum number of parts in flight across all transfers
+            session_dir: Directory where multipart sessions are persisted (created on first use)
+        """
+        self.provider = provider
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.session_dir = session_dir
+        # Shared by concurrent transfers, so batch and sync runs stay within the bound too
+        self.part_slots = threading.BoundedSemaphore(max_workers)
+
+    def _new_session(self, session_path: str, data: Dict[str, Any]) -> TransferSession:
+        """Create and persist a session, creating the session directory if needed"""
+        os.makedirs(self.session_dir, exist_ok=True)
+        session = TransferSession(session_path, data)
+        session.save()
+        return session
+
+    def _session_path(self, direction: str, local_path: str, remote_path: str) -> str:
+        """Get the session file for a transfer"""
+        key = f"{direction}\n{os.path.abspath(local_path)}\n{remote_path}"
+        return os.path.join(self.session_dir, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def _load_session(self, session_path: str, expected: Dict[str, Any]) -> Optional[TransferSession]:
+        """
+        Load a persisted session if it still describes the same transfer.
+
+        Args:
+            session_path: Path of the session file
+            expected: Values that must match for the session to be resumed
+
+        Returns:
+            Optional[TransferSession]: The session, or None if there is nothing to resume
+        """
+        if not os.path.exists(session_path):
+            return None
+
+        try:
+            with open(session_path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable transfer session {session_path}: {e}")
+            return None
+
+        if any(data.get(key) != value for key, value in expected.items()):
+            logger.info(f"Discarding stale transfer session {session_path}")
+            if data.get("upload_id"):
+                try:
+                    self.provider.abort_multipart_upload(data["remote_path"], data["upload_id"])
+                except Exception as e:
+                    logger.warning(f"Could not abort stale multipart upload: {e}")
+            return None
+
+        return TransferSession(session_path, data)
+
+    def _part_ranges(self, size: int) -> List[Tuple[int, int, int]]:
+        """Split a file size into (part number, offset, length) ranges"""
+        return [
+            (index + 1, offset, min(self.chunk_size, size - offset))
+            for index, offset in enumerate(range(0, size, self.chunk_size))
+        ]
+
+    def _run_parts(self, parts: List[Tuple[int, int, int]], transfer_part) -> bool:
+        """
+        Run part transfers, holding one of the engine's part slots per part.
+
+        Args:
+            parts: Parts to transfer as (part number, offset, length)
+            transfer_part: Callable taking (part number, offset, length)
+
+        Returns:
+            bool: True if every part succeeded
+        """
+        if not parts:
+            return True
+
+        pending = iter(parts)
+        in_flight = {}
+        success = True
+
+        def run_part(part_number: int, offset: int, length: int):
+            with self.part_slots:
+                transfer_part(part_number, offset, length)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for part in pending:
+                in_flight[executor.submit(run_part, *part)] = part
+                if len(in_flight) >= self.max_workers:
+                    break
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    part_number = in_flight.pop(future)[0]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Transfer of part {part_number} failed: {e}")
+                        success = False
+
+                # Stop issuing new parts after a failure; completed parts stay recorded
+                if success:
+                    for part in pending:
+                        in_flight[executor.submit(run_part, *part)] = part
+                        if len(in_flight) >= self.max_workers:
+                            break
+
+        return success
+
+    def upload(self, local_path: str, remote_path: str) -> bool:
+        """
+        Upload a file, using a resumable multipart session for large files.
+
+        Args:
+            local_path: Local file path
+            remote_path: Remote file path
+
+        Returns:
+            bool: True if upload successful, False otherwise
+        """
+        stats = os.stat(local_path)
+        if stats.st_size <= self.chunk_size or not self.provider.supports_multipart():
+            return self.provider.upload_file(local_path, remote_path)
+
+        session_path = self._session_path("upload", local_path, remote_path)
+        expected = {
+            "version": SESSION_VERSION,
+            "remote_path": remote_path,
+            "size": stats.st_size,
+            "mtime_ns": stats.st_mtime_ns,
+            "chunk_size": self.chunk_size
+        }
+
+        session = self._load_session(session_path, expected)
+        if session is None:
+            upload_id = self.provider.create_multipart_upload(remote_path)
+            session = self._new_session(session_path, dict(expected, upload_id=upload_id, parts={}))
+        else:
+            logger.info(f"Resuming upload of {local_path} with {len(session.parts)} part(s) already done")
+
+        upload_id = session.data["upload_id"]
+
+        def upload_part(part_number: int, offset: int, length: int):
+            with open(local_path, 'rb') as f:
+                f.seek(offset)
+                data = f.read(length)
+            checksum = chunk_checksum(data)
+            part_id = self.provider.upload_part(remote_path, upload_id, part_number, data, checksum)
+            session.complete_part(part_number, {"checksum": checksum, "part_id": part_id})
+
+        parts = self._part_ranges(stats.st_size)
+        remaining = [part for part in parts if str(part[0]) not in session.parts]
+
+        if not self._run_parts(remaining, upload_part):
+            logger.error(f"Upload of {local_path} interrupted; it will resume from the session in {session_path}")
+            return False
+
+        completed = [(part[0], session.parts[str(part[0])]["part_id"]) for part in parts]
+        if not self.provider.complete_multipart_upload(remote_path, upload_id, completed):
+            return False
+
+        session.delete()
+        logger.info(f"Uploaded {local_path} to {remote_path} in {len(parts)} part(s)")
+        return True
+
+    def download(self, remote_path: str, local_path: str, size_hint: Optional[int] = None) -> bool:
+        """
+        Download a file, using resumable ranged reads for large files.
+
+        Args:
+            remote_path: Remote file path
+            local_path: Local file path
+            size_hint: Cached remote file size; a small hint skips the metadata request
+
+        Returns:
+            bool: True if download successful, False otherwise
+        """
+        if not self.provider.supports_multipart() or (size_hint is not None and size_hint <= self.chunk_size):
+            return self.provider.download_file(remote_path, local_path)
+
+        metadata = self.provider.get_file_metadata(remote_path) or {}
+        size = metadata.get("size")
+        if not size or size <= self.chunk_size:
+            return self.provider.download_file(remote_path, local_path)
+
+        os.makedirs(os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
+        partial_path = local_path + ".part"
+        session_path = self._session_path("download", local_path, remote_path)
+        expected = {
+            "version": SESSION_VERSION,
+            "remote_path": remote_path,
+            "size": size,
+            "etag": metadata.get("etag"),
+            "last_modified": metadata.get("last_modified"),
+            "chunk_size": self.chunk_size
+        }
+
+        # A remote object replaced since the session started has a new ETag or modification time
+        session = self._load_session(session_path, expected)
+        if session is not None and os.path.exists(partial_path):
+            self._verify_partial(partial_path, session)
+            logger.info(f"Resuming download of {remote_path} with {len(session.parts)} part(s) already done")
+        else:
+            session = self._new_session(session_path, dict(expected, parts={}))
+            with open(partial_path, 'wb') as f:
+                f.truncate(size)
+
+        def download_part(part_number: int, offset: int, length: int):
+            data = self.provider.download_range(remote_path, offset, length)
+            if len(data) != length:
+                raise IOError(f"Expected {length} bytes, got {len(data)}")
+            with open(partial_path, 'r+b') as f:
+                f.seek(offset)
+                f.write(data)
+            session.complete_part(part_number, {"checksum": chunk_checksum(data)})
+
+        parts = self._part_ranges(size)
+        remaining = [part for part in parts if str(part[0]) not in session.parts]
+
+        if not self._run_parts(remaining, download_part):
+            logger.error(f"Download of {remote_path} interrupted; it will resume from the session in {session_path}")
+            return False
+
+        os.replace(partial_path, local_path)
+        session.delete()
+        logger.info(f"Downloaded {remote_path} to {local_path} in {len(parts)} part(s)")
+        return True
+
+    def _verify_partial(self, partial_path: str, session: TransferSession):
+        """Drop recorded parts whose data on disk no longer matches their checksum"""
+        with open(partial_path, 'rb') as f:
+            for part_number, part_info in list(session.parts.items()):
+                f.seek((int(part_number) - 1) * self.chunk_size)
+                data = f.read(self.chunk_size)
+                if chunk_checksum(data) != part_info["checksum"]:
+                    logger.warning(f"Part {part_number} of {partial_path} is corrupt and will be re-downloaded")
+                    del session.parts[part_number]
+        session.save()
@@ -18,7 +18,7 @@ from ros2_integration.message_types import (
 )
 from ros2_integration.component_interface import ComponentInterface, ComponentStatus
 from ros2_integration.pub_sub_patterns import (
-    Publisher, Subscriber, RequestResponsePattern, MessagePattern
+    CommunicationPattern, StatementPublisher, RoleScopeReceiver, FormationCommandPattern
 )
 from ros2_integration.dashboard_integration import create_ros2_tab
 
@@ -0,0 +1,509 @@
+"""
+Benchmark Script for ROS2 Integration
+
+This script measures ROS2 integration hot paths offline, using the mock ROS2
+implementation, and prints the results as JSON. The "load" benchmark drives
+synthetic multi-component traffic and can record it to a trace, which the
+"replay" benchmark plays back so runs on different commits can be compared.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+import argparse
+import platform
+import subprocess
+from typing import Dict, List, Any, Callable
+
+from ros2_integration.ros2_bridge import (
+    ROS2Bridge, ROS2Message, MessagePriority, ComponentCommunicator, CommunicationType
+)
+from ros2_integration.message_types import (
+    ComponentType, ComponentState, MotionCommand, SensorData, ActuatorCommand,
+    JointConfiguration, InterfaceSettings, TaskAssignment, CoordinationMessage,
+    SimulationControl, PhysicalProperties, PowerState, ErrorMessage
+)
+from ros2_integration.binary_codec import encode_message, decode_message
+from ros2_integration.component_interface import ComponentInterface
+from ros2_integration.task_executor import fixed_cost
+from ros2_integration.message_history import MessageHistory
+from ros2_integration.pub_sub_patterns import RoleScopeReceiver, CommunicationPattern, get_statement_router
+from ros2_integration.load_harness import run_load, run_replay, _percentile
+
+
+def create_sample_messages() -> Dict[str, Any]:
+    """
+    Create one representative instance of each message type.
+
+    Returns:
+        Dict[str, Any]: Message type name to message
+    """
+    return {
+        "ComponentState": ComponentState(
+            component_id="sphere_1", component_type="sphere",
+            position=[1.5, -2.25, 0.75], orientation=[0.0, 0.0, 0.7071, 0.7071],
+            velocity=[0.1, 0.0, -0.05], angular_velocity=[0.0, 0.01, 0.0],
+            status="moving", battery_level=87.5, temperature=31.2,
+            connected_components=["joint_1", "joint_2"], timestamp=time.time()
+        ),
+        "MotionCommand": MotionCommand(
+            target_position=[10.0, 5.0, 0.0], target_orientation=[0.0, 0.0, 0.0, 1.0],
+            target_velocity=[1.0, 0.5, 0.0], motion_type="combined", duration=2.5, priority=2
+        ),
+        "SensorData": SensorData(
+            sensor_id="imu_1", sensor_type="acceleration",
+            values={"x": 0.12, "y": -9.81, "z": 0.03}, timestamp=time.time(),
+            confidence=0.98, units={"x": "m/s^2", "y": "m/s^2", "z": "m/s^2"}
+        ),
+        "ActuatorCommand": ActuatorCommand(
+            actuator_id="servo_3", actuator_type="servo", action="rotate",
+            parameters={"angle": 45.0, "speed": 0.5}, duration=0.8, priority=2
+        ),
+        "JointConfiguration": JointConfiguration(
+            joint_id="joint_1", joint_type="ball", connected_components=["sphere_1", "sphere_2"],
+            position=[0.5, 0.0, 0.0], limits={"min_angle": -90.0, "max_angle": 90.0},
+            stiffness=0.8, damping=0.2
+        ),
+        "InterfaceSettings": InterfaceSettings(
+            interface_id="iface_1", interface_type="magnetic",
+            connected_components=["sphere_1", "sphere_2"], power_transfer_enabled=True,
+            flags={"locked": True, "shielded": False}
+        ),
+        "TaskAssignment": TaskAssignment(
+            task_id="task_42", task_type="assembly", assigned_components=["sphere_1", "sphere_2"],
+            priority=3, deadline=time.time() + 60, parameters={"target": "structure_a", "steps": 4},
+            dependencies=["task_41"]
+        ),
+        "CoordinationMessage": CoordinationMessage(
+            coordination_type="formation", source_component="controller_1",
+            target_components=["sphere_1", "sphere_2", "sphere_3"], action="form_line",
+            parameters={"spacing": 1.5}, response_required=True, group_id="group_a"
+        ),
+        "SimulationControl": SimulationControl(
+            command="step", parameters={"steps": 10}, affected_components=["sphere_1"],
+            time_scale=0.5, physics_parameters={"gravity": -9.81}, random_seed=1234
+        ),
+        "PhysicalProperties": PhysicalProperties(
+            component_id="sphere_1", mass=0.25, material="aluminum", dimensions=[0.1, 0.1, 0.1],
+            collision_shape="sphere"
+        ),
+        "PowerState": PowerState(
+            component_id="sphere_1", battery_level=76.0, power_consumption=1.25,
+            power_generation=0.3, charging=True, available_power=80.0
+        ),
+        "ErrorMessage": ErrorMessage(
+            component_id="sphere_1", error_code=503, error_type="communication",
+            error_message="Lost link to controller", severity="warning",
+            suggested_actions=["retry", "reconnect"], timestamp=time.time()
+        ),
+        "ROS2Message": ROS2Message(
+            message_type="telemetry", source_id="sphere_1", priority=MessagePriority.HIGH,
+            data={"telemetry_type": "position", "values": {"x": 1.5, "y": -2.25, "z": 0.75}}
+        )
+    }
+
+
+def _time_per_call(func: Callable[[], Any], iterations: int) -> float:
+    """Get the mean time of a call in microseconds"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def benchmark_codec(iterations: int = 20000) -> Dict[str, Any]:
+    """
+    Compare JSON and binary encoding of every message type.
+
+    Args:
+        iterations: Encode/decode calls timed per message type and codec
+
+    Returns:
+        Dict[str, Any]: Encode/decode time (microseconds) and payload size (bytes) per message type
+    """
+    results: List[Dict[str, Any]] = []
+
+    for name, message in create_sample_messages().items():
+        message_cls = type(message)
+        if isinstance(message, ROS2Message):
+            to_binary, from_binary = message.to_bytes, ROS2Message.from_bytes
+        else:
+            to_binary, from_binary = (lambda m=message: encode_message(m)), decode_message
+
+        json_payload = message.to_json()
+        binary_payload = to_binary()
+
+        # Round trip must be lossless for the benchmark to be meaningful
+        if from_binary(binary_payload).to_dict() != message_cls.from_json(json_payload).to_dict():
+            raise AssertionError(f"Binary round trip of {name} does not match JSON")
+
+        results.append({
+            "message_type": name,
+            "json": {
+                "bytes": len(json_payload.encode("utf-8")),
+                "encode_us": _time_per_call(message.to_json, iterations),
+                "decode_us": _time_per_call(lambda: message_cls.from_json(json_payload), iterations)
+            },
+            "binary": {
+                "bytes": len(binary_payload),
+                "encode_us": _time_per_call(to_binary, iterations),
+                "decode_us": _time_per_call(lambda: from_binary(binary_payload), iterations)
+            }
+        })
+
+    return {
+        "benchmark": "codec",
+        "iterations": iterations,
+        "message_types": results
+    }
+
+
+def benchmark_task_dispatch(
+    motion_tasks: int = 200,
+    sensing_tasks: int = 200,
+    motion_cost: float = 0.002,
+    sensing_cost: float = 0.001,
+    worker_counts: tuple = (1, 2, 4)
+) -> Dict[str, Any]:
+    """
+    Measure ComponentInterface task throughput for a mixed motion and sensing workload.
+    
+    Sensing tasks are submitted at higher priority with a deadline, so they
+    preempt queued and running motion.
+    
+    Args:
+        motion_tasks: Number of motion commands
+        sensing_tasks: Number of sensing tasks
+        motion_cost: Simulated execution time of a motion command (seconds)
+        sensing_cost: Simulated execution time of a sensing task (seconds)
+        worker_counts: Worker pool sizes to measure
+        
+    Returns:
+        Dict[str, Any]: Wall time, throughput, latency, preemptions and deadline misses per pool size
+    """
+    results: List[Dict[str, Any]] = []
+    
+    for num_workers in worker_counts:
+        bridge = ROS2Bridge("benchmark_bridge", use_mock=True)
+        component = ComponentInterface(
+            "benchmark_component", ComponentType.SPHERE, bridge,
+            num_workers=num_workers,
+            cost_models={"motion": fixed_cost(motion_cost), "sensing": fixed_cost(sensing_cost)}
+        )
+        bridge.start()
+        component.start()
+        
+        try:
+            start = time.perf_counter()
+            for i in range(max(motion_tasks, sensing_tasks)):
+                if i < motion_tasks:
+                    component.queue_motion(MotionCommand(target_position=[float(i), 0.0, 0.0]))
+                if i < sensing_tasks:
+                    component.queue_task(TaskAssignment(
+                        task_id=f"sense_{i}", task_type="sensing",
+                        assigned_components=["benchmark_component"],
+                        priority=MessagePriority.HIGH.value, deadline=time.time() + 0.25
+                    ))
+            component.executor.wait_idle()
+            elapsed = time.perf_counter() - start
+            
+            stats = component.get_executor_stats()
+            results.append({
+                "workers": num_workers,
+                "wall_seconds": elapsed,
+                "tasks_per_second": (motion_tasks + sensing_tasks) / elapsed,
+                "preemptions": stats["preemptions"],
+                "kinds": {
+                    kind: {
+                        "completed": kind_stats["completed"],
+                        "mean_latency_ms": kind_stats["mean_latency"] * 1000,
+                        "deadline_misses": kind_stats["deadline_misses"]
+                    }
+                    for kind, kind_stats in stats["kinds"].items()
+                }
+            })
+        finally:
+            component.stop()
+            bridge.stop()
+    
+    return {
+        "benchmark": "task_dispatch",
+        "motion_tasks": motion_tasks,
+        "sensing_tasks": sensing_tasks,
+        "motion_cost": motion_cost,
+        "sensing_cost": sensing_cost,
+        "runs": results
+    }
+
+
+def benchmark_statement_routing(
+    swarm_sizes: tuple = (10, 100, 500),
+    relays: int = 5,
+    iterations: int = 2000
+) -> Dict[str, Any]:
+    """
+    Measure per-statement dispatch cost of role-scoped statements as the swarm grows.
+    
+    Every component has a role-scope receiver; a fixed number of them are relays.
+    A statement addressed to the relay role is dispatched through the routing
+    table and, for comparison, by checking every receiver in turn.
+    
+    Args:
+        swarm_sizes: Numbers of components to measure
+        relays: Number of components with the targeted role
+        iterations: Statements dispatched per swarm size
+        
+    Returns:
+        Dict[str, Any]: Indexed and scanning dispatch time (microseconds) per swarm size
+    """
+    results: List[Dict[str, Any]] = []
+    statement = ComponentState(component_id="leader", component_type="sphere", status="moving").to_dict()
+    
+    for size in swarm_sizes:
+        bridge = ROS2Bridge(f"routing_bridge_{size}", use_mock=True)
+        receivers = []
+        for i in range(size):
+            communicator = ComponentCommunicator(f"sphere{i}", "sphere", bridge)
+            receivers.append(RoleScopeReceiver(
+                communicator=communicator,
+                statement_type="formation_state",
+                context_topic="formation",
+                statement_handler=lambda source_id, s: None,
+                statement_class=ComponentState,
+                role_in_formation="relay" if i < relays else "member",
+                pattern=CommunicationPattern.ROLE_SCOPE_FOCUSED
+            ))
+        
+        router = get_statement_router(bridge)
+        message = bridge.create_coordination_message(
+            source_id="leader",
+            coordination_type="formation_state",
+            action="role_statement",
+            params={"statement": statement, "context": "formation", "formation_role": "relay"}
+        )
+        
+        def scan():
+            # Per-receiver matching, decoding the statement for every match
+            params = message.data["params"]
+            for receiver in receivers:
+                if (message.data["coordination_type"] == receiver.statement_type
+                        and params["context"] == receiver.context_topic
+                        and params["formation_role"] == receiver.role_in_formation):
+                    receiver.statement_handler(message.source_id, ComponentState.from_dict(params["statement"]))
+        
+        results.append({
+            "components": size,
+            "matching_receivers": relays,
+            "indexed_us": _time_per_call(lambda: router._dispatch_context(message), iterations),
+            "scan_us": _time_per_call(scan, iterations)
+        })
+    
+    return {
+        "benchmark": "statement_routing",
+        "iterations": iterations,
+        "runs": results
+    }
+
+
+def benchmark_message_history(
+    message_counts: tuple = (1000, 100000, 1000000),
+    components: int = 20,
+    window: int = 100,
+    iterations: int = 200
+) -> Dict[str, Any]:
+    """
+    Measure dashboard history refresh cost as the number of messages seen grows.
+    
+    Args:
+        message_counts: Total messages appended before measuring
+        components: Number of components sending state and sensor messages
+        window: Messages displayed per refresh
+        iterations: Refreshes timed per message count
+        
+    Returns:
+        Dict[str, Any]: Append and refresh time (microseconds) and entries held per message count
+    """
+    results: List[Dict[str, Any]] = []
+    
+    for count in message_counts:
+        history = MessageHistory()
+        start = time.perf_counter()
+        for i in range(count):
+            history.append(f"sphere{i % components}", "state" if i % 3 else "sensor", f"message {i}")
+        append_us = (time.perf_counter() - start) / count * 1e6
+        
+        results.append({
+            "messages_seen": count,
+            "entries_held": len(history),
+            "append_us": append_us,
+            "refresh_all_us": _time_per_call(lambda: history.query(limit=window), iterations),
+            "refresh_component_us": _time_per_call(lambda: history.query(component_id="sphere1", limit=window), iterations),
+            "rate_us": _time_per_call(lambda: history.get_rate(), iterations)
+        })
+    
+    return {
+        "benchmark": "message_history",
+        "components": components,
+        "window": window,
+        "runs": results
+    }
+
+
+def benchmark_transport(rate: float = 10000.0, duration: float = 5.0) -> Dict[str, Any]:
+    """
+    Measure publish-to-callback latency of the mock ROS2 transport at a fixed rate.
+    
+    Telemetry messages are published through a mock bridge on a fixed schedule
+    and timed from publish until the subscription callback runs.
+    
+    Args:
+        rate: Messages published per second
+        duration: Seconds of traffic
+        
+    Returns:
+        Dict[str, Any]: Achieved rate, delivered and dropped counts and latency percentiles (ms)
+    """
+    bridge = ROS2Bridge("transport_bridge", use_mock=True)
+    bridge.create_publisher("sphere0", CommunicationType.TELEMETRY)
+    
+    count = int(rate * duration)
+    latencies: List[float] = []
+    all_received = threading.Event()
+    
+    def on_message(message: ROS2Message):
+        latencies.append(time.perf_counter() - message.data["sent"])
+        if len(latencies) == count:
+            all_received.set()
+    
+    bridge.create_subscription("sphere0", CommunicationType.TELEMETRY, on_message)
+    bridge.start()
+    
+    try:
+        start = time.perf_counter()
+        for i in range(count):
+            # Pace against the schedule so a slow publish does not lower the rate
+            delay = start + i / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            bridge.publish_message("sphere0", CommunicationType.TELEMETRY, ROS2Message(
+                message_type="telemetry",
+                source_id="sphere0",
+                data={"seq": i, "sent": time.perf_counter()}
+            ))
+        publish_seconds = time.perf_counter() - start
+        all_received.wait(timeout=10.0)
+    finally:
+        bridge.stop()
+    
+    latencies.sort()
+    return {
+        "benchmark": "transport",
+        "rate": rate,
+        "duration": duration,
+        "published": count,
+        "achieved_rate": count / publish_seconds if publish_seconds > 0 else 0.0,
+        "received": len(latencies),
+        "dropped": count - len(latencies),
+        "latency_ms": {
+            "p50": _percentile(latencies, 0.50) * 1000,
+            "p95": _percentile(latencies, 0.95) * 1000,
+            "p99": _percentile(latencies, 0.99) * 1000,
+            "max": (latencies[-1] if latencies else 0.0) * 1000
+        }
+    }
+
+
+BENCHMARKS = {
+    "codec": benchmark_codec,
+    "task_dispatch": benchmark_task_dispatch,
+    "statement_routing": benchmark_statement_routing,
+    "message_history": benchmark_message_history,
+    "transport": benchmark_transport,
+    "load": run_load,
+    "replay": run_replay
+}
+
+# Benchmarks run when none are named ("replay" needs a trace)
+DEFAULT_BENCHMARKS = ["codec", "task_dispatch", "statement_routing", "message_history", "transport", "load"]
+
+
+def get_run_metadata() -> Dict[str, Any]:
+    """
+    Get metadata identifying a benchmark run.
+
+    Returns:
+        Dict[str, Any]: Commit (if available), Python version, platform and time
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time()
+    }
+
+
+def main():
+    """Run the selected benchmarks and print the results as JSON"""
+    parser = argparse.ArgumentParser(description="ROS2 integration benchmarks")
+    parser.add_argument("benchmarks", nargs="*", default=DEFAULT_BENCHMARKS, choices=list(BENCHMARKS),
+                        help="Benchmarks to run (default: all but replay)")
+    parser.add_argument("--components", type=int, default=20, help="Components in the load run")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of load or transport traffic")
+    parser.add_argument("--rate", type=float, default=10000.0, help="Messages per second in the transport run")
+    parser.add_argument("--state-rate", type=float, default=10.0, help="ComponentState messages per second per component")
+    parser.add_argument("--sensor-rate", type=float, default=20.0, help="SensorData messages per second per component")
+    parser.add_argument("--motion-rate", type=float, default=2.0, help="MotionCommands per second per component")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the load traffic")
+    parser.add_argument("--workers", type=int, default=None, help="Task executor workers per component")
+    parser.add_argument("--record", help="Trace file to record the load traffic to")
+    parser.add_argument("--trace", help="Trace file to replay")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier")
+    parser.add_argument("--output", help="File to write the results to (default: stdout)")
+    parser.add_argument("--log-level", default="WARNING", help="Logging level")
+    args = parser.parse_args()
+
+    if "replay" in args.benchmarks and not args.trace:
+        parser.error("replay needs --trace")
+    # The bridge configures INFO logging on import, which would drown the report
+    logging.getLogger().setLevel(getattr(logging, args.log_level.upper(), logging.WARNING))
+
+    results = []
+    for name in args.benchmarks:
+        if name == "load":
+            results.append(run_load(
+                components=args.components,
+                duration=args.duration,
+                state_rate=args.state_rate,
+                sensor_rate=args.sensor_rate,
+                motion_rate=args.motion_rate,
+                seed=args.seed,
+                num_workers=args.workers or 1,
+                record_path=args.record
+            ))
+        elif name == "transport":
+            results.append(benchmark_transport(rate=args.rate, duration=args.duration))
+        elif name == "replay":
+            results.append(run_replay(args.trace, speed=args.speed, num_workers=args.workers))
+        else:
+            results.append(BENCHMARKS[name]())
+
+    report = json.dumps({"metadata": get_run_metadata(), "results": results}, indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
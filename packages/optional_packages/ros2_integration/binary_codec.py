@@ -0,0 +1,425 @@
+"""
+Binary Codec for ROS2 Messages
+
+This module implements a compact binary encoding for the message types in
+message_types.py and for the ROS2Message envelope, as an alternative to JSON.
+
+Every payload starts with a versioned header (magic, codec version, type ID).
+The layout of each message type is derived once from its dataclass fields:
+
+- float, int and bool fields are packed together into one fixed-size block
+- lists of floats (positions, orientations, tensors) are packed as float64 arrays
+- strings and lists of strings are length-prefixed UTF-8
+- dict and Any fields are packed as float64 arrays/maps when every value is a
+  float, and fall back to embedded JSON otherwise
+
+Fields are read straight from the message attributes, so encoding never goes
+through dataclasses.asdict().
+
+In the data of a ROS2Message envelope, message dataclasses are embedded in
+their binary encoding, and dicts holding them are packed key by key. Other
+values use the dict/Any encoding above.
+"""
+
+import json
+import struct
+import typing
+from dataclasses import fields
+from operator import attrgetter
+from typing import Dict, List, Any, Optional, Tuple, Callable, Type
+
+from ros2_integration.message_types import (
+    BaseMessage, ComponentState, MotionCommand, SensorData, ActuatorCommand,
+    JointConfiguration, InterfaceSettings, TaskAssignment, CoordinationMessage,
+    SimulationControl, PhysicalProperties, PowerState, ErrorMessage, message_to_dict
+)
+
+# Constants
+MAGIC = b"GG"
+CODEC_VERSION = 1
+ENVELOPE_TYPE_ID = 0
+
+# Type IDs are part of the wire format: only ever append to this list
+MESSAGE_TYPES: List[Type[BaseMessage]] = [
+    ComponentState, MotionCommand, SensorData, ActuatorCommand,
+    JointConfiguration, InterfaceSettings, TaskAssignment, CoordinationMessage,
+    SimulationControl, PhysicalProperties, PowerState, ErrorMessage
+]
+
+_HEADER = struct.Struct("<2sBH")
+_U32 = struct.Struct("<I")
+_pack_u32 = _U32.pack
+_unpack_u32 = _U32.unpack_from
+_ENVELOPE_FIXED = struct.Struct("<Bd")  # priority, timestamp
+
+# Tags for dict/Any values
+_TAG_JSON = 0
+_TAG_FLOAT_ARRAY = 1
+_TAG_FLOAT_MAP = 2
+_TAG_MESSAGE = 3
+_TAG_FIELDS = 4
+_TAG_STR = 5
+
+_FIXED_CODES = {float: "d", int: "q", bool: "?"}
+
+Encoder = Callable[[Any], bytes]
+Decoder = Callable[[bytes, int], Tuple[Any, int]]
+
+
+class CodecError(ValueError):
+    """Raised when a payload cannot be decoded"""
+    pass
+
+
+# Primitive encoders and decoders
+
+
+def _encode_str(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return _pack_u32(len(data)) + data
+
+
+def _decode_str(buf: bytes, offset: int) -> Tuple[str, int]:
+    end = offset + 4 + _unpack_u32(buf, offset)[0]
+    return buf[offset + 4:end].decode("utf-8"), end
+
+
+def _encode_floats(values: List[float]) -> bytes:
+    return _pack_u32(len(values)) + struct.pack(f"<{len(values)}d", *values)
+
+
+def _decode_floats(buf: bytes, offset: int) -> Tuple[List[float], int]:
+    count = _unpack_u32(buf, offset)[0]
+    offset += 4
+    return list(struct.unpack_from(f"<{count}d", buf, offset)), offset + 8 * count
+
+
+def _encode_strs(values: List[str]) -> bytes:
+    return _pack_u32(len(values)) + b"".join([_encode_str(value) for value in values])
+
+
+def _decode_strs(buf: bytes, offset: int) -> Tuple[List[str], int]:
+    count = _unpack_u32(buf, offset)[0]
+    offset += 4
+    values = []
+    for _ in range(count):
+        value, offset = _decode_str(buf, offset)
+        values.append(value)
+    return values, offset
+
+
+def _encode_any(value: Any) -> bytes:
+    if type(value) is list and value and all(type(v) is float for v in value):
+        return bytes((_TAG_FLOAT_ARRAY,)) + _encode_floats(value)
+    if type(value) is dict and value and all(type(v) is float for v in value.values()):
+        return bytes((_TAG_FLOAT_MAP,)) + _encode_strs(list(value)) + _encode_floats(list(value.values()))
+    return bytes((_TAG_JSON,)) + _encode_str(json.dumps(value, default=message_to_dict))
+
+
+def _decode_any(buf: bytes, offset: int) -> Tuple[Any, int]:
+    tag = buf[offset]
+    offset += 1
+    if tag == _TAG_FLOAT_ARRAY:
+        return _decode_floats(buf, offset)
+    if tag == _TAG_FLOAT_MAP:
+        keys, offset = _decode_strs(buf, offset)
+        values, offset = _decode_floats(buf, offset)
+        return dict(zip(keys, values)), offset
+    if tag == _TAG_JSON:
+        text, offset = _decode_str(buf, offset)
+        return json.loads(text), offset
+    if tag == _TAG_STR:
+        return _decode_str(buf, offset)
+    if tag == _TAG_FIELDS:
+        count = _unpack_u32(buf, offset)[0]
+        offset += 4
+        values = {}
+        for _ in range(count):
+            key, offset = _decode_str(buf, offset)
+            values[key], offset = _decode_any(buf, offset)
+        return values, offset
+    if tag == _TAG_MESSAGE:
+        end = offset + 4 + _unpack_u32(buf, offset)[0]
+        return decode_message(buf[offset + 4:end]), end
+    raise CodecError(f"Unknown value tag: {tag}")
+
+
+def _optional(encode: Encoder, decode: Decoder) -> Tuple[Encoder, Decoder]:
+    """Wrap an encoder/decoder pair with a presence byte for Optional fields"""
+    def encode_optional(value: Any) -> bytes:
+        return b"\x00" if value is None else b"\x01" + encode(value)
+
+    def decode_optional(buf: bytes, offset: int) -> Tuple[Any, int]:
+        if buf[offset] == 0:
+            return None, offset + 1
+        return decode(buf, offset + 1)
+
+    return encode_optional, decode_optional
+
+
+def _scalar_codec(code: str) -> Tuple[Encoder, Decoder]:
+    """Encoder/decoder pair for a single (optional) scalar"""
+    packer = struct.Struct("<" + code)
+
+    def decode(buf: bytes, offset: int) -> Tuple[Any, int]:
+        return packer.unpack_from(buf, offset)[0], offset + packer.size
+
+    return packer.pack, decode
+
+
+def _field_codec(field_type: Any) -> Tuple[Optional[str], Optional[Encoder], Optional[Decoder]]:
+    """
+    Derive the encoding of a dataclass field from its type annotation.
+
+    Args:
+        field_type: Resolved type annotation
+
+    Returns:
+        Tuple: (fixed struct code, None, None) for fixed-layout fields,
+            or (None, encoder, decoder) for variable-length fields
+    """
+    if field_type in _FIXED_CODES:
+        return _FIXED_CODES[field_type], None, None
+
+    origin = typing.get_origin(field_type)
+    args = typing.get_args(field_type)
+
+    if origin is typing.Union and type(None) in args:
+        inner = [arg for arg in args if arg is not type(None)][0]
+        code, encode, decode = _field_codec(inner)
+        if code is not None:
+            encode, decode = _scalar_codec(code)
+        return (None,) + _optional(encode, decode)
+
+    if field_type is str:
+        return None, _encode_str, _decode_str
+    if origin is list and args == (float,):
+        return None, _encode_floats, _decode_floats
+    if origin is list and args == (str,):
+        return None, _encode_strs, _decode_strs
+    return None, _encode_any, _decode_any
+
+
+class MessageSchema:
+    """Binary layout of one message dataclass"""
+
+    def __init__(self, message_cls: Type[BaseMessage], type_id: int):
+        """
+        Derive the layout from the dataclass fields.
+
+        Args:
+            message_cls: Message dataclass
+            type_id: Wire type ID
+        """
+        self.message_cls = message_cls
+        self.type_id = type_id
+        self.header = _HEADER.pack(MAGIC, CODEC_VERSION, type_id)
+
+        hints = typing.get_type_hints(message_cls)
+        fixed_names, fixed_codes = [], []
+        self.variable_fields: List[Tuple[str, Encoder, Decoder]] = []
+
+        for message_field in fields(message_cls):
+            code, encode, decode = _field_codec(hints[message_field.name])
+            if code is not None:
+                fixed_names.append(message_field.name)
+                fixed_codes.append(code)
+            else:
+                self.variable_fields.append((message_field.name, encode, decode))
+
+        self.fixed_names = fixed_names
+        self.fixed_struct = struct.Struct("<" + "".join(fixed_codes))
+        if len(fixed_names) == 1:
+            getter = attrgetter(fixed_names[0])
+            self.get_fixed = lambda message: (getter(message),)
+        elif fixed_names:
+            self.get_fixed = attrgetter(*fixed_names)
+        else:
+            self.get_fixed = lambda message: ()
+
+    def encode(self, message: BaseMessage) -> bytes:
+        """Encode a message, including the header"""
+        parts = [self.header, self.fixed_struct.pack(*self.get_fixed(message))]
+        for name, encode, _ in self.variable_fields:
+            parts.append(encode(getattr(message, name)))
+        return b"".join(parts)
+
+    def decode(self, buf: bytes, offset: int) -> BaseMessage:
+        """Decode a message body starting after the header"""
+        message = self.message_cls.__new__(self.message_cls)
+        values = message.__dict__
+        values.update(zip(self.fixed_names, self.fixed_struct.unpack_from(buf, offset)))
+        offset += self.fixed_struct.size
+        for name, _, decode in self.variable_fields:
+            values[name], offset = decode(buf, offset)
+        return message
+
+
+_SCHEMAS_BY_CLASS: Dict[type, MessageSchema] = {}
+_SCHEMAS_BY_ID: Dict[int, MessageSchema] = {}
+
+for _type_id, _message_cls in enumerate(MESSAGE_TYPES, start=1):
+    _schema = MessageSchema(_message_cls, _type_id)
+    _SCHEMAS_BY_CLASS[_message_cls] = _schema
+    _SCHEMAS_BY_ID[_type_id] = _schema
+
+
+def _read_header(payload: bytes) -> int:
+    """Validate the header and return the type ID"""
+    if len(payload) < _HEADER.size:
+        raise CodecError("Payload too short")
+    magic, version, type_id = _HEADER.unpack_from(payload, 0)
+    if magic != MAGIC:
+        raise CodecError("Not a binary codec payload")
+    if version != CODEC_VERSION:
+        raise CodecError(f"Unsupported codec version: {version}")
+    return type_id
+
+
+def is_binary_payload(payload: Any) -> bool:
+    """Check whether a payload was produced by this codec"""
+    return isinstance(payload, (bytes, bytearray, memoryview)) and bytes(payload[:2]) == MAGIC
+
+
+def encode_message(message: BaseMessage) -> bytes:
+    """
+    Encode a message_types dataclass.
+
+    Args:
+        message: Message to encode
+
+    Returns:
+        bytes: Binary payload
+    """
+    schema = _SCHEMAS_BY_CLASS.get(type(message))
+    if schema is None:
+        raise TypeError(f"No binary schema for {type(message).__name__}")
+    return schema.encode(message)
+
+
+def decode_message(payload: bytes) -> BaseMessage:
+    """
+    Decode a message_types dataclass.
+
+    Args:
+        payload: Binary payload
+
+    Returns:
+        BaseMessage: Decoded message
+    """
+    type_id = _read_header(payload)
+    schema = _SCHEMAS_BY_ID.get(type_id)
+    if schema is None:
+        raise CodecError(f"Unknown message type ID: {type_id}")
+    return schema.decode(payload, _HEADER.size)
+
+
+def _contains_message(value: Dict[Any, Any]) -> bool:
+    """Check whether a dict holds a message dataclass with a schema, at any depth"""
+    for item in value.values():
+        item_type = type(item)
+        if item_type in _SCHEMAS_BY_CLASS or (item_type is dict and _contains_message(item)):
+            return True
+    return False
+
+
+def _encode_value(value: Any) -> bytes:
+    """
+    Encode a value of envelope data, using the schema of message dataclasses.
+
+    Dicts holding messages are packed key by key so the messages can use their
+    schemas; other values are passed to _encode_any.
+    """
+    value_type = type(value)
+    schema = _SCHEMAS_BY_CLASS.get(value_type)
+    if schema is not None:
+        payload = schema.encode(value)
+        return bytes((_TAG_MESSAGE,)) + _pack_u32(len(payload)) + payload
+    if value_type is str:
+        return bytes((_TAG_STR,)) + _encode_str(value)
+    if value_type is dict and all(type(key) is str for key in value) and _contains_message(value):
+        parts = [bytes((_TAG_FIELDS,)), _pack_u32(len(value))]
+        for key, item in value.items():
+            parts.append(_encode_str(key))
+            parts.append(_encode_value(item))
+        return b"".join(parts)
+    return _encode_any(value)
+
+
+_ENVELOPE_HEADER = _HEADER.pack(MAGIC, CODEC_VERSION, ENVELOPE_TYPE_ID)
+_encode_target, _decode_target = _optional(_encode_str, _decode_str)
+
+
+def _format_uuid(raw_id: bytes) -> str:
+    """Format 16 raw bytes as a canonical UUID string"""
+    h = raw_id.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def pack_envelope(
+    message_id: str,
+    message_type: str,
+    source_id: str,
+    target_id: Optional[str],
+    priority: int,
+    timestamp: float,
+    data: Dict[str, Any]
+) -> bytes:
+    """
+    Encode the fields of a ROS2Message envelope.
+
+    Canonical (lowercase, hyphenated) UUID message IDs are packed as their 16 raw bytes.
+    Message dataclasses in data are packed with their schemas and decoded as
+    dataclasses again.
+
+    Returns:
+        bytes: Binary payload
+    """
+    raw_id = None
+    if len(message_id) == 36 and message_id[8] == message_id[13] == message_id[18] == message_id[23] == "-":
+        try:
+            raw_id = bytes.fromhex(message_id.replace("-", ""))
+        except ValueError:
+            pass
+        if raw_id is not None and _format_uuid(raw_id) != message_id:
+            raw_id = None
+
+    return b"".join((
+        _ENVELOPE_HEADER,
+        b"\x00" + raw_id if raw_id is not None else b"\x01" + _encode_str(message_id),
+        _ENVELOPE_FIXED.pack(priority, timestamp),
+        _encode_str(message_type),
+        _encode_str(source_id),
+        _encode_target(target_id),
+        _encode_value(data)
+    ))
+
+
+def unpack_envelope(payload: bytes) -> Tuple[str, str, str, Optional[str], int, float, Dict[str, Any]]:
+    """
+    Decode the fields of a ROS2Message envelope.
+
+    Args:
+        payload: Binary payload
+
+    Returns:
+        Tuple: (message_id, message_type, source_id, target_id, priority, timestamp, data)
+    """
+    if _read_header(payload) != ENVELOPE_TYPE_ID:
+        raise CodecError("Payload is not a ROS2Message envelope")
+
+    offset = _HEADER.size
+    if payload[offset] == 0:
+        message_id = _format_uuid(payload[offset + 1:offset + 17])
+        offset += 17
+    else:
+        message_id, offset = _decode_str(payload, offset + 1)
+
+    priority, timestamp = _ENVELOPE_FIXED.unpack_from(payload, offset)
+    offset += _ENVELOPE_FIXED.size
+    message_type, offset = _decode_str(payload, offset)
+    source_id, offset = _decode_str(payload, offset)
+    target_id, offset = _decode_target(payload, offset)
+    data, offset = _decode_any(payload, offset)
+
+    return message_id, message_type, source_id, target_id, priority, timestamp, data
@@ -5,10 +5,10 @@ This module provides a high-level interface for micro-robot components
 to communicate with each other using ROS2.
 """
 
+import copy
 import time
 import logging
 import threading
-import queue
 from typing import Dict, List, Any, Optional, Callable, Union, Tuple
 from enum import Enum
 
@@ -23,6 +23,7 @@ from ros2_integration.message_types import (
     CoordinationMessage, SimulationControl, PhysicalProperties,
     PowerState, ErrorMessage
 )
+from ros2_integration.task_executor import TaskExecutor, WorkItem, CostModel
 
 # Set up logging
 logging.basicConfig(
@@ -59,7 +60,9 @@ class ComponentInterface:
         component_id: str,
         component_type: ComponentType,
         bridge: Optional[ROS2Bridge] = None,
-        initial_state: Optional[Dict[str, Any]] = None
+        initial_state: Optional[Dict[str, Any]] = None,
+        num_workers: int = 1,
+        cost_models: Optional[Dict[str, CostModel]] = None
     ):
         """
         Initialize component interface.
@@ -69,6 +72,9 @@ class ComponentInterface:
             component_type: Component type
             bridge: ROS2 bridge (created if not provided)
             initial_state: Initial component state
+            num_workers: Number of worker threads executing queued tasks (state updates
+                         are serialized by state_lock)
+            cost_models: Simulated execution time per task kind ("motion", a task type, or "default")
         """
         self.component_id = component_id
         self.component_type = component_type
@@ -80,7 +86,8 @@ class ComponentInterface:
             bridge=bridge
         )
         
-        # Component state
+        # Component state; handlers on the executor's workers update it concurrently
+        self.state_lock = threading.RLock()
         self.state = ComponentState(
             component_id=component_id,
             component_type=component_type.value,
@@ -96,8 +103,13 @@ class ComponentInterface:
         # Connected components
         self.connected_components = {}
         
-        # Task queue
-        self.task_queue = queue.PriorityQueue()
+        # Task executor
+        self.executor = TaskExecutor(
+            self._execute_task,
+            num_workers=num_workers,
+            cost_models=cost_models,
+            name=f"{component_id}-executor"
+        )
         
         # Callback handlers
         self.motion_callbacks = []
@@ -112,9 +124,6 @@ class ComponentInterface:
         
         # Status
         self.status = ComponentStatus.INITIALIZING
-        
-        # Processing thread
-        self.processing_thread = None
         self.running = False
         
         logger.info(f"Initialized ComponentInterface for {component_type.value} {component_id}")
@@ -155,10 +164,7 @@ class ComponentInterface:
             motion_command = MotionCommand(**params)
             
             # Add to task queue
-            self.task_queue.put((
-                message.priority.value,
-                ("motion", motion_command, message.timestamp)
-            ))
+            self.queue_motion(motion_command, message.priority.value)
             
             # Notify callbacks
             for callback in self.motion_callbacks:
@@ -168,8 +174,9 @@ class ComponentInterface:
                     logger.error(f"Error in motion callback: {e}")
             
             # Update state
-            self.state.status = "moving"
-            self.state.timestamp = time.time()
+            with self.state_lock:
+                self.state.status = "moving"
+                self.state.timestamp = time.time()
             
             # Broadcast state update
             self._broadcast_state()
@@ -190,12 +197,13 @@ class ComponentInterface:
         
         try:
             # Update state with configuration
-            for key, value in params.items():
-                if hasattr(self.state, key):
-                    setattr(self.state, key, value)
-            
-            # Update timestamp
-            self.state.timestamp = time.time()
+            with self.state_lock:
+                for key, value in params.items():
+                    if hasattr(self.state, key):
+                        setattr(self.state, key, value)
+                
+                # Update timestamp
+                self.state.timestamp = time.time()
             
             # Broadcast state update
             self._broadcast_state()
@@ -252,10 +260,7 @@ class ComponentInterface:
             # Check if this component is assigned
             if self.component_id in task_assignment.assigned_components:
                 # Add to task queue
-                self.task_queue.put((
-                    task_assignment.priority,
-                    ("task", task_assignment, message.timestamp)
-                ))
+                self.queue_task(task_assignment)
                 
                 # Notify callbacks
                 for callback in self.task_callbacks:
@@ -265,8 +270,9 @@ class ComponentInterface:
                         logger.error(f"Error in task callback: {e}")
                 
                 # Update state
-                self.state.status = "task_assigned"
-                self.state.timestamp = time.time()
+                with self.state_lock:
+                    self.state.status = "task_assigned"
+                    self.state.timestamp = time.time()
                 
                 # Broadcast state update
                 self._broadcast_state()
@@ -285,6 +291,10 @@ class ComponentInterface:
         """
         logger.debug(f"Received state telemetry from {message.source_id}")
         
+        # State broadcasts reach every subscriber, including the sender
+        if message.source_id == self.component_id:
+            return
+        
         try:
             # Parse component state
             component_state = ComponentState.from_dict(values)
@@ -424,14 +434,15 @@ class ComponentInterface:
                     relative_offset = params.get("relative_offset", [0.0, 0.0, 0.0])
                     
                     # Update position with offset
-                    self.state.position = [
-                        source_state.position[0] + relative_offset[0],
-                        source_state.position[1] + relative_offset[1],
-                        source_state.position[2] + relative_offset[2]
-                    ]
-                    
-                    # Update timestamp
-                    self.state.timestamp = time.time()
+                    with self.state_lock:
+                        self.state.position = [
+                            source_state.position[0] + relative_offset[0],
+                            source_state.position[1] + relative_offset[1],
+                            source_state.position[2] + relative_offset[2]
+                        ]
+                        
+                        # Update timestamp
+                        self.state.timestamp = time.time()
                     
                     # Broadcast state update
                     self._broadcast_state()
@@ -603,14 +614,12 @@ class ComponentInterface:
                     )
                     
                     # Add to task queue
-                    self.task_queue.put((
-                        MessagePriority.NORMAL.value,
-                        ("motion", motion_command, time.time())
-                    ))
+                    self.queue_motion(motion_command, MessagePriority.NORMAL.value)
                     
                     # Update state
-                    self.state.status = "moving"
-                    self.state.timestamp = time.time()
+                    with self.state_lock:
+                        self.state.status = "moving"
+                        self.state.timestamp = time.time()
                     
                     # Broadcast state update
                     self._broadcast_state()
@@ -618,13 +627,30 @@ class ComponentInterface:
             logger.error(f"Error handling formation coordination: {e}")
             self._report_error(f"formation_error", str(e))
     
+    def _state_snapshot(self) -> ComponentState:
+        """
+        Copy the state for sending, without converting it to a dict.
+        
+        List fields are copied too, so later state updates do not show in
+        messages already sent.
+        
+        Returns:
+            ComponentState: Copy of the component state
+        """
+        with self.state_lock:
+            snapshot = copy.copy(self.state)
+            for name, value in list(vars(snapshot).items()):
+                if type(value) is list:
+                    setattr(snapshot, name, list(value))
+        return snapshot
+    
     def _broadcast_state(self):
         """Broadcast component state to all components"""
         try:
             # Send telemetry message with current state
             self.communicator.send_telemetry(
                 telemetry_type="state",
-                values=self.state.to_dict()
+                values=self._state_snapshot()
             )
             
             logger.debug(f"Broadcasted state update")
@@ -642,7 +668,7 @@ class ComponentInterface:
             # Send telemetry message with current state
             self.communicator.send_telemetry(
                 telemetry_type="state",
-                values=self.state.to_dict(),
+                values=self._state_snapshot(),
                 target_id=target_id
             )
             
@@ -725,7 +751,7 @@ class ComponentInterface:
                 action="group_state_update",
                 params={
                     "group_id": group_id,
-                    "state": self.state.to_dict()
+                    "state": self._state_snapshot()
                 }
             )
             
@@ -786,14 +812,12 @@ class ComponentInterface:
             )
             
             # Add to task queue
-            self.task_queue.put((
-                task.priority,
-                ("task", task, time.time())
-            ))
+            self.queue_task(task)
             
             # Update state
-            self.state.status = "task_assigned"
-            self.state.timestamp = time.time()
+            with self.state_lock:
+                self.state.status = "task_assigned"
+                self.state.timestamp = time.time()
             
             # Broadcast state update
             self._broadcast_state()
@@ -847,13 +871,14 @@ class ComponentInterface:
             # Send telemetry message with error
             self.communicator.send_telemetry(
                 telemetry_type="error",
-                values=error.to_dict()
+                values=error
             )
             
             # Update state
             if severity == "critical":
-                self.state.status = "error"
-                self.state.timestamp = time.time()
+                with self.state_lock:
+                    self.state.status = "error"
+                    self.state.timestamp = time.time()
                 
                 # Broadcast state update
                 self._broadcast_state()
@@ -902,58 +927,92 @@ class ComponentInterface:
         # This method should be overridden by subclasses
         return ["telemetry", "command", "coordination"]
     
-    def _process_tasks(self):
-        """Process tasks in the queue"""
-        while self.running:
-            try:
-                # Get next task (non-blocking)
-                try:
-                    priority, (task_type, task_data, timestamp) = self.task_queue.get(block=False)
-                except queue.Empty:
-                    # No tasks, sleep and continue
-                    time.sleep(0.01)
-                    continue
-                
-                # Process task
-                if task_type == "motion":
-                    self._process_motion_task(task_data)
-                elif task_type == "task":
-                    self._process_general_task(task_data)
-                
-                # Mark task as done
-                self.task_queue.task_done()
-            except Exception as e:
-                logger.error(f"Error processing tasks: {e}")
-    
-    def _process_motion_task(self, motion_command: MotionCommand):
+    def queue_motion(self, motion_command: MotionCommand, priority: int = MessagePriority.NORMAL.value) -> WorkItem:
         """
-        Process a motion task.
+        Queue a motion command for execution.
         
         Args:
             motion_command: Motion command
+            priority: Priority (higher runs first)
+            
+        Returns:
+            WorkItem: The queued item
         """
-        # This method should be overridden by subclasses
-        logger.debug(f"Processing motion task: {motion_command}")
+        return self.executor.submit("motion", motion_command, priority)
+    
+    def queue_task(self, task: TaskAssignment) -> WorkItem:
+        """
+        Queue a task assignment for execution.
         
-        # Simulate motion
-        time.sleep(0.5)
+        The task type selects the cost model, and the task deadline is tracked.
         
-        # Update state
-        if motion_command.target_position:
-            self.state.position = motion_command.target_position
+        Args:
+            task: Task assignment
+            
+        Returns:
+            WorkItem: The queued item
+        """
+        return self.executor.submit(task.task_type, task, task.priority, task.deadline)
+    
+    def set_cost_model(self, kind: str, model: CostModel):
+        """
+        Set the simulated execution time for a task kind.
         
-        if motion_command.target_orientation:
-            self.state.orientation = motion_command.target_orientation
+        Args:
+            kind: "motion", a task type, or "default"
+            model: Cost model (payload -> seconds)
+        """
+        self.executor.set_cost_model(kind, model)
+    
+    def get_executor_stats(self) -> Dict[str, Any]:
+        """
+        Get task execution statistics.
+        
+        Returns:
+            Dict[str, Any]: Queue length, preemptions, and per-kind throughput, latency and deadline misses
+        """
+        return self.executor.get_stats()
+    
+    def _execute_task(self, item: WorkItem):
+        """
+        Complete a task once the executor has paid its cost.
         
-        if motion_command.target_velocity:
-            self.state.velocity = motion_command.target_velocity
+        Args:
+            item: Executed work item
+        """
+        if isinstance(item.payload, MotionCommand):
+            self._process_motion_task(item.payload)
+        else:
+            self._process_general_task(item.payload)
+    
+    def _process_motion_task(self, motion_command: MotionCommand):
+        """
+        Process a motion task.
         
-        if motion_command.target_angular_velocity:
-            self.state.angular_velocity = motion_command.target_angular_velocity
+        Args:
+            motion_command: Motion command
+        """
+        # This method should be overridden by subclasses; the simulated
+        # duration of the motion comes from the executor's cost model
+        logger.debug(f"Processing motion task: {motion_command}")
         
-        # Update status and timestamp
-        self.state.status = "idle"
-        self.state.timestamp = time.time()
+        # Update state
+        with self.state_lock:
+            if motion_command.target_position:
+                self.state.position = motion_command.target_position
+            
+            if motion_command.target_orientation:
+                self.state.orientation = motion_command.target_orientation
+            
+            if motion_command.target_velocity:
+                self.state.velocity = motion_command.target_velocity
+            
+            if motion_command.target_angular_velocity:
+                self.state.angular_velocity = motion_command.target_angular_velocity
+            
+            # Update status and timestamp
+            self.state.status = "idle"
+            self.state.timestamp = time.time()
         
         # Broadcast state update
         self._broadcast_state()
@@ -965,18 +1024,17 @@ class ComponentInterface:
         Args:
             task: Task assignment
         """
-        # This method should be overridden by subclasses
+        # This method should be overridden by subclasses; the simulated
+        # duration of the task comes from the executor's cost model
         logger.debug(f"Processing general task: {task.task_id}")
         
-        # Simulate task execution
-        time.sleep(1.0)
-        
         # Update task status
         task.status = "completed"
         
         # Update component state
-        self.state.status = "idle"
-        self.state.timestamp = time.time()
+        with self.state_lock:
+            self.state.status = "idle"
+            self.state.timestamp = time.time()
         
         # Broadcast state update
         self._broadcast_state()
@@ -1071,6 +1129,9 @@ class ComponentInterface:
         Args:
             component_id: Target component ID
         """
+        # Listen for the target's telemetry so its state reply reaches us
+        self.communicator.subscribe_to_component(component_id)
+        
         # Send query command to get component state
         self.send_command(
             target_id=component_id,
@@ -1085,11 +1146,12 @@ class ComponentInterface:
             self.connected_components[component_id] = None
             
             # Update state
-            if component_id not in self.state.connected_components:
-                self.state.connected_components.append(component_id)
-            
-            # Update timestamp
-            self.state.timestamp = time.time()
+            with self.state_lock:
+                if component_id not in self.state.connected_components:
+                    self.state.connected_components.append(component_id)
+                
+                # Update timestamp
+                self.state.timestamp = time.time()
             
             # Broadcast state update
             self._broadcast_state()
@@ -1106,11 +1168,12 @@ class ComponentInterface:
             del self.connected_components[component_id]
             
             # Update state
-            if component_id in self.state.connected_components:
-                self.state.connected_components.remove(component_id)
-            
-            # Update timestamp
-            self.state.timestamp = time.time()
+            with self.state_lock:
+                if component_id in self.state.connected_components:
+                    self.state.connected_components.remove(component_id)
+                
+                # Update timestamp
+                self.state.timestamp = time.time()
             
             # Broadcast state update
             self._broadcast_state()
@@ -1173,7 +1236,7 @@ class ComponentInterface:
         # Send telemetry
         return self.communicator.send_telemetry(
             telemetry_type="sensor",
-            values=sensor_data.to_dict(),
+            values=sensor_data,
             target_id=target_id,
             priority=priority
         )
@@ -1214,7 +1277,7 @@ class ComponentInterface:
             coordination_type="task_distribution",
             action="task_offer",
             params={
-                "task": task.to_dict()
+                "task": task
             },
             target_id=None  # Broadcast
         )
@@ -1254,16 +1317,15 @@ class ComponentInterface:
         # Start communicator
         self.communicator.start()
         
-        # Start processing thread
+        # Start task executor
         self.running = True
-        self.processing_thread = threading.Thread(target=self._process_tasks)
-        self.processing_thread.daemon = True
-        self.processing_thread.start()
+        self.executor.start()
         
         # Update state
-        self.state.status = "ready"
-        self.state.active = True
-        self.state.timestamp = time.time()
+        with self.state_lock:
+            self.state.status = "ready"
+            self.state.active = True
+            self.state.timestamp = time.time()
         
         # Broadcast initial state
         self._broadcast_state()
@@ -1275,15 +1337,15 @@ class ComponentInterface:
         # Set status to disconnected
         self.status = ComponentStatus.DISCONNECTED
         
-        # Stop processing thread
+        # Stop task executor
         self.running = False
-        if self.processing_thread:
-            self.processing_thread.join(timeout=1.0)
+        self.executor.stop(timeout=1.0)
         
         # Update state
-        self.state.status = "disconnected"
-        self.state.active = False
-        self.state.timestamp = time.time()
+        with self.state_lock:
+            self.state.status = "disconnected"
+            self.state.active = False
+            self.state.timestamp = time.time()
         
         # Broadcast final state
         self._broadcast_state()
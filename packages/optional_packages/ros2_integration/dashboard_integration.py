@@ -27,6 +27,7 @@ from ros2_integration.message_types import (
     PowerState, ErrorMessage
 )
 from ros2_integration.component_interface import ComponentStatus
+from ros2_integration.message_history import MessageHistory, DEFAULT_TOPIC_CAPACITY
 
 # Set up logging
 logging.basicConfig(
@@ -43,7 +44,14 @@ logger = logging.getLogger(__name__)
 class ROS2DashboardIntegration:
     """Integration of ROS2 with the visualization dashboard"""
     
-    def __init__(self, parent_frame, dashboard=None, status_callback=None):
+    def __init__(
+        self,
+        parent_frame,
+        dashboard=None,
+        status_callback=None,
+        history_capacity: int = DEFAULT_TOPIC_CAPACITY,
+        history_spill_path: Optional[str] = None
+    ):
         """
         Initialize ROS2 dashboard integration.
         
@@ -51,6 +59,8 @@ class ROS2DashboardIntegration:
             parent_frame: The tkinter frame to add the ROS2 UI to
             dashboard: Optional reference to the main dashboard
             status_callback: Optional callback for status updates
+            history_capacity: Messages kept in memory per component and message type
+            history_spill_path: File all messages are also logged to for replay (None to disable)
         """
         self.parent = parent_frame
         self.dashboard = dashboard
@@ -69,8 +79,11 @@ class ROS2DashboardIntegration:
         self.message_list = None
         self.status_label = None
         
-        # Message history
-        self.message_history = []
+        # Message history (bounded per topic) and the number of messages displayed
+        self.message_history = MessageHistory(
+            capacity_per_topic=history_capacity,
+            spill_path=history_spill_path
+        )
         self.max_history_size = 100
         
         # Task queue for background operations
@@ -610,28 +623,15 @@ class ROS2DashboardIntegration:
             message_type: Message type
             content: Message content
         """
-        # Create message entry
-        message_entry = {
-            "component_id": component_id,
-            "type": message_type,
-            "content": content,
-            "timestamp": time.time()
-        }
-        
-        # Add to history
-        self.message_history.append(message_entry)
-        
-        # Trim history if needed
-        if len(self.message_history) > self.max_history_size:
-            self.message_history = self.message_history[-self.max_history_size:]
+        self.message_history.append(component_id, message_type, content)
     
     def _update_message_list(self):
         """Update the message list in the UI"""
         # Clear list
         self.message_list.delete(0, tk.END)
         
-        # Add messages in reverse order (newest first)
-        for message in reversed(self.message_history):
+        # Add the visible window of messages (newest first)
+        for message in self.message_history.query(limit=self.max_history_size):
             timestamp = time.strftime("%H:%M:%S", time.localtime(message["timestamp"]))
             self.message_list.insert(
                 tk.END,
@@ -753,13 +753,12 @@ class ROS2DashboardIntegration:
         messages_list = tk.Listbox(messages_frame)
         messages_list.pack(fill=tk.BOTH, expand=True)
         
-        for message in reversed(self.message_history):
-            if message["component_id"] == component_id:
-                timestamp = time.strftime("%H:%M:%S", time.localtime(message["timestamp"]))
-                messages_list.insert(
-                    tk.END,
-                    f"{timestamp} | {message['type']} | {message['content']}"
-                )
+        for message in self.message_history.query(component_id=component_id, limit=self.max_history_size):
+            timestamp = time.strftime("%H:%M:%S", time.localtime(message["timestamp"]))
+            messages_list.insert(
+                tk.END,
+                f"{timestamp} | {message['type']} | {message['content']}"
+            )
         
         # Close button
         ttk.Button(
@@ -1203,6 +1202,13 @@ class ROS2DashboardIntegration:
         message_tree.column("Type", width=100)
         message_tree.column("Content", width=400)
         
+        # Message rate for the current filter
+        rate_label = ttk.Label(frame, text="")
+        rate_label.pack(anchor=tk.W, pady=(5, 0))
+        
+        # Messages currently displayed, newest first
+        displayed_messages = []
+        
         # Function to update message list based on filters
         def update_messages():
             # Clear treeview
@@ -1214,27 +1220,28 @@ class ROS2DashboardIntegration:
             type_filter = type_var.get()
             limit_filter = limit_var.get()
             
-            # Get messages to display
-            messages = list(self.message_history)
+            component_id_filter = None if component_filter == "All" else component_filter
+            message_type_filter = None if type_filter == "All" else type_filter
             
-            # Apply component filter
-            if component_filter != "All":
-                messages = [m for m in messages if m["component_id"] == component_filter]
-            
-            # Apply type filter
-            if type_filter != "All":
-                messages = [m for m in messages if m["type"] == type_filter]
-            
-            # Apply limit filter
+            limit = None
             if limit_filter != "All":
                 try:
                     limit = int(limit_filter)
-                    messages = messages[-limit:]
                 except ValueError:
                     pass
             
+            # Get only the messages to display, newest first
+            displayed_messages[:] = self.message_history.query(
+                component_id=component_id_filter,
+                message_type=message_type_filter,
+                limit=limit
+            )
+            
+            rate = self.message_history.get_rate(component_id_filter, message_type_filter)
+            rate_label.config(text=f"Rate: {rate:.1f} messages/s (last 10 s)")
+            
             # Add messages to treeview (newest first)
-            for i, message in enumerate(reversed(messages)):
+            for i, message in enumerate(displayed_messages):
                 timestamp = time.strftime("%H:%M:%S", time.localtime(message["timestamp"]))
                 message_tree.insert(
                     "",
@@ -1276,20 +1283,8 @@ class ROS2DashboardIntegration:
             try:
                 idx = int(msg_id[4:])
                 
-                # Get filtered messages
-                component_filter = component_var.get()
-                type_filter = type_var.get()
-                
-                messages = list(self.message_history)
-                
-                if component_filter != "All":
-                    messages = [m for m in messages if m["component_id"] == component_filter]
-                
-                if type_filter != "All":
-                    messages = [m for m in messages if m["type"] == type_filter]
-                
                 # Get selected message
-                message = list(reversed(messages))[idx]
+                message = displayed_messages[idx]
                 
                 # Create details dialog
                 details_dialog = tk.Toplevel(dialog)
@@ -1401,6 +1396,9 @@ class ROS2DashboardIntegration:
                 bridge.stop()
             except Exception as e:
                 logger.error(f"Error stopping bridge for {component_id}: {e}")
+        
+        # Close the message history spill file
+        self.message_history.close()
 
 
 # Helper function to create and integrate the ROS2 tab with the dashboard
@@ -0,0 +1,440 @@
+"""
+Load Harness for ROS2 Integration
+
+This module drives the ROS2 integration layer headlessly under synthetic load.
+N ComponentInterfaces share one mock ROS2 bridge. They publish:
+
+- ComponentState statements, through StatementPublisher/RoleScopeReceiver
+  (role-scoped to a monitor component)
+- SensorData telemetry, through ComponentInterface.send_sensor_data
+- MotionCommand commands to a neighbouring component, executed by its task
+  executor
+
+Published traffic can be recorded to a JSON-lines trace and replayed later with
+the same messages, order and timing, so runs on different commits see identical
+load. Each run reports throughput, p50/p95/p99 latency, dropped messages and
+process CPU time.
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import threading
+from typing import Dict, List, Any, Optional
+
+from ros2_integration.ros2_bridge import ROS2Bridge, MessagePriority
+from ros2_integration.message_types import ComponentType, ComponentState
+from ros2_integration.component_interface import ComponentInterface
+from ros2_integration.task_executor import fixed_cost
+from ros2_integration.pub_sub_patterns import StatementPublisher, RoleScopeReceiver, CommunicationPattern
+
+logger = logging.getLogger(__name__)
+
+# Constants
+TRACE_FORMAT = "ros2-traffic"
+TRACE_VERSION = 1
+MESSAGE_KINDS = ("state", "sensor", "motion")
+MONITOR_ROLE = "monitor"
+STATEMENT_TYPE = "swarm_state"
+STATEMENT_CONTEXT = "load_harness"
+DEFAULT_DRAIN_TIMEOUT = 5.0  # seconds to wait for in-flight messages after the last publish
+
+
+def synthesize_traffic(
+    components: int = 20,
+    duration: float = 5.0,
+    state_rate: float = 10.0,
+    sensor_rate: float = 20.0,
+    motion_rate: float = 2.0,
+    seed: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Generate a deterministic traffic schedule.
+
+    Args:
+        components: Number of components
+        duration: Length of the schedule in seconds
+        state_rate: ComponentState statements per second per component
+        sensor_rate: SensorData messages per second per component
+        motion_rate: MotionCommands per second per component
+        seed: Random seed
+
+    Returns:
+        List[Dict[str, Any]]: Events (offset, kind, source, target, data), ordered by offset
+    """
+    rng = random.Random(seed)
+    component_ids = [f"sphere{i}" for i in range(components)]
+    events = []
+
+    for index, source in enumerate(component_ids):
+        for kind, rate in (("state", state_rate), ("sensor", sensor_rate), ("motion", motion_rate)):
+            if rate <= 0:
+                continue
+            interval = 1.0 / rate
+            # Random phase so components do not publish in lockstep
+            offset = rng.uniform(0.0, interval)
+            while offset < duration:
+                event = {"t": round(offset, 6), "kind": kind, "source": source, "target": None}
+                if kind == "state":
+                    event["data"] = {
+                        "position": [rng.uniform(-10, 10) for _ in range(3)],
+                        "velocity": [rng.uniform(-1, 1) for _ in range(3)],
+                        "battery_level": rng.uniform(20, 100)
+                    }
+                elif kind == "sensor":
+                    event["data"] = {
+                        "sensor_id": f"{source}_imu",
+                        "sensor_type": "acceleration",
+                        "values": {axis: rng.gauss(0.0, 1.0) for axis in ("x", "y", "z")}
+                    }
+                else:
+                    event["target"] = component_ids[(index + 1) % components]
+                    event["data"] = {
+                        "target_position": [rng.uniform(-10, 10) for _ in range(3)],
+                        "motion_type": "linear"
+                    }
+                events.append(event)
+                offset += interval
+
+    events.sort(key=lambda event: (event["t"], event["source"], event["kind"]))
+    return events
+
+
+class TrafficRecorder:
+    """Writes published events to a JSON-lines trace"""
+
+    def __init__(self, path: str, components: List[str], config: Dict[str, Any]):
+        """
+        Initialize the recorder.
+
+        Args:
+            path: Trace file path
+            components: Component IDs in the run
+            config: Run configuration stored in the trace header
+        """
+        trace_dir = os.path.dirname(path)
+        if trace_dir:
+            os.makedirs(trace_dir, exist_ok=True)
+        self.path = path
+        self.file = open(path, "w")
+        self.file.write(json.dumps({
+            "format": TRACE_FORMAT,
+            "version": TRACE_VERSION,
+            "components": components,
+            "config": config
+        }) + "\n")
+        self.events_recorded = 0
+
+    def record(self, event: Dict[str, Any], offset: float):
+        """
+        Record a published event.
+
+        Args:
+            event: Event as published
+            offset: Actual publish time relative to the start of the run (seconds)
+        """
+        self.file.write(json.dumps({**event, "t": round(offset, 6)}) + "\n")
+        self.events_recorded += 1
+
+    def close(self):
+        """Close the trace file"""
+        self.file.close()
+
+
+def load_trace(path: str) -> Dict[str, Any]:
+    """
+    Load a recorded trace.
+
+    Args:
+        path: Trace file path
+
+    Returns:
+        Dict[str, Any]: Trace header with its events under "events"
+
+    Raises:
+        ValueError: If the file is not a traffic trace
+    """
+    with open(path) as f:
+        header = json.loads(f.readline())
+        if header.get("format") != TRACE_FORMAT or header.get("version") != TRACE_VERSION:
+            raise ValueError(f"Not a traffic trace: {path}")
+        header["events"] = [json.loads(line) for line in f if line.strip()]
+    return header
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Get a percentile from sorted values (nearest rank)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class LoadHarness:
+    """Runs a traffic schedule against ComponentInterfaces on a mock bridge"""
+
+    def __init__(self, component_ids: List[str], num_workers: int = 1):
+        """
+        Initialize the harness.
+
+        Args:
+            component_ids: Components to create; the first one is the monitor receiving state statements
+            num_workers: Task executor workers per component
+        """
+        self.component_ids = component_ids
+        self.num_workers = num_workers
+
+        # Delivery latencies in seconds per message kind
+        self.latencies: Dict[str, List[float]] = {kind: [] for kind in MESSAGE_KINDS}
+        self.sent = {kind: 0 for kind in MESSAGE_KINDS}
+        self.failed = {kind: 0 for kind in MESSAGE_KINDS}
+        self.received_condition = threading.Condition()
+        self.received_total = 0
+
+        self.bridge: Optional[ROS2Bridge] = None
+        self.components: Dict[str, ComponentInterface] = {}
+        self.statement_publishers: Dict[str, StatementPublisher] = {}
+
+    def _record_receipt(self, kind: str, sent_at: float):
+        """Record a received harness message"""
+        latency = time.time() - sent_at
+        with self.received_condition:
+            self.latencies[kind].append(latency)
+            self.received_total += 1
+            self.received_condition.notify_all()
+
+    def _timed_motion_handler(self, handler):
+        """Wrap a component's motion command handler to measure delivery latency"""
+        def timed_handler(command, params, message):
+            self._record_receipt("motion", message.timestamp)
+            handler(command, params, message)
+        return timed_handler
+
+    def setup(self):
+        """Create the bridge, components, statement publishers and receivers"""
+        self.bridge = ROS2Bridge("load_harness", use_mock=True)
+        zero_cost = {"motion": fixed_cost(0.0), "default": fixed_cost(0.0)}
+
+        for component_id in self.component_ids:
+            component = ComponentInterface(
+                component_id, ComponentType.SPHERE, self.bridge,
+                num_workers=self.num_workers, cost_models=zero_cost
+            )
+            component.register_sensor_callback(
+                lambda source_id, sensor_data: self._record_receipt("sensor", sensor_data.timestamp)
+            )
+            handlers = component.communicator.command_handlers
+            handlers["motion"] = self._timed_motion_handler(handlers["motion"])
+            self.components[component_id] = component
+
+            self.statement_publishers[component_id] = StatementPublisher(
+                component.communicator, STATEMENT_TYPE, STATEMENT_CONTEXT,
+                pattern=CommunicationPattern.ROLE_SCOPE_FOCUSED
+            )
+
+        monitor = self.components[self.component_ids[0]]
+        RoleScopeReceiver(
+            communicator=monitor.communicator,
+            statement_type=STATEMENT_TYPE,
+            context_topic=STATEMENT_CONTEXT,
+            statement_handler=lambda source_id, state: self._record_receipt("state", state.timestamp),
+            statement_class=ComponentState,
+            role_in_formation=MONITOR_ROLE,
+            pattern=CommunicationPattern.ROLE_SCOPE_FOCUSED
+        )
+
+        self.bridge.start()
+        for component in self.components.values():
+            component.start()
+
+    def teardown(self):
+        """Stop the components and the bridge"""
+        for component in self.components.values():
+            component.stop()
+        if self.bridge:
+            self.bridge.stop()
+
+    def _publish(self, event: Dict[str, Any]) -> bool:
+        """Publish one event, stamping it with the current time"""
+        source = event["source"]
+        data = event["data"]
+
+        if event["kind"] == "state":
+            state = ComponentState(
+                component_id=source, component_type="sphere",
+                position=data["position"], velocity=data["velocity"],
+                battery_level=data["battery_level"], status="moving", timestamp=time.time()
+            )
+            return self.statement_publishers[source].make_statement(state, target_role=MONITOR_ROLE)
+
+        if event["kind"] == "sensor":
+            return self.components[source].send_sensor_data(
+                data["sensor_id"], data["sensor_type"], data["values"]
+            )
+
+        return self.components[source].send_command(
+            event["target"], "motion", data, priority=MessagePriority.NORMAL
+        )
+
+    def run(
+        self,
+        events: List[Dict[str, Any]],
+        speed: float = 1.0,
+        recorder: Optional[TrafficRecorder] = None,
+        drain_timeout: float = DEFAULT_DRAIN_TIMEOUT
+    ) -> Dict[str, Any]:
+        """
+        Publish events on schedule and measure their delivery.
+
+        Args:
+            events: Events ordered by offset
+            speed: Replay speed multiplier (2.0 publishes twice as fast)
+            recorder: Recorder for the published traffic
+            drain_timeout: Seconds to wait for in-flight messages after the last publish
+
+        Returns:
+            Dict[str, Any]: Throughput, latency percentiles, dropped messages and CPU usage
+        """
+        cpu_start = os.times()
+        start = time.perf_counter()
+        max_lag = 0.0
+
+        for event in events:
+            due = start + event["t"] / speed
+            now = time.perf_counter()
+            if due > now:
+                time.sleep(due - now)
+            else:
+                max_lag = max(max_lag, now - due)
+
+            published_at = time.perf_counter() - start
+            if self._publish(event):
+                self.sent[event["kind"]] += 1
+            else:
+                self.failed[event["kind"]] += 1
+            if recorder:
+                recorder.record(event, published_at * speed)
+
+        publish_seconds = time.perf_counter() - start
+        expected = sum(self.sent.values())
+        with self.received_condition:
+            self.received_condition.wait_for(lambda: self.received_total >= expected, drain_timeout)
+        wall_seconds = time.perf_counter() - start
+        cpu_end = os.times()
+
+        kinds = {}
+        for kind in MESSAGE_KINDS:
+            with self.received_condition:
+                latencies = sorted(self.latencies[kind])
+            kinds[kind] = {
+                "sent": self.sent[kind],
+                "received": len(latencies),
+                "dropped": self.sent[kind] + self.failed[kind] - len(latencies),
+                "throughput": len(latencies) / wall_seconds if wall_seconds > 0 else 0.0,
+                "latency_ms": {
+                    "p50": _percentile(latencies, 0.50) * 1000,
+                    "p95": _percentile(latencies, 0.95) * 1000,
+                    "p99": _percentile(latencies, 0.99) * 1000,
+                    "max": (latencies[-1] if latencies else 0.0) * 1000
+                }
+            }
+
+        user_seconds = cpu_end.user - cpu_start.user
+        system_seconds = cpu_end.system - cpu_start.system
+        received = sum(kind["received"] for kind in kinds.values())
+
+        return {
+            "components": len(self.component_ids),
+            "events": len(events),
+            "publish_seconds": publish_seconds,
+            "wall_seconds": wall_seconds,
+            "throughput": received / wall_seconds if wall_seconds > 0 else 0.0,
+            "dropped": sum(kind["dropped"] for kind in kinds.values()),
+            "generator_max_lag_ms": max_lag * 1000,
+            "cpu": {
+                "user_seconds": user_seconds,
+                "system_seconds": system_seconds,
+                "percent": (user_seconds + system_seconds) / wall_seconds * 100 if wall_seconds > 0 else 0.0
+            },
+            "kinds": kinds
+        }
+
+
+def run_load(
+    components: int = 20,
+    duration: float = 5.0,
+    state_rate: float = 10.0,
+    sensor_rate: float = 20.0,
+    motion_rate: float = 2.0,
+    seed: int = 0,
+    num_workers: int = 1,
+    record_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run synthesized traffic, optionally recording it.
+
+    Args:
+        components: Number of components
+        duration: Seconds of traffic
+        state_rate: ComponentState statements per second per component
+        sensor_rate: SensorData messages per second per component
+        motion_rate: MotionCommands per second per component
+        seed: Random seed for the traffic schedule
+        num_workers: Task executor workers per component
+        record_path: Trace file to record the published traffic to (None to not record)
+
+    Returns:
+        Dict[str, Any]: Run configuration and measurements
+    """
+    config = {
+        "components": components,
+        "duration": duration,
+        "state_rate": state_rate,
+        "sensor_rate": sensor_rate,
+        "motion_rate": motion_rate,
+        "seed": seed,
+        "num_workers": num_workers
+    }
+    events = synthesize_traffic(components, duration, state_rate, sensor_rate, motion_rate, seed)
+    component_ids = [f"sphere{i}" for i in range(components)]
+
+    harness = LoadHarness(component_ids, num_workers)
+    recorder = TrafficRecorder(record_path, component_ids, config) if record_path else None
+    harness.setup()
+    try:
+        results = harness.run(events, recorder=recorder)
+    finally:
+        harness.teardown()
+        if recorder:
+            recorder.close()
+
+    return {"benchmark": "load", "config": config, "trace": record_path, **results}
+
+
+def run_replay(trace_path: str, speed: float = 1.0, num_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Replay a recorded trace.
+
+    Args:
+        trace_path: Trace file written by run_load
+        speed: Replay speed multiplier
+        num_workers: Task executor workers per component (None for the recorded setting)
+
+    Returns:
+        Dict[str, Any]: Run configuration and measurements
+    """
+    trace = load_trace(trace_path)
+    config = dict(trace["config"])
+    if num_workers is not None:
+        config["num_workers"] = num_workers
+
+    harness = LoadHarness(trace["components"], config.get("num_workers", 1))
+    harness.setup()
+    try:
+        results = harness.run(trace["events"], speed=speed)
+    finally:
+        harness.teardown()
+
+    return {"benchmark": "replay", "config": config, "trace": trace_path, "speed": speed, **results}
@@ -0,0 +1,364 @@
+"""
+Message History for ROS2 Dashboard Integration
+
+This module implements the bounded message history shown by the ROS2
+dashboard. Each topic (component and message type) keeps its own fixed-size
+ring buffer, a message counter, and per-interval message counts used for rates
+and charts. Queries merge only the entries that will be displayed, so a
+refresh costs O(visible window) however many messages have been seen.
+
+Messages can optionally be written through to a compact binary log, which
+replay_history() reads back. The log is appended to across restarts, so it
+holds the messages of every run.
+"""
+
+import os
+import math
+import time
+import heapq
+import struct
+import itertools
+import threading
+from collections import deque
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+# Constants
+DEFAULT_TOPIC_CAPACITY = 1000  # entries kept per topic
+DEFAULT_BUCKET_SECONDS = 1.0  # width of an aggregate bucket
+DEFAULT_BUCKET_COUNT = 600  # buckets kept per topic
+SPILL_MAGIC = b"GGMH"
+SPILL_VERSION = 1
+
+# Spill record: timestamp, sequence, then component ID, message type and content lengths
+_RECORD_HEADER = struct.Struct("<dQHHI")
+_FILE_HEADER = struct.Struct("<4sB")
+
+Topic = Tuple[str, str]
+
+
+class _TopicHistory:
+    """Ring buffer and counters for one topic"""
+
+    __slots__ = ("entries", "buckets", "total")
+
+    def __init__(self, capacity: int, bucket_count: int):
+        self.entries = deque(maxlen=capacity)
+        # [bucket index, message count], oldest first
+        self.buckets = deque(maxlen=bucket_count)
+        self.total = 0
+
+
+class MessageHistory:
+    """Per-topic ring buffers with rate counters and time-bucketed aggregates"""
+
+    def __init__(
+        self,
+        capacity_per_topic: int = DEFAULT_TOPIC_CAPACITY,
+        bucket_seconds: float = DEFAULT_BUCKET_SECONDS,
+        bucket_count: int = DEFAULT_BUCKET_COUNT,
+        spill_path: Optional[str] = None
+    ):
+        """
+        Initialize the message history.
+
+        Args:
+            capacity_per_topic: Entries kept in memory per topic
+            bucket_seconds: Width of an aggregate bucket in seconds
+            bucket_count: Aggregate buckets kept per topic
+            spill_path: File every message is also appended to (None to keep messages in memory only)
+        """
+        self.capacity_per_topic = capacity_per_topic
+        self.bucket_seconds = bucket_seconds
+        self.bucket_count = bucket_count
+        self.spill_path = spill_path
+
+        self.topics: Dict[Topic, _TopicHistory] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+        self._spill_file = None
+        if spill_path:
+            spill_dir = os.path.dirname(spill_path)
+            if spill_dir:
+                os.makedirs(spill_dir, exist_ok=True)
+            self._spill_file = self._open_spill(spill_path)
+
+    def _open_spill(self, path: str):
+        """
+        Open the spill file for appending.
+
+        A record cut short by a crash is truncated away, and sequence numbers
+        continue from the last record. A file that is not a spill file is kept
+        under a timestamped name and a new one is started.
+        """
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            try:
+                with open(path, "rb") as f:
+                    end = _FILE_HEADER.size
+                    last_seq = None
+                    for entry, end in _read_records(f, path):
+                        last_seq = entry["seq"]
+                spill_file = open(path, "r+b")
+                spill_file.truncate(end)
+                spill_file.seek(end)
+                if last_seq is not None:
+                    self._sequence = itertools.count(last_seq + 1)
+                return spill_file
+            except (ValueError, struct.error):
+                os.replace(path, f"{path}.{time.strftime('%Y%m%d-%H%M%S')}")
+
+        spill_file = open(path, "wb")
+        spill_file.write(_FILE_HEADER.pack(SPILL_MAGIC, SPILL_VERSION))
+        return spill_file
+
+    def append(self, component_id: str, message_type: str, content: str, timestamp: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Record a message.
+
+        Args:
+            component_id: Component ID
+            message_type: Message type
+            content: Message summary
+            timestamp: Message time (None for now)
+
+        Returns:
+            Dict[str, Any]: The stored entry
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        bucket = int(timestamp // self.bucket_seconds)
+
+        with self._lock:
+            entry = {
+                "component_id": component_id,
+                "type": message_type,
+                "content": content,
+                "timestamp": timestamp,
+                "seq": next(self._sequence)
+            }
+
+            topic = self.topics.get((component_id, message_type))
+            if topic is None:
+                topic = self.topics[(component_id, message_type)] = _TopicHistory(
+                    self.capacity_per_topic, self.bucket_count
+                )
+
+            topic.entries.append(entry)
+            topic.total += 1
+            if topic.buckets and topic.buckets[-1][0] == bucket:
+                topic.buckets[-1][1] += 1
+            else:
+                topic.buckets.append([bucket, 1])
+
+            if self._spill_file is not None:
+                self._write_record(entry)
+
+        return entry
+
+    def _write_record(self, entry: Dict[str, Any]):
+        """Append an entry to the spill file (caller holds the lock)"""
+        component_id = entry["component_id"].encode("utf-8")
+        message_type = entry["type"].encode("utf-8")
+        content = entry["content"].encode("utf-8")
+        self._spill_file.write(
+            _RECORD_HEADER.pack(entry["timestamp"], entry["seq"], len(component_id), len(message_type), len(content))
+        )
+        self._spill_file.write(component_id)
+        self._spill_file.write(message_type)
+        self._spill_file.write(content)
+
+    def _select_topics(self, component_id: Optional[str], message_type: Optional[str]) -> List[_TopicHistory]:
+        """Get the topics matching a filter (caller holds the lock)"""
+        if component_id is not None and message_type is not None:
+            topic = self.topics.get((component_id, message_type))
+            return [topic] if topic else []
+
+        return [
+            topic for (topic_component, topic_type), topic in self.topics.items()
+            if (component_id is None or topic_component == component_id)
+            and (message_type is None or topic_type == message_type)
+        ]
+
+    def query(
+        self,
+        component_id: Optional[str] = None,
+        message_type: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the most recent messages, newest first.
+
+        Args:
+            component_id: Only messages from this component (None for all)
+            message_type: Only messages of this type (None for all)
+            limit: Maximum number of messages (None for everything held in memory)
+
+        Returns:
+            List[Dict[str, Any]]: Message entries, newest first
+        """
+        with self._lock:
+            topics = self._select_topics(component_id, message_type)
+            if len(topics) == 1:
+                return list(itertools.islice(reversed(topics[0].entries), limit))
+
+            # Each buffer is already ordered, so merge lazily and stop at the limit
+            newest_first = heapq.merge(
+                *(reversed(topic.entries) for topic in topics),
+                key=lambda entry: entry["seq"],
+                reverse=True
+            )
+            return list(itertools.islice(newest_first, limit))
+
+    def get_rate(
+        self,
+        component_id: Optional[str] = None,
+        message_type: Optional[str] = None,
+        window: float = 10.0,
+        now: Optional[float] = None
+    ) -> float:
+        """
+        Get the message rate over a recent window.
+
+        Args:
+            component_id: Only messages from this component (None for all)
+            message_type: Only messages of this type (None for all)
+            window: Window in seconds
+            now: End of the window (None for now)
+
+        Returns:
+            float: Messages per second
+        """
+        if now is None:
+            now = time.time()
+        # Buckets starting inside the window
+        first_bucket = math.ceil((now - window) / self.bucket_seconds)
+
+        count = 0
+        with self._lock:
+            for topic in self._select_topics(component_id, message_type):
+                for bucket, bucket_count in reversed(topic.buckets):
+                    if bucket < first_bucket:
+                        break
+                    count += bucket_count
+
+        return count / window if window > 0 else 0.0
+
+    def get_aggregates(
+        self,
+        component_id: Optional[str] = None,
+        message_type: Optional[str] = None,
+        window: float = 60.0,
+        now: Optional[float] = None
+    ) -> List[Tuple[float, int]]:
+        """
+        Get message counts per time bucket over a recent window.
+
+        Args:
+            component_id: Only messages from this component (None for all)
+            message_type: Only messages of this type (None for all)
+            window: Window in seconds
+            now: End of the window (None for now)
+
+        Returns:
+            List[Tuple[float, int]]: (bucket start time, message count), oldest first, including empty buckets
+        """
+        if now is None:
+            now = time.time()
+        last_bucket = int(now // self.bucket_seconds)
+        first_bucket = last_bucket - max(1, int(window / self.bucket_seconds)) + 1
+
+        counts = [0] * (last_bucket - first_bucket + 1)
+        with self._lock:
+            for topic in self._select_topics(component_id, message_type):
+                for bucket, bucket_count in reversed(topic.buckets):
+                    if bucket < first_bucket:
+                        break
+                    if bucket <= last_bucket:
+                        counts[bucket - first_bucket] += bucket_count
+
+        return [((first_bucket + i) * self.bucket_seconds, count) for i, count in enumerate(counts)]
+
+    def get_topics(self) -> List[Topic]:
+        """Get the (component ID, message type) topics seen so far"""
+        with self._lock:
+            return list(self.topics)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(topic.entries) for topic in self.topics.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get history statistics.
+
+        Returns:
+            Dict[str, Any]: Topic count, entries in memory and messages seen per topic
+        """
+        with self._lock:
+            return {
+                "topics": len(self.topics),
+                "entries": sum(len(topic.entries) for topic in self.topics.values()),
+                "capacity_per_topic": self.capacity_per_topic,
+                "messages_seen": {
+                    f"{component_id}/{message_type}": topic.total
+                    for (component_id, message_type), topic in self.topics.items()
+                },
+                "spill_path": self.spill_path
+            }
+
+    def flush(self):
+        """Flush the spill file"""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.flush()
+
+    def close(self):
+        """Close the spill file"""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+
+def replay_history(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read the messages written to a spill file, oldest first.
+
+    Args:
+        path: Spill file written by a MessageHistory
+
+    Returns:
+        Iterator[Dict[str, Any]]: Message entries
+
+    Raises:
+        ValueError: If the file is not a message history spill file
+    """
+    with open(path, "rb") as f:
+        for entry, _ in _read_records(f, path):
+            yield entry
+
+
+def _read_records(f, path: str) -> Iterator[Tuple[Dict[str, Any], int]]:
+    """Read the entries of an open spill file with the offset each one ends at"""
+    magic, version = _FILE_HEADER.unpack(f.read(_FILE_HEADER.size))
+    if magic != SPILL_MAGIC or version != SPILL_VERSION:
+        raise ValueError(f"Not a message history file: {path}")
+
+    while True:
+        header = f.read(_RECORD_HEADER.size)
+        if len(header) < _RECORD_HEADER.size:
+            # End of file (or a record cut short by a crash)
+            return
+
+        timestamp, seq, component_length, type_length, content_length = _RECORD_HEADER.unpack(header)
+        body = f.read(component_length + type_length + content_length)
+        if len(body) < component_length + type_length + content_length:
+            return
+
+        yield {
+            "component_id": body[:component_length].decode("utf-8"),
+            "type": body[component_length:component_length + type_length].decode("utf-8"),
+            "content": body[component_length + type_length:].decode("utf-8"),
+            "timestamp": timestamp,
+            "seq": seq
+        }, f.tell()
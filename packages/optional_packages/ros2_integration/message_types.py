@@ -81,7 +81,11 @@ class BaseMessage:
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'BaseMessage':
-        """Create message from dictionary"""
+        """Create message from dictionary (a message of this type is returned as is)"""
+        if isinstance(data, cls):
+            return data
+        if isinstance(data, BaseMessage):
+            data = data.to_dict()
         return cls(**data)
     
     @classmethod
@@ -90,6 +94,21 @@ class BaseMessage:
         return cls.from_dict(json.loads(json_str))
 
 
+def message_to_dict(value: Any) -> Dict[str, Any]:
+    """
+    JSON fallback for message dataclasses held in other data, for json.dumps(default=...)
+    
+    Args:
+        value: Object json cannot encode itself
+        
+    Returns:
+        Dict[str, Any]: The message as a dictionary
+    """
+    if isinstance(value, BaseMessage):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 @dataclass
 class ComponentState(BaseMessage):
     """State of a micro-robot component"""
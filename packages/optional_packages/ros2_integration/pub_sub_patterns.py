@@ -7,9 +7,12 @@ approaches to enable precise, formation-focused communication between micro-robo
 
 import time
 import logging
+import uuid
+import weakref
 import threading
 import queue
 from enum import Enum
+from concurrent.futures import Future, CancelledError
 from typing import Dict, List, Any, Optional, Callable, Union, Tuple, Set, TypeVar, Generic
 
 from ros2_integration.ros2_bridge import (
@@ -19,6 +22,7 @@ from ros2_integration.ros2_bridge import (
 from ros2_integration.message_types import (
     ComponentType, BaseMessage
 )
+from ros2_integration.request_timer import RequestTimer, get_request_timer
 
 # Set up logging
 logging.basicConfig(
@@ -44,6 +48,294 @@ class CommunicationPattern(Enum):
     PROCESSING_SEQUENCE = "processing_sequence"  # Sequential processing across formation components
 
 
+# Formation roles that address every receiver in a context
+WILDCARD_ROLES = (None, "defined_scope", "broadcast")
+
+# Statement action for each pattern
+PATTERN_ACTIONS = {
+    CommunicationPattern.STATEMENT_DIRECTED: "directed_statement",
+    CommunicationPattern.STATEMENT_BROADCAST: "formation_statement",
+    CommunicationPattern.ROLE_SCOPE_FOCUSED: "role_statement",
+    CommunicationPattern.FORMATION_COMMAND: "role_statement",
+    CommunicationPattern.PROCESSING_SEQUENCE: "sequence_statement"
+}
+
+# Patterns delivered on the shared context topic rather than a component's own topic
+CONTEXT_PATTERNS = (
+    CommunicationPattern.STATEMENT_BROADCAST,
+    CommunicationPattern.ROLE_SCOPE_FOCUSED,
+    CommunicationPattern.FORMATION_COMMAND
+)
+
+
+class StatementRouter:
+    """
+    Routing table delivering statements to RoleScopeReceivers.
+    
+    There is one router per ROS2 bridge. Each context topic gets one
+    subscription and each component gets one coordination handler per
+    statement type, however many receivers share them. Receivers are indexed
+    by context, statement type, action and role, or by target component ID,
+    so dispatching a statement costs O(matching receivers) rather than
+    O(all receivers). The statement is decoded once per statement class and
+    handed to every matching receiver.
+    """
+    
+    def __init__(self, bridge: ROS2Bridge):
+        """
+        Initialize statement router.
+        
+        Args:
+            bridge: ROS2 bridge the router subscribes through
+        """
+        # Weak, so the router kept for the bridge in _routers does not keep the bridge alive
+        self._bridge_ref = weakref.ref(bridge)
+        
+        # (context, statement_type, action) -> {"all": [receivers], "by_role": {role: [receivers]}}
+        self.context_routes: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        
+        # (component_id, statement_type, action, context) -> [receivers]
+        self.directed_routes: Dict[Tuple[str, str, str, str], List["RoleScopeReceiver"]] = {}
+        
+        # Context topics subscribed and (component_id, statement_type) handlers registered
+        self.subscribed_contexts: Set[str] = set()
+        self.registered_handlers: Set[Tuple[str, str]] = set()
+        
+        # Route lists are replaced rather than mutated, so dispatch reads them without the lock
+        self.lock = threading.Lock()
+        
+        # Statistics, updated from the bridge's worker threads
+        self.stats_lock = threading.Lock()
+        self.statements_dispatched = 0
+        self.deliveries = 0
+        self.unmatched = 0
+    
+    @property
+    def bridge(self) -> Optional[ROS2Bridge]:
+        """The ROS2 bridge the router subscribes through (None once it is gone)"""
+        return self._bridge_ref()
+    
+    def _count_unmatched(self):
+        """Count a statement no receiver matched"""
+        with self.stats_lock:
+            self.unmatched += 1
+    
+    def add_receiver(self, receiver: "RoleScopeReceiver"):
+        """
+        Add a receiver to the routing table.
+        
+        Args:
+            receiver: Receiver to add
+        """
+        action = PATTERN_ACTIONS[receiver.pattern]
+        subscribe_context = False
+        register_handler = False
+        
+        with self.lock:
+            if receiver.pattern in CONTEXT_PATTERNS:
+                key = (receiver.context_topic, receiver.statement_type, action)
+                route = self.context_routes.get(key, {"all": [], "by_role": {}})
+                by_role = dict(route["by_role"])
+                by_role[receiver.role_in_formation] = by_role.get(receiver.role_in_formation, []) + [receiver]
+                self.context_routes[key] = {"all": route["all"] + [receiver], "by_role": by_role}
+                
+                if receiver.context_topic not in self.subscribed_contexts:
+                    self.subscribed_contexts.add(receiver.context_topic)
+                    subscribe_context = True
+            else:
+                component_id = receiver.communicator.component_id
+                key = (component_id, receiver.statement_type, action, receiver.context_topic)
+                self.directed_routes[key] = self.directed_routes.get(key, []) + [receiver]
+                
+                if (component_id, receiver.statement_type) not in self.registered_handlers:
+                    self.registered_handlers.add((component_id, receiver.statement_type))
+                    register_handler = True
+        
+        bridge = self.bridge
+        if subscribe_context and bridge is not None:
+            bridge.create_subscription(
+                receiver.context_topic,
+                CommunicationType.COORDINATION,
+                self._dispatch_context,
+                reliable=receiver.reliable
+            )
+        
+        if register_handler:
+            receiver.communicator.register_coordination_handler(
+                receiver.statement_type,
+                self._make_directed_handler(receiver.communicator.component_id)
+            )
+    
+    def remove_receiver(self, receiver: "RoleScopeReceiver"):
+        """
+        Remove a receiver from the routing table.
+        
+        Args:
+            receiver: Receiver to remove
+        """
+        action = PATTERN_ACTIONS[receiver.pattern]
+        
+        with self.lock:
+            if receiver.pattern in CONTEXT_PATTERNS:
+                key = (receiver.context_topic, receiver.statement_type, action)
+                route = self.context_routes.get(key)
+                if route is None:
+                    return
+                
+                remaining = [r for r in route["all"] if r is not receiver]
+                if not remaining:
+                    del self.context_routes[key]
+                    return
+                
+                by_role = dict(route["by_role"])
+                role_receivers = [r for r in by_role.get(receiver.role_in_formation, []) if r is not receiver]
+                if role_receivers:
+                    by_role[receiver.role_in_formation] = role_receivers
+                else:
+                    by_role.pop(receiver.role_in_formation, None)
+                self.context_routes[key] = {"all": remaining, "by_role": by_role}
+            else:
+                key = (receiver.communicator.component_id, receiver.statement_type, action, receiver.context_topic)
+                remaining = [r for r in self.directed_routes.get(key, []) if r is not receiver]
+                if remaining:
+                    self.directed_routes[key] = remaining
+                else:
+                    self.directed_routes.pop(key, None)
+    
+    def _dispatch_context(self, message: ROS2Message):
+        """
+        Deliver a statement published on a context topic.
+        
+        Args:
+            message: Received statement message
+        """
+        data = message.data
+        params = data.get("params", {})
+        route = self.context_routes.get((params.get("context"), data.get("coordination_type"), data.get("action")))
+        if route is None:
+            self._count_unmatched()
+            return
+        
+        formation_role = params.get("formation_role")
+        if formation_role in WILDCARD_ROLES:
+            receivers = route["all"]
+        else:
+            receivers = route["by_role"].get(formation_role, ())
+        
+        self._deliver(receivers, message.source_id, params.get("statement"), formation_role)
+    
+    def _make_directed_handler(self, component_id: str) -> Callable[[str, str, Dict[str, Any], ROS2Message], None]:
+        """
+        Create the coordination handler delivering statements addressed to a component.
+        
+        Args:
+            component_id: Component ID the handler is registered for
+            
+        Returns:
+            Callable: Coordination handler (coordination_type, action, params, message)
+        """
+        def handle_directed(coordination_type: str, action: str, params: Dict[str, Any], message: ROS2Message):
+            receivers = self.directed_routes.get((component_id, coordination_type, action, params.get("context")))
+            if not receivers:
+                self._count_unmatched()
+                return
+            
+            if action == "sequence_statement":
+                sequence = params.get("formation_sequence", [])
+                position = params.get("sequence_position", 0)
+                if position >= len(sequence) or sequence[position] != component_id:
+                    self._count_unmatched()
+                    return
+            
+            statement_data = params.get("statement")
+            formation_role = params.get("formation_role")
+            self._deliver(receivers, message.source_id, statement_data, formation_role)
+            
+            if action == "sequence_statement" and statement_data:
+                # Forward once per component, not once per receiver
+                receivers[0]._forward_sequence_statement(
+                    message.source_id, statement_data, sequence, position, formation_role
+                )
+        
+        return handle_directed
+    
+    def _deliver(
+        self,
+        receivers: List["RoleScopeReceiver"],
+        source_id: str,
+        statement_data: Optional[Dict[str, Any]],
+        formation_role: Optional[str]
+    ):
+        """
+        Decode a statement once per statement class and hand it to each receiver.
+        
+        Args:
+            receivers: Matching receivers
+            source_id: Source component ID making the statement
+            statement_data: Statement content data
+            formation_role: Role context of the statement in formation
+        """
+        if not statement_data or not receivers:
+            return
+        
+        decoded: Dict[type, Any] = {}
+        delivered = 0
+        
+        for receiver in receivers:
+            statement_class = receiver.statement_class
+            statement = decoded.get(statement_class)
+            if statement is None:
+                try:
+                    statement = decoded[statement_class] = statement_class.from_dict(statement_data)
+                except Exception as e:
+                    logger.error(f"Error decoding {statement_class.__name__} statement: {e}")
+                    continue
+            
+            delivered += 1
+            receiver._accept_statement(source_id, statement, formation_role)
+        
+        with self.stats_lock:
+            self.statements_dispatched += 1
+            self.deliveries += delivered
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get routing statistics.
+        
+        Returns:
+            Dict[str, Any]: Route counts, dispatched statements, deliveries and unmatched messages
+        """
+        with self.stats_lock:
+            return {
+                "context_routes": len(self.context_routes),
+                "directed_routes": len(self.directed_routes),
+                "statements_dispatched": self.statements_dispatched,
+                "deliveries": self.deliveries,
+                "unmatched": self.unmatched
+            }
+
+
+_routers: "weakref.WeakKeyDictionary[ROS2Bridge, StatementRouter]" = weakref.WeakKeyDictionary()
+_routers_lock = threading.Lock()
+
+
+def get_statement_router(bridge: ROS2Bridge) -> StatementRouter:
+    """
+    Get the statement router for a ROS2 bridge.
+    
+    Args:
+        bridge: ROS2 bridge
+        
+    Returns:
+        StatementRouter: The bridge's statement router
+    """
+    with _routers_lock:
+        router = _routers.get(bridge)
+        if router is None:
+            router = _routers[bridge] = StatementRouter(bridge)
+        return router
+
+
 class StatementPublisher(Generic[T]):
     """
     ROS2 Statement publisher for micro-robot components.
@@ -82,11 +374,14 @@ class StatementPublisher(Generic[T]):
         self.statements_made = 0
         self.failed_statements = 0
         
-        # Role-based recipients (components with specific roles in formation)
-        self.role_recipients: Set[str] = set()
+        # Role-based recipients (component ID -> role), in processing sequence order
+        self.role_recipients: Dict[str, str] = {}
+        
+        # Processing sequence compiled from the role recipients, rebuilt when they change
+        self._sequence_plan: Optional[List[str]] = None
         
         # Create appropriate communication channel based on pattern
-        if pattern in [CommunicationPattern.ROLE_SCOPE_FOCUSED, CommunicationPattern.FORMATION_COMMAND]:
+        if pattern in CONTEXT_PATTERNS:
             comm_type = CommunicationType.COORDINATION
             
             # Create statement publisher for the context topic
@@ -109,7 +404,7 @@ class StatementPublisher(Generic[T]):
         
         Args:
             statement_content: The statement content/data to publish
-            target_role: Target component role or ID within the formation
+            target_role: Target component ID (directed) or formation role (role-scoped, None for all roles)
             priority: Statement priority for formation coordination
             
         Returns:
@@ -131,7 +426,7 @@ class StatementPublisher(Generic[T]):
                     coordination_type=self.statement_type,
                     action="directed_statement",
                     params={
-                        "statement": statement_content.to_dict(),
+                        "statement": statement_content,
                         "context": self.context_topic,
                         "formation_role": "precise"
                     },
@@ -153,7 +448,7 @@ class StatementPublisher(Generic[T]):
                     coordination_type=self.statement_type,
                     action="formation_statement",
                     params={
-                        "statement": statement_content.to_dict(),
+                        "statement": statement_content,
                         "context": self.context_topic,
                         "formation_role": "broadcast"
                     },
@@ -161,23 +456,23 @@ class StatementPublisher(Generic[T]):
                     priority=priority
                 )
                 
-                # Broadcast statement to all formation components
+                # Broadcast statement to all formation components in the context
                 success = self.communicator.bridge.publish_message(
-                    self.communicator.component_id,
+                    self.context_topic,
                     CommunicationType.COORDINATION,
                     coord_message
                 )
             
-            elif self.pattern == CommunicationPattern.ROLE_SCOPE_FOCUSED:
+            elif self.pattern in (CommunicationPattern.ROLE_SCOPE_FOCUSED, CommunicationPattern.FORMATION_COMMAND):
                 # Create coordination message with role-scoped focus
                 coord_message = self.communicator.bridge.create_coordination_message(
                     source_id=self.communicator.component_id,
                     coordination_type=self.statement_type,
                     action="role_statement",
                     params={
-                        "statement": statement_content.to_dict(),
+                        "statement": statement_content,
                         "context": self.context_topic,
-                        "formation_role": "defined_scope"
+                        "formation_role": target_role or "defined_scope"
                     },
                     target_id=None,
                     priority=priority
@@ -198,7 +493,8 @@ class StatementPublisher(Generic[T]):
                     return False
                 
                 # Get first component in processing sequence
-                first_component = list(self.role_recipients)[0]
+                sequence = self._get_sequence_plan()
+                first_component = sequence[0]
                 
                 # Create coordination message for sequential processing
                 coord_message = self.communicator.bridge.create_coordination_message(
@@ -206,9 +502,9 @@ class StatementPublisher(Generic[T]):
                     coordination_type=self.statement_type,
                     action="sequence_statement",
                     params={
-                        "statement": statement_content.to_dict(),
+                        "statement": statement_content,
                         "context": self.context_topic,
-                        "formation_sequence": list(self.role_recipients),
+                        "formation_sequence": sequence,
                         "sequence_position": 0,
                         "formation_role": "sequence"
                     },
@@ -244,7 +540,8 @@ class StatementPublisher(Generic[T]):
             component_id: Component ID to add
             role: The component's role in the formation ("coordinator", "relay", etc.)
         """
-        self.role_recipients.add(component_id)
+        self.role_recipients[component_id] = role
+        self._sequence_plan = None
         logger.debug(f"Added {role} recipient {component_id} to statement publisher")
     
     def remove_role_recipient(self, component_id: str):
@@ -255,8 +552,20 @@ class StatementPublisher(Generic[T]):
             component_id: Component ID to remove from the formation communication
         """
         if component_id in self.role_recipients:
-            self.role_recipients.remove(component_id)
+            del self.role_recipients[component_id]
+            self._sequence_plan = None
             logger.debug(f"Removed role recipient {component_id} from statement publisher")
+    
+    def _get_sequence_plan(self) -> List[str]:
+        """
+        Get the processing sequence delivery plan, compiling it if recipients changed.
+        
+        Returns:
+            List[str]: Component IDs in delivery order
+        """
+        if self._sequence_plan is None:
+            self._sequence_plan = list(self.role_recipients)
+        return self._sequence_plan
 
 
 class RoleScopeReceiver(Generic[T]):
@@ -316,140 +625,46 @@ class RoleScopeReceiver(Generic[T]):
         logger.info(f"Initialized {pattern.value} role-scope receiver for {statement_type} statements in {context_topic} context, with role: {role_in_formation}")
     
     def _register_role_handlers(self):
-        """Register role-specific statement handlers"""
-        # Register coordination handler based on role and statement type
-        self.communicator.register_coordination_handler(
-            self.statement_type,
-            self._handle_role_statement
-        )
-        
-        # Create subscriptions based on communication pattern
-        if self.pattern in [CommunicationPattern.ROLE_SCOPE_FOCUSED, CommunicationPattern.FORMATION_COMMAND]:
-            comm_type = CommunicationType.COORDINATION
-            
-            # Create subscription for the context topic with role awareness
-            self.communicator.bridge.create_subscription(
-                self.context_topic,
-                comm_type,
-                self._handle_context_statement,
-                reliable=self.reliable
-            )
+        """Add this receiver to the bridge's statement routing table"""
+        self.router = get_statement_router(self.communicator.bridge)
+        self.router.add_receiver(self)
     
-    def _handle_role_statement(
-        self,
-        coordination_type: str,
-        action: str,
-        params: Dict[str, Any],
-        message: ROS2Message
-    ):
-        """
-        Handle a role-based statement in formation coordination.
-        
-        Args:
-            coordination_type: Statement type in coordination
-            action: Statement action/intent
-            params: Statement parameters
-            message: Original message
+    def close(self):
+        """Stop receiving statements"""
+        self.router.remove_receiver(self)
+    
+    def _process_statement(self, source_id: str, statement_data: Dict[str, Any], formation_role: Optional[str] = None):
         """
-        # Check if this statement matches our statement type
-        if coordination_type != self.statement_type:
-            return
-        
-        # Handle statements based on pattern and role-specific action
-        if self.pattern == CommunicationPattern.STATEMENT_DIRECTED and action == "directed_statement":
-            # Check if this statement is for our context
-            if params.get("context") != self.context_topic:
-                return
-            
-            # Get statement content
-            statement_data = params.get("statement")
-            
-            if statement_data:
-                # Process statement with role awareness
-                self._process_statement(message.source_id, statement_data, params.get("formation_role"))
-        
-        elif self.pattern == CommunicationPattern.STATEMENT_BROADCAST and action == "formation_statement":
-            # Check if this statement is for our context
-            if params.get("context") != self.context_topic:
-                return
-            
-            # Get statement data
-            statement_data = params.get("statement")
-            
-            if statement_data:
-                # Process broadcast statement with role awareness
-                self._process_statement(message.source_id, statement_data, params.get("formation_role"))
-        
-        elif self.pattern == CommunicationPattern.PROCESSING_SEQUENCE and action == "sequence_statement":
-            # Check if this statement is for our context
-            if params.get("context") != self.context_topic:
-                return
-            
-            # Get sequence information
-            sequence = params.get("formation_sequence", [])
-            position = params.get("sequence_position", 0)
-            
-            # Check if this component's role is the current recipient in sequence
-            if (position < len(sequence) and 
-                sequence[position] == self.communicator.component_id):
-                
-                # Get statement data
-                statement_data = params.get("statement")
-                
-                if statement_data:
-                    # Process statement based on role in sequence
-                    self._process_statement(message.source_id, statement_data, params.get("formation_role"))
-                    
-                    # Forward to next component in sequence based on role
-                    self._forward_sequence_statement(
-                        message.source_id,
-                        statement_data,
-                        sequence,
-                        position,
-                        params.get("formation_role")
-                    )
-    
-    def _handle_context_statement(self, message: ROS2Message):
-        """
-        Handle a context-specific statement (role-scoped).
+        Process a received statement with role-scope awareness.
         
         Args:
-            message: Received statement message
+            source_id: Source component ID making the statement
+            statement_data: Statement content data
+            formation_role: Role context of the statement in formation
         """
-        # Check if this is a relevant statement for our role
-        if message.message_type != self.statement_type or message.data.get("action") != "role_statement":
-            return
-        
-        # Check if this statement is for our context topic
-        if message.data.get("params", {}).get("context") != self.context_topic:
-            return
-        
-        # Get statement data
-        statement_data = message.data.get("params", {}).get("statement")
-        formation_role = message.data.get("params", {}).get("formation_role")
-        
-        # Verify statement applies to this component's role in formation
-        if formation_role and formation_role != "defined_scope" and formation_role != self.role_in_formation:
-            # This statement is not applicable to this component's role
+        try:
+            # Create statement instance from data
+            statement = self.statement_class.from_dict(statement_data)
+        except Exception as e:
+            logger.error(f"Error processing statement: {e}")
             return
         
-        if statement_data:
-            # Process statement with role context awareness
-            self._process_statement(message.source_id, statement_data, formation_role)
+        self._accept_statement(source_id, statement, formation_role)
     
-    def _process_statement(self, source_id: str, statement_data: Dict[str, Any], formation_role: Optional[str] = None):
+    def _accept_statement(self, source_id: str, statement: T, formation_role: Optional[str] = None):
         """
-        Process a received statement with role-scope awareness.
+        Handle a decoded statement routed to this receiver.
+        
+        The router has already matched the statement to this receiver's
+        context, role or component ID. The statement instance is shared with
+        other receivers of the same statement class and should not be modified.
         
         Args:
             source_id: Source component ID making the statement
-            statement_data: Statement content data
+            statement: Decoded statement
             formation_role: Role context of the statement in formation
         """
         try:
-            # Create statement instance from data
-            statement = self.statement_class.from_dict(statement_data)
-            
             # Track statement receipt
             self.statements_received += 1
             
@@ -459,12 +674,6 @@ class RoleScopeReceiver(Generic[T]):
                 logger.debug(f"Statement filtered out due to scope constraints (role: {formation_role})")
                 return
             
-            # Verify this component has appropriate role to process the statement
-            if (formation_role and formation_role != "broadcast" and 
-                formation_role != "defined_scope" and formation_role != self.role_in_formation):
-                logger.debug(f"Statement not applicable to this component's role: {self.role_in_formation}")
-                return
-                
             # Update processing counter
             self.statements_processed += 1
             
@@ -541,13 +750,18 @@ class FormationCommandPattern:
     This class provides a high-level interface for issuing formation commands
     and receiving responses, enabling precise coordination between micro-robot
     components in formation activities.
+    
+    Each pending request is tracked by a Future. Request deadlines are owned by
+    a RequestTimer shared by all patterns in the process, so no thread is
+    started per request and a response cancels its timeout in O(1).
     """
     
     def __init__(
         self,
         communicator: ComponentCommunicator,
         request_type: str,
-        response_timeout: float = 5.0
+        response_timeout: float = 5.0,
+        timer: Optional[RequestTimer] = None
     ):
         """
         Initialize request-response pattern.
@@ -556,16 +770,15 @@ class FormationCommandPattern:
             communicator: Component communicator
             request_type: Type of requests to handle
             response_timeout: Timeout for waiting for responses (seconds)
+            timer: Timer service for request deadlines (None for the shared timer)
         """
         self.communicator = communicator
         self.request_type = request_type
         self.response_timeout = response_timeout
+        self.timer = timer or get_request_timer()
         
-        # Pending requests
-        self.pending_requests: Dict[str, Any] = {}
-        
-        # Response handlers
-        self.response_handlers: Dict[str, Callable[[str, Dict[str, Any]], None]] = {}
+        # Pending requests: request ID -> request details, future and timer handle
+        self.pending_requests: Dict[str, Dict[str, Any]] = {}
         
         # Register coordination handlers
         self.communicator.register_coordination_handler(
@@ -593,42 +806,53 @@ class FormationCommandPattern:
         self.request_handlers[request_action] = handler
         logger.debug(f"Registered handler for request action: {request_action}")
     
-    def send_request(
+    def send_request_async(
         self,
         target_id: str,
         request_action: str,
         request_data: Dict[str, Any],
-        response_handler: Callable[[str, Dict[str, Any]], None],
+        timeout: Optional[float] = None,
         priority: MessagePriority = MessagePriority.NORMAL
-    ) -> str:
+    ) -> Future:
         """
-        Send a request to a target component.
+        Send a request to a target component without waiting for the response.
+        
+        The returned future has a request_id attribute. It resolves to a
+        (source_id, response_data) tuple, or fails with TimeoutError if no
+        response arrives in time and with ConnectionError if the request could
+        not be sent.
         
         Args:
             target_id: Target component ID
             request_action: Request action
             request_data: Request data
-            response_handler: Handler for the response
+            timeout: Timeout for waiting for response (seconds, None for default)
             priority: Message priority
             
         Returns:
-            str: Request ID
+            Future: Future for the response
         """
+        # Use default timeout if not specified
+        if timeout is None:
+            timeout = self.response_timeout
+        
         # Generate request ID
-        import uuid
         request_id = str(uuid.uuid4())
+        future = Future()
+        future.request_id = request_id
         
-        # Store response handler
-        self.response_handlers[request_id] = response_handler
-        
-        # Store pending request with timeout
-        self.pending_requests[request_id] = {
+        # Store pending request before sending, so a fast response finds it
+        now = time.time()
+        request = {
             "target_id": target_id,
             "request_action": request_action,
             "request_data": request_data,
-            "timestamp": time.time(),
-            "timeout": time.time() + self.response_timeout
+            "timestamp": now,
+            "timeout": now + timeout,
+            "future": future
         }
+        self.pending_requests[request_id] = request
+        request["timer"] = self.timer.schedule(timeout, lambda: self._expire_request(request_id))
         
         # Create coordination message
         coord_message = self.communicator.bridge.create_coordination_message(
@@ -653,16 +877,49 @@ class FormationCommandPattern:
         if not success:
             # Request failed to send
             logger.error(f"Failed to send request {request_id} to {target_id}")
-            del self.response_handlers[request_id]
-            del self.pending_requests[request_id]
-            return ""
+            if self.pending_requests.pop(request_id, None) is not None:
+                self.timer.cancel(request["timer"])
+                future.set_exception(ConnectionError(f"Failed to send request to {target_id}"))
+            return future
         
         logger.debug(f"Sent request {request_id} to {target_id}")
         
-        # Start timeout checker if not already running
-        self._check_request_timeouts()
+        return future
+    
+    def send_request(
+        self,
+        target_id: str,
+        request_action: str,
+        request_data: Dict[str, Any],
+        response_handler: Callable[[str, Dict[str, Any]], None],
+        priority: MessagePriority = MessagePriority.NORMAL
+    ) -> str:
+        """
+        Send a request to a target component.
+        
+        Args:
+            target_id: Target component ID
+            request_action: Request action
+            request_data: Request data
+            response_handler: Handler for the response, called with ("", {"error": "timeout"}) on timeout
+            priority: Message priority
+            
+        Returns:
+            str: Request ID
+        """
+        future = self.send_request_async(
+            target_id=target_id,
+            request_action=request_action,
+            request_data=request_data,
+            priority=priority
+        )
         
-        return request_id
+        if future.done() and isinstance(future.exception(), ConnectionError):
+            return ""
+        
+        future.add_done_callback(lambda f: self._call_response_handler(f, response_handler))
+        
+        return future.request_id
     
     def send_request_sync(
         self,
@@ -685,43 +942,39 @@ class FormationCommandPattern:
         Returns:
             Tuple[bool, Optional[Dict[str, Any]]]: Success flag and response data
         """
-        # Use default timeout if not specified
-        if timeout is None:
-            timeout = self.response_timeout
-        
-        # Create synchronization objects
-        response_received = threading.Event()
-        response_data = {"success": False, "data": None}
-        
-        # Define response handler
-        def sync_response_handler(source_id, data):
-            response_data["success"] = True
-            response_data["data"] = data
-            response_received.set()
-        
-        # Send request
-        request_id = self.send_request(
+        future = self.send_request_async(
             target_id=target_id,
             request_action=request_action,
             request_data=request_data,
-            response_handler=sync_response_handler,
+            timeout=timeout,
             priority=priority
         )
         
-        if not request_id:
-            # Request failed to send
+        # The timer resolves the future once the timeout expires; cancel_request cancels it
+        try:
+            _, response_data = future.result()
+        except (TimeoutError, ConnectionError, CancelledError):
             return False, None
         
-        # Wait for response or timeout
-        response_received.wait(timeout=timeout)
+        return True, response_data
+    
+    def cancel_request(self, request_id: str) -> bool:
+        """
+        Cancel a pending request.
         
-        # Clean up if timed out
-        if not response_received.is_set() and request_id in self.pending_requests:
-            del self.pending_requests[request_id]
-            if request_id in self.response_handlers:
-                del self.response_handlers[request_id]
+        Args:
+            request_id: Request ID
+            
+        Returns:
+            bool: True if the request was pending, False otherwise
+        """
+        request = self.pending_requests.pop(request_id, None)
+        if request is None:
+            return False
         
-        return response_data["success"], response_data["data"]
+        self.timer.cancel(request["timer"])
+        request["future"].cancel()
+        return True
     
     def send_response(
         self,
@@ -787,27 +1040,17 @@ class FormationCommandPattern:
         """
         # Handle response message
         if action == "response":
-            # Get request ID
+            # Get request ID; popping claims the request against a concurrent timeout
             request_id = params.get("request_id")
+            request = self.pending_requests.pop(request_id, None) if request_id else None
             
-            if not request_id or request_id not in self.pending_requests:
+            if request is None:
                 logger.warning(f"Received response for unknown request: {request_id}")
                 return
             
-            # Get response data
-            response_data = params.get("response_data", {})
-            
-            # Call response handler
-            if request_id in self.response_handlers:
-                try:
-                    self.response_handlers[request_id](message.source_id, response_data)
-                except Exception as e:
-                    logger.error(f"Error in response handler: {e}")
-            
-            # Clean up
-            del self.pending_requests[request_id]
-            if request_id in self.response_handlers:
-                del self.response_handlers[request_id]
+            # Cancel the timeout and complete the request
+            self.timer.cancel(request["timer"])
+            request["future"].set_result((message.source_id, params.get("response_data", {})))
             
             logger.debug(f"Handled response for request {request_id} from {message.source_id}")
             return
@@ -860,38 +1103,39 @@ class FormationCommandPattern:
                 }
             )
     
-    def _check_request_timeouts(self):
-        """Check for timed out requests"""
-        # Run in a separate thread
-        threading.Thread(target=self._timeout_checker).start()
+    def _expire_request(self, request_id: str):
+        """
+        Fail a request whose response timeout expired (called on the timer thread).
+        
+        Args:
+            request_id: Request ID
+        """
+        request = self.pending_requests.pop(request_id, None)
+        if request is None:
+            return
+        
+        request["future"].set_exception(TimeoutError(f"Request {request_id} timed out"))
+        logger.debug(f"Request {request_id} timed out")
     
-    def _timeout_checker(self):
-        """Thread function for checking request timeouts"""
-        while self.pending_requests:
-            now = time.time()
-            timed_out = []
-            
-            # Find timed out requests
-            for request_id, request in self.pending_requests.items():
-                if request["timeout"] <= now:
-                    timed_out.append(request_id)
-            
-            # Handle timed out requests
-            for request_id in timed_out:
-                # Call response handler with timeout error
-                if request_id in self.response_handlers:
-                    try:
-                        self.response_handlers[request_id]("", {"error": "timeout"})
-                    except Exception as e:
-                        logger.error(f"Error in response handler for timeout: {e}")
-                
-                # Clean up
-                if request_id in self.pending_requests:
-                    del self.pending_requests[request_id]
-                if request_id in self.response_handlers:
-                    del self.response_handlers[request_id]
-                
-                logger.debug(f"Request {request_id} timed out")
-            
-            # Sleep
-            time.sleep(0.1)
\ No newline at end of file
+    def _call_response_handler(
+        self,
+        future: Future,
+        response_handler: Callable[[str, Dict[str, Any]], None]
+    ):
+        """
+        Pass a completed request's response to its handler.
+        
+        Args:
+            future: Completed request future
+            response_handler: Handler for the response
+        """
+        if future.cancelled():
+            return
+        
+        try:
+            if isinstance(future.exception(), TimeoutError):
+                response_handler("", {"error": "timeout"})
+            elif future.exception() is None:
+                response_handler(*future.result())
+        except Exception as e:
+            logger.error(f"Error in response handler: {e}")
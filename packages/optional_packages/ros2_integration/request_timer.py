@@ -0,0 +1,179 @@
+"""
+Request Timer for ROS2 Communication Patterns
+
+This module implements the timer service that owns the deadlines of pending
+requests. A single thread waits on a heap of deadlines, so the number of
+threads stays constant however many requests are in flight. Cancelling a
+timer only marks its entry; cancelled entries are discarded when they reach
+the top of the heap, or in bulk once they make up most of it.
+"""
+
+import time
+import heapq
+import itertools
+import logging
+import threading
+from typing import List, Dict, Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Constants
+COMPACT_MIN_SIZE = 1024  # heap entries before cancelled entries are compacted
+
+
+class TimerHandle:
+    """Handle for a scheduled timeout, used to cancel it"""
+
+    __slots__ = ("deadline", "callback", "cancelled")
+
+    def __init__(self, deadline: float, callback: Callable[[], None]):
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+
+class RequestTimer:
+    """Single-threaded timer service for request deadlines"""
+
+    def __init__(self, name: str = "request-timer"):
+        """
+        Initialize the timer service.
+
+        Args:
+            name: Name of the timer thread
+        """
+        self.name = name
+
+        # (deadline, sequence, handle), earliest deadline first
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._cancelled = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+        # Statistics
+        self.scheduled_count = 0
+        self.cancelled_count = 0
+        self.fired_count = 0
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> TimerHandle:
+        """
+        Schedule a callback to run after a delay.
+
+        The callback runs on the timer thread and should return quickly.
+
+        Args:
+            delay: Delay in seconds
+            callback: Function to call when the timer expires
+
+        Returns:
+            TimerHandle: Handle for cancelling the timer
+        """
+        handle = TimerHandle(time.monotonic() + delay, callback)
+
+        with self._condition:
+            heapq.heappush(self._heap, (handle.deadline, next(self._sequence), handle))
+            self.scheduled_count += 1
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            elif self._heap[0][2] is handle:
+                # New earliest deadline, wake the timer thread to shorten its wait
+                self._condition.notify()
+
+        return handle
+
+    def cancel(self, handle: TimerHandle) -> bool:
+        """
+        Cancel a scheduled timer.
+
+        Args:
+            handle: Handle returned by schedule()
+
+        Returns:
+            bool: True if the timer was cancelled, False if it already fired or was cancelled
+        """
+        with self._condition:
+            if handle.cancelled or handle.callback is None:
+                return False
+            handle.cancelled = True
+            handle.callback = None
+            self._cancelled += 1
+            self.cancelled_count += 1
+
+            if self._cancelled > COMPACT_MIN_SIZE and self._cancelled * 2 > len(self._heap):
+                self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+        return True
+
+    def _run(self):
+        """Thread function firing expired timers"""
+        while True:
+            with self._condition:
+                while True:
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+
+                    deadline, _, handle = self._heap[0]
+                    if handle.cancelled:
+                        heapq.heappop(self._heap)
+                        self._cancelled -= 1
+                        continue
+
+                    remaining = deadline - time.monotonic()
+                    if remaining > 0:
+                        self._condition.wait(remaining)
+                        continue
+
+                    heapq.heappop(self._heap)
+                    callback = handle.callback
+                    handle.callback = None
+                    self.fired_count += 1
+                    break
+
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in timer callback: {e}")
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._heap) - self._cancelled
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get timer statistics.
+
+        Returns:
+            Dict[str, Any]: Pending, scheduled, cancelled and fired timer counts
+        """
+        with self._condition:
+            return {
+                "pending": len(self._heap) - self._cancelled,
+                "heap_size": len(self._heap),
+                "scheduled": self.scheduled_count,
+                "cancelled": self.cancelled_count,
+                "fired": self.fired_count
+            }
+
+
+_shared_timer: Optional[RequestTimer] = None
+_shared_timer_lock = threading.Lock()
+
+
+def get_request_timer() -> RequestTimer:
+    """
+    Get the timer service shared by all request patterns in the process.
+
+    Returns:
+        RequestTimer: The shared timer service
+    """
+    global _shared_timer
+    with _shared_timer_lock:
+        if _shared_timer is None:
+            _shared_timer = RequestTimer()
+        return _shared_timer
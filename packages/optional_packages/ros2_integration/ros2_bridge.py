@@ -12,9 +12,13 @@ import threading
 import logging
 import json
 import uuid
+from collections import deque
 from typing import Dict, List, Any, Optional, Callable, Union
 from enum import Enum
 
+from ros2_integration.message_types import message_to_dict
+from ros2_integration.binary_codec import pack_envelope, unpack_envelope
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -99,7 +103,7 @@ class ROS2Message:
     
     def to_json(self) -> str:
         """Convert message to JSON string"""
-        return json.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), default=message_to_dict)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ROS2Message':
@@ -123,10 +127,39 @@ class ROS2Message:
     def from_json(cls, json_str: str) -> 'ROS2Message':
         """Create message from JSON string"""
         return cls.from_dict(json.loads(json_str))
+    
+    def to_bytes(self) -> bytes:
+        """Convert message to the compact binary encoding"""
+        return pack_envelope(
+            self.message_id, self.message_type, self.source_id, self.target_id,
+            self.priority.value, self.timestamp, self.data
+        )
+    
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'ROS2Message':
+        """Create message from the compact binary encoding"""
+        message_id, message_type, source_id, target_id, priority, timestamp, data = unpack_envelope(payload)
+        
+        # Bypass __init__ so no throwaway message ID is generated
+        message = cls.__new__(cls)
+        message.message_id = message_id
+        message.message_type = message_type
+        message.source_id = source_id
+        message.target_id = target_id
+        message.priority = MessagePriority(priority)
+        message.timestamp = timestamp
+        message.data = data
+        return message
 
 
 class MockROS2Node:
-    """Mock implementation of a ROS2 node for testing without ROS2"""
+    """
+    Mock implementation of a ROS2 node for testing without ROS2.
+    
+    Published messages are queued in a deque and handed to a dispatch thread that
+    blocks on a condition variable while the queue is empty. Messages are passed to
+    subscription callbacks by reference, without copying or re-serialization.
+    """
     
     def __init__(self, node_name: str):
         """
@@ -137,8 +170,9 @@ class MockROS2Node:
         """
         self.node_name = node_name
         self.publishers = {}
-        self.subscriptions = {}
-        self.message_queue = []
+        self.subscriptions: Dict[str, List['MockSubscription']] = {}
+        self.message_queue = deque()
+        self.queue_condition = threading.Condition()
         self.running = False
         self.thread = None
         
@@ -178,10 +212,38 @@ class MockROS2Node:
             MockSubscription: Mock subscription
         """
         subscription = MockSubscription(self, topic, callback)
-        self.subscriptions[topic] = subscription
+        with self.queue_condition:
+            # Copy on write so the dispatch thread can iterate without holding the lock
+            self.subscriptions[topic] = self.subscriptions.get(topic, []) + [subscription]
         logger.info(f"Created mock subscription for topic: {topic}")
         return subscription
     
+    def destroy_subscription(self, subscription: 'MockSubscription'):
+        """
+        Remove a mock subscription.
+        
+        Args:
+            subscription: Subscription to remove
+        """
+        with self.queue_condition:
+            remaining = [s for s in self.subscriptions.get(subscription.topic, []) if s is not subscription]
+            if remaining:
+                self.subscriptions[subscription.topic] = remaining
+            else:
+                self.subscriptions.pop(subscription.topic, None)
+    
+    def enqueue(self, topic: str, message: Any):
+        """
+        Queue a message for delivery and wake the dispatch thread.
+        
+        Args:
+            topic: Topic the message was published on
+            message: Message object, delivered to callbacks as is
+        """
+        with self.queue_condition:
+            self.message_queue.append((topic, message))
+            self.queue_condition.notify()
+    
     def start(self):
         """Start the mock node"""
         if self.running:
@@ -195,22 +257,33 @@ class MockROS2Node:
     
     def stop(self):
         """Stop the mock node"""
-        self.running = False
+        with self.queue_condition:
+            self.running = False
+            self.queue_condition.notify_all()
         if self.thread:
             self.thread.join(timeout=1.0)
         logger.info(f"Stopped mock ROS2 node: {self.node_name}")
     
     def _process_messages(self):
-        """Process messages in the queue"""
-        while self.running:
-            if self.message_queue:
-                topic, message = self.message_queue.pop(0)
+        """Deliver queued messages, sleeping on the condition while the queue is empty"""
+        while True:
+            with self.queue_condition:
+                while self.running and not self.message_queue:
+                    self.queue_condition.wait()
+                if not self.running:
+                    return
                 
-                # Find subscriptions for this topic
-                if topic in self.subscriptions:
-                    self.subscriptions[topic].callback(message)
+                # Take everything queued so far and deliver it outside the lock
+                batch = self.message_queue
+                self.message_queue = deque()
+                subscriptions = self.subscriptions
             
-            time.sleep(0.01)  # Avoid busy waiting
+            for topic, message in batch:
+                for subscription in subscriptions.get(topic, ()):
+                    try:
+                        subscription.callback(message)
+                    except Exception as e:
+                        logger.error(f"Error in mock subscription callback for {topic}: {e}")
 
 
 class MockPublisher:
@@ -227,21 +300,20 @@ class MockPublisher:
         self.node = node
         self.topic = topic
     
-    def publish(self, message: Dict[str, Any]):
+    def publish(self, message: Any):
         """
         Publish a message.
         
         Args:
-            message: Message to publish
+            message: Message to publish (delivered to subscribers by reference)
         """
-        self.node.message_queue.append((self.topic, message))
-        logger.debug(f"Published mock message to topic: {self.topic}")
+        self.node.enqueue(self.topic, message)
 
 
 class MockSubscription:
     """Mock implementation of a ROS2 subscription"""
     
-    def __init__(self, node: MockROS2Node, topic: str, callback: Callable[[Dict[str, Any]], None]):
+    def __init__(self, node: MockROS2Node, topic: str, callback: Callable[[Any], None]):
         """
         Initialize mock subscription.
         
@@ -258,20 +330,27 @@ class MockSubscription:
 class ROS2Bridge:
     """Bridge between GlowingGoldenGlobe and ROS2"""
     
-    def __init__(self, node_name: str, use_mock: bool = not ROS2_AVAILABLE):
+    def __init__(self, node_name: str, use_mock: bool = not ROS2_AVAILABLE, codec: str = "json"):
         """
         Initialize ROS2 bridge.
         
         Args:
             node_name: Name of the ROS2 node
             use_mock: Whether to use mock ROS2 implementation
+            codec: Wire encoding for real ROS2 topics: "json" (std_msgs/String)
+                or "binary" (std_msgs/UInt8MultiArray)
         """
+        if codec not in ("json", "binary"):
+            raise ValueError(f"Unsupported codec: {codec}")
+        
         self.node_name = node_name
         self.use_mock = use_mock
+        self.codec = codec
         self.node = None
         self.publishers = {}
         self.subscriptions = {}
         self.message_handlers = {}
+        self.message_callbacks = {}
         
         # Initialize ROS2 node
         self._initialize_node()
@@ -295,6 +374,14 @@ class ROS2Bridge:
                 self.node = MockROS2Node(self.node_name)
                 logger.info(f"Falling back to mock ROS2 implementation for node: {self.node_name}")
     
+    def _message_class(self):
+        """Get the ROS2 message class carrying the encoded messages"""
+        if self.codec == "binary":
+            from std_msgs.msg import UInt8MultiArray
+            return UInt8MultiArray
+        from std_msgs.msg import String
+        return String
+    
     def _create_topic_name(self, component_id: str, comm_type: CommunicationType) -> str:
         """
         Create a topic name for a component and communication type.
@@ -326,9 +413,9 @@ class ROS2Bridge:
         """
         topic = self._create_topic_name(component_id, comm_type)
         
-        # Check if publisher already exists
+        # Components sharing a bridge reuse the publisher of a shared topic
         if topic in self.publishers:
-            logger.warning(f"Publisher already exists for topic: {topic}")
+            logger.debug(f"Publisher already exists for topic: {topic}")
             return
         
         if self.use_mock:
@@ -342,7 +429,7 @@ class ROS2Bridge:
                 depth=history_depth,
                 durability=DurabilityPolicy.VOLATILE
             )
-            publisher = self.node.create_publisher(topic, qos)
+            publisher = self.node.create_publisher(self._message_class(), topic, qos)
         
         # Store publisher
         self.publishers[topic] = publisher
@@ -368,8 +455,9 @@ class ROS2Bridge:
         """
         topic = self._create_topic_name(component_id, comm_type)
         
-        # Check if subscription already exists
-        if topic in self.subscriptions:
+        # Several components sharing a bridge may listen on the same topic,
+        # but the same callback is only subscribed once
+        if callback in self.message_callbacks.get(topic, []):
             logger.warning(f"Subscription already exists for topic: {topic}")
             return
         
@@ -377,11 +465,17 @@ class ROS2Bridge:
         def message_handler(msg):
             try:
                 # Parse message
-                if isinstance(msg, dict):
+                if isinstance(msg, ROS2Message):
+                    # Mock transport delivers the published object itself
+                    message = msg
+                elif isinstance(msg, dict):
                     # Mock implementation returns dict
                     message = ROS2Message.from_dict(msg)
+                elif self.codec == "binary":
+                    # Real ROS2 implementation returns a byte array message
+                    message = ROS2Message.from_bytes(bytes(msg.data))
                 else:
-                    # Real ROS2 implementation returns ROS2 message
+                    # Real ROS2 implementation returns a string message
                     message = ROS2Message.from_json(msg.data)
                 
                 # Call callback
@@ -390,7 +484,8 @@ class ROS2Bridge:
                 logger.error(f"Error handling message: {e}")
         
         # Store message handler
-        self.message_handlers[topic] = message_handler
+        self.message_callbacks[topic] = self.message_callbacks.get(topic, []) + [callback]
+        self.message_handlers[topic] = self.message_handlers.get(topic, []) + [message_handler]
         
         if self.use_mock:
             # Create mock subscription
@@ -403,10 +498,10 @@ class ROS2Bridge:
                 depth=history_depth,
                 durability=DurabilityPolicy.VOLATILE
             )
-            subscription = self.node.create_subscription(topic, message_handler, qos)
+            subscription = self.node.create_subscription(self._message_class(), topic, message_handler, qos)
         
         # Store subscription
-        self.subscriptions[topic] = subscription
+        self.subscriptions[topic] = self.subscriptions.get(topic, []) + [subscription]
         logger.info(f"Created subscription for topic: {topic}")
     
     def publish_message(
@@ -438,13 +533,12 @@ class ROS2Bridge:
             publisher = self.publishers[topic]
             
             if self.use_mock:
-                # Mock implementation accepts dict
-                publisher.publish(message.to_dict())
+                # Mock transport passes the message by reference, no serialization
+                publisher.publish(message)
             else:
                 # Create ROS2 message
-                from std_msgs.msg import String
-                ros2_msg = String()
-                ros2_msg.data = message.to_json()
+                ros2_msg = self._message_class()()
+                ros2_msg.data = message.to_bytes() if self.codec == "binary" else message.to_json()
                 
                 # Publish message
                 publisher.publish(ros2_msg)
@@ -824,6 +918,25 @@ class ComponentCommunicator:
         self.coordination_handlers[coordination_type] = handler
         logger.info(f"Registered handler for coordination type: {coordination_type}")
     
+    def subscribe_to_component(self, component_id: str):
+        """
+        Receive telemetry published by another component.
+        
+        Telemetry goes out on the sender's own topic, so replies addressed
+        to this component are only seen after subscribing to the sender.
+        
+        Args:
+            component_id: Component ID to listen to
+        """
+        if component_id == self.component_id:
+            return
+        
+        self.bridge.create_subscription(
+            component_id,
+            CommunicationType.TELEMETRY,
+            self._handle_telemetry_message
+        )
+    
     def send_command(
         self,
         target_id: str,
@@ -0,0 +1,351 @@
+"""
+Task Executor for Micro-Robot Components
+
+This module implements the worker pool that executes the motion and task
+assignments queued on a ComponentInterface. Workers block on a priority heap
+instead of polling it. Higher-priority work preempts lower-priority work that
+is still in its simulated execution phase, and each task's deadline is tracked.
+
+How long a task takes is decided by a pluggable cost model rather than a fixed
+sleep, so throughput can be measured and tuned for different workload mixes.
+"""
+
+import time
+import heapq
+import itertools
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+# A cost model maps a task payload to its simulated execution time (seconds)
+CostModel = Callable[[Any], float]
+
+# Constants
+DEFAULT_COST_KEY = "default"  # cost model for kinds without their own
+
+
+def fixed_cost(seconds: float) -> CostModel:
+    """
+    Create a cost model with a constant execution time.
+
+    Args:
+        seconds: Execution time in seconds
+
+    Returns:
+        CostModel: The cost model
+    """
+    return lambda payload: seconds
+
+
+def duration_cost(default: float) -> CostModel:
+    """
+    Create a cost model using the payload's own duration field.
+
+    Args:
+        default: Execution time for payloads without a positive duration
+
+    Returns:
+        CostModel: The cost model
+    """
+    def model(payload: Any) -> float:
+        duration = getattr(payload, "duration", 0.0) or 0.0
+        return duration if duration > 0 else default
+    return model
+
+
+DEFAULT_COST_MODELS: Dict[str, CostModel] = {
+    "motion": fixed_cost(0.5),
+    DEFAULT_COST_KEY: fixed_cost(1.0)
+}
+
+
+class WorkItem:
+    """A queued task with its priority, deadline and remaining cost"""
+
+    __slots__ = ("kind", "payload", "priority", "deadline", "sequence", "submitted_at",
+                 "remaining_cost", "preemptions")
+
+    def __init__(self, kind: str, payload: Any, priority: int, deadline: Optional[float], sequence: int):
+        self.kind = kind
+        self.payload = payload
+        self.priority = priority
+        self.deadline = deadline
+        self.sequence = sequence
+        self.submitted_at = time.time()
+        self.remaining_cost: Optional[float] = None
+        self.preemptions = 0
+
+    def sort_key(self) -> tuple:
+        """Highest priority first, then earliest deadline, then submission order"""
+        return (-self.priority, self.deadline if self.deadline is not None else float("inf"), self.sequence)
+
+
+class _Worker:
+    """State of one worker thread"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.thread: Optional[threading.Thread] = None
+        self.item: Optional[WorkItem] = None
+        self.preemptible = False
+        self.preempt_event = threading.Event()
+
+
+class TaskExecutor:
+    """Priority-preemptive worker pool with per-task deadlines and cost models"""
+
+    def __init__(
+        self,
+        handler: Callable[[WorkItem], None],
+        num_workers: int = 1,
+        cost_models: Optional[Dict[str, CostModel]] = None,
+        name: str = "task-executor"
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            handler: Function completing a task once its cost has been paid
+            num_workers: Number of worker threads
+            cost_models: Cost model per task kind, merged over the defaults
+            name: Name prefix for worker threads
+        """
+        self.handler = handler
+        self.num_workers = max(1, num_workers)
+        self.cost_models = dict(DEFAULT_COST_MODELS)
+        if cost_models:
+            self.cost_models.update(cost_models)
+        self.name = name
+
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._workers = [_Worker(i) for i in range(self.num_workers)]
+        self._idle_workers = self.num_workers
+        self.running = False
+
+        # Statistics
+        self.started_at: Optional[float] = None
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self.preemptions = 0
+
+    def set_cost_model(self, kind: str, model: CostModel):
+        """
+        Set the cost model for a task kind.
+
+        Args:
+            kind: Task kind ("motion", a task type, or "default")
+            model: Cost model
+        """
+        with self._condition:
+            self.cost_models[kind] = model
+
+    def submit(self, kind: str, payload: Any, priority: int = 1, deadline: Optional[float] = None) -> WorkItem:
+        """
+        Queue a task, preempting lower-priority work if every worker is busy.
+
+        Args:
+            kind: Task kind, used to select the cost model and group statistics
+            payload: Task payload passed to the handler
+            priority: Task priority (higher runs first)
+            deadline: Absolute time the task should complete by (None for no deadline)
+
+        Returns:
+            WorkItem: The queued item
+        """
+        with self._condition:
+            item = WorkItem(kind, payload, priority, deadline, next(self._sequence))
+            self._kind_stats(kind)["submitted"] += 1
+            heapq.heappush(self._heap, (item.sort_key(), item))
+
+            if self._idle_workers > 0:
+                self._condition.notify()
+            else:
+                self._preempt_for(item)
+
+        return item
+
+    def _kind_stats(self, kind: str) -> Dict[str, float]:
+        """Get the statistics for a task kind (caller holds the lock)"""
+        stats = self.stats.get(kind)
+        if stats is None:
+            stats = self.stats[kind] = {
+                "submitted": 0,
+                "completed": 0,
+                "failed": 0,
+                "preempted": 0,
+                "deadline_misses": 0,
+                "busy_seconds": 0.0,
+                "total_latency": 0.0
+            }
+        return stats
+
+    def _preempt_for(self, item: WorkItem):
+        """Signal the worker running the lowest-priority preemptible task below item's priority"""
+        victim = None
+        for worker in self._workers:
+            if not worker.preemptible or worker.preempt_event.is_set():
+                continue
+            if worker.item.priority < item.priority and (victim is None or worker.item.priority < victim.item.priority):
+                victim = worker
+
+        if victim is not None:
+            victim.preempt_event.set()
+
+    def _next_item(self, worker: _Worker) -> Optional[WorkItem]:
+        """Block until a task is available (None once the executor stops)"""
+        with self._condition:
+            while self.running and not self._heap:
+                self._condition.wait()
+            if not self.running:
+                return None
+
+            _, item = heapq.heappop(self._heap)
+            self._idle_workers -= 1
+            worker.item = item
+            worker.preemptible = True
+            worker.preempt_event.clear()
+            return item
+
+    def _pay_cost(self, worker: _Worker, item: WorkItem) -> bool:
+        """
+        Spend the task's simulated execution time, stopping early if preempted.
+
+        Returns:
+            bool: True if the cost was paid, False if the task was preempted
+        """
+        if item.remaining_cost is None:
+            model = self.cost_models.get(item.kind, self.cost_models[DEFAULT_COST_KEY])
+            item.remaining_cost = max(0.0, model(item.payload))
+
+        started = time.perf_counter()
+        preempted = item.remaining_cost > 0 and worker.preempt_event.wait(item.remaining_cost)
+        elapsed = time.perf_counter() - started
+
+        with self._condition:
+            self._kind_stats(item.kind)["busy_seconds"] += elapsed
+            worker.preemptible = False
+            if not preempted:
+                return True
+
+            item.remaining_cost = max(0.0, item.remaining_cost - elapsed)
+            item.preemptions += 1
+            self.preemptions += 1
+            self._kind_stats(item.kind)["preempted"] += 1
+
+            # Requeue with the original sequence so it resumes ahead of later equals
+            if self.running:
+                heapq.heappush(self._heap, (item.sort_key(), item))
+            worker.item = None
+            self._idle_workers += 1
+            return False
+
+    def _run_worker(self, worker: _Worker):
+        """Thread function for one worker"""
+        while True:
+            item = self._next_item(worker)
+            if item is None:
+                return
+
+            if not self._pay_cost(worker, item):
+                logger.debug(f"Task {item.kind} preempted with {item.remaining_cost:.3f}s remaining")
+                continue
+
+            failed = False
+            try:
+                self.handler(item)
+            except Exception as e:
+                failed = True
+                logger.error(f"Error processing {item.kind} task: {e}")
+
+            now = time.time()
+            with self._condition:
+                stats = self._kind_stats(item.kind)
+                stats["failed" if failed else "completed"] += 1
+                stats["total_latency"] += now - item.submitted_at
+                if item.deadline is not None and now > item.deadline:
+                    stats["deadline_misses"] += 1
+                    logger.warning(f"{item.kind} task finished {now - item.deadline:.3f}s after its deadline")
+                worker.item = None
+                self._idle_workers += 1
+                self._condition.notify_all()
+
+    def start(self):
+        """Start the worker threads"""
+        with self._condition:
+            if self.running:
+                return
+            self.running = True
+            self.started_at = time.time()
+
+        for worker in self._workers:
+            worker.thread = threading.Thread(
+                target=self._run_worker, args=(worker,), name=f"{self.name}-worker-{worker.index}"
+            )
+            worker.thread.daemon = True
+            worker.thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """
+        Stop the worker threads. Queued tasks are discarded.
+
+        Args:
+            timeout: Maximum time to wait for each worker (seconds)
+        """
+        with self._condition:
+            self.running = False
+            self._heap.clear()
+            for worker in self._workers:
+                worker.preempt_event.set()
+            self._condition.notify_all()
+
+        for worker in self._workers:
+            if worker.thread:
+                worker.thread.join(timeout=timeout)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the queue is empty and every worker is idle.
+
+        Args:
+            timeout: Maximum time to wait (seconds, None to wait indefinitely)
+
+        Returns:
+            bool: True if the executor became idle
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._heap and self._idle_workers == self.num_workers, timeout
+            )
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._heap)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get executor statistics.
+
+        Returns:
+            Dict[str, Any]: Queue length, preemptions, and per-kind counts, throughput and mean latency
+        """
+        with self._condition:
+            elapsed = time.time() - self.started_at if self.started_at else 0.0
+            kinds = {}
+            for kind, stats in self.stats.items():
+                finished = stats["completed"] + stats["failed"]
+                kinds[kind] = {
+                    **stats,
+                    "throughput": stats["completed"] / elapsed if elapsed > 0 else 0.0,
+                    "mean_latency": stats["total_latency"] / finished if finished else 0.0
+                }
+
+            return {
+                "workers": self.num_workers,
+                "busy_workers": self.num_workers - self._idle_workers,
+                "queued": len(self._heap),
+                "preemptions": self.preemptions,
+                "kinds": kinds
+            }
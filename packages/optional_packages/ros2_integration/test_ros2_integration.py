@@ -14,7 +14,7 @@ from typing import Dict, List, Any, Optional
 
 from ros2_integration.ros2_bridge import (
     ROS2Bridge, ComponentCommunicator,
-    CommunicationType, MessagePriority, ROS2Message
+    CommunicationType, MessagePriority, ROS2Message, MockROS2Node
 )
 from ros2_integration.message_types import (
     ComponentType, MotionType, SensorType, ActuatorType, CoordinationType,
@@ -24,8 +24,13 @@ from ros2_integration.message_types import (
     PowerState, ErrorMessage
 )
 from ros2_integration.component_interface import ComponentInterface, ComponentStatus
+from ros2_integration.binary_codec import encode_message, decode_message
+from ros2_integration.request_timer import RequestTimer
+from ros2_integration.task_executor import TaskExecutor, fixed_cost
+from ros2_integration.message_history import MessageHistory, replay_history
+from ros2_integration.load_harness import run_load, run_replay, load_trace
 from ros2_integration.pub_sub_patterns import (
-    Publisher, Subscriber, RequestResponsePattern, MessagePattern
+    FormationCommandPattern, StatementPublisher, RoleScopeReceiver, CommunicationPattern
 )
 
 # Set up logging
@@ -283,24 +288,25 @@ def test_pub_sub_patterns():
         received_message = [None]
         
         # Create subscriber
-        subscriber = Subscriber(
+        subscriber = RoleScopeReceiver(
             communicator=comm2,
-            message_type="test_messages",
-            topic="test_topic",
-            callback=lambda source_id, message: (
+            statement_type="test_messages",
+            context_topic="test_topic",
+            statement_handler=lambda source_id, message: (
                 received_message.__setitem__(0, (source_id, message)),
                 message_received.set()
             ),
-            message_class=ComponentState,
-            pattern=MessagePattern.PUBLISH_SUBSCRIBE
+            statement_class=ComponentState,
+            role_in_formation="standard",
+            pattern=CommunicationPattern.STATEMENT_BROADCAST
         )
         
         # Create publisher
-        publisher = Publisher(
+        publisher = StatementPublisher(
             communicator=comm1,
-            message_type="test_messages",
-            topic="test_topic",
-            pattern=MessagePattern.PUBLISH_SUBSCRIBE
+            statement_type="test_messages",
+            context_topic="test_topic",
+            pattern=CommunicationPattern.STATEMENT_BROADCAST
         )
         
         # Create test message
@@ -312,7 +318,7 @@ def test_pub_sub_patterns():
         )
         
         # Publish message
-        success = publisher.publish(test_state)
+        success = publisher.make_statement(test_state)
         
         if not success:
             print("❌ Failed to publish message")
@@ -335,8 +341,8 @@ def test_pub_sub_patterns():
         print("\nTesting Request-Response Pattern...")
         
         # Create request-response patterns
-        req_resp1 = RequestResponsePattern(comm1, "test_requests")
-        req_resp2 = RequestResponsePattern(comm2, "test_requests")
+        req_resp1 = FormationCommandPattern(comm1, "test_requests")
+        req_resp2 = FormationCommandPattern(comm2, "test_requests")
         
         # Register request handler
         def handle_request(source_id, request_data):
@@ -366,7 +372,8 @@ def test_pub_sub_patterns():
         
         print("✅ Request-response pattern tested successfully")
         
-        # Stop communicators
+        # Stop receiving
+        subscriber.close()
         
         # Stop bridge
         bridge.stop()
@@ -381,13 +388,442 @@ def test_pub_sub_patterns():
         bridge.stop()
 
 
+def test_mock_transport():
+    """Test event-driven delivery in the mock ROS2 node"""
+    print("\n=== Testing Mock Transport ===")
+    
+    node = MockROS2Node("test_transport")
+    publisher = node.create_publisher("/test/topic")
+    
+    # Two subscriptions on the same topic
+    received_a = []
+    received_b = []
+    done = threading.Event()
+    message_count = 1000
+    
+    def callback_b(message):
+        received_b.append(message)
+        if len(received_b) == message_count:
+            done.set()
+    
+    node.create_subscription("/test/topic", received_a.append)
+    node.create_subscription("/test/topic", callback_b)
+    node.start()
+    
+    try:
+        messages = [{"index": i} for i in range(message_count)]
+        start = time.time()
+        for message in messages:
+            publisher.publish(message)
+        
+        if not done.wait(timeout=5.0):
+            print(f"❌ Only {len(received_b)}/{message_count} messages delivered")
+            return False
+        
+        elapsed = time.time() - start
+        print(f"✅ Delivered {message_count} messages to 2 subscriptions in {elapsed * 1000:.1f} ms")
+        
+        if [m["index"] for m in received_b] != list(range(message_count)):
+            print("❌ Messages were delivered out of order")
+            return False
+        
+        if len(received_a) != message_count or any(a is not m for a, m in zip(received_a, messages)):
+            print("❌ Messages were not delivered by reference to every subscription")
+            return False
+        
+        print("✅ Messages delivered in order and by reference")
+        return True
+    finally:
+        node.stop()
+
+
+def test_binary_codec():
+    """Test binary encoding of message types and ROS2 messages"""
+    print("\n=== Testing Binary Codec ===")
+    
+    messages = [
+        ComponentState(component_id="sphere_1", component_type="sphere", position=[1.0, 2.0, 3.0]),
+        MotionCommand(target_position=[10.0, 5.0, 0.0], duration=2.5, priority=2),
+        SensorData(sensor_id="imu_1", sensor_type="acceleration", values={"x": 0.1, "y": -9.81, "z": 0.0}),
+        TaskAssignment(task_id="task_1", task_type="assembly", deadline=None, parameters={"steps": 4}),
+        ErrorMessage(component_id="sphere_1", error_code=503, suggested_actions=["retry"])
+    ]
+    
+    for message in messages:
+        payload = encode_message(message)
+        decoded = decode_message(payload)
+        if decoded != message:
+            print(f"❌ Binary round trip changed {type(message).__name__}: {decoded}")
+            return False
+        if len(payload) >= len(message.to_json()):
+            print(f"❌ Binary payload for {type(message).__name__} is not smaller than JSON")
+            return False
+    
+    print(f"✅ {len(messages)} message types round-tripped through the binary codec")
+    
+    ros2_message = ROS2Message(
+        message_type="command",
+        source_id="controller",
+        target_id=None,
+        priority=MessagePriority.HIGH,
+        data={"command": "move", "params": {"x": 1.0}}
+    )
+    decoded = ROS2Message.from_bytes(ros2_message.to_bytes())
+    if decoded.to_dict() != ros2_message.to_dict():
+        print(f"❌ ROS2Message binary round trip mismatch: {decoded.to_dict()}")
+        return False
+    
+    print("✅ ROS2Message round-tripped through the binary codec")
+
+    # Message dataclasses in the data are packed with their schemas, not as JSON
+    state = messages[0]
+    telemetry = ROS2Message(
+        message_type="telemetry",
+        source_id="sphere_1",
+        data={"telemetry_type": "state", "values": state}
+    )
+    as_dict = ROS2Message(
+        message_type="telemetry",
+        source_id="sphere_1",
+        data={"telemetry_type": "state", "values": state.to_dict()}
+    )
+    payload = telemetry.to_bytes()
+    decoded = ROS2Message.from_bytes(payload)
+    if decoded.data["values"] != state or ComponentState.from_dict(decoded.data["values"]) != state:
+        print(f"❌ Message in ROS2Message data did not round-trip: {decoded.data}")
+        return False
+    if len(payload) >= len(as_dict.to_bytes()):
+        print("❌ Message in ROS2Message data was not packed with its schema")
+        return False
+    if json.loads(telemetry.to_json())["data"]["values"] != state.to_dict():
+        print("❌ Message in ROS2Message data did not encode as JSON")
+        return False
+
+    print(f"✅ Message in ROS2Message data packed with its schema ({len(payload)} vs {len(as_dict.to_bytes())} bytes)")
+    return True
+
+
+def test_request_timer():
+    """Test shared request deadlines for formation commands"""
+    print("\n=== Testing Request Timer ===")
+    
+    timer = RequestTimer()
+    fired = []
+    
+    # Cancelled timers never fire; the rest fire in deadline order
+    handles = [timer.schedule(0.05 + i * 0.01, lambda i=i: fired.append(i)) for i in range(10)]
+    for handle in handles[::2]:
+        timer.cancel(handle)
+    time.sleep(0.3)
+    
+    if fired != [1, 3, 5, 7, 9]:
+        print(f"❌ Unexpected timers fired: {fired}")
+        return False
+    
+    print("✅ Timers fired in order and cancelled timers were skipped")
+    
+    # Many in-flight requests must not start a thread each
+    bridge = ROS2Bridge("test_bridge", use_mock=True)
+    
+    try:
+        comm1 = ComponentCommunicator("component1", "test", bridge)
+        comm2 = ComponentCommunicator("component2", "test", bridge)
+        bridge.start()
+        
+        pattern1 = FormationCommandPattern(comm1, "test_requests", response_timeout=0.5, timer=timer)
+        pattern2 = FormationCommandPattern(comm2, "test_requests", timer=timer)
+        pattern2.register_request_handler("double", lambda source_id, data: {"value": data["value"] * 2})
+        
+        # Component without a pattern: requests to it are never answered
+        bridge.create_publisher("component3", CommunicationType.COORDINATION)
+        
+        # Warm up, so threads started lazily by the bridge are counted
+        pattern1.send_request_sync("component2", "double", {"value": 0})
+        thread_count = threading.active_count()
+        answered = [pattern1.send_request_async("component2", "double", {"value": i}) for i in range(100)]
+        unanswered = [pattern1.send_request_async("component2", "unknown_target", {}, timeout=0.2)
+                      for _ in range(100)]
+        timed_out = [pattern1.send_request_async("component3", "double", {"value": 0}, timeout=0.2)
+                     for _ in range(100)]
+        
+        if threading.active_count() > thread_count:
+            print(f"❌ Thread count grew from {thread_count} to {threading.active_count()}")
+            return False
+        
+        for i, future in enumerate(answered):
+            source_id, response = future.result(timeout=2.0)
+            if source_id != "component2" or response.get("value") != i * 2:
+                print(f"❌ Received different response: {response}")
+                return False
+        
+        for future in unanswered:
+            if "error" not in future.result(timeout=2.0)[1]:
+                print("❌ Unknown action was not answered with an error")
+                return False
+        
+        for future in timed_out:
+            try:
+                future.result(timeout=2.0)
+                print("❌ Unanswered request did not time out")
+                return False
+            except TimeoutError:
+                pass
+        
+        if pattern1.pending_requests:
+            print(f"❌ {len(pattern1.pending_requests)} requests still pending")
+            return False
+        
+        print(f"✅ 300 requests completed on a constant {thread_count} threads")
+        
+        # A cancelled blocking request fails like a timed out one
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(
+            pattern1.send_request_sync("component3", "double", {"value": 0}, timeout=5.0)))
+        waiter.start()
+        deadline = time.time() + 2.0
+        while not pattern1.pending_requests and time.time() < deadline:
+            time.sleep(0.01)
+        for request_id in list(pattern1.pending_requests):
+            pattern1.cancel_request(request_id)
+        waiter.join(timeout=2.0)
+        
+        if results != [(False, None)]:
+            print(f"❌ Cancelled request returned {results}")
+            return False
+        
+        print("✅ Cancelled request returned a failure")
+        return True
+    finally:
+        bridge.stop()
+
+
+def test_task_executor():
+    """Test priority preemption and deadline tracking in the task executor"""
+    print("\n=== Testing Task Executor ===")
+    
+    completed = []
+    executor = TaskExecutor(
+        lambda item: completed.append(item.payload),
+        num_workers=1,
+        cost_models={"survey": fixed_cost(0.3), "sensing": fixed_cost(0.01)}
+    )
+    executor.start()
+    
+    try:
+        # A long low-priority task is preempted by urgent sensing
+        executor.submit("survey", "survey", priority=0)
+        time.sleep(0.05)
+        executor.submit("sensing", "urgent", priority=3)
+        # Already past its deadline when submitted
+        executor.submit("sensing", "late", priority=1, deadline=time.time() - 1.0)
+        
+        if not executor.wait_idle(timeout=2.0):
+            print("❌ Executor did not become idle")
+            return False
+        
+        if completed != ["urgent", "late", "survey"]:
+            print(f"❌ Tasks completed in the wrong order: {completed}")
+            return False
+        
+        stats = executor.get_stats()
+        if stats["preemptions"] != 1 or stats["kinds"]["sensing"]["deadline_misses"] != 1:
+            print(f"❌ Unexpected executor statistics: {stats}")
+            return False
+        
+        # Preemption must not restart the survey's cost from zero
+        survey_busy = stats["kinds"]["survey"]["busy_seconds"]
+        if not 0.29 <= survey_busy < 0.4:
+            print(f"❌ Preempted task spent {survey_busy:.3f}s instead of 0.3s")
+            return False
+        
+        print("✅ Urgent task preempted the survey, which resumed with its remaining cost")
+        return True
+    finally:
+        executor.stop()
+
+
+def test_statement_routing():
+    """Test indexed routing of statements to role-scope receivers"""
+    print("\n=== Testing Statement Routing ===")
+    
+    bridge = ROS2Bridge("test_bridge", use_mock=True)
+    
+    try:
+        roles = ["coordinator", "relay", "relay", "endpoint", "endpoint", "endpoint"]
+        communicators = [ComponentCommunicator(f"sphere{i}", "sphere", bridge) for i in range(len(roles))]
+        received: Dict[str, List[str]] = {c.component_id: [] for c in communicators}
+        all_received = threading.Event()
+        
+        def make_handler(component_id):
+            def handler(source_id, statement):
+                received[component_id].append(statement.status)
+                if sum(len(r) for r in received.values()) == expected[0]:
+                    all_received.set()
+            return handler
+        
+        for comm, role in zip(communicators, roles):
+            for pattern in (CommunicationPattern.ROLE_SCOPE_FOCUSED, CommunicationPattern.STATEMENT_BROADCAST,
+                            CommunicationPattern.PROCESSING_SEQUENCE):
+                RoleScopeReceiver(
+                    communicator=comm,
+                    statement_type="formation_state",
+                    context_topic="formation",
+                    statement_handler=make_handler(comm.component_id),
+                    statement_class=ComponentState,
+                    role_in_formation=role,
+                    pattern=pattern
+                )
+        
+        bridge.start()
+        leader = communicators[0]
+        role_publisher = StatementPublisher(leader, "formation_state", "formation",
+                                            pattern=CommunicationPattern.ROLE_SCOPE_FOCUSED)
+        broadcast_publisher = StatementPublisher(leader, "formation_state", "formation",
+                                                 pattern=CommunicationPattern.STATEMENT_BROADCAST)
+        sequence_publisher = StatementPublisher(leader, "formation_state", "formation",
+                                                pattern=CommunicationPattern.PROCESSING_SEQUENCE)
+        for component_id in ["sphere5", "sphere3", "sphere1"]:
+            sequence_publisher.add_role_recipient(component_id)
+        
+        # 3 endpoints + 6 broadcast recipients + 3 components in sequence
+        expected = [12]
+        role_publisher.make_statement(ComponentState("leader", "sphere", status="role"), target_role="endpoint")
+        broadcast_publisher.make_statement(ComponentState("leader", "sphere", status="broadcast"))
+        sequence_publisher.make_statement(ComponentState("leader", "sphere", status="sequence"))
+        
+        if not all_received.wait(timeout=2.0):
+            print(f"❌ Not every statement was delivered: {received}")
+            return False
+        time.sleep(0.1)
+        
+        for comm, role in zip(communicators, roles):
+            statuses = received[comm.component_id]
+            expected_statuses = {"broadcast"}
+            if role == "endpoint":
+                expected_statuses.add("role")
+            if comm.component_id in ("sphere5", "sphere3", "sphere1"):
+                expected_statuses.add("sequence")
+            if sorted(statuses) != sorted(expected_statuses):
+                print(f"❌ {comm.component_id} ({role}) received {statuses}")
+                return False
+        
+        print("✅ Role-scoped, broadcast and sequence statements reached exactly their receivers")
+        return True
+    finally:
+        bridge.stop()
+
+
+def test_message_history():
+    """Test bounded per-topic message history, rates and replay"""
+    print("\n=== Testing Message History ===")
+    
+    import tempfile
+    spill_path = os.path.join(tempfile.mkdtemp(), "history.bin")
+    history = MessageHistory(capacity_per_topic=50, bucket_seconds=1.0, spill_path=spill_path)
+    
+    start = 1000.0
+    for i in range(1000):
+        history.append(f"sphere{i % 4}", "state" if i % 2 else "sensor", f"message {i}", timestamp=start + i * 0.01)
+    history.close()
+    
+    # Even components send sensor data and odd components state: 4 topics
+    if len(history) != 4 * 50:
+        print(f"❌ History holds {len(history)} entries instead of 200")
+        return False
+    
+    newest = history.query(limit=5)
+    if [m["content"] for m in newest] != [f"message {i}" for i in range(999, 994, -1)]:
+        print(f"❌ Unexpected newest messages: {newest}")
+        return False
+    
+    sphere1 = history.query(component_id="sphere1", message_type="state", limit=3)
+    if [m["content"] for m in sphere1] != ["message 997", "message 993", "message 989"]:
+        print(f"❌ Unexpected filtered messages: {sphere1}")
+        return False
+    
+    print("✅ Queries return the newest messages of each topic within capacity")
+    
+    rate = history.get_rate(window=5.0, now=start + 10.0)
+    aggregates = history.get_aggregates(window=10.0, now=start + 9.99)
+    if abs(rate - 100.0) > 1e-6 or [count for _, count in aggregates] != [100] * 10:
+        print(f"❌ Unexpected rate {rate} or aggregates {aggregates}")
+        return False
+    
+    print("✅ Rates and time-bucketed aggregates cover every message seen")
+    
+    replayed = list(replay_history(spill_path))
+    if len(replayed) != 1000 or replayed[-1]["content"] != "message 999":
+        print(f"❌ Replayed {len(replayed)} messages instead of 1000")
+        return False
+    
+    print(f"✅ Replayed 1000 messages from a {os.path.getsize(spill_path)} byte spill file")
+    
+    # A restart after a crash mid-record appends after the last whole record
+    with open(spill_path, "ab") as f:
+        f.write(b"torn record")
+    history = MessageHistory(spill_path=spill_path)
+    for i in range(10):
+        history.append("sphere0", "state", f"restarted {i}", timestamp=start + 20.0 + i)
+    history.close()
+    
+    replayed = list(replay_history(spill_path))
+    seqs = [m["seq"] for m in replayed]
+    if len(replayed) != 1010 or replayed[-1]["content"] != "restarted 9" or seqs != sorted(set(seqs)):
+        print(f"❌ Expected 1010 messages with increasing sequence numbers after a restart, got {len(replayed)}")
+        return False
+    
+    print("✅ Restart appended to the spill file after dropping a torn record")
+    return True
+
+
+def test_load_harness():
+    """Test recording and replaying synthetic component traffic"""
+    print("\n=== Testing Load Harness ===")
+    
+    import tempfile
+    trace_path = os.path.join(tempfile.mkdtemp(), "traffic.jsonl")
+    
+    recorded = run_load(components=3, duration=0.5, seed=7, record_path=trace_path)
+    if recorded["dropped"] != 0 or recorded["events"] == 0:
+        print(f"❌ Load run dropped {recorded['dropped']} of {recorded['events']} messages")
+        return False
+    
+    for kind, stats in recorded["kinds"].items():
+        if stats["received"] != stats["sent"] or stats["latency_ms"]["p99"] < stats["latency_ms"]["p50"]:
+            print(f"❌ Unexpected {kind} measurements: {stats}")
+            return False
+    
+    print(f"✅ Load run delivered {recorded['events']} messages at {recorded['throughput']:.0f} msg/s")
+    
+    trace = load_trace(trace_path)
+    if len(trace["events"]) != recorded["events"] or trace["components"] != ["sphere0", "sphere1", "sphere2"]:
+        print(f"❌ Trace holds {len(trace['events'])} events instead of {recorded['events']}")
+        return False
+    
+    replayed = run_replay(trace_path, speed=4.0)
+    sent = {kind: stats["sent"] for kind, stats in replayed["kinds"].items()}
+    if sent != {kind: stats["sent"] for kind, stats in recorded["kinds"].items()} or replayed["dropped"] != 0:
+        print(f"❌ Replay sent {sent} instead of the recorded traffic")
+        return False
+    
+    print(f"✅ Replayed the recorded traffic in {replayed['wall_seconds']:.2f}s")
+    return True
+
+
 def run_all_tests():
     """Run all ROS2 integration tests"""
     tests = [
         ("ROS2 Bridge", test_ros2_bridge),
         ("Component Communicator", test_component_communicator),
         ("Component Interface", test_component_interface),
-        ("Pub/Sub Patterns", test_pub_sub_patterns)
+        ("Pub/Sub Patterns", test_pub_sub_patterns),
+        ("Mock Transport", test_mock_transport),
+        ("Binary Codec", test_binary_codec),
+        ("Request Timer", test_request_timer),
+        ("Task Executor", test_task_executor),
+        ("Statement Routing", test_statement_routing),
+        ("Message History", test_message_history),
+        ("Load Harness", test_load_harness)
     ]
     
     success = True
@@ -0,0 +1,662 @@
+#!/usr/bin/env python
+"""
+Benchmark Script for the Claude Parallel Manager
+
+This script replays skewed task mixes through the Claude Parallel Manager's
+dispatch policies on a simulated clock and prints the results as JSON. Tasks
+are not executed; each one occupies its slot for a sampled duration, so runs
+are fast and repeatable.
+
+Policies compared:
+- head_of_line: the previous single priority queue, which requeued the head
+  task when its type was at max_instances and started nothing that round
+- dispatcher: per-type ready queues with deficit round robin and resource
+  admission (task_dispatcher.TaskDispatcher)
+
+The overhead benchmark runs a short task for real, one at a time, as a script
+child process and as a function task in the warm worker pool, and reports the
+latency per task.
+
+The admission benchmark replays a usage trace (recorded, or generated when none
+is given) as background load, adds bursts of tasks whose load ramps up after
+they start, and compares admission policies on a simulated clock:
+- tiers: the Claude Resource Monitor's high/medium/low max_tasks tiers with the
+  manager's snapshot threshold check and the dispatcher's static budget
+- predictive: the predictive allocator (predictive_allocator.PredictiveAllocator)
+  with its default capacity and safety factor
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import queue
+import random
+import argparse
+import datetime
+import tempfile
+import threading
+from typing import Dict, List, Any
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from task_dispatcher import TaskDispatcher
+from process_supervisor import ProcessSupervisor
+from function_worker_pool import FunctionWorkerPool
+from predictive_allocator import PredictiveAllocator
+
+# Task types as in the manager's default configuration
+TASK_TYPES = {
+    "blender_task": {"max_instances": 1, "resource_requirements": {"cpu": 40, "memory": 30}},
+    "simulation": {"max_instances": 2, "resource_requirements": {"cpu": 30, "memory": 25}},
+    "analysis": {"max_instances": 3, "resource_requirements": {"cpu": 20, "memory": 15}},
+    "utility": {"max_instances": 5, "resource_requirements": {"cpu": 10, "memory": 10}}
+}
+
+# Mean duration in seconds per task type
+MEAN_DURATIONS = {"blender_task": 30.0, "simulation": 20.0, "analysis": 8.0, "utility": 2.0}
+
+# Task type shares of each mix
+MIXES = {
+    "blender_heavy": {"blender_task": 0.3, "simulation": 0.1, "analysis": 0.2, "utility": 0.4},
+    "simulation_heavy": {"blender_task": 0.05, "simulation": 0.4, "analysis": 0.15, "utility": 0.4},
+    "balanced": {"blender_task": 0.1, "simulation": 0.2, "analysis": 0.3, "utility": 0.4}
+}
+
+MAX_PARALLEL_TASKS = 5
+TICK_SECONDS = 0.5  # main loop interval of the manager
+
+
+def generate_tasks(mix: Dict[str, float], count: int, arrival_rate: float, seed: int) -> List[Dict[str, Any]]:
+    """
+    Generate tasks with Poisson arrivals and exponential durations.
+
+    Args:
+        mix: Share of each task type
+        count: Number of tasks
+        arrival_rate: Tasks arriving per second
+        seed: Random seed
+
+    Returns:
+        List[Dict[str, Any]]: Tasks ordered by arrival
+    """
+    rng = random.Random(seed)
+    types = list(mix)
+    weights = [mix[task_type] for task_type in types]
+    tasks = []
+    now = 0.0
+    for i in range(count):
+        now += rng.expovariate(arrival_rate)
+        task_type = rng.choices(types, weights)[0]
+        tasks.append({
+            "id": f"task_{i}",
+            "task_type": task_type,
+            "priority": rng.randint(1, 9),
+            "added_time": now,
+            "duration": rng.expovariate(1.0 / MEAN_DURATIONS[task_type])
+        })
+    return tasks
+
+
+class HeadOfLineQueue:
+    """The previous dispatch policy: one priority queue, one attempt per round"""
+
+    def __init__(self):
+        self.queue = queue.PriorityQueue()
+
+    def push(self, task: Dict[str, Any], now: float):
+        self.queue.put((task["priority"], now, task["id"], task))
+
+    def start_round(self, active: List[Dict[str, Any]], now: float) -> List[Dict[str, Any]]:
+        if len(active) >= MAX_PARALLEL_TASKS or self.queue.empty():
+            return []
+        priority, _, task_id, task = self.queue.get()
+        active_count = sum(1 for t in active if t["task_type"] == task["task_type"])
+        if active_count >= TASK_TYPES[task["task_type"]]["max_instances"]:
+            self.queue.put((priority, now, task_id, task))
+            return []
+        return [task]
+
+    def finish(self, task: Dict[str, Any]):
+        pass
+
+
+class DispatcherQueue:
+    """The per-type dispatcher, starting every admissible task each round"""
+
+    def __init__(self):
+        self.dispatcher = TaskDispatcher(TASK_TYPES)
+
+    def push(self, task: Dict[str, Any], now: float):
+        self.dispatcher.push(task, task["priority"])
+
+    def start_round(self, active: List[Dict[str, Any]], now: float) -> List[Dict[str, Any]]:
+        started = []
+        while len(active) + len(started) < MAX_PARALLEL_TASKS:
+            next_task = self.dispatcher.next_task(now)
+            if next_task is None:
+                break
+            started.append(next_task[1])
+        return started
+
+    def finish(self, task: Dict[str, Any]):
+        self.dispatcher.release(task["task_type"])
+
+
+def simulate(policy, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Run tasks through a dispatch policy on a simulated clock.
+
+    Args:
+        policy: HeadOfLineQueue or DispatcherQueue
+        tasks: Tasks ordered by arrival
+
+    Returns:
+        Dict[str, Any]: Makespan, slot utilization and wait times
+    """
+    pending = list(tasks)
+    active: List[Dict[str, Any]] = []
+    waits: Dict[str, List[float]] = {task_type: [] for task_type in TASK_TYPES}
+    busy_slot_seconds = 0.0
+    backlog_seconds = 0.0
+    backlog_busy_slot_seconds = 0.0
+    now = 0.0
+    next_arrival = 0
+    started = 0
+
+    while started < len(tasks) or active:
+        # Completions since the last round
+        for task in [t for t in active if t["end_time"] <= now]:
+            active.remove(task)
+            policy.finish(task)
+
+        # Arrivals since the last round
+        while next_arrival < len(pending) and pending[next_arrival]["added_time"] <= now:
+            policy.push(dict(pending[next_arrival]), now)
+            next_arrival += 1
+
+        for task in policy.start_round(active, now):
+            task["end_time"] = now + task["duration"]
+            waits[task["task_type"]].append(now - task["added_time"])
+            active.append(task)
+            started += 1
+
+        busy_slot_seconds += len(active) * TICK_SECONDS
+        if started < next_arrival:
+            # Tasks are waiting, so idle slots are lost capacity
+            backlog_seconds += TICK_SECONDS
+            backlog_busy_slot_seconds += len(active) * TICK_SECONDS
+        now += TICK_SECONDS
+
+    all_waits = sorted(wait for type_waits in waits.values() for wait in type_waits)
+    return {
+        "makespan": now,
+        "utilization": busy_slot_seconds / (now * MAX_PARALLEL_TASKS) if now else 0.0,
+        "utilization_while_queued": (
+            backlog_busy_slot_seconds / (backlog_seconds * MAX_PARALLEL_TASKS) if backlog_seconds else 0.0
+        ),
+        "mean_wait": sum(all_waits) / len(all_waits) if all_waits else 0.0,
+        "p95_wait": all_waits[int(0.95 * (len(all_waits) - 1))] if all_waits else 0.0,
+        "mean_wait_by_type": {
+            task_type: sum(type_waits) / len(type_waits) if type_waits else 0.0
+            for task_type, type_waits in waits.items()
+        }
+    }
+
+
+def benchmark_dispatch(count: int = 500, arrival_rate: float = 0.2, seed: int = 0) -> Dict[str, Any]:
+    """
+    Compare the dispatch policies on each task mix.
+
+    Args:
+        count: Tasks per mix
+        arrival_rate: Tasks arriving per second
+        seed: Random seed
+
+    Returns:
+        Dict[str, Any]: Results per mix and policy
+    """
+    results = {}
+    for mix_name, mix in MIXES.items():
+        tasks = generate_tasks(mix, count, arrival_rate, seed)
+        results[mix_name] = {
+            "head_of_line": simulate(HeadOfLineQueue(), tasks),
+            "dispatcher": simulate(DispatcherQueue(), tasks)
+        }
+    return {
+        "benchmark": "dispatch",
+        "tasks_per_mix": count,
+        "arrival_rate": arrival_rate,
+        "max_parallel_tasks": MAX_PARALLEL_TASKS,
+        "mixes": results
+    }
+
+
+def _latency_stats(latencies: List[float]) -> Dict[str, float]:
+    """Mean, p50, p95 and max of latencies in milliseconds"""
+    latencies = sorted(latency * 1000 for latency in latencies)
+    return {
+        "mean_ms": sum(latencies) / len(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+        "max_ms": latencies[-1]
+    }
+
+
+def benchmark_overhead(count: int = 50) -> Dict[str, Any]:
+    """
+    Measure per-task latency of script tasks and warm function tasks.
+
+    Both run the same short task (json.dumps of a small dict) one at a time,
+    from submission to the result being reported.
+
+    Args:
+        count: Tasks per backend
+
+    Returns:
+        Dict[str, Any]: Latency statistics per backend
+    """
+    done = threading.Event()
+
+    # Script tasks: a child interpreter per task
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+        f.write("import json\nprint(json.dumps({'a': 1}))\n")
+        script_path = f.name
+    supervisor = ProcessSupervisor(lambda supervised: done.set())
+    supervisor.start()
+    script_latencies = []
+    try:
+        for i in range(count):
+            done.clear()
+            start = time.perf_counter()
+            supervisor.spawn(f"script_{i}", [sys.executable, script_path])
+            done.wait()
+            script_latencies.append(time.perf_counter() - start)
+    finally:
+        supervisor.stop()
+        os.remove(script_path)
+
+    # Function tasks: warm workers, started before timing
+    pool = FunctionWorkerPool(lambda result: done.set(), num_workers=1, preload=["json"])
+    pool.start()
+    function_latencies = []
+    try:
+        for i in range(count):
+            done.clear()
+            start = time.perf_counter()
+            pool.submit(f"function_{i}", "json.dumps", [{"a": 1}])
+            done.wait()
+            function_latencies.append(time.perf_counter() - start)
+    finally:
+        pool.stop()
+
+    return {
+        "benchmark": "overhead",
+        "tasks": count,
+        "script": _latency_stats(script_latencies),
+        "function_pool": _latency_stats(function_latencies)
+    }
+
+
+# Actual (cpu, memory) load per task type, in percent of the machine; the
+# configured resource_requirements overstate some types and understate others
+TASK_LOADS = {"blender_task": (45.0, 20.0), "simulation": (25.0, 15.0), "analysis": (12.0, 8.0), "utility": (4.0, 3.0)}
+
+ADMISSION_MAX_TASKS = 10  # Highest max_tasks of the resource monitor's tiers
+SAMPLE_SECONDS = 5  # Resource monitor sampling interval
+STRATEGY_SECONDS = 15  # Resource monitor allocation interval
+TASK_RAMP_SECONDS = 6  # Seconds before a started task reaches its full load
+OVERLOAD_PERCENT = 90  # Critical threshold of the resource monitor
+CONTENTION_LOSS = 0.5  # Share of the CPU demand above 100% lost to contention
+SWAP_PERCENT = 95  # Memory usage at which tasks slow down by half
+CAPACITY = {"cpu": 80, "memory": 85}  # The manager's resource_thresholds, for the tier logic
+
+
+def load_trace(path: str) -> List[Dict[str, float]]:
+    """
+    Load a recorded usage trace.
+
+    Accepts JSON lines with cpu_percent and memory_percent (hardware monitor
+    logs), a JSON file with a "usage_history" list (resource monitor history),
+    or the output of query_usage_history.
+
+    Args:
+        path: Trace file
+
+    Returns:
+        List[Dict[str, float]]: Samples with "offset" in seconds, "cpu" and "memory"
+    """
+    with open(path, "r") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    if isinstance(data, dict) and "timestamps" in data:
+        fields = data["fields"]
+        records = [
+            {"timestamp": t, "cpu_percent": cpu, "memory_percent": memory}
+            for t, cpu, memory in zip(data["timestamps"], fields["cpu_percent"]["mean"], fields["memory_percent"]["mean"])
+        ]
+    elif isinstance(data, dict):
+        records = data.get("usage_history", [])
+    else:
+        records = data
+
+    samples = []
+    for i, record in enumerate(records):
+        timestamp = record.get("timestamp", i * SAMPLE_SECONDS)
+        if isinstance(timestamp, str):
+            timestamp = datetime.datetime.fromisoformat(timestamp).timestamp()
+        samples.append({"offset": timestamp, "cpu": record.get("cpu_percent", 0), "memory": record.get("memory_percent", 0)})
+    if not samples:
+        raise ValueError(f"No usage samples in {path}")
+
+    start = samples[0]["offset"]
+    for sample in samples:
+        sample["offset"] -= start
+    return samples
+
+
+def generate_trace(seconds: int, seed: int) -> List[Dict[str, float]]:
+    """
+    Generate a background usage trace: a slow CPU cycle with noise and spikes,
+    and slowly drifting memory.
+
+    Args:
+        seconds: Trace length
+        seed: Random seed
+
+    Returns:
+        List[Dict[str, float]]: Samples with "offset" in seconds, "cpu" and "memory"
+    """
+    rng = random.Random(seed)
+    samples = []
+    spike = 0.0
+    memory = 35.0
+    for t in range(0, seconds, SAMPLE_SECONDS):
+        if rng.random() < 0.02:
+            spike = rng.uniform(15, 35)
+        spike *= 0.8
+        memory = min(60.0, max(25.0, memory + rng.gauss(0, 0.5)))
+        cpu = 25 + 15 * math.sin(2 * math.pi * t / 1800) + rng.gauss(0, 3) + spike
+        samples.append({"offset": t, "cpu": max(0.0, cpu), "memory": memory})
+    return samples
+
+
+def generate_bursts(count: int, burst_interval: float, seed: int) -> List[Dict[str, Any]]:
+    """
+    Generate tasks that arrive in bursts of 3 to 8.
+
+    Args:
+        count: Number of tasks
+        burst_interval: Mean seconds between bursts
+        seed: Random seed
+
+    Returns:
+        List[Dict[str, Any]]: Tasks ordered by arrival, with their actual load
+    """
+    rng = random.Random(seed)
+    mix = MIXES["balanced"]
+    types = list(mix)
+    weights = [mix[task_type] for task_type in types]
+    tasks = []
+    now = 0.0
+    while len(tasks) < count:
+        now += rng.expovariate(1.0 / burst_interval)
+        for _ in range(min(rng.randint(3, 8), count - len(tasks))):
+            task_type = rng.choices(types, weights)[0]
+            cpu, memory = TASK_LOADS[task_type]
+            tasks.append({
+                "id": f"task_{len(tasks)}",
+                "task_type": task_type,
+                "priority": rng.randint(1, 9),
+                "added_time": now,
+                "work": rng.expovariate(1.0 / MEAN_DURATIONS[task_type]) * 2,
+                "cpu": cpu * rng.uniform(0.7, 1.3),
+                "memory": memory * rng.uniform(0.7, 1.3)
+            })
+    return tasks
+
+
+def _tier_max_tasks(cpu: float, memory: float, previous: int) -> int:
+    """max_tasks of the Claude Resource Monitor's tiers with its default thresholds"""
+    if cpu >= 90 or memory >= 90:
+        return 0
+    if cpu >= 80 or memory >= 80:
+        max_tasks = 3 if cpu < 85 and memory < 85 else 2
+        return max(max_tasks, previous - 1) if previous > 0 else max_tasks
+    if cpu >= 50 or memory >= 60:
+        ratio = max((cpu - 50) / 30, (memory - 60) / 20)
+        max_tasks = 4 if ratio > 0.7 else 5 if ratio > 0.3 else 6
+        return max(min(max_tasks, previous + 1), previous - 1) if previous > 0 else max_tasks
+    max_tasks = 10 if cpu < 10 and memory < 10 else 8
+    return min(max_tasks, previous + 2) if previous > 0 else max_tasks
+
+
+class TierAdmission:
+    """The previous admission: snapshot tiers, threshold check and static budget"""
+
+    def __init__(self):
+        self.dispatcher = TaskDispatcher(TASK_TYPES)
+        self.max_tasks = 5
+
+    def observe(self, sample: Dict[str, float], now: float):
+        self.sample = sample
+        if now % STRATEGY_SECONDS == 0:
+            self.max_tasks = _tier_max_tasks(sample["cpu"], sample["memory"], self.max_tasks)
+
+    def start_round(self, active: List[Dict[str, Any]], now: float) -> List[Dict[str, Any]]:
+        if self.sample["cpu"] >= CAPACITY["cpu"] or self.sample["memory"] >= CAPACITY["memory"]:
+            return []
+        started = []
+        while len(active) + len(started) < min(self.max_tasks, ADMISSION_MAX_TASKS):
+            next_task = self.dispatcher.next_task(now)
+            if next_task is None:
+                break
+            started.append(next_task[1])
+        return started
+
+    def finish(self, task: Dict[str, Any], now: float):
+        self.dispatcher.release(task["task_type"])
+
+
+class PredictiveAdmission:
+    """The predictive allocator as the dispatcher's admission check"""
+
+    def __init__(self):
+        self.allocator = PredictiveAllocator(TASK_TYPES, ramp_seconds=TASK_RAMP_SECONDS)
+        self.dispatcher = TaskDispatcher(TASK_TYPES, admission=self.allocator.admit)
+
+    def observe(self, sample: Dict[str, float], now: float):
+        self.allocator.observe({"cpu_percent": sample["cpu"], "memory_percent": sample["memory"]}, now)
+
+    def start_round(self, active: List[Dict[str, Any]], now: float) -> List[Dict[str, Any]]:
+        started = []
+        while len(active) + len(started) < ADMISSION_MAX_TASKS:
+            next_task = self.dispatcher.next_task(now)
+            if next_task is None:
+                break
+            task = next_task[1]
+            self.allocator.task_started(task["id"], task["task_type"], now)
+            started.append(task)
+        return started
+
+    def finish(self, task: Dict[str, Any], now: float):
+        self.dispatcher.release(task["task_type"])
+        self.allocator.task_finished(task["id"])
+        duration = now - task["start_time"]
+        self.allocator.record_run(task["task_type"], task["cpu_used"] / duration, task["memory"], duration)
+
+
+def simulate_admission(policy, tasks: List[Dict[str, Any]], trace: List[Dict[str, float]]) -> Dict[str, Any]:
+    """
+    Run bursts of tasks over a background trace with an admission policy, one second per step.
+
+    Tasks ramp up to their load over TASK_RAMP_SECONDS. When CPU demand exceeds
+    the machine, running tasks share what is left, less CONTENTION_LOSS of the
+    excess demand, and they run at half speed while memory is above SWAP_PERCENT.
+
+    Args:
+        policy: TierAdmission or PredictiveAdmission
+        tasks: Tasks ordered by arrival
+        trace: Background usage samples, repeated if shorter than the run
+
+    Returns:
+        Dict[str, Any]: Overload, utilization, makespan and wait times; useful
+                        CPU counts background load and task work actually done
+    """
+    trace_length = trace[-1]["offset"] + SAMPLE_SECONDS
+    trace_index = 0
+    active: List[Dict[str, Any]] = []
+    waits = []
+    next_arrival = 0
+    finished = 0
+    overloaded = False
+    overload_events = 0
+    overload_seconds = 0
+    cpu_total = 0.0
+    useful_total = 0.0
+    backlog_seconds = 0
+    backlog_cpu_total = 0.0
+    backlog_useful_total = 0.0
+    now = 0
+
+    while finished < len(tasks):
+        # Background load at this point of the trace
+        offset = now % trace_length
+        if offset < trace[trace_index]["offset"]:
+            trace_index = 0
+        while trace_index + 1 < len(trace) and trace[trace_index + 1]["offset"] <= offset:
+            trace_index += 1
+        background = trace[trace_index]
+
+        # Task load, ramping up after each start
+        ramps = [min(1.0, (now - task["start_time"] + 1) / TASK_RAMP_SECONDS) for task in active]
+        task_cpu = sum(task["cpu"] * ramp for task, ramp in zip(active, ramps))
+        cpu_demand = background["cpu"] + task_cpu
+        memory = background["memory"] + sum(task["memory"] * ramp for task, ramp in zip(active, ramps))
+        speed = 1.0
+        if cpu_demand > 100 and task_cpu:
+            available = 100 - background["cpu"] - CONTENTION_LOSS * (cpu_demand - 100)
+            speed = max(0.0, available) / task_cpu
+        if memory >= SWAP_PERCENT:
+            speed *= 0.5
+        cpu = min(100.0, cpu_demand)
+        useful = min(100.0, background["cpu"]) + task_cpu * speed
+
+        # Overload: above the critical threshold
+        if cpu_demand >= OVERLOAD_PERCENT or memory >= OVERLOAD_PERCENT:
+            overload_seconds += 1
+            if not overloaded:
+                overload_events += 1
+            overloaded = True
+        else:
+            overloaded = False
+        cpu_total += cpu
+        useful_total += useful
+
+        # Progress and completions
+        for task, ramp in zip(list(active), ramps):
+            task["work"] -= speed
+            task["cpu_used"] += task["cpu"] * ramp * speed
+            if task["work"] <= 0:
+                active.remove(task)
+                policy.finish(task, now + 1)
+                finished += 1
+
+        now += 1
+
+        # The resource monitor samples the machine
+        if now % SAMPLE_SECONDS == 0:
+            policy.observe({"cpu": cpu, "memory": memory}, now)
+        elif now == 1:
+            policy.observe({"cpu": cpu, "memory": memory}, now)
+
+        # Arrivals and dispatch
+        while next_arrival < len(tasks) and tasks[next_arrival]["added_time"] <= now:
+            task = dict(tasks[next_arrival])
+            policy.dispatcher.push(task, task["priority"])
+            next_arrival += 1
+        for task in policy.start_round(active, now):
+            task["start_time"] = now
+            task["cpu_used"] = 0.0
+            waits.append(now - task["added_time"])
+            active.append(task)
+
+        if finished + len(active) < next_arrival:
+            backlog_seconds += 1
+            backlog_cpu_total += cpu
+            backlog_useful_total += useful
+
+    waits.sort()
+    return {
+        "makespan": now,
+        "overload_events": overload_events,
+        "overload_seconds": overload_seconds,
+        "mean_cpu": cpu_total / now,
+        "mean_cpu_while_queued": backlog_cpu_total / backlog_seconds if backlog_seconds else 0.0,
+        "mean_useful_cpu": useful_total / now,
+        "mean_useful_cpu_while_queued": backlog_useful_total / backlog_seconds if backlog_seconds else 0.0,
+        "mean_wait": sum(waits) / len(waits),
+        "p95_wait": waits[int(0.95 * (len(waits) - 1))]
+    }
+
+
+def benchmark_admission(count: int = 300, burst_interval: float = 60.0, seed: int = 0,
+                        trace_path: str = None) -> Dict[str, Any]:
+    """
+    Compare the tier and predictive admission policies over a usage trace.
+
+    Args:
+        count: Number of tasks
+        burst_interval: Mean seconds between bursts of tasks
+        seed: Random seed
+        trace_path: Recorded usage trace (None to generate one)
+
+    Returns:
+        Dict[str, Any]: Results per policy
+    """
+    tasks = generate_bursts(count, burst_interval, seed)
+    trace = load_trace(trace_path) if trace_path else generate_trace(int(count * burst_interval / 5), seed)
+    return {
+        "benchmark": "admission",
+        "tasks": count,
+        "burst_interval": burst_interval,
+        "trace": trace_path or "generated",
+        "trace_samples": len(trace),
+        "overload_percent": OVERLOAD_PERCENT,
+        "tiers": simulate_admission(TierAdmission(), tasks, trace),
+        "predictive": simulate_admission(PredictiveAdmission(), tasks, trace)
+    }
+
+
+def main():
+    """Run the benchmark and print the results as JSON"""
+    parser = argparse.ArgumentParser(description="Claude Parallel Manager dispatch benchmark")
+    parser.add_argument("--tasks", type=int, default=500, help="Tasks per mix")
+    parser.add_argument("--arrival-rate", type=float, default=0.2, help="Tasks arriving per second")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--benchmark", choices=["dispatch", "overhead", "admission", "all"], default="all",
+                        help="Benchmark to run")
+    parser.add_argument("--overhead-tasks", type=int, default=50, help="Tasks per backend in the overhead benchmark")
+    parser.add_argument("--admission-tasks", type=int, default=300, help="Tasks in the admission benchmark")
+    parser.add_argument("--burst-interval", type=float, default=60.0, help="Mean seconds between bursts of tasks")
+    parser.add_argument("--trace", help="Recorded usage trace for the admission benchmark (default: generated)")
+    args = parser.parse_args()
+
+    results = []
+    if args.benchmark in ("dispatch", "all"):
+        results.append(benchmark_dispatch(args.tasks, args.arrival_rate, args.seed))
+    if args.benchmark in ("overhead", "all"):
+        results.append(benchmark_overhead(args.overhead_tasks))
+    if args.benchmark in ("admission", "all"):
+        results.append(benchmark_admission(args.admission_tasks, args.burst_interval, args.seed, args.trace))
+
+    print(json.dumps(results[0] if len(results) == 1 else results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
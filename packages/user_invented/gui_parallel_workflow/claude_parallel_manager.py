@@ -19,12 +19,10 @@ import os
 import sys
 import json
 import time
-import queue
 import logging
 import threading
-import subprocess
 from pathlib import Path
-from typing import Dict, List, Tuple, Any, Optional, Set, Union
+from typing import Dict, List, Any, Optional, Set, Union
 import datetime
 
 # Try to import psutil for better system monitoring
@@ -34,6 +32,12 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+from task_dispatcher import TaskDispatcher
+from process_supervisor import ProcessSupervisor, SupervisedProcess, DEFAULT_OUTPUT_LIMIT, KILL_GRACE_SECONDS
+from function_worker_pool import FunctionWorkerPool, FunctionResult, DEFAULT_MAX_TASKS_PER_WORKER
+from task_archive import TaskArchive, DEFAULT_RECENT_LIMIT, DEFAULT_RETENTION_DAYS
+from predictive_allocator import PredictiveAllocator, DEFAULT_CAPACITY, DEFAULT_HORIZON, DEFAULT_SAFETY_FACTOR
+
 # Base directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -59,18 +63,59 @@ class ClaudeParallelManager:
         self.config_path = os.path.join(BASE_DIR, config_path)
         self.config = self._load_config()
         
-        # Task system
-        self.task_queue = queue.PriorityQueue()
+        # Admission from forecast load and learned task profiles
+        self.allocator = None
+        if self.config.get("predictive_admission", False):
+            capacity = self.config.get("admission_capacity", {})
+            self.allocator = PredictiveAllocator(
+                self.config.get("task_types", {}),
+                capacity={
+                    "cpu": capacity.get("cpu_percent", DEFAULT_CAPACITY["cpu"]),
+                    "memory": capacity.get("memory_percent", DEFAULT_CAPACITY["memory"])
+                },
+                horizon=self.config.get("forecast_horizon", DEFAULT_HORIZON),
+                safety_factor=self.config.get("forecast_safety_factor", DEFAULT_SAFETY_FACTOR)
+            )
+        
+        # Task system: a ready queue per task type
+        self.dispatcher = TaskDispatcher(
+            self.config.get("task_types", {}),
+            default_task_type=self.config.get("default_task_type", "utility"),
+            resource_budget=self.config.get("resource_budget"),
+            admission=self.allocator.admit if self.allocator else None
+        )
         self.active_tasks = {}
-        self.completed_tasks = []
-        self.task_history = []
         self.task_lock = threading.Lock()
         
+        # Finished tasks: recent ones in memory, all of them in an indexed archive
+        self.task_archive = TaskArchive(
+            os.path.join(BASE_DIR, self.config.get("task_archive_path", "claude_task_archive.db")),
+            recent_limit=self.config.get("recent_completed_limit", DEFAULT_RECENT_LIMIT),
+            retention_days=self.config.get("archive_retention_days", DEFAULT_RETENTION_DAYS)
+        )
+        self.completed_tasks = self.task_archive.recent  # Bounded deque of recent finished tasks
+        
         # Thread management
         self.main_thread = None
         self.running = False
-        self.threads = []
-        self.thread_stop_flags = {}
+        
+        # Function tasks run in warm worker processes, started by the first function task
+        self.function_pool = FunctionWorkerPool(
+            self._on_function_result,
+            num_workers=self.config.get("function_workers", self.config.get("max_parallel_tasks", 5)),
+            max_tasks_per_worker=self.config.get("function_worker_max_tasks", DEFAULT_MAX_TASKS_PER_WORKER),
+            memory_limit_mb=self.config.get("function_memory_limit_mb"),
+            preload=self.config.get("function_preload", [])
+        )
+        
+        # Script tasks run as child processes watched by one supervisor thread
+        self.supervisor = ProcessSupervisor(
+            self._on_process_exit,
+            output_limit=self.config.get("output_limit", DEFAULT_OUTPUT_LIMIT)
+        )
+        
+        # Set when a task is queued or finishes, waking the main loop to dispatch
+        self.dispatch_event = threading.Event()
         
         # Monitoring
         self.monitor_thread = None
@@ -83,6 +128,9 @@ class ClaudeParallelManager:
             "disk_percent": 0,
         }
         
+        # Usage of running script tasks, learned into the allocator's profiles
+        self.task_usage: Dict[str, Dict[str, Any]] = {}
+        
         logger.info("Claude Parallel Manager initialized")
         
     def _load_config(self) -> Dict[str, Any]:
@@ -105,6 +153,14 @@ class ClaudeParallelManager:
                 "disk_percent": 90,
             },
             "monitoring_interval": 5,
+            "resource_budget": {"cpu": 100, "memory": 100},  # Used when predictive_admission is off
+            "predictive_admission": False,  # Admit from forecast load and learned profiles (predictive_allocator)
+            "admission_capacity": {  # Projected load plus new work may reach this
+                "cpu_percent": DEFAULT_CAPACITY["cpu"],
+                "memory_percent": DEFAULT_CAPACITY["memory"]
+            },
+            "forecast_horizon": DEFAULT_HORIZON,  # Seconds ahead the load is forecast
+            "forecast_safety_factor": DEFAULT_SAFETY_FACTOR,  # Forecast errors kept free as headroom
             "task_types": {
                 "blender_task": {
                     "max_instances": 1,
@@ -133,6 +189,15 @@ class ClaudeParallelManager:
             "default_task_type": "utility",
             "fallback_mode": "sequential",
             "task_timeout": 3600,  # 1 hour in seconds
+            "output_limit": DEFAULT_OUTPUT_LIMIT,  # Bytes of stdout/stderr kept per task
+            "function_workers": 5,
+            "function_worker_max_tasks": DEFAULT_MAX_TASKS_PER_WORKER,  # Tasks before a worker is replaced
+            "function_memory_limit_mb": None,  # Memory cap per function task
+            "function_preload": [],  # Modules imported once before the workers start
+            "task_archive_path": "claude_task_archive.db",
+            "recent_completed_limit": DEFAULT_RECENT_LIMIT,  # Finished tasks kept in memory
+            "archive_retention_days": DEFAULT_RETENTION_DAYS,
+            "status_recent_tasks": 10,  # Finished tasks included in get_status
             "check_other_agents": True
         }
         
@@ -173,9 +238,9 @@ class ClaudeParallelManager:
             
         logger.info(f"Adding task {task_id} to queue with priority {priority}")
         
-        # Add to priority queue - (priority, time added, task data)
-        # Time added is used as a secondary sort key to ensure FIFO within same priority
-        self.task_queue.put((priority, time.time(), task_data))
+        # Add to the task type's ready queue, FIFO within the same priority
+        self.dispatcher.push(task_data, priority)
+        self.dispatch_event.set()
         
         return task_id
     
@@ -217,14 +282,60 @@ class ClaudeParallelManager:
                 self.current_resources["memory_percent"] = 50
                 self.current_resources["disk_percent"] = 50
             
+            if self.allocator:
+                self._sample_task_usage()
+                self.allocator.observe(self.current_resources)
+            
             # Log current resource usage
             logger.debug(f"CPU: {self.current_resources['cpu_percent']}%, "
                        f"Memory: {self.current_resources['memory_percent']}%, "
                        f"Disk: {self.current_resources['disk_percent']}%")
             
+            # Queued tasks held back by the resource thresholds may fit now
+            if len(self.dispatcher):
+                self.dispatch_event.set()
+            
             # Sleep for the monitoring interval
             time.sleep(interval)
     
+    def _sample_task_usage(self):
+        """Read the CPU time and memory of running script tasks"""
+        if not PSUTIL_AVAILABLE:
+            return
+        
+        with self.task_lock:
+            pids = {task_id: task_data.get("pid") for task_id, task_data in self.active_tasks.items()}
+        
+        for task_id, pid in pids.items():
+            if not pid:
+                continue
+            usage = self.task_usage.get(task_id)
+            try:
+                if usage is None or usage["process"].pid != pid:
+                    usage = self.task_usage[task_id] = {
+                        "process": psutil.Process(pid), "cpu_time": 0.0, "peak_memory_percent": 0.0
+                    }
+                process = usage["process"]
+                times = process.cpu_times()
+                usage["cpu_time"] = times.user + times.system
+                usage["peak_memory_percent"] = max(usage["peak_memory_percent"], process.memory_percent())
+            except psutil.Error:
+                pass
+    
+    def _record_task_usage(self, task_data: Dict[str, Any]):
+        """Learn a finished task's usage into its type's profile"""
+        usage = self.task_usage.pop(task_data.get("id"), None)
+        duration = task_data.get("duration", 0)
+        if task_data.get("status") == "stopped" or duration <= 0:
+            return
+        
+        cpu_percent = memory_percent = None
+        if usage and usage["cpu_time"]:
+            # Percent of the whole machine, like the system samples
+            cpu_percent = min(100.0, 100.0 * usage["cpu_time"] / duration / (os.cpu_count() or 1))
+            memory_percent = usage["peak_memory_percent"]
+        self.allocator.record_run(task_data.get("task_type"), cpu_percent, memory_percent, duration)
+    
     def start(self):
         """Start the Claude Parallel Manager main thread"""
         if self.running:
@@ -238,6 +349,7 @@ class ClaudeParallelManager:
         
         self.running = True
         self.start_monitoring()
+        self.supervisor.start()
         
         self.main_thread = threading.Thread(target=self._main_loop, daemon=True)
         self.main_thread.start()
@@ -258,12 +370,16 @@ class ClaudeParallelManager:
         self._stop_all_tasks()
         
         # Wait for main thread to complete
+        self.dispatch_event.set()
         if self.main_thread and self.main_thread.is_alive():
             self.main_thread.join(timeout=5.0)
         
         # Stop monitoring
         self.stop_monitoring()
         
+        # Write buffered finished tasks to the archive
+        self.task_archive.flush()
+        
         logger.info("Claude Parallel Manager stopped")
         return True
     
@@ -288,6 +404,7 @@ class ClaudeParallelManager:
             self.config["max_parallel_tasks"] = 1
             self.running = True
             self.start_monitoring()
+            self.supervisor.start()
             
             self.main_thread = threading.Thread(target=self._main_loop, daemon=True)
             self.main_thread.start()
@@ -316,14 +433,14 @@ class ClaudeParallelManager:
                 if current_tasks < max_tasks:
                     # Check resource limits
                     if self._check_resources_available():
-                        # Start a new task if one is available
-                        self._start_next_task()
+                        # Start queued tasks while there are free slots
+                        while len(self.active_tasks) < max_tasks and self._start_next_task():
+                            pass
                 
-                # Check for completed tasks
-                self._check_completed_tasks()
-                
-                # Sleep a short time to prevent CPU hogging
-                time.sleep(0.5)
+                # Wait until a task is queued or finishes, or the resource monitor
+                # takes a new sample; the timeout is only a safety net
+                self.dispatch_event.wait(self.config.get("monitoring_interval", 5))
+                self.dispatch_event.clear()
                 
             except Exception as e:
                 logger.error(f"Error in main loop: {e}")
@@ -334,6 +451,10 @@ class ClaudeParallelManager:
         Check if there are enough system resources available to start a new task.
         Returns True if resources are available, False otherwise.
         """
+        if self.allocator:
+            # Forecast load plus the running tasks' profiles, not a snapshot
+            return self.allocator.has_headroom()
+        
         # Get resource thresholds
         thresholds = self.config.get("resource_thresholds", {})
         cpu_threshold = thresholds.get("cpu_percent", 80)
@@ -349,26 +470,17 @@ class ClaudeParallelManager:
         
         return cpu_available and memory_available
     
-    def _start_next_task(self):
-        """Get and start the next task from the queue if available"""
+    def _start_next_task(self) -> bool:
+        """
+        Start the next task the dispatcher admits.
+        Returns True if a task was started, False if no queued task can start now.
+        """
         try:
-            # Try to get a task with a short timeout
-            priority, _, task_data = self.task_queue.get(timeout=0.1)
-            
-            # Check if we're at the limit for this task type
-            task_type = task_data.get("task_type", self.config.get("default_task_type", "utility"))
-            type_limits = self.config.get("task_types", {}).get(task_type, {})
-            max_instances = type_limits.get("max_instances", 5)
-            
-            # Count active tasks of this type
-            active_count = sum(1 for t in self.active_tasks.values() 
-                             if t.get("task_type") == task_type)
-            
-            if active_count >= max_instances:
-                # We're at the limit for this task type, put it back in the queue
-                self.task_queue.put((priority, time.time(), task_data))
-                logger.debug(f"Reached limit for task type {task_type}, delaying task {task_data.get('id')}")
-                return
+            # Skips task types at max_instances or without room in the resource budget
+            next_task = self.dispatcher.next_task()
+            if next_task is None:
+                return False
+            priority, task_data = next_task
             
             # Start the task
             task_id = task_data.get("id")
@@ -378,281 +490,237 @@ class ClaudeParallelManager:
             task_data["status"] = "running"
             task_data["start_time"] = time.time()
             
-            # Start task in a separate thread
-            thread_stop_flag = threading.Event()
-            self.thread_stop_flags[task_id] = thread_stop_flag
-            
-            thread = threading.Thread(
-                target=self._execute_task,
-                args=(task_data, thread_stop_flag),
-                daemon=True
-            )
-            thread.start()
-            
-            # Store thread and task data
             with self.task_lock:
-                self.threads.append(thread)
                 self.active_tasks[task_id] = task_data
+            if self.allocator:
+                self.allocator.task_started(task_id, task_data.get("task_type"), task_data["start_time"])
+            
+            script_path = task_data.get("script_path")
+            if script_path and os.path.exists(script_path):
+                # Run as a child process watched by the supervisor
+                self._start_script(task_data)
+            elif "function" in task_data:
+                # Run in a warm worker process
+                self._start_function(task_data)
+            else:
+                self._finish_task(task_data, "failed", error="No valid script_path or function specified in task")
             
-            # Task is now being processed
-            self.task_queue.task_done()
+            return True
             
-        except queue.Empty:
-            # No tasks in queue
-            pass
         except Exception as e:
             logger.error(f"Error starting next task: {e}")
+            return False
     
-    def _execute_task(self, task_data: Dict[str, Any], stop_flag: threading.Event):
-        """Execute a task in a separate thread"""
+    def _start_script(self, task_data: Dict[str, Any]):
+        """Start a script task as a supervised child process"""
         task_id = task_data.get("id")
-        task_type = task_data.get("task_type")
-        script_path = task_data.get("script_path")
+        script_path = task_data["script_path"]
         task_timeout = task_data.get("timeout", self.config.get("task_timeout", 3600))
         
+        logger.info(f"Running script: {script_path}")
         try:
-            logger.info(f"Executing task {task_id} of type {task_type}")
-            
-            # Set start time for timeout checking
-            start_time = time.time()
-            result = None
-            error = None
-            
-            # Check task type and execute accordingly
-            if script_path and os.path.exists(script_path):
-                # Execute a Python script
-                result, error = self._run_script(script_path, stop_flag, task_timeout)
-            elif "function" in task_data:
-                # Execute a function if provided
-                func_name = task_data["function"]
-                func_args = task_data.get("args", [])
-                func_kwargs = task_data.get("kwargs", {})
-                
-                try:
-                    # Find and execute the function
-                    result = self._execute_function(func_name, func_args, func_kwargs)
-                except Exception as e:
-                    error = str(e)
-            else:
-                error = "No valid script_path or function specified in task"
-            
-            # Check if task was stopped
-            if stop_flag.is_set():
-                task_data["status"] = "stopped"
-                logger.info(f"Task {task_id} was stopped")
-            else:
-                # Task completed
-                end_time = time.time()
-                duration = end_time - start_time
-                
-                task_data["status"] = "completed" if error is None else "failed"
-                task_data["end_time"] = end_time
-                task_data["duration"] = duration
-                task_data["result"] = result
-                task_data["error"] = error
-                
-                logger.info(f"Task {task_id} completed with status {task_data['status']} in {duration:.2f} seconds")
-            
-            # Add to completed tasks
-            with self.task_lock:
-                if task_id in self.active_tasks:
-                    del self.active_tasks[task_id]
-                self.completed_tasks.append(task_data)
-                self.task_history.append(task_data)
-                
-                # Limit history size
-                max_history = self.config.get("max_history", 100)
-                if len(self.task_history) > max_history:
-                    self.task_history = self.task_history[-max_history:]
-                
+            supervised = self.supervisor.spawn(task_id, [sys.executable, script_path], timeout=task_timeout)
+            task_data["pid"] = supervised.pid
         except Exception as e:
-            logger.error(f"Error executing task {task_id}: {e}")
-            
-            # Mark task as failed
-            task_data["status"] = "failed"
-            task_data["error"] = str(e)
-            task_data["end_time"] = time.time()
-            
-            # Update task lists
-            with self.task_lock:
-                if task_id in self.active_tasks:
-                    del self.active_tasks[task_id]
-                self.completed_tasks.append(task_data)
-                self.task_history.append(task_data)
+            logger.error(f"Error starting task {task_id}: {e}")
+            self._finish_task(task_data, "failed", error=str(e))
     
-    def _run_script(self, script_path: str, stop_flag: threading.Event, timeout: int) -> Tuple[Any, Optional[str]]:
-        """Run a Python script with the given timeout"""
-        logger.info(f"Running script: {script_path}")
+    def _on_process_exit(self, supervised: SupervisedProcess):
+        """Record a finished script task (called on the supervisor thread)"""
+        with self.task_lock:
+            task_data = self.active_tasks.get(supervised.task_id)
+        if task_data is None:
+            return
         
-        try:
-            # Create a process to run the script
-            process = subprocess.Popen(
-                ["python", script_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            # Wait for the process to complete or timeout
-            start_time = time.time()
-            while process.poll() is None:
-                # Check if we should stop
-                if stop_flag.is_set():
-                    process.terminate()
-                    return None, "Task was stopped"
-                
-                # Check timeout
-                if time.time() - start_time > timeout:
-                    process.terminate()
-                    return None, f"Task exceeded timeout of {timeout} seconds"
-                
-                # Sleep a bit to prevent CPU hogging
-                time.sleep(0.1)
-            
-            # Get output and error
-            stdout, stderr = process.communicate()
-            
-            if process.returncode == 0:
-                return stdout, None
-            else:
-                return stdout, stderr
-                
-        except Exception as e:
-            return None, str(e)
+        stdout = supervised.stdout.getvalue()
+        stderr = supervised.stderr.getvalue()
+        task_data["returncode"] = supervised.returncode
+        
+        if supervised.stopped:
+            self._finish_task(task_data, "stopped", stdout, "Task was stopped")
+        elif supervised.timed_out:
+            self._finish_task(task_data, "failed", stdout, f"Task exceeded timeout of {supervised.timeout} seconds")
+        elif supervised.returncode == 0:
+            self._finish_task(task_data, "completed", stdout)
+        else:
+            self._finish_task(task_data, "failed", stdout, stderr or f"Script exited with code {supervised.returncode}")
+    
+    def _finish_task(self, task_data: Dict[str, Any], status: str, result: Any = None, error: Optional[str] = None):
+        """Move a task from the active to the completed tasks and wake the main loop"""
+        task_id = task_data.get("id")
+        end_time = time.time()
+        duration = end_time - task_data.get("start_time", end_time)
+        
+        task_data["status"] = status
+        task_data["end_time"] = end_time
+        task_data["duration"] = duration
+        task_data["result"] = result
+        task_data["error"] = error
+        
+        logger.info(f"Task {task_id} finished with status {status} in {duration:.2f} seconds")
+        
+        with self.task_lock:
+            if task_id in self.active_tasks:
+                del self.active_tasks[task_id]
+                self.dispatcher.release(task_data.get("task_type"))
+            self.task_archive.add(task_data)
+        
+        if self.allocator:
+            self.allocator.task_finished(task_id)
+            self._record_task_usage(task_data)
+        
+        # The freed slot can be used right away
+        self.dispatch_event.set()
     
-    def _execute_function(self, func_name: str, args: List[Any], kwargs: Dict[str, Any]) -> Any:
-        """Execute a named function with the given arguments"""
+    def _start_function(self, task_data: Dict[str, Any]):
+        """Queue a function task in the worker pool"""
+        task_id = task_data.get("id")
+        func_name = task_data["function"]
         logger.info(f"Executing function: {func_name}")
         
-        # This would require a more sophisticated implementation to dynamically
-        # import and execute functions. For now, just return a placeholder result.
-        return f"Function {func_name} would be executed with args={args}, kwargs={kwargs}"
+        try:
+            self.function_pool.submit(
+                task_id,
+                func_name,
+                task_data.get("args", []),
+                task_data.get("kwargs", {}),
+                timeout=task_data.get("timeout", self.config.get("task_timeout", 3600)),
+                memory_limit_mb=task_data.get("memory_limit_mb")
+            )
+        except Exception as e:
+            logger.error(f"Error starting task {task_id}: {e}")
+            self._finish_task(task_data, "failed", error=f"Arguments could not be pickled: {e}")
     
-    def _check_completed_tasks(self):
-        """Check for completed tasks and perform any necessary cleanup"""
-        # Clean up finished threads
+    def _on_function_result(self, function_result: FunctionResult):
+        """Record a finished function task (called on the worker pool thread)"""
         with self.task_lock:
-            active_threads = []
-            for thread in self.threads:
-                if thread.is_alive():
-                    active_threads.append(thread)
-            self.threads = active_threads
+            task_data = self.active_tasks.get(function_result.task_id)
+        if task_data is None:
+            return
+        
+        task_data["worker_pid"] = function_result.worker_pid
+        if function_result.traceback:
+            task_data["traceback"] = function_result.traceback
+        
+        if function_result.cancelled:
+            self._finish_task(task_data, "stopped", error=function_result.error)
+        elif function_result.ok:
+            self._finish_task(task_data, "completed", function_result.result)
+        else:
+            self._finish_task(task_data, "failed", error=function_result.error)
     
     def _stop_all_tasks(self):
         """Stop all running tasks"""
         logger.info("Stopping all running tasks")
         
-        # Set all stop flags
-        for task_id, stop_flag in self.thread_stop_flags.items():
-            stop_flag.set()
-        
-        # Wait for tasks to complete
-        for thread in self.threads:
-            if thread.is_alive():
-                thread.join(timeout=2.0)
+        # Terminate script tasks and function workers; their tasks are recorded as stopped
+        self.supervisor.stop(timeout=KILL_GRACE_SECONDS + 2.0)
+        self.function_pool.stop()
         
         # Clear active tasks
         with self.task_lock:
             for task_id, task_data in self.active_tasks.items():
                 task_data["status"] = "stopped"
-                self.completed_tasks.append(task_data)
+                self.task_archive.add(task_data)
+                self.dispatcher.release(task_data.get("task_type"))
+                if self.allocator:
+                    self.allocator.task_finished(task_id)
             self.active_tasks.clear()
+            self.task_usage.clear()
     
     def get_status(self) -> Dict[str, Any]:
-        """Get the current status of the Claude Parallel Manager"""
+        """
+        Get the current status of the Claude Parallel Manager.
+        Completed task counts cover this run; archived counts also include
+        earlier runs. The size does not grow with the number of finished
+        tasks; use query_completed_tasks for older ones.
+        """
+        completed = self.task_archive.get_summary(self.config.get("status_recent_tasks", 10))
         with self.task_lock:
             status = {
                 "running": self.running,
                 "resources": self.current_resources,
                 "active_tasks": len(self.active_tasks),
-                "queued_tasks": self.task_queue.qsize(),
-                "completed_tasks": len(self.completed_tasks),
+                "queued_tasks": len(self.dispatcher),
+                "completed_tasks": completed["total"],
+                "completed_by_status": completed["by_status"],
+                "completed_by_type": completed["by_type"],
+                "archived_tasks": completed["archived"]["total"],
+                "archived_by_status": completed["archived"]["by_status"],
+                "archived_by_type": completed["archived"]["by_type"],
                 "active_task_ids": list(self.active_tasks.keys()),
                 "task_details": {
                     "active": list(self.active_tasks.values()),
-                    "completed": self.completed_tasks[-10:] if self.completed_tasks else []
+                    "completed": completed["recent"]
                 },
                 "config": {
                     "max_parallel_tasks": self.config.get("max_parallel_tasks", 5),
                     "resource_thresholds": self.config.get("resource_thresholds", {})
-                }
+                },
+                "dispatcher": self.dispatcher.get_stats(),
+                "allocator": self.allocator.get_stats() if self.allocator else None,
+                "function_pool": self.function_pool.get_stats()
             }
             return status
     
     def get_task_status(self, task_id: str) -> Dict[str, Any]:
         """Get the status of a specific task"""
-        # Check active tasks
+        # Check active tasks, with the output of a running script so far
         if task_id in self.active_tasks:
-            return self.active_tasks[task_id]
-        
-        # Check completed tasks
-        for task in self.completed_tasks:
-            if task.get("id") == task_id:
-                return task
+            task_data = self.active_tasks[task_id]
+            output = self.supervisor.get_output(task_id)
+            if output is not None:
+                return dict(task_data, **output)
+            return task_data
         
-        # Check task history
-        for task in self.task_history:
-            if task.get("id") == task_id:
-                return task
+        # Check finished tasks, in memory first and then in the archive
+        task_data = self.task_archive.get(task_id)
+        if task_data is not None:
+            return task_data
         
         return {"error": "Task not found"}
     
+    def query_completed_tasks(self, task_type: str = None, status: str = None,
+                              start: float = None, end: float = None,
+                              offset: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """
+        Get finished tasks from the archive, most recently finished first.
+        Filters by task type, status and finish time range (Unix timestamps);
+        returns the "total" number of matches and one page of "tasks".
+        """
+        return self.task_archive.query(task_type, status, start, end, offset, limit)
+    
     def cancel_task(self, task_id: str) -> bool:
         """Cancel a running or queued task"""
         logger.info(f"Attempting to cancel task {task_id}")
         
         # Check if task is active
         if task_id in self.active_tasks:
-            # Set stop flag if available
-            if task_id in self.thread_stop_flags:
-                self.thread_stop_flags[task_id].set()
-                logger.info(f"Stop flag set for task {task_id}")
+            # Terminate a running script
+            if self.supervisor.terminate(task_id):
+                logger.info(f"Terminating process of task {task_id}")
+                return True
+            
+            # Kill the worker running a function task
+            if self.function_pool.cancel(task_id):
+                logger.info(f"Cancelling function task {task_id}")
                 return True
         
         # Check if task is in queue
-        new_queue = queue.PriorityQueue()
-        found = False
+        task_data = self.dispatcher.cancel(task_id)
+        if task_data is None:
+            return False
         
-        while not self.task_queue.empty():
-            try:
-                priority, time_added, task_data = self.task_queue.get()
-                if task_data.get("id") == task_id:
-                    # Found the task, mark it as cancelled
-                    task_data["status"] = "cancelled"
-                    self.completed_tasks.append(task_data)
-                    found = True
-                    logger.info(f"Cancelled queued task {task_id}")
-                else:
-                    # Put it back in the new queue
-                    new_queue.put((priority, time_added, task_data))
-            except queue.Empty:
-                break
-        
-        # Replace queue with new_queue
-        self.task_queue = new_queue
-        
-        return found
+        task_data["status"] = "cancelled"
+        self.task_archive.add(task_data)
+        logger.info(f"Cancelled queued task {task_id}")
+        return True
     
     def get_queue_status(self) -> List[Dict[str, Any]]:
         """Get a list of tasks in the queue"""
         items = []
         
-        # Create a copy of the queue
-        temp_queue = queue.PriorityQueue()
-        queue_copy = []
-        
-        # Extract items from the original queue
-        while not self.task_queue.empty():
-            try:
-                item = self.task_queue.get()
-                queue_copy.append(item)
-            except queue.Empty:
-                break
-        
-        # Put items back into the original queue and create result list
-        for priority, time_added, task_data in queue_copy:
-            self.task_queue.put((priority, time_added, task_data))
-            
+        for priority, time_added, task_data in self.dispatcher.queued_tasks():
             # Add task info to result
             items.append({
                 "id": task_data.get("id"),
@@ -689,7 +757,21 @@ class ClaudeParallelManager:
         
         # Add to queue
         return self.add_task(task_data, priority)
-    
+
+    def add_function_task(self, function: str, args: List[Any] = None, kwargs: Dict[str, Any] = None,
+                          priority: int = 5, task_type: str = None) -> str:
+        """Add a function task, named by dotted path ("package.module.func"), to the queue"""
+        task_data = {
+            "function": function,
+            "args": list(args or []),
+            "kwargs": dict(kwargs or {}),
+            "task_type": task_type or self.config.get("default_task_type", "utility"),
+            "name": function
+        }
+
+        # Add to queue
+        return self.add_task(task_data, priority)
+
     def add_batch_tasks(self, tasks: List[Dict[str, Any]]) -> List[str]:
         """Add multiple tasks to the queue in a batch"""
         task_ids = []
@@ -0,0 +1,536 @@
+#!/usr/bin/env python
+"""
+Function Worker Pool for the Claude Parallel Manager
+
+This module runs the Claude Parallel Manager's function tasks in a pool of warm
+worker processes. Workers are started ahead of time and reused, so a task pays
+neither interpreter startup nor import time: each worker imports the modules in
+the preload list when it starts and keeps every function it has resolved. Tasks
+name their function by dotted path ("package.module.func" or
+"package.module:Class.method") and their arguments are pickled.
+
+Each task can have a timeout, after which its worker is killed and replaced, and
+a memory cap, applied in the worker as an address space limit. Workers are
+recycled after a configurable number of tasks so leaks in task code do not
+accumulate.
+
+Workers are this file run as a script, talking to the pool over their stdin and
+stdout with length-prefixed pickles; output printed by task code goes to the
+worker's stderr. One pool thread dispatches tasks and enforces timeouts, and one
+reader thread per worker (not per task) forwards its replies.
+"""
+
+import os
+import sys
+import time
+import queue
+import pickle
+import struct
+import logging
+import importlib
+import threading
+import traceback
+import subprocess
+from collections import deque
+from typing import Dict, List, Any, Optional, Callable
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+logger = logging.getLogger("ClaudeParallelManager.FunctionPool")
+
+# Tasks a worker runs before it is replaced
+DEFAULT_MAX_TASKS_PER_WORKER = 100
+
+# Seconds a stopping worker gets before it is killed
+WORKER_STOP_GRACE_SECONDS = 2.0
+
+# Message framing: 8-byte big-endian length, then the pickle
+_HEADER = struct.Struct("!Q")
+
+
+def _send_message(stream, message: Any):
+    """Write a length-prefixed pickle"""
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    stream.write(_HEADER.pack(len(data)) + data)
+    stream.flush()
+
+
+def _recv_message(stream) -> Any:
+    """Read a length-prefixed pickle, raising EOFError when the stream ends"""
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise EOFError
+    (length,) = _HEADER.unpack(header)
+    data = stream.read(length)
+    if len(data) < length:
+        raise EOFError
+    return pickle.loads(data)
+
+
+def _resolve_function(func_path: str) -> Callable:
+    """
+    Import the function named by a dotted path
+
+    Args:
+        func_path: "package.module.func" or "package.module:Class.method"
+
+    Returns:
+        Callable: The function
+    """
+    if ":" in func_path:
+        module_name, attr_path = func_path.split(":", 1)
+    else:
+        module_name, _, attr_path = func_path.rpartition(".")
+    if not module_name or not attr_path:
+        raise ValueError(f"Invalid function path: {func_path}")
+
+    target = importlib.import_module(module_name)
+    for attr in attr_path.split("."):
+        target = getattr(target, attr)
+    if not callable(target):
+        raise TypeError(f"{func_path} is not callable")
+    return target
+
+
+def _set_memory_limit(limit_bytes: Optional[int]):
+    """Set the soft address space limit of this process (None for the hard limit)"""
+    if not RESOURCE_AVAILABLE:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if limit_bytes is None:
+        resource.setrlimit(resource.RLIMIT_AS, (hard, hard))
+    else:
+        if hard != resource.RLIM_INFINITY:
+            limit_bytes = min(limit_bytes, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, hard))
+
+
+def _worker_main():
+    """
+    Worker process: run tasks received on stdin until told to stop
+
+    The first message is {"sys_path", "preload"}. Each request after it is
+    (task_id, func_path, pickled (args, kwargs), memory limit in bytes) and each
+    reply is (task_id, ok, result or error, traceback, recycle). None stops the
+    worker.
+    """
+    requests = sys.stdin.buffer
+    replies = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    # Output printed by task code must not end up in the reply stream
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    init = _recv_message(requests)
+    sys.path[:] = init["sys_path"]
+    for module_name in init["preload"]:
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            pass  # Reported when a task uses it
+
+    functions: Dict[str, Callable] = {}
+
+    while True:
+        try:
+            request = _recv_message(requests)
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+
+        task_id, func_path, payload, memory_limit = request
+        recycle = False
+        try:
+            func = functions.get(func_path)
+            if func is None:
+                func = functions[func_path] = _resolve_function(func_path)
+            args, kwargs = pickle.loads(payload)
+
+            _set_memory_limit(memory_limit)
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                if memory_limit is not None:
+                    _set_memory_limit(None)
+
+            reply = (task_id, True, result, None, False)
+        except BaseException as e:
+            # A worker that ran out of memory may be left in a bad state
+            recycle = isinstance(e, MemoryError)
+            reply = (task_id, False, f"{type(e).__name__}: {e}", traceback.format_exc(), recycle)
+
+        try:
+            _send_message(replies, reply)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            _send_message(replies, (task_id, False, f"Result could not be pickled: {e}", None, recycle))
+
+
+class FunctionResult:
+    """Outcome of a function task"""
+
+    def __init__(self, task_id: str, ok: bool, result: Any = None, error: Optional[str] = None,
+                 traceback: Optional[str] = None, started_at: Optional[float] = None,
+                 worker_pid: Optional[int] = None):
+        self.task_id = task_id
+        self.ok = ok
+        self.result = result
+        self.error = error
+        self.traceback = traceback
+        self.finished_at = time.time()
+        self.started_at = started_at or self.finished_at
+        self.worker_pid = worker_pid
+        self.timed_out = False
+        self.cancelled = False
+
+    @property
+    def duration(self) -> float:
+        """Seconds from dispatch to the worker to the result"""
+        return self.finished_at - self.started_at
+
+
+class _Worker:
+    """A worker process and the task it is running"""
+
+    def __init__(self, process: subprocess.Popen):
+        self.process = process
+        self.pid = process.pid
+        self.tasks_run = 0
+        self.task: Optional[Dict[str, Any]] = None
+        self.deadline: Optional[float] = None
+
+
+class FunctionWorkerPool:
+    """
+    Pool of warm worker processes running function tasks
+    """
+
+    def __init__(self, on_result: Callable[[FunctionResult], None], num_workers: int = 4,
+                 max_tasks_per_worker: int = DEFAULT_MAX_TASKS_PER_WORKER,
+                 memory_limit_mb: Optional[float] = None, preload: Optional[List[str]] = None):
+        """
+        Initialize the pool
+
+        Args:
+            on_result: Called on the pool thread with each task's FunctionResult
+            num_workers: Number of worker processes
+            max_tasks_per_worker: Tasks a worker runs before it is replaced (0 for no limit)
+            memory_limit_mb: Default memory cap per task in MB (None for no cap)
+            preload: Modules each worker imports when it starts
+        """
+        self.on_result = on_result
+        self.num_workers = max(1, num_workers)
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.memory_limit_mb = memory_limit_mb
+        self.preload = list(preload or [])
+
+        self.lock = threading.Lock()
+        self.workers: List[_Worker] = []
+        self.pending: deque = deque()  # Task requests waiting for a free worker
+        self.cancel_requests = set()
+
+        # Replies from the worker reader threads, and wakeups for submit/cancel/stop
+        self.events: queue.Queue = queue.Queue()
+
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+        # Statistics
+        self.tasks_completed = 0
+        self.tasks_failed = 0
+        self.workers_started = 0
+        self.workers_recycled = 0
+
+    def start(self):
+        """Start the workers and the pool thread (done by the first submit if not called)"""
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+            for _ in range(self.num_workers):
+                self.workers.append(self._spawn_worker())
+        self.thread = threading.Thread(target=self._run, name="function-pool", daemon=True)
+        self.thread.start()
+        logger.info(f"Started {self.num_workers} function workers")
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop the pool, reporting queued and running tasks as stopped
+
+        Args:
+            timeout: Seconds to wait for the pool thread
+        """
+        if not self.running:
+            return
+        self.running = False
+        self.events.put(("wake", None, None))
+        if self.thread:
+            self.thread.join(timeout=timeout)
+
+    def _spawn_worker(self) -> _Worker:
+        """Start a worker process and its reader thread"""
+        process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE
+        )
+        _send_message(process.stdin, {"sys_path": list(sys.path), "preload": self.preload})
+        worker = _Worker(process)
+        threading.Thread(target=self._read_replies, args=(worker,), name="function-worker-reader", daemon=True).start()
+        self.workers_started += 1
+        return worker
+
+    def _read_replies(self, worker: _Worker):
+        """Forward a worker's replies to the pool thread (reader thread)"""
+        try:
+            while True:
+                self.events.put(("reply", worker, _recv_message(worker.process.stdout)))
+        except Exception:
+            self.events.put(("exit", worker, None))
+
+    def _stop_worker(self, worker: _Worker, kill: bool = False):
+        """Stop a worker process, killing it if asked or if it does not exit"""
+        if not kill:
+            try:
+                _send_message(worker.process.stdin, None)
+            except OSError:
+                kill = True
+        if kill:
+            worker.process.kill()
+        try:
+            worker.process.wait(WORKER_STOP_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            worker.process.kill()
+            worker.process.wait()
+        try:
+            worker.process.stdin.close()
+        except OSError:
+            pass
+
+    def submit(self, task_id: str, func_path: str, args: Optional[List[Any]] = None,
+               kwargs: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None,
+               memory_limit_mb: Optional[float] = None):
+        """
+        Queue a function task, starting the pool if it is not running
+
+        Args:
+            task_id: ID of the task
+            func_path: Dotted path of the function
+            args: Positional arguments (must be picklable)
+            kwargs: Keyword arguments (must be picklable)
+            timeout: Seconds before the task's worker is killed (None for no timeout)
+            memory_limit_mb: Memory cap in MB (None for the pool default)
+
+        Raises:
+            pickle.PicklingError: If the arguments cannot be pickled
+        """
+        payload = pickle.dumps((list(args or []), dict(kwargs or {})), protocol=pickle.HIGHEST_PROTOCOL)
+        if memory_limit_mb is None:
+            memory_limit_mb = self.memory_limit_mb
+
+        with self.lock:
+            self.pending.append({
+                "task_id": task_id,
+                "func_path": func_path,
+                "payload": payload,
+                "timeout": timeout,
+                "memory_limit": int(memory_limit_mb * 1024 * 1024) if memory_limit_mb else None
+            })
+        if not self.running:
+            self.start()
+        self.events.put(("wake", None, None))
+
+    def cancel(self, task_id: str) -> bool:
+        """
+        Cancel a queued or running task; a running task's worker is killed
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            bool: True if the task was queued or running
+        """
+        with self.lock:
+            known = any(request["task_id"] == task_id for request in self.pending) or any(
+                worker.task is not None and worker.task["task_id"] == task_id for worker in self.workers
+            )
+            if not known:
+                return False
+            self.cancel_requests.add(task_id)
+        self.events.put(("wake", None, None))
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics
+
+        Returns:
+            Dict[str, Any]: Worker and task counts
+        """
+        with self.lock:
+            return {
+                "workers": len(self.workers),
+                "busy_workers": sum(1 for worker in self.workers if worker.task is not None),
+                "pending": len(self.pending),
+                "tasks_completed": self.tasks_completed,
+                "tasks_failed": self.tasks_failed,
+                "workers_started": self.workers_started,
+                "workers_recycled": self.workers_recycled
+            }
+
+    def _report(self, result: FunctionResult):
+        """Pass a result to the callback (pool thread)"""
+        if result.ok:
+            self.tasks_completed += 1
+        else:
+            self.tasks_failed += 1
+        try:
+            self.on_result(result)
+        except Exception as e:
+            logger.error(f"Error handling result of task {result.task_id}: {e}")
+
+    def _replace_worker(self, worker: _Worker, kill: bool):
+        """Stop a worker and start a fresh one in its place (pool thread)"""
+        self._stop_worker(worker, kill=kill)
+        replacement = self._spawn_worker()
+        with self.lock:
+            self.workers[self.workers.index(worker)] = replacement
+        self.workers_recycled += 1
+
+    def _finish_worker_task(self, worker: _Worker, result: FunctionResult, recycle: bool = False, kill: bool = False):
+        """Report a worker's task and replace the worker if needed (pool thread)"""
+        with self.lock:
+            worker.task = None
+            worker.deadline = None
+            worker.tasks_run += 1
+            self.cancel_requests.discard(result.task_id)
+        self._report(result)
+
+        if kill or recycle or (self.max_tasks_per_worker and worker.tasks_run >= self.max_tasks_per_worker):
+            self._replace_worker(worker, kill=kill)
+
+    def _dispatch(self):
+        """Hand pending tasks to idle workers (pool thread)"""
+        while True:
+            with self.lock:
+                if not self.pending:
+                    return
+                worker = next((w for w in self.workers if w.task is None), None)
+                if worker is None:
+                    return
+                request = self.pending.popleft()
+                cancelled = request["task_id"] in self.cancel_requests
+                if cancelled:
+                    self.cancel_requests.discard(request["task_id"])
+                else:
+                    request["started_at"] = time.time()
+                    worker.task = request
+                    worker.deadline = time.monotonic() + request["timeout"] if request["timeout"] else None
+
+            if cancelled:
+                result = FunctionResult(request["task_id"], False, error="Task was cancelled")
+                result.cancelled = True
+                self._report(result)
+                continue
+
+            try:
+                _send_message(worker.process.stdin, (
+                    request["task_id"], request["func_path"], request["payload"], request["memory_limit"]
+                ))
+            except OSError:
+                # The worker died while idle; its exit event reports the task
+                pass
+
+    def _kill_task(self, worker: _Worker, error: str, timed_out: bool = False, cancelled: bool = False):
+        """Kill a worker's running task and report it (pool thread)"""
+        task = worker.task
+        result = FunctionResult(task["task_id"], False, error=error, started_at=task["started_at"],
+                                worker_pid=worker.pid)
+        result.timed_out = timed_out
+        result.cancelled = cancelled
+        self._finish_worker_task(worker, result, kill=True)
+
+    def _check_workers(self):
+        """Apply cancellations and timeouts to running tasks (pool thread)"""
+        now = time.monotonic()
+        for worker in list(self.workers):
+            task = worker.task
+            if task is None:
+                continue
+            if task["task_id"] in self.cancel_requests:
+                logger.info(f"Killing worker of cancelled task {task['task_id']}")
+                self._kill_task(worker, "Task was cancelled", cancelled=True)
+            elif worker.deadline is not None and now >= worker.deadline:
+                logger.warning(f"Task {task['task_id']} exceeded timeout of {task['timeout']} seconds")
+                self._kill_task(worker, f"Task exceeded timeout of {task['timeout']} seconds", timed_out=True)
+
+    def _handle_event(self, kind: str, worker: Optional[_Worker], message: Any):
+        """Handle a reply or exit from a worker (pool thread)"""
+        if worker not in self.workers:
+            return  # Already replaced
+
+        task = worker.task
+        if kind == "reply":
+            if task is None:
+                return
+            task_id, ok, value, tb, recycle = message
+            if ok:
+                result = FunctionResult(task_id, True, result=value, started_at=task["started_at"],
+                                        worker_pid=worker.pid)
+            else:
+                result = FunctionResult(task_id, False, error=value, traceback=tb,
+                                        started_at=task["started_at"], worker_pid=worker.pid)
+            self._finish_worker_task(worker, result, recycle=recycle)
+        elif kind == "exit":
+            if task is None:
+                logger.warning(f"Function worker {worker.pid} exited, replacing it")
+                self._replace_worker(worker, kill=True)
+                return
+            code = worker.process.poll()
+            result = FunctionResult(task["task_id"], False, error=f"Worker exited unexpectedly (exit code {code})",
+                                    started_at=task["started_at"], worker_pid=worker.pid)
+            self._finish_worker_task(worker, result, kill=True)
+
+    def _run(self):
+        """Pool thread: dispatch tasks, collect results, enforce timeouts"""
+        while self.running:
+            self._check_workers()
+            self._dispatch()
+
+            deadlines = [worker.deadline for worker in self.workers if worker.deadline is not None]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+
+            try:
+                kind, worker, message = self.events.get(timeout=timeout)
+            except queue.Empty:
+                continue
+            if kind != "wake":
+                self._handle_event(kind, worker, message)
+
+        self._shutdown()
+
+    def _shutdown(self):
+        """Report remaining tasks as stopped and stop all workers (pool thread)"""
+        with self.lock:
+            pending, self.pending = list(self.pending), deque()
+        for request in pending:
+            result = FunctionResult(request["task_id"], False, error="Task was stopped")
+            result.cancelled = True
+            self._report(result)
+
+        for worker in self.workers:
+            if worker.task is not None:
+                result = FunctionResult(worker.task["task_id"], False, error="Task was stopped",
+                                        started_at=worker.task["started_at"], worker_pid=worker.pid)
+                result.cancelled = True
+                self._report(result)
+            self._stop_worker(worker, kill=worker.task is not None)
+        with self.lock:
+            self.workers = []
+        logger.info("Function workers stopped")
+
+
+if __name__ == "__main__":
+    _worker_main()
@@ -399,7 +399,7 @@ class ClaudeParallelGUI:
                     
                     self.active_tasks_var.set(str(status.get("active_tasks", 0)))
                     self.queued_tasks_var.set(str(status.get("queued_tasks", 0)))
-                    self.completed_tasks_var.set(str(len(status.get("task_details", {}).get("completed", []))))
+                    self.completed_tasks_var.set(str(status.get("completed_tasks", 0)))
                     
                     self.cpu_var.set(f"{status.get('resources', {}).get('cpu_percent', 0):.1f}%")
                     self.memory_var.set(f"{status.get('resources', {}).get('memory_percent', 0):.1f}%")
@@ -0,0 +1,476 @@
+#!/usr/bin/env python
+"""
+Process Supervisor for the Claude Parallel Manager
+
+This module runs the Claude Parallel Manager's script tasks as child processes
+and watches all of them from a single thread. The thread waits in a selector on
+every child's stdout and stderr pipes and, on Linux, on a pidfd per child that
+becomes readable when the child exits. Without pidfd support, children are
+polled for their exit on a timer instead: often once their pipes have closed,
+and less often while a pipe is still open, since a background grandchild may
+hold it open long after the child has exited. On Windows, where pipes
+cannot be registered with a selector, each pipe is drained by a small reader
+thread that hands end-of-stream back to the supervisor thread.
+
+Output is streamed into bounded per-task buffers that keep the most recent
+bytes, and per-task timeouts are kept in a heap, so supervising a task costs no
+thread and no polling. The exit callback runs as soon as a child finishes, which
+lets the manager dispatch the next task immediately.
+"""
+
+import os
+import heapq
+import logging
+import socket
+import selectors
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional, Callable
+
+logger = logging.getLogger("ClaudeParallelManager.Supervisor")
+
+# Bytes of output kept per stream and task
+DEFAULT_OUTPUT_LIMIT = 256 * 1024
+
+# Seconds between SIGTERM and SIGKILL for a child that is being stopped
+KILL_GRACE_SECONDS = 5.0
+
+# Poll intervals for reaping children when pidfd is not available: children
+# whose pipes have closed are about to exit, the others may run for a long time
+REAP_POLL_SECONDS = 0.005
+EXIT_POLL_SECONDS = 0.1
+
+_READ_SIZE = 65536
+
+PIDFD_AVAILABLE = hasattr(os, "pidfd_open")
+
+# Pipes can only be registered with a selector on POSIX
+SELECTABLE_PIPES = os.name != "nt"
+
+
+class BoundedOutput:
+    """Output buffer that keeps the last limit bytes of a stream"""
+
+    def __init__(self, limit: int = DEFAULT_OUTPUT_LIMIT):
+        self.limit = limit
+        self.buffer = bytearray()
+        self.total_bytes = 0
+
+    def write(self, data: bytes):
+        """Append data, discarding the oldest bytes beyond the limit"""
+        self.total_bytes += len(data)
+        self.buffer += data
+        if len(self.buffer) > self.limit:
+            del self.buffer[:len(self.buffer) - self.limit]
+
+    @property
+    def truncated_bytes(self) -> int:
+        """Number of bytes discarded from the start of the stream"""
+        return self.total_bytes - len(self.buffer)
+
+    def getvalue(self) -> str:
+        """Get the kept output as text"""
+        text = self.buffer.decode("utf-8", errors="replace")
+        if self.truncated_bytes:
+            return f"[... {self.truncated_bytes} bytes truncated ...]\n{text}"
+        return text
+
+
+class SupervisedProcess:
+    """A child process and its captured output"""
+
+    def __init__(self, task_id: str, process: subprocess.Popen, timeout: Optional[float], output_limit: int):
+        self.task_id = task_id
+        self.process = process
+        self.pid = process.pid
+        self.started_at = time.time()
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.timeout = timeout
+        self.stdout = BoundedOutput(output_limit)
+        self.stderr = BoundedOutput(output_limit)
+        self.open_streams = 0
+        self.pidfd: Optional[int] = None
+        self.exited = False
+        self.returncode: Optional[int] = None
+        self.timed_out = False
+        self.stopped = False
+        self.kill_deadline: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        """Seconds from start to exit (or to now while running)"""
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class ProcessSupervisor:
+    """
+    Single-threaded supervisor for task child processes
+    """
+
+    def __init__(self, on_exit: Callable[[SupervisedProcess], None],
+                 output_limit: int = DEFAULT_OUTPUT_LIMIT, name: str = "process-supervisor"):
+        """
+        Initialize the supervisor
+
+        Args:
+            on_exit: Called on the supervisor thread with each finished process
+            output_limit: Bytes of output kept per stream and task
+            name: Name of the supervisor thread
+        """
+        self.on_exit = on_exit
+        self.output_limit = output_limit
+        self.name = name
+
+        self.selector = selectors.DefaultSelector()
+        self.processes: Dict[str, SupervisedProcess] = {}
+        self.lock = threading.Lock()
+        self.requests: List[tuple] = []  # ("add", process), ("terminate", task_id) or ("eof", process)
+        self.timers: List[tuple] = []  # (deadline, sequence, task_id)
+        self.timer_sequence = 0
+        self.reap_pending: Dict[str, SupervisedProcess] = {}  # Polled for exit (no pidfd)
+        self.next_exit_poll = 0.0  # When children with open pipes are next polled
+
+        # Socket pair waking the selector when requests arrive (selectable on every platform)
+        self.wake_read, self.wake_write = socket.socketpair()
+        self.wake_read.setblocking(False)
+        self.wake_write.setblocking(False)
+        self.selector.register(self.wake_read, selectors.EVENT_READ, ("wake", None))
+
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the supervisor thread"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop supervising, terminating any remaining children
+
+        Args:
+            timeout: Seconds to wait for the supervisor thread
+        """
+        if not self.running:
+            return
+        self.terminate_all()
+        self.running = False
+        self._wake()
+        if self.thread:
+            self.thread.join(timeout=timeout)
+
+    def _wake(self):
+        """Wake the supervisor thread"""
+        try:
+            self.wake_write.send(b"\0")
+        except BlockingIOError:
+            pass  # Already has a pending wakeup
+
+    def spawn(self, task_id: str, args: List[str], timeout: Optional[float] = None,
+              cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> SupervisedProcess:
+        """
+        Start a child process and supervise it
+
+        Args:
+            task_id: ID of the task the process runs
+            args: Command line
+            timeout: Seconds before the process is terminated (None for no timeout)
+            cwd: Working directory
+            env: Environment variables
+
+        Returns:
+            SupervisedProcess: The supervised process
+        """
+        process = subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=cwd,
+            env=env
+        )
+        supervised = SupervisedProcess(task_id, process, timeout, self.output_limit)
+
+        with self.lock:
+            self.processes[task_id] = supervised
+            self.requests.append(("add", supervised))
+        self._wake()
+
+        logger.debug(f"Started process {process.pid} for task {task_id}")
+        return supervised
+
+    def terminate(self, task_id: str) -> bool:
+        """
+        Stop a supervised process (SIGTERM, then SIGKILL after a grace period)
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            bool: True if the task has a running process
+        """
+        with self.lock:
+            if task_id not in self.processes:
+                return False
+            self.requests.append(("terminate", task_id))
+        self._wake()
+        return True
+
+    def terminate_all(self):
+        """Stop every supervised process"""
+        with self.lock:
+            for task_id in self.processes:
+                self.requests.append(("terminate", task_id))
+        self._wake()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.processes)
+
+    def get_output(self, task_id: str) -> Optional[Dict[str, str]]:
+        """
+        Get the output captured so far from a running process
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            Optional[Dict[str, str]]: stdout and stderr, or None if the task has no running process
+        """
+        with self.lock:
+            supervised = self.processes.get(task_id)
+            if supervised is None:
+                return None
+            return {"stdout": supervised.stdout.getvalue(), "stderr": supervised.stderr.getvalue()}
+
+    def _add_timer(self, deadline: float, task_id: str):
+        """Schedule a deadline check for a task"""
+        self.timer_sequence += 1
+        heapq.heappush(self.timers, (deadline, self.timer_sequence, task_id))
+
+    def _register(self, supervised: SupervisedProcess):
+        """Start watching a process's pipes and exit (supervisor thread)"""
+        for stream, output in ((supervised.process.stdout, supervised.stdout),
+                               (supervised.process.stderr, supervised.stderr)):
+            supervised.open_streams += 1
+            if SELECTABLE_PIPES:
+                os.set_blocking(stream.fileno(), False)
+                self.selector.register(stream, selectors.EVENT_READ, ("output", (supervised, output)))
+            else:
+                threading.Thread(
+                    target=self._read_output_blocking,
+                    args=(stream, supervised, output),
+                    name=f"{self.name}-reader",
+                    daemon=True
+                ).start()
+
+        if PIDFD_AVAILABLE:
+            try:
+                supervised.pidfd = os.pidfd_open(supervised.pid)
+                self.selector.register(supervised.pidfd, selectors.EVENT_READ, ("exit", supervised))
+            except OSError:
+                supervised.pidfd = None
+
+        if supervised.pidfd is None:
+            self.reap_pending[supervised.task_id] = supervised
+
+        if supervised.deadline is not None:
+            self._add_timer(supervised.deadline, supervised.task_id)
+
+    def _process_requests(self):
+        """Handle spawn and terminate requests (supervisor thread)"""
+        with self.lock:
+            requests, self.requests = self.requests, []
+
+        for action, value in requests:
+            if action == "add":
+                self._register(value)
+            elif action == "eof":
+                value.open_streams -= 1
+                if value.open_streams == 0:
+                    self._check_exit(value)
+            elif action == "terminate":
+                supervised = self.processes.get(value)
+                if supervised is not None and not supervised.exited:
+                    supervised.stopped = True
+                    self._signal_stop(supervised)
+
+    def _signal_stop(self, supervised: SupervisedProcess):
+        """Send SIGTERM and schedule SIGKILL (supervisor thread)"""
+        if supervised.kill_deadline is not None:
+            return
+        try:
+            supervised.process.terminate()
+        except OSError:
+            pass
+        supervised.kill_deadline = time.monotonic() + KILL_GRACE_SECONDS
+        self._add_timer(supervised.kill_deadline, supervised.task_id)
+
+    def _read_output(self, stream, supervised: SupervisedProcess, output: BoundedOutput):
+        """Read available output from a pipe (supervisor thread)"""
+        while True:
+            try:
+                data = os.read(stream.fileno(), _READ_SIZE)
+            except BlockingIOError:
+                return
+            except OSError:
+                data = b""
+
+            if data:
+                with self.lock:
+                    output.write(data)
+                continue
+
+            # End of stream
+            self.selector.unregister(stream)
+            stream.close()
+            supervised.open_streams -= 1
+            if supervised.open_streams == 0:
+                self._check_exit(supervised)
+            return
+
+    def _read_output_blocking(self, stream, supervised: SupervisedProcess, output: BoundedOutput):
+        """Drain a pipe that cannot be selected (reader thread)"""
+        try:
+            while True:
+                data = stream.read1(_READ_SIZE)
+                if not data:
+                    break
+                with self.lock:
+                    output.write(data)
+        except (OSError, ValueError):
+            pass
+        finally:
+            stream.close()
+            with self.lock:
+                self.requests.append(("eof", supervised))
+            self._wake()
+
+    def _handle_exit(self, supervised: SupervisedProcess):
+        """Handle a pidfd exit notification (supervisor thread)"""
+        self.selector.unregister(supervised.pidfd)
+        os.close(supervised.pidfd)
+        supervised.pidfd = None
+        supervised.exited = True
+        supervised.returncode = supervised.process.wait()
+        self._close_output(supervised)
+        self._finish(supervised)
+
+    def _close_output(self, supervised: SupervisedProcess):
+        """Collect the output still in an exited process's pipes and close them (supervisor thread)"""
+        # A grandchild holding a pipe open does not keep the task running
+        for key in list(self.selector.get_map().values()):
+            kind, data = key.data
+            if kind == "output" and data[0] is supervised:
+                self._read_output(key.fileobj, supervised, data[1])
+                # _read_output closes the pipe itself when it reaches the end
+                if not key.fileobj.closed:
+                    self.selector.unregister(key.fileobj)
+                    key.fileobj.close()
+                    supervised.open_streams -= 1
+
+    def _check_exit(self, supervised: SupervisedProcess):
+        """Finish a process without a pidfd if it has exited (supervisor thread)"""
+        if supervised.pidfd is not None or supervised.exited:
+            return  # The pidfd reports the exit, or already has
+        returncode = supervised.process.poll()
+        if returncode is None:
+            return
+        self.reap_pending.pop(supervised.task_id, None)
+        supervised.exited = True
+        supervised.returncode = returncode
+        self._close_output(supervised)
+        self._finish(supervised)
+
+    def _finish(self, supervised: SupervisedProcess):
+        """Report a finished process (supervisor thread)"""
+        supervised.finished_at = time.time()
+        with self.lock:
+            self.processes.pop(supervised.task_id, None)
+        try:
+            self.on_exit(supervised)
+        except Exception as e:
+            logger.error(f"Error handling exit of task {supervised.task_id}: {e}")
+
+    def _process_timers(self):
+        """Apply expired timeouts and kill deadlines (supervisor thread)"""
+        now = time.monotonic()
+        while self.timers and self.timers[0][0] <= now:
+            _, _, task_id = heapq.heappop(self.timers)
+            supervised = self.processes.get(task_id)
+            if supervised is None or supervised.exited:
+                continue
+
+            if supervised.kill_deadline is not None and supervised.kill_deadline <= now:
+                logger.warning(f"Killing task {task_id} after it ignored SIGTERM")
+                try:
+                    supervised.process.kill()
+                except OSError:
+                    pass
+            elif supervised.deadline is not None and supervised.deadline <= now and not supervised.timed_out:
+                logger.warning(f"Task {task_id} exceeded timeout of {supervised.timeout} seconds")
+                supervised.timed_out = True
+                self._signal_stop(supervised)
+
+    def _select_timeout(self) -> Optional[float]:
+        """Seconds until the next timer, or None to wait for events only"""
+        timeout = None
+        if self.timers:
+            timeout = max(0.0, self.timers[0][0] - time.monotonic())
+        if self.reap_pending:
+            if any(supervised.open_streams == 0 for supervised in self.reap_pending.values()):
+                poll_timeout = REAP_POLL_SECONDS
+            else:
+                poll_timeout = max(0.0, self.next_exit_poll - time.monotonic())
+            timeout = poll_timeout if timeout is None else min(timeout, poll_timeout)
+        return timeout
+
+    def _run(self):
+        """Supervisor thread: wait for output, exits, timeouts and requests"""
+        while self.running or self.processes:
+            try:
+                self._run_once()
+            except Exception as e:
+                # Keep supervising the other processes
+                logger.error(f"Error in process supervisor: {e}")
+
+            if not self.running and not self.processes:
+                break
+
+    def _run_once(self):
+        """Handle one round of selector events, requests and timers (supervisor thread)"""
+        for key, _ in self.selector.select(self._select_timeout()):
+            kind, data = key.data
+            if kind == "wake":
+                try:
+                    while self.wake_read.recv(4096):
+                        pass
+                except BlockingIOError:
+                    pass
+            elif kind == "output":
+                # An earlier event in this round may have closed the pipe
+                if not key.fileobj.closed and key.fileobj in self.selector.get_map():
+                    self._read_output(key.fileobj, *data)
+            elif kind == "exit":
+                if data.pidfd is not None:
+                    self._handle_exit(data)
+
+        self._process_requests()
+        self._process_timers()
+        self._poll_exits()
+
+    def _poll_exits(self):
+        """Reap children without a pidfd that have exited (supervisor thread)"""
+        now = time.monotonic()
+        poll_all = now >= self.next_exit_poll
+        if poll_all:
+            self.next_exit_poll = now + EXIT_POLL_SECONDS
+
+        for supervised in list(self.reap_pending.values()):
+            if poll_all or supervised.open_streams == 0:
+                self._check_exit(supervised)
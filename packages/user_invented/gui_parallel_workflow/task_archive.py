@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+"""
+Task Archive for the Claude Parallel Manager
+
+This module keeps the Claude Parallel Manager's finished tasks in two tiers.
+The most recent completions stay in memory in a bounded deque, for the GUI and
+for task lookups. Every completion is also written to a SQLite database indexed
+by task type, status and finish time, so older tasks can be queried by type,
+status and time range, a page at a time, without holding them in memory.
+
+Writes are batched: completions are inserted once a batch fills up and before
+any query, so the archive costs one transaction per batch rather than one per
+task. Counts by status and type are kept as counters, both for this run and
+for the whole archive, so the status summary stays the same size however long
+the manager runs.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import deque, Counter
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger("ClaudeParallelManager.Archive")
+
+# Finished tasks kept in memory
+DEFAULT_RECENT_LIMIT = 200
+
+# Completions buffered before they are written to the database
+DEFAULT_FLUSH_EVERY = 50
+
+# Archived tasks older than this are deleted when the archive is opened
+DEFAULT_RETENTION_DAYS = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id TEXT NOT NULL,
+    task_type TEXT,
+    status TEXT,
+    finished_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_task_id ON tasks(task_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_finished ON tasks(finished_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_type ON tasks(task_type, finished_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status, finished_at);
+"""
+
+
+class TaskArchive:
+    """
+    Bounded in-memory list of recent finished tasks backed by an indexed SQLite archive
+    """
+
+    def __init__(self, db_path: str, recent_limit: int = DEFAULT_RECENT_LIMIT,
+                 flush_every: int = DEFAULT_FLUSH_EVERY,
+                 retention_days: Optional[float] = DEFAULT_RETENTION_DAYS):
+        """
+        Initialize the archive
+
+        Args:
+            db_path: Path to the SQLite database
+            recent_limit: Finished tasks kept in memory
+            flush_every: Completions buffered before they are written
+            retention_days: Days of archived tasks kept (None to keep all)
+        """
+        self.db_path = db_path
+        self.flush_every = max(1, flush_every)
+
+        self.lock = threading.Lock()
+        self.recent: deque = deque(maxlen=recent_limit)
+        self.recent_by_id: Dict[str, Dict[str, Any]] = {}
+        self.unflushed: List[tuple] = []
+
+        db_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+        # Counts over the whole archive, kept up to date as tasks are added
+        self.by_status: Counter = Counter()
+        self.by_type: Counter = Counter()
+
+        # Counts of the tasks added since the archive was opened
+        self.run_by_status: Counter = Counter()
+        self.run_by_type: Counter = Counter()
+
+        if retention_days:
+            self.prune(time.time() - retention_days * 86400)
+        else:
+            with self.lock:
+                self._load_counts()
+
+    def _load_counts(self):
+        """Count the archived tasks by status and type (caller holds the lock)"""
+        self.by_status.clear()
+        self.by_type.clear()
+        for row in self.conn.execute("SELECT status, task_type, COUNT(*) AS n FROM tasks GROUP BY status, task_type"):
+            self.by_status[row["status"]] += row["n"]
+            self.by_type[row["task_type"]] += row["n"]
+
+    def add(self, task_data: Dict[str, Any]):
+        """
+        Archive a finished task
+
+        Args:
+            task_data: Task data, with "id", "task_type", "status" and optionally "end_time"
+        """
+        task_id = task_data.get("id")
+        finished_at = task_data.get("end_time") or time.time()
+        data = json.dumps(task_data, default=str)
+
+        with self.lock:
+            if len(self.recent) == self.recent.maxlen:
+                evicted = self.recent[0]
+                if self.recent_by_id.get(evicted.get("id")) is evicted:
+                    del self.recent_by_id[evicted.get("id")]
+            self.recent.append(task_data)
+            self.recent_by_id[task_id] = task_data
+
+            self.by_status[task_data.get("status")] += 1
+            self.by_type[task_data.get("task_type")] += 1
+            self.run_by_status[task_data.get("status")] += 1
+            self.run_by_type[task_data.get("task_type")] += 1
+
+            self.unflushed.append((task_id, task_data.get("task_type"), task_data.get("status"), finished_at, data))
+            if len(self.unflushed) >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        """Write buffered completions in one transaction (caller holds the lock)"""
+        if not self.unflushed:
+            return
+        try:
+            self.conn.execute("BEGIN")
+            self.conn.executemany(
+                "INSERT INTO tasks (task_id, task_type, status, finished_at, data) VALUES (?, ?, ?, ?, ?)",
+                self.unflushed
+            )
+            self.conn.execute("COMMIT")
+            self.unflushed = []
+        except sqlite3.Error as e:
+            logger.error(f"Error writing task archive: {e}")
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+
+    def flush(self):
+        """Write buffered completions to the database"""
+        with self.lock:
+            self._flush()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return sum(self.by_status.values())
+
+    def recent_tasks(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the most recent finished tasks, oldest first
+
+        Args:
+            limit: Maximum number of tasks (None for all kept in memory)
+
+        Returns:
+            List[Dict[str, Any]]: Task data
+        """
+        with self.lock:
+            if limit is None or limit >= len(self.recent):
+                return list(self.recent)
+            return list(self.recent)[-limit:] if limit > 0 else []
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a finished task by ID
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            Optional[Dict[str, Any]]: Task data, or None if the task is not archived
+        """
+        with self.lock:
+            task_data = self.recent_by_id.get(task_id)
+            if task_data is not None:
+                return task_data
+            self._flush()
+            row = self.conn.execute(
+                "SELECT data FROM tasks WHERE task_id = ? ORDER BY seq DESC LIMIT 1", (task_id,)
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def query(self, task_type: Optional[str] = None, status: Optional[str] = None,
+              start: Optional[float] = None, end: Optional[float] = None,
+              offset: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """
+        Get finished tasks, most recently finished first
+
+        Args:
+            task_type: Only tasks of this type (None for all)
+            status: Only tasks with this status (None for all)
+            start: Only tasks finished at or after this time (Unix timestamp)
+            end: Only tasks finished before this time (Unix timestamp)
+            offset: Matching tasks to skip
+            limit: Maximum number of tasks
+
+        Returns:
+            Dict[str, Any]: "total" matching tasks, and "tasks" for the requested page
+        """
+        conditions = []
+        params: List[Any] = []
+        if task_type is not None:
+            conditions.append("task_type = ?")
+            params.append(task_type)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if start is not None:
+            conditions.append("finished_at >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("finished_at < ?")
+            params.append(end)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+        with self.lock:
+            self._flush()
+            total = self.conn.execute(f"SELECT COUNT(*) FROM tasks{where}", params).fetchone()[0]
+            rows = self.conn.execute(
+                f"SELECT data FROM tasks{where} ORDER BY finished_at DESC, seq DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+
+        return {
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "tasks": [json.loads(row["data"]) for row in rows]
+        }
+
+    def get_summary(self, recent: int = 10) -> Dict[str, Any]:
+        """
+        Get a fixed-size summary of the archive
+
+        Args:
+            recent: Number of most recent tasks to include
+
+        Returns:
+            Dict[str, Any]: Total and counts by status and type of the tasks added
+            since the archive was opened, the same counts over the whole archive
+            under "archived", and the most recent tasks
+        """
+        recent_tasks = self.recent_tasks(recent)
+        with self.lock:
+            return {
+                "total": sum(self.run_by_status.values()),
+                "by_status": dict(self.run_by_status),
+                "by_type": dict(self.run_by_type),
+                "archived": {
+                    "total": sum(self.by_status.values()),
+                    "by_status": dict(self.by_status),
+                    "by_type": dict(self.by_type)
+                },
+                "recent": recent_tasks
+            }
+
+    def prune(self, before: float) -> int:
+        """
+        Delete archived tasks finished before a time
+
+        Args:
+            before: Cutoff time (Unix timestamp)
+
+        Returns:
+            int: Number of tasks deleted
+        """
+        with self.lock:
+            self._flush()
+            pruned = self.conn.execute("DELETE FROM tasks WHERE finished_at < ?", (before,)).rowcount
+            self._load_counts()
+        if pruned:
+            logger.info(f"Pruned {pruned} archived tasks")
+        return pruned
+
+    def close(self):
+        """Write buffered completions and close the database"""
+        with self.lock:
+            self._flush()
+            self.conn.close()
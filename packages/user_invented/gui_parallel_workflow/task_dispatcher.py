@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+"""
+Task Dispatcher for the Claude Parallel Manager
+
+This module decides which queued task the Claude Parallel Manager starts next.
+Each task type has its own ready queue, ordered by priority and then by arrival,
+so a type that has reached its max_instances no longer blocks the tasks of other
+types queued behind it.
+
+Types take turns by deficit round robin: each turn adds the type's configured
+weight to its deficit, and each task started costs one. A task is admitted only
+when its type is below max_instances and its resource_requirements fit in the
+resource budget not yet reserved by running tasks. Running counts and reserved
+resources are counters, so each dispatch decision costs O(task types).
+
+An admission check can replace the static budget, e.g. the predictive
+allocator's forecast of the headroom left on the machine.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Tuple, Any, Optional, Callable
+
+logger = logging.getLogger("ClaudeParallelManager.Dispatcher")
+
+# Resources that task types can reserve, in percent of the machine
+RESOURCE_KEYS = ("cpu", "memory")
+
+# Resource budget used when the configuration does not set one
+DEFAULT_RESOURCE_BUDGET = {"cpu": 100, "memory": 100}
+
+
+class _TypeQueue:
+    """Ready queue and counters for one task type"""
+
+    def __init__(self, task_type: str, config: Dict[str, Any]):
+        self.task_type = task_type
+        self.heap: List[Tuple[int, int, Dict[str, Any]]] = []  # (priority, sequence, task data)
+        self.queued = 0
+        self.running = 0
+        self.deficit = 0.0
+        self.active = False  # In the round-robin rotation
+
+        # Statistics
+        self.started = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+        self.configure(config)
+
+    def configure(self, config: Dict[str, Any]):
+        """Apply the task type's configuration"""
+        self.max_instances = config.get("max_instances", 5)
+        self.weight = max(float(config.get("weight", 1)), 0.01)
+        requirements = config.get("resource_requirements", {})
+        self.requirements = {key: requirements.get(key, 0) for key in RESOURCE_KEYS}
+
+
+class TaskDispatcher:
+    """
+    Per-type ready queues with deficit round robin selection and resource admission
+    """
+
+    def __init__(self, task_types: Dict[str, Dict[str, Any]], default_task_type: str = "utility",
+                 resource_budget: Optional[Dict[str, float]] = None,
+                 admission: Optional[Callable[[str], bool]] = None):
+        """
+        Initialize the dispatcher
+
+        Args:
+            task_types: Task type configuration (max_instances, resource_requirements, optional weight)
+            default_task_type: Task type used for tasks without one
+            resource_budget: Resources running tasks may reserve in total, in percent
+            admission: Check whether a task of a type may start, used instead of
+                       the resource budget (None to use the budget)
+        """
+        self.task_types = task_types
+        self.default_task_type = default_task_type
+        self.admission = admission
+        self.resource_budget = dict(DEFAULT_RESOURCE_BUDGET)
+        if resource_budget:
+            self.resource_budget.update(resource_budget)
+
+        self.lock = threading.Lock()
+        self.queues: Dict[str, _TypeQueue] = {}
+        self.rotation: deque = deque()  # Task types with queued tasks, in turn order
+        self.reserved = {key: 0.0 for key in RESOURCE_KEYS}
+        self.sequence = itertools.count()
+        self.cancelled_ids = set()
+        self.queued_total = 0
+        self.running_total = 0
+
+    def _queue_for(self, task_type: str) -> _TypeQueue:
+        """Get the ready queue for a task type, creating it on first use (caller holds the lock)"""
+        type_queue = self.queues.get(task_type)
+        if type_queue is None:
+            type_queue = self.queues[task_type] = _TypeQueue(task_type, self.task_types.get(task_type, {}))
+        return type_queue
+
+    def configure(self, task_types: Dict[str, Dict[str, Any]],
+                  resource_budget: Optional[Dict[str, float]] = None):
+        """
+        Apply changed task type configuration
+
+        Args:
+            task_types: Task type configuration
+            resource_budget: Resources running tasks may reserve in total, in percent
+        """
+        with self.lock:
+            self.task_types = task_types
+            for task_type, type_queue in self.queues.items():
+                type_queue.configure(task_types.get(task_type, {}))
+            if resource_budget:
+                self.resource_budget.update(resource_budget)
+
+    def push(self, task_data: Dict[str, Any], priority: int = 5):
+        """
+        Queue a task
+
+        Args:
+            task_data: Task data, with "id" and "task_type"
+            priority: Task priority (lower numbers run first within the type)
+        """
+        task_type = task_data.get("task_type") or self.default_task_type
+        with self.lock:
+            type_queue = self._queue_for(task_type)
+            heapq.heappush(type_queue.heap, (priority, next(self.sequence), task_data))
+            type_queue.queued += 1
+            self.queued_total += 1
+            if not type_queue.active:
+                type_queue.active = True
+                self.rotation.append(type_queue)
+
+    def _admissible(self, type_queue: _TypeQueue) -> bool:
+        """Check whether a task of this type can start now (caller holds the lock)"""
+        if type_queue.running >= type_queue.max_instances:
+            return False
+
+        if self.admission is not None:
+            return self.admission(type_queue.task_type)
+
+        # A task whose requirements exceed the whole budget still runs alone
+        if not self.running_total:
+            return True
+
+        return all(
+            self.reserved[key] + type_queue.requirements[key] <= self.resource_budget.get(key, 100)
+            for key in RESOURCE_KEYS
+        )
+
+    def _pop_live(self, type_queue: _TypeQueue) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Pop the type's next task that has not been cancelled (caller holds the lock)"""
+        while type_queue.heap:
+            priority, _, task_data = heapq.heappop(type_queue.heap)
+            task_id = task_data.get("id")
+            if task_id in self.cancelled_ids:
+                self.cancelled_ids.discard(task_id)
+                continue
+            type_queue.queued -= 1
+            self.queued_total -= 1
+            return priority, task_data
+        return None
+
+    def next_task(self, now: Optional[float] = None) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Select and reserve the next task to start
+
+        Args:
+            now: Current time, for wait statistics (None for time.time())
+
+        Returns:
+            Optional[Tuple[int, Dict[str, Any]]]: (priority, task data), or None if no queued task can start
+        """
+        if now is None:
+            now = time.time()
+
+        with self.lock:
+            # A full rotation without starting anything means nothing is admissible;
+            # types with a weight below one may need several turns to earn a start
+            min_weight = min((q.weight for q in self.rotation), default=1.0)
+            max_turns = len(self.rotation) * (int(1 / min_weight) + 1)
+
+            for _ in range(max_turns):
+                if not self.rotation:
+                    return None
+
+                type_queue = self.rotation[0]
+                if not type_queue.queued:
+                    # Only cancelled tasks left
+                    for _, _, task_data in type_queue.heap:
+                        self.cancelled_ids.discard(task_data.get("id"))
+                    type_queue.heap.clear()
+                    type_queue.active = False
+                    type_queue.deficit = 0.0
+                    self.rotation.popleft()
+                    continue
+
+                if not self._admissible(type_queue):
+                    # Blocked types keep at most one turn of credit
+                    type_queue.deficit = min(type_queue.deficit, type_queue.weight)
+                    self.rotation.rotate(-1)
+                    continue
+
+                if type_queue.deficit < 1:
+                    type_queue.deficit += type_queue.weight
+                    if type_queue.deficit < 1:
+                        self.rotation.rotate(-1)
+                        continue
+
+                entry = self._pop_live(type_queue)
+                if entry is None:
+                    continue
+
+                type_queue.deficit -= 1
+                if not type_queue.queued:
+                    type_queue.active = False
+                    type_queue.deficit = 0.0
+                    self.rotation.popleft()
+                elif type_queue.deficit < 1:
+                    self.rotation.rotate(-1)
+
+                self._reserve(type_queue)
+                priority, task_data = entry
+                wait = max(0.0, now - task_data.get("added_time", now))
+                type_queue.started += 1
+                type_queue.total_wait += wait
+                type_queue.max_wait = max(type_queue.max_wait, wait)
+                return priority, task_data
+
+            return None
+
+    def _reserve(self, type_queue: _TypeQueue):
+        """Count a started task against its type and the resource budget (caller holds the lock)"""
+        type_queue.running += 1
+        self.running_total += 1
+        for key in RESOURCE_KEYS:
+            self.reserved[key] += type_queue.requirements[key]
+
+    def release(self, task_type: str):
+        """
+        Release the slot and resources of a finished task
+
+        Args:
+            task_type: Type of the finished task
+        """
+        with self.lock:
+            type_queue = self._queue_for(task_type or self.default_task_type)
+            if type_queue.running <= 0:
+                return
+            type_queue.running -= 1
+            self.running_total -= 1
+            for key in RESOURCE_KEYS:
+                self.reserved[key] = max(0.0, self.reserved[key] - type_queue.requirements[key])
+
+    def cancel(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Remove a queued task
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            Optional[Dict[str, Any]]: The cancelled task's data, or None if it is not queued
+        """
+        with self.lock:
+            if task_id in self.cancelled_ids:
+                return None
+            for type_queue in self.queues.values():
+                for _, _, task_data in type_queue.heap:
+                    if task_data.get("id") == task_id:
+                        # Dropped lazily when it reaches the head of its queue
+                        self.cancelled_ids.add(task_id)
+                        type_queue.queued -= 1
+                        self.queued_total -= 1
+                        return task_data
+        return None
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.queued_total
+
+    def queued_tasks(self) -> List[Tuple[int, float, Dict[str, Any]]]:
+        """
+        Get the queued tasks
+
+        Returns:
+            List[Tuple[int, float, Dict[str, Any]]]: (priority, time added, task data) for each queued task
+        """
+        with self.lock:
+            return [
+                (priority, task_data.get("added_time", 0.0), task_data)
+                for type_queue in self.queues.values()
+                for priority, _, task_data in type_queue.heap
+                if task_data.get("id") not in self.cancelled_ids
+            ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get dispatcher statistics
+
+        Returns:
+            Dict[str, Any]: Reserved resources, and queued, running, started and wait times per type
+        """
+        with self.lock:
+            return {
+                "queued": self.queued_total,
+                "running": self.running_total,
+                "reserved": dict(self.reserved),
+                "resource_budget": dict(self.resource_budget),
+                "types": {
+                    task_type: {
+                        "queued": q.queued,
+                        "running": q.running,
+                        "max_instances": q.max_instances,
+                        "weight": q.weight,
+                        "started": q.started,
+                        "mean_wait": q.total_wait / q.started if q.started else 0.0,
+                        "max_wait": q.max_wait
+                    }
+                    for task_type, q in self.queues.items()
+                }
+            }
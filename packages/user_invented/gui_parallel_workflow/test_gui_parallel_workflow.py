@@ -0,0 +1,426 @@
+"""
+Test Script for the GUI Parallel Workflow
+
+This script tests the process supervisor and worker pool that run the Claude
+Parallel Manager's tasks, the task dispatcher, the task archive and the
+predictive allocator.
+"""
+
+import os
+import sys
+import time
+import signal
+import shutil
+import logging
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import process_supervisor
+from process_supervisor import ProcessSupervisor
+from predictive_allocator import PredictiveAllocator
+from function_worker_pool import FunctionWorkerPool
+from task_archive import TaskArchive
+from task_dispatcher import TaskDispatcher
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Writes a line, then exits while a forked grandchild still holds its pipes open
+FORKING_SCRIPT = """
+import os, time
+print("started")
+if os.fork() == 0:
+    time.sleep(0.02)
+    os._exit(0)
+"""
+
+# Exits at once while a background grandchild keeps its stdout open for a minute
+DETACHING_SCRIPT = """
+import os, sys, time
+pid = os.fork()
+if pid == 0:
+    time.sleep(60)
+    os._exit(0)
+print(pid)
+sys.stdout.flush()
+"""
+
+
+def test_many_short_scripts():
+    """Test that many short scripts with lingering grandchildren all finish"""
+    print("\n=== Testing Many Short Scripts ===")
+
+    count = 400
+    finished = []
+    all_finished = threading.Event()
+
+    def on_exit(supervised):
+        # A slow exit handler lets pipe and exit events pile up between rounds
+        time.sleep(0.005)
+        finished.append(supervised)
+        if len(finished) >= count:
+            all_finished.set()
+
+    supervisor = ProcessSupervisor(on_exit)
+    supervisor.start()
+
+    try:
+        if hasattr(os, "fork"):
+            args = [sys.executable, "-c", FORKING_SCRIPT]
+        else:
+            args = [sys.executable, "-c", "print('started')"]
+
+        for i in range(count):
+            supervisor.spawn(f"task_{i}", args, timeout=60)
+
+        if not all_finished.wait(120):
+            print(f"❌ Only {len(finished)}/{count} scripts finished "
+                  f"(supervisor thread alive: {supervisor.thread.is_alive()})")
+            return False
+
+        # Give a duplicate report time to arrive
+        time.sleep(0.5)
+        task_ids = {supervised.task_id for supervised in finished}
+        if len(finished) != count or len(task_ids) != count:
+            print(f"❌ Expected each of {count} scripts to be reported once, "
+                  f"got {len(finished)} reports for {len(task_ids)} scripts")
+            return False
+
+        failed = [supervised.task_id for supervised in finished
+                  if supervised.returncode != 0 or "started" not in supervised.stdout.getvalue()]
+        if failed:
+            print(f"❌ {len(failed)} scripts failed or lost their output, e.g. {failed[:5]}")
+            return False
+
+        if not supervisor.thread.is_alive():
+            print("❌ Supervisor thread stopped")
+            return False
+
+        print(f"✅ All {count} scripts finished and were reported once")
+        return True
+
+    finally:
+        supervisor.stop()
+
+
+def test_exit_without_pidfd():
+    """Test that without pidfd a script finishes while a grandchild still holds its stdout"""
+    print("\n=== Testing Exit Without pidfd ===")
+
+    if not hasattr(os, "fork"):
+        print("✅ Skipped: needs os.fork")
+        return True
+
+    finished = []
+    exited = threading.Event()
+
+    def on_exit(supervised):
+        finished.append(supervised)
+        exited.set()
+
+    pidfd_available = process_supervisor.PIDFD_AVAILABLE
+    process_supervisor.PIDFD_AVAILABLE = False
+    supervisor = ProcessSupervisor(on_exit)
+    supervisor.start()
+    grandchild = None
+
+    try:
+        start = time.monotonic()
+        supervisor.spawn("detaching", [sys.executable, "-c", DETACHING_SCRIPT], timeout=30)
+        if not exited.wait(10):
+            print("❌ Script was not reported finished while its grandchild held stdout")
+            return False
+        elapsed = time.monotonic() - start
+
+        supervised = finished[0]
+        output = supervised.stdout.getvalue().strip()
+        grandchild = int(output) if output.isdigit() else None
+        if supervised.returncode != 0 or grandchild is None or supervised.timed_out:
+            print(f"❌ Expected a clean exit with the grandchild's PID as output, "
+                  f"got {supervised.returncode} and {output!r}")
+            return False
+
+        print(f"✅ Script finished after {elapsed:.2f}s with its grandchild still running")
+        return True
+
+    finally:
+        supervisor.stop()
+        process_supervisor.PIDFD_AVAILABLE = pidfd_available
+        if grandchild is not None:
+            try:
+                os.kill(grandchild, signal.SIGKILL)
+            except OSError:
+                pass
+
+
+def test_function_pool_lazy_start():
+    """Test that function workers start on the first submitted task, not before"""
+    print("\n=== Testing Function Pool Lazy Start ===")
+
+    results = []
+    done = threading.Event()
+
+    def on_result(result):
+        results.append(result)
+        done.set()
+
+    pool = FunctionWorkerPool(on_result, num_workers=2)
+    try:
+        if pool.running or pool.get_stats()["workers_started"] != 0:
+            print(f"❌ Expected no workers before a task is submitted, got {pool.get_stats()}")
+            return False
+
+        pool.submit("lazy", "json.dumps", [{"a": 1}])
+        if not done.wait(30):
+            print("❌ First submitted task did not finish")
+            return False
+        if not results[0].ok or results[0].result != '{"a": 1}':
+            print(f"❌ Expected the task's result, got {results[0].error}")
+            return False
+        if pool.get_stats()["workers_started"] != 2:
+            print(f"❌ Expected the first submit to start 2 workers, got {pool.get_stats()}")
+            return False
+
+        print("✅ Workers started by the first submitted task")
+        return True
+    finally:
+        pool.stop()
+
+
+def test_archive_counts_per_run():
+    """Test that the archive summary counts this run's tasks apart from earlier runs"""
+    print("\n=== Testing Archive Counts per Run ===")
+
+    test_dir = tempfile.mkdtemp(prefix="gui_parallel_workflow_test_")
+    try:
+        db_path = os.path.join(test_dir, "archive.db")
+        archive = TaskArchive(db_path, retention_days=None)
+        for i in range(3):
+            archive.add({"id": f"old_{i}", "task_type": "simulation", "status": "completed"})
+        archive.close()
+
+        archive = TaskArchive(db_path, retention_days=None)
+        archive.add({"id": "new_0", "task_type": "analysis", "status": "failed"})
+        summary = archive.get_summary()
+        archive.close()
+
+        if summary["total"] != 1 or summary["by_status"] != {"failed": 1}:
+            print(f"❌ Expected only this run's task in the summary, got {summary['total']} "
+                  f"and {summary['by_status']}")
+            return False
+        archived = summary["archived"]
+        if archived["total"] != 4 or archived["by_type"] != {"simulation": 3, "analysis": 1}:
+            print(f"❌ Expected 4 archived tasks over both runs, got {archived}")
+            return False
+
+        print("✅ Summary counts this run's task; archive totals include the earlier run")
+        return True
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_dispatcher_fairness():
+    """Test that task types take turns by weight and a full type does not block others"""
+    print("\n=== Testing Dispatcher Fairness ===")
+
+    dispatcher = TaskDispatcher({
+        "simulation": {"max_instances": 100, "weight": 2},
+        "analysis": {"max_instances": 100, "weight": 1}
+    })
+    for i in range(30):
+        dispatcher.push({"id": f"simulation_{i}", "task_type": "simulation"})
+        dispatcher.push({"id": f"analysis_{i}", "task_type": "analysis"})
+
+    started = []
+    for _ in range(9):
+        _, task_data = dispatcher.next_task()
+        started.append(task_data["task_type"])
+        dispatcher.release(task_data["task_type"])
+    counts = {task_type: started.count(task_type) for task_type in ("simulation", "analysis")}
+    if counts != {"simulation": 6, "analysis": 3}:
+        print(f"❌ Expected a 2:1 split by weight, got {started}")
+        return False
+
+    print(f"✅ Weighted turns started {counts['simulation']} simulation and {counts['analysis']} analysis tasks")
+
+    # A type at max_instances is skipped, not waited on
+    dispatcher = TaskDispatcher({"rendering": {"max_instances": 1}, "utility": {"max_instances": 5}})
+    for i in range(3):
+        dispatcher.push({"id": f"rendering_{i}", "task_type": "rendering"}, priority=1)
+    dispatcher.push({"id": "utility_0", "task_type": "utility"}, priority=9)
+
+    first = dispatcher.next_task()[1]["id"]
+    second = dispatcher.next_task()
+    if first != "rendering_0" or second is None or second[1]["id"] != "utility_0":
+        print(f"❌ Expected the utility task to start beside the running rendering task, got {first} and {second}")
+        return False
+    if dispatcher.next_task() is not None:
+        print("❌ A second rendering task started above max_instances")
+        return False
+
+    print("✅ Type at max_instances did not block the type queued behind it")
+    return True
+
+
+def test_dispatcher_cancellation():
+    """Test that cancelled tasks are never started and leave nothing behind"""
+    print("\n=== Testing Dispatcher Cancellation ===")
+
+    dispatcher = TaskDispatcher({"simulation": {"max_instances": 5}})
+    for i in range(3):
+        dispatcher.push({"id": f"task_{i}", "task_type": "simulation"}, priority=i)
+
+    cancelled = dispatcher.cancel("task_0")
+    if cancelled is None or cancelled["id"] != "task_0" or dispatcher.cancel("task_0") is not None:
+        print("❌ Expected the first cancel to return the task and the second to find nothing")
+        return False
+    if len(dispatcher) != 2 or "task_0" in [task["id"] for _, _, task in dispatcher.queued_tasks()]:
+        print(f"❌ Cancelled task still counted as queued: {dispatcher.queued_tasks()}")
+        return False
+
+    next_id = dispatcher.next_task()[1]["id"]
+    if next_id != "task_1" or dispatcher.cancelled_ids:
+        print(f"❌ Expected task_1 next with the cancelled entry dropped, got {next_id} "
+              f"and {dispatcher.cancelled_ids}")
+        return False
+
+    print("✅ Cancelled task skipped and its entry dropped at the head of the queue")
+
+    # A queue holding only cancelled tasks leaves the rotation
+    dispatcher.cancel("task_2")
+    if dispatcher.next_task() is not None:
+        print("❌ A cancelled task was started")
+        return False
+    queue_left = dispatcher.queues["simulation"]
+    if dispatcher.rotation or queue_left.heap or queue_left.active or dispatcher.cancelled_ids:
+        print(f"❌ Expected an empty rotation and queue, got {len(dispatcher.rotation)} types, "
+              f"{len(queue_left.heap)} entries and {dispatcher.cancelled_ids}")
+        return False
+
+    # The same ID can be queued again after its cancelled entry is gone
+    dispatcher.push({"id": "task_2", "task_type": "simulation"})
+    restarted = dispatcher.next_task()
+    if restarted is None or restarted[1]["id"] != "task_2":
+        print(f"❌ Requeued task was not started, got {restarted}")
+        return False
+
+    print("✅ Queue of cancelled tasks cleared; a requeued ID starts normally")
+    return True
+
+
+def test_dispatcher_release_accounting():
+    """Test that releases return reserved resources and never go below zero"""
+    print("\n=== Testing Dispatcher Release Accounting ===")
+
+    dispatcher = TaskDispatcher({
+        "simulation": {"max_instances": 5, "resource_requirements": {"cpu": 60, "memory": 10}}
+    })
+    for i in range(3):
+        dispatcher.push({"id": f"task_{i}", "task_type": "simulation"})
+
+    dispatcher.next_task()
+    if dispatcher.next_task() is not None:
+        print(f"❌ Second task started over the CPU budget: {dispatcher.get_stats()['reserved']}")
+        return False
+
+    dispatcher.release("simulation")
+    stats = dispatcher.get_stats()
+    if stats["running"] != 0 or stats["reserved"] != {"cpu": 0.0, "memory": 0.0}:
+        print(f"❌ Expected nothing reserved after the release, got {stats}")
+        return False
+    if dispatcher.next_task() is None:
+        print("❌ Released resources were not available to the next task")
+        return False
+
+    print("✅ Released resources admitted the next task")
+
+    # Extra releases, and releases of types never started, change nothing
+    dispatcher.release("simulation")
+    dispatcher.release("simulation")
+    dispatcher.release("analysis")
+    dispatcher.release(None)
+    stats = dispatcher.get_stats()
+    if stats["running"] != 0 or min(stats["reserved"].values()) != 0.0 or \
+            any(type_stats["running"] != 0 for type_stats in stats["types"].values()):
+        print(f"❌ Extra releases changed the accounting: {stats}")
+        return False
+
+    print("✅ Extra releases left the running count and reservations at zero")
+    return True
+
+
+def test_predictive_admission_idle():
+    """Test that heavy task types still start on an idle machine"""
+    print("\n=== Testing Predictive Admission on an Idle Machine ===")
+
+    task_types = {
+        "blender_task": {"resource_requirements": {"cpu": 40, "memory": 30}},
+        "simulation": {"resource_requirements": {"cpu": 30, "memory": 25}}
+    }
+    allocator = PredictiveAllocator(task_types)
+    now = time.time()
+    for i in range(10):
+        allocator.observe({"cpu_percent": 10, "memory_percent": 68}, now + i)
+
+    # 68% memory plus a 30% profile exceeds capacity, but nothing else is running
+    for task_type in task_types:
+        if not allocator.admit(task_type):
+            print(f"❌ {task_type} was not admitted with nothing running")
+            return False
+
+    allocator.task_started("task_1", "blender_task", now + 10)
+    if allocator.admit("simulation"):
+        print("❌ simulation was admitted on top of a running task past capacity")
+        return False
+
+    print("✅ Heavy task types start alone and are held back once work is running")
+    return True
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        ("Many Short Scripts", test_many_short_scripts),
+        ("Exit Without pidfd", test_exit_without_pidfd),
+        ("Function Pool Lazy Start", test_function_pool_lazy_start),
+        ("Archive Counts per Run", test_archive_counts_per_run),
+        ("Dispatcher Fairness", test_dispatcher_fairness),
+        ("Dispatcher Cancellation", test_dispatcher_cancellation),
+        ("Dispatcher Release Accounting", test_dispatcher_release_accounting),
+        ("Predictive Admission on an Idle Machine", test_predictive_admission_idle)
+    ]
+
+    success = True
+    results = []
+
+    print("=== GUI Parallel Workflow Tests ===\n")
+
+    for name, test_func in tests:
+        print(f"\n=== Running Test: {name} ===")
+        try:
+            test_success = test_func()
+            results.append((name, test_success))
+            if not test_success:
+                success = False
+        except Exception as e:
+            print(f"❌ Test failed with exception: {e}")
+            results.append((name, False))
+            success = False
+
+    print("\n=== Test Results ===")
+    for name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {name}")
+
+    return success
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+"""
+Benchmark Script for the resource monitors' samplers
+
+This script measures the cost per tick of the Claude Resource Monitor's sampling
+with many processes running, and of the Hardware Monitor's collection, and prints
+the results as JSON. For the sampler benchmark, idle child processes are started
+until the machine has at least the requested number of processes.
+
+Samplers compared:
+- legacy: the previous _get_resource_usage, which blocked in
+  psutil.cpu_percent(interval=1) and ran psutil.process_iter over every process
+  on each sample. The one-second block is left out here (interval=None) so
+  only the work is timed; the real call also took a second of wall time.
+- sampler: resource_sampler.ResourceSampler, with delta-based CPU readings and
+  a cached, incrementally refreshed PID set
+
+Hardware Monitor collection modes compared:
+- psutil: get_hardware_info with psutil, which averages three 0.25 second
+  CPU samples
+- proc: proc_sampler.ProcSampler, reading /proc and /sys with state kept
+  between calls
+The collection benchmark also runs the monitoring loop and counts configuration
+writes while nothing changes, and after one threshold change.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List, Any, Callable
+
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from resource_sampler import ResourceSampler
+from hardware_monitor import HardwareMonitor
+
+
+def legacy_sample() -> Dict[str, Any]:
+    """The previous sampling code, without the one-second CPU interval"""
+    cpu_percent = psutil.cpu_percent(interval=None)
+    memory_percent = psutil.virtual_memory().percent
+    disk_percent = psutil.disk_usage('/').percent
+    network = psutil.net_io_counters()
+    network_bytes = network.bytes_sent + network.bytes_recv
+
+    processes = []
+    for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
+        processes.append(proc.info)
+    processes.sort(key=lambda x: x.get('cpu_percent', 0) or 0, reverse=True)
+
+    return {
+        "cpu_percent": cpu_percent,
+        "memory_percent": memory_percent,
+        "disk_percent": disk_percent,
+        "network_bytes": network_bytes,
+        "process_details": {f"proc_{i+1}": proc for i, proc in enumerate(processes[:5])}
+    }
+
+
+def spawn_idle_processes(target: int) -> List[subprocess.Popen]:
+    """
+    Start idle child processes until at least target processes are running.
+
+    Args:
+        target: Total number of processes wanted on the machine
+
+    Returns:
+        List[subprocess.Popen]: The started children
+    """
+    needed = max(0, target - len(psutil.pids()))
+    sleep_binary = shutil.which("sleep")
+    if sleep_binary:
+        command = [sleep_binary, "600"]
+    else:
+        command = [sys.executable, "-c", "import time; time.sleep(600)"]
+    return [subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL) for _ in range(needed)]
+
+
+def time_ticks(sample: Callable[[], Dict[str, Any]], ticks: int, interval: float) -> Dict[str, float]:
+    """
+    Time a sampling function over a number of ticks.
+
+    Args:
+        sample: Sampling function
+        ticks: Number of samples
+        interval: Seconds between samples
+
+    Returns:
+        Dict[str, float]: Mean and p95 wall time and mean CPU time per tick, in milliseconds
+    """
+    wall_times = []
+    cpu_times = []
+    for _ in range(ticks):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        sample()
+        cpu_times.append(time.process_time() - cpu_start)
+        wall_times.append(time.perf_counter() - wall_start)
+        time.sleep(interval)
+
+    wall_times.sort()
+    return {
+        "mean_wall_ms": 1000 * sum(wall_times) / ticks,
+        "p95_wall_ms": 1000 * wall_times[int(0.95 * (ticks - 1))],
+        "mean_cpu_ms": 1000 * sum(cpu_times) / ticks
+    }
+
+
+def benchmark_sampler(processes: int = 500, ticks: int = 50, interval: float = 0.1) -> Dict[str, Any]:
+    """
+    Compare the legacy sampling code with the ResourceSampler.
+
+    Args:
+        processes: Processes to have running on the machine
+        ticks: Samples per sampler
+        interval: Seconds between samples
+
+    Returns:
+        Dict[str, Any]: Cost per tick of each sampler
+    """
+    children = spawn_idle_processes(processes)
+    try:
+        running = len(psutil.pids())
+        legacy = time_ticks(legacy_sample, ticks, interval)
+        sampler = ResourceSampler()
+        delta = time_ticks(sampler.sample, ticks, interval)
+        return {
+            "benchmark": "sampler",
+            "processes": running,
+            "ticks": ticks,
+            "interval": interval,
+            "legacy": legacy,
+            "legacy_blocking_wall_ms": 1000.0,
+            "sampler": delta,
+            "sampler_stats": sampler.get_stats(),
+            "cpu_cost_ratio": delta["mean_cpu_ms"] / legacy["mean_cpu_ms"] if legacy["mean_cpu_ms"] else None
+        }
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+
+
+def benchmark_collection(ticks: int = 50, psutil_ticks: int = 5, loop_seconds: float = 3.0) -> Dict[str, Any]:
+    """
+    Compare the Hardware Monitor's psutil and /proc collection, and count
+    configuration writes of the monitoring loop.
+
+    Args:
+        ticks: Collections timed in /proc mode
+        psutil_ticks: Collections timed in psutil mode, which sleeps in each
+        loop_seconds: Seconds the monitoring loop runs in each phase
+
+    Returns:
+        Dict[str, Any]: Cost per collection of each mode and configuration writes
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        monitor = HardwareMonitor(log_dir=os.path.join(directory, "logs"),
+                                  config_file=os.path.join(directory, "hardware_monitor_config.json"))
+        results: Dict[str, Any] = {"benchmark": "collection", "ticks": ticks}
+
+        if monitor.proc_sampler:
+            results["proc"] = time_ticks(monitor.get_hardware_info, ticks, 0.01)
+            sampler, monitor.proc_sampler = monitor.proc_sampler, None
+        else:
+            results["proc"] = None
+            sampler = None
+        results["psutil"] = time_ticks(monitor.get_hardware_info, psutil_ticks, 0.01)
+        monitor.proc_sampler = sampler
+
+        # Steady state: nothing changes, so nothing should be written
+        monitor.config_save_debounce = loop_seconds / 3
+        monitor.start_monitoring(interval=0.05)
+        time.sleep(loop_seconds)
+        steady_writes = monitor.config_writes
+
+        # One change is written once, after the debounce delay
+        monitor.set_threshold("cpu_percent", monitor.thresholds["cpu_percent"] + 1)
+        time.sleep(loop_seconds)
+        monitor.stop_monitoring()
+        if sampler:
+            sampler.close()
+
+        results["config_writes"] = {
+            "steady_state": steady_writes,
+            "after_one_change": monitor.config_writes - steady_writes,
+            "loop_seconds": loop_seconds,
+            "loop_interval": 0.05,
+            "debounce": monitor.config_save_debounce
+        }
+        return results
+
+
+def main():
+    """Run the benchmarks and print the results as JSON"""
+    parser = argparse.ArgumentParser(description="Resource monitor sampler benchmarks")
+    parser.add_argument("--benchmark", choices=["sampler", "collection", "all"], default="sampler",
+                        help="Claude Resource Monitor sampler, Hardware Monitor collection, or both")
+    parser.add_argument("--processes", type=int, default=500, help="Processes to have running")
+    parser.add_argument("--ticks", type=int, default=50, help="Samples per sampler")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between samples")
+    args = parser.parse_args()
+
+    if args.benchmark in ("sampler", "all"):
+        print(json.dumps(benchmark_sampler(args.processes, args.ticks, args.interval), indent=4))
+    if args.benchmark in ("collection", "all"):
+        print(json.dumps(benchmark_collection(args.ticks), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -43,6 +43,9 @@ except ImportError:
     logger.warning("psutil not available, using fallback resource monitoring")
     PSUTIL_AVAILABLE = False
 
+from resource_sampler import ResourceSampler, DEFAULT_PROCESS_SCAN_INTERVAL, DEFAULT_DISK_INTERVAL
+from timeseries_store import TimeSeriesStore, DEFAULT_TIERS
+
 class ResourceUsage:
     """
     Represents a snapshot of system resource usage.
@@ -143,11 +146,20 @@ class ClaudeResourceMonitor:
         
         # Resource monitoring
         self.running = False
+        self.stop_event = threading.Event()
+        self.sampler = ResourceSampler(
+            process_scan_interval=self.config.get("process_scan_interval", DEFAULT_PROCESS_SCAN_INTERVAL),
+            disk_interval=self.config.get("disk_interval", DEFAULT_DISK_INTERVAL)
+        )
         self.monitor_thread = None
         self.allocation_thread = None
         self.current_usage = ResourceUsage()
-        self.usage_history = []  # List of ResourceUsage objects
+        self.usage_history = []  # Recent ResourceUsage objects, in memory only
         self.max_history = self.config.get("max_history", 100)
+        self.history_store = TimeSeriesStore(
+            os.path.join(BASE_DIR, self.config.get("history_store_dir", "resource_history")),
+            tiers=[tuple(tier) for tier in self.config.get("history_tiers", DEFAULT_TIERS)]
+        )
         
         # Resource allocation
         self.current_strategy = None
@@ -178,9 +190,15 @@ class ClaudeResourceMonitor:
         
         # Default configuration
         default_config = {
-            "monitoring_interval": 5,  # Seconds between checks
+            "monitoring_interval": 5,  # Seconds between samples (may be below 1)
+            "process_scan_interval": DEFAULT_PROCESS_SCAN_INTERVAL,  # Seconds between reads of all processes
+            "disk_interval": DEFAULT_DISK_INTERVAL,  # Seconds between disk usage reads
+            "history_save_interval": 60,  # Seconds between history file writes
+            "history_store_dir": "resource_history",  # Directory of the usage time-series store
+            "history_tiers": [[1, 3600], [60, 1209600], [3600, 31536000]],  # [resolution, retention] in seconds
+            "summary_window": 60,       # Seconds of usage averaged in the resource summary
             "allocation_interval": 15,  # Seconds between allocation decisions
-            "max_history": 100,         # Maximum number of history entries to keep
+            "max_history": 100,         # Maximum number of history entries kept in memory
             "resource_thresholds": {
                 "cpu_percent": {
                     "low": 20,
@@ -267,7 +285,9 @@ class ClaudeResourceMonitor:
                 logger.error(f"Error loading history: {e}")
     
     def _save_history(self):
-        """Save resource usage and strategy history to file"""
+        """Save strategy history to file; usage history is kept in the time-series store"""
+        self.history_store.flush()
+        
         if not self.config.get("save_history", True):
             return
         
@@ -275,11 +295,9 @@ class ClaudeResourceMonitor:
         
         try:
             # Convert history to serializable format
-            usage_history = [usage.to_dict() for usage in self.usage_history]
             strategy_history = [strategy.to_dict() for strategy in self.strategy_history]
             
             data = {
-                "usage_history": usage_history,
                 "strategy_history": strategy_history,
                 "updated_at": time.time()
             }
@@ -319,6 +337,7 @@ class ClaudeResourceMonitor:
         
         # Start monitoring thread
         self.running = True
+        self.stop_event.clear()
         self.monitor_thread = threading.Thread(target=self._monitoring_loop)
         self.monitor_thread.daemon = True
         self.monitor_thread.start()
@@ -339,6 +358,7 @@ class ClaudeResourceMonitor:
         
         # Signal threads to stop
         self.running = False
+        self.stop_event.set()
         
         # Wait for threads to finish
         if self.monitor_thread and self.monitor_thread.is_alive():
@@ -357,15 +377,17 @@ class ClaudeResourceMonitor:
         """Main monitoring loop"""
         logger.info("Monitoring loop started")
         
-        interval = self.config.get("monitoring_interval", 5)
+        last_save = time.monotonic()
         
         while self.running:
+            tick_start = time.monotonic()
             try:
                 # Get current resource usage
                 self.current_usage = self._get_resource_usage()
                 
                 # Add to history
                 self.usage_history.append(self.current_usage)
+                self.history_store.add(self.current_usage.to_dict(), self.current_usage.timestamp)
                 
                 # Trim history if needed
                 self._trim_history()
@@ -375,15 +397,17 @@ class ClaudeResourceMonitor:
                            f"Memory {self.current_usage.memory_percent:.1f}%, "
                            f"Disk {self.current_usage.disk_percent:.1f}%")
                 
-                # Save history periodically (every 10 iterations)
-                if len(self.usage_history) % 10 == 0:
+                # Save history periodically, independent of the sample rate
+                if time.monotonic() - last_save >= self.config.get("history_save_interval", 60):
                     self._save_history()
+                    last_save = time.monotonic()
                 
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
             
-            # Sleep for the monitoring interval
-            time.sleep(interval)
+            # Wait out the rest of the monitoring interval, which may change at runtime
+            interval = self.config.get("monitoring_interval", 5)
+            self.stop_event.wait(max(0.0, interval - (time.monotonic() - tick_start)))
     
     def _allocation_loop(self):
         """Main allocation loop"""
@@ -418,74 +442,53 @@ class ClaudeResourceMonitor:
                 logger.error(f"Error in allocation loop: {e}")
             
             # Sleep for the allocation interval
-            time.sleep(interval)
+            self.stop_event.wait(interval)
     
     def _get_resource_usage(self) -> ResourceUsage:
         """
         Get current system resource usage.
         
+        The sampler compares against its previous sample, so this does not
+        block and CPU usage covers the time since the last call.
+        
         Returns:
             ResourceUsage object with current resource usage
         """
-        cpu_percent = 0
-        memory_percent = 0
-        disk_percent = 0
-        network_bytes = 0
-        process_details = {}
-        
-        if PSUTIL_AVAILABLE:
-            try:
-                # Get CPU usage
-                cpu_percent = psutil.cpu_percent(interval=1)
-                
-                # Get memory usage
-                memory = psutil.virtual_memory()
-                memory_percent = memory.percent
-                
-                # Get disk usage
-                disk = psutil.disk_usage('/')
-                disk_percent = disk.percent
-                
-                # Get network usage (simplified)
-                network = psutil.net_io_counters()
-                network_bytes = network.bytes_sent + network.bytes_recv
-                
-                # Get process details (top 5 CPU-consuming processes)
-                processes = []
-                for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                    processes.append(proc.info)
-                
-                # Sort by CPU usage
-                processes.sort(key=lambda x: x.get('cpu_percent', 0), reverse=True)
-                
-                # Add top 5 processes to details
-                for i, proc in enumerate(processes[:5]):
-                    process_details[f"proc_{i+1}"] = {
-                        "pid": proc.get('pid', 0),
-                        "name": proc.get('name', 'unknown'),
-                        "cpu_percent": proc.get('cpu_percent', 0),
-                        "memory_percent": proc.get('memory_percent', 0)
-                    }
-                
-            except Exception as e:
-                logger.error(f"Error getting resource usage with psutil: {e}")
-        else:
-            # Fallback if psutil is not available
-            cpu_percent = 50  # Assume 50% usage
-            memory_percent = 50
-            disk_percent = 50
+        try:
+            sample = self.sampler.sample()
+        except Exception as e:
+            logger.error(f"Error getting resource usage with psutil: {e}")
+            sample = {}
         
         # Create and return resource usage
         usage = ResourceUsage(
-            cpu_percent=cpu_percent,
-            memory_percent=memory_percent,
-            disk_percent=disk_percent,
-            network_bytes=network_bytes
+            cpu_percent=sample.get("cpu_percent", 0),
+            memory_percent=sample.get("memory_percent", 0),
+            disk_percent=sample.get("disk_percent", 0),
+            network_bytes=sample.get("network_bytes", 0)
         )
-        usage.process_details = process_details
+        usage.process_details = sample.get("process_details", {})
         
         return usage
     
+    def set_sample_interval(self, interval: float):
+        """
+        Set the time between resource samples.
+        
+        Args:
+            interval: Seconds between samples (may be below 1)
+        """
+        self.config["monitoring_interval"] = max(0.01, float(interval))
+    
+    def track_process(self, pid: int):
+        """
+        Report a process (e.g. a running task) on every sample, whatever its usage.
+        
+        Args:
+            pid: Process ID
+        """
+        self.sampler.track_pid(pid)
+    
     def _create_allocation_strategy(self) -> ResourceAllocationStrategy:
         """
         Create a resource allocation strategy based on current and historical usage.
@@ -789,6 +792,35 @@ class ClaudeResourceMonitor:
         else:
             return [usage.to_dict() for usage in self.usage_history[-limit:]]
     
+    def query_usage_history(self, start: float, end: Optional[float] = None,
+                            resolution: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get resource usage history in a time range from the time-series store.
+        
+        Args:
+            start: Start of the range (Unix timestamp)
+            end: End of the range (Unix timestamp, defaults to now)
+            resolution: Seconds per point: 1, 60 or 3600 with the default tiers
+                        (None to pick the finest that fits the range)
+        
+        Returns:
+            Dictionary with "timestamps" and per-field "mean", "min" and "max" columns
+        """
+        return self.history_store.query(start, end, resolution=resolution)
+    
+    def get_usage_aggregates(self, start: float, end: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get the mean, minimum and maximum resource usage over a time range.
+        
+        Args:
+            start: Start of the range (Unix timestamp)
+            end: End of the range (Unix timestamp, defaults to now)
+        
+        Returns:
+            Dictionary with the sample count and per-field aggregates
+        """
+        return self.history_store.aggregate(start, end)
+    
     def get_strategy_history(self, limit: int = 0) -> List[Dict[str, Any]]:
         """
         Get allocation strategy history.
@@ -811,19 +843,15 @@ class ClaudeResourceMonitor:
         Returns:
             Dictionary with resource summary
         """
-        # Calculate usage statistics
-        cpu_avg = 0
-        memory_avg = 0
-        disk_avg = 0
+        # Calculate usage statistics over the summary window
+        window = self.config.get("summary_window", 60)
+        recent = self.history_store.aggregate(
+            time.time() - window, fields=["cpu_percent", "memory_percent", "disk_percent"]
+        )["fields"]
         
-        if self.usage_history:
-            # Calculate averages from last 10 records or all if fewer
-            history_len = min(len(self.usage_history), 10)
-            recent_history = self.usage_history[-history_len:]
-            
-            cpu_avg = sum(usage.cpu_percent for usage in recent_history) / history_len
-            memory_avg = sum(usage.memory_percent for usage in recent_history) / history_len
-            disk_avg = sum(usage.disk_percent for usage in recent_history) / history_len
+        cpu_avg = recent["cpu_percent"]["mean"] or 0
+        memory_avg = recent["memory_percent"]["mean"] or 0
+        disk_avg = recent["disk_percent"]["mean"] or 0
         
         # Get current values
         current_cpu = self.current_usage.cpu_percent
@@ -850,10 +878,17 @@ class ClaudeResourceMonitor:
                 "memory_percent": memory_avg,
                 "disk_percent": disk_avg
             },
+            "peak": {
+                "cpu_percent": recent["cpu_percent"]["max"] or 0,
+                "memory_percent": recent["memory_percent"]["max"] or 0,
+                "disk_percent": recent["disk_percent"]["max"] or 0
+            },
             "allocation": {
                 "strategy": strategy,
                 "max_tasks": max_tasks
             },
+            "sampler": self.sampler.get_stats(),
+            "history": self.history_store.get_stats(),
             "timestamp": time.time()
         }
 
@@ -11,6 +11,9 @@ import threading
 import subprocess
 from pathlib import Path
 
+from timeseries_store import TimeSeriesStore
+from proc_sampler import ProcSampler, PROC_AVAILABLE
+
 # Try to import psutil for system monitoring
 try:
     import psutil
@@ -18,6 +21,10 @@ except ImportError:
     print("psutil not installed. Limited functionality available.")
     psutil = None
 
+# Seconds a configuration change waits before it is written, so a burst of
+# changes is written once
+CONFIG_SAVE_DEBOUNCE = 5.0
+
 class HardwareMonitor:
     """Monitors hardware resource usage and provides alerts"""
     def __init__(self, log_dir="logs", config_file="hardware_monitor_config.json"):
@@ -26,6 +33,7 @@ class HardwareMonitor:
         self.monitoring = False
         self.monitor_thread = None
         self.history = []
+        self.collection_mode = "auto"  # "proc" (Linux), "psutil", or "auto" for proc where available
         self.thresholds = {
             "cpu_percent": 80,  # Alert if CPU usage > 80%
             "memory_percent": 85,  # Alert if memory usage > 85%
@@ -40,8 +48,28 @@ class HardwareMonitor:
         # Ensure log directory exists
         os.makedirs(log_dir, exist_ok=True)
         
+        # Usage history, downsampled to 1 second, 1 minute and 1 hour
+        self.history_store = TimeSeriesStore(os.path.join(log_dir, "usage_history"))
+        
+        # Configuration is written only after it changes, debounced
+        self.config_save_debounce = CONFIG_SAVE_DEBOUNCE
+        self.config_dirty = False
+        self.config_changed_at = 0.0
+        self.config_writes = 0
+        
         # Load configuration if exists
         self.load_config()
+        self.saved_config = self._config_data()
+        
+        # Sleep-free collection from /proc and /sys, with state kept between samples
+        self.proc_sampler = None
+        if self.collection_mode in ("auto", "proc") and PROC_AVAILABLE:
+            try:
+                self.proc_sampler = ProcSampler()
+            except OSError as e:
+                print(f"Error opening /proc for collection: {str(e)}")
+        elif self.collection_mode == "proc":
+            print("/proc collection not available on this platform. Using psutil.")
     
     def load_config(self):
         """Load monitoring configuration"""
@@ -51,23 +79,59 @@ class HardwareMonitor:
                     config = json.load(f)
                     if "thresholds" in config:
                         self.thresholds.update(config["thresholds"])
+                    if "collection_mode" in config:
+                        self.collection_mode = config["collection_mode"]
+                    # Older configurations also kept recent usage
                     if "history" in config:
                         self.history = config["history"]
             except Exception as e:
                 print(f"Error loading monitor config: {str(e)}")
     
+    def _config_data(self):
+        """Configuration as saved; usage history is kept in the history store"""
+        return {
+            "thresholds": dict(self.thresholds),
+            "collection_mode": self.collection_mode,
+        }
+    
     def save_config(self):
         """Save monitoring configuration"""
         try:
-            config = {
-                "thresholds": self.thresholds,
-                "history": self.history[-50:],  # Keep last 50 entries
-            }
+            config = self._config_data()
             with open(self.config_file, "w") as f:
                 json.dump(config, f, indent=2)
+            self.saved_config = config
+            self.config_dirty = False
+            self.config_writes += 1
         except Exception as e:
             print(f"Error saving monitor config: {str(e)}")
     
+    def mark_config_dirty(self):
+        """Note a configuration change to be written after the debounce delay"""
+        self.config_dirty = True
+        self.config_changed_at = time.monotonic()
+    
+    def set_threshold(self, name, value):
+        """Set an alert threshold in percent and schedule a configuration write"""
+        self.thresholds[name] = value
+        self.mark_config_dirty()
+    
+    def save_config_if_changed(self, force=False):
+        """Write the configuration if it changed, once it has been unchanged for the debounce delay
+        
+        Changes made by assigning to thresholds directly are picked up too. With
+        force, a pending change is written without waiting.
+        Returns True if the configuration was written.
+        """
+        if self._config_data() != self.saved_config and not self.config_dirty:
+            self.mark_config_dirty()
+        if not self.config_dirty:
+            return False
+        if not force and time.monotonic() - self.config_changed_at < self.config_save_debounce:
+            return False
+        self.save_config()
+        return True
+    
     def get_hardware_info(self):
         """Get current hardware resource usage"""
         info = {
@@ -75,6 +139,16 @@ class HardwareMonitor:
             "platform": platform.system(),
         }
         
+        if self.proc_sampler:
+            # Read /proc and /sys directly; CPU usage is the change since the previous call
+            try:
+                info.update(self.proc_sampler.sample())
+                return info
+            except (OSError, ValueError) as e:
+                print(f"Error reading /proc, falling back to psutil: {str(e)}")
+                self.proc_sampler.close()
+                self.proc_sampler = None
+        
         if psutil:
             # CPU information - use average of multiple samples to match Task Manager
             cpu_samples = []
@@ -173,8 +247,8 @@ class HardwareMonitor:
         return alerts, critical_alerts
     
     def record_usage(self, info):
-        """Record hardware usage to log"""
-        # Add to history
+        """Record hardware usage to the usage history store"""
+        # Add to recent history
         record = {
             "timestamp": info["timestamp"],
             "cpu_percent": info.get("cpu_percent", 0),
@@ -183,21 +257,29 @@ class HardwareMonitor:
         }
         
         self.history.append(record)
-        
-        # Save to log file
-        timestamp = datetime.datetime.now().strftime("%Y%m%d")
-        log_file = os.path.join(self.log_dir, f"hardware_usage_{timestamp}.log")
+        del self.history[:-100]  # Older entries are in the history store
         
         try:
-            with open(log_file, "a") as f:
-                f.write(json.dumps(info) + "\n")
+            timestamp = datetime.datetime.fromisoformat(info["timestamp"]).timestamp()
+            self.history_store.add(info, timestamp)
         except Exception as e:
-            print(f"Error writing to log file: {str(e)}")
+            print(f"Error recording usage history: {str(e)}")
     
     def get_recent_usage(self, count=10):
         """Get recent usage history"""
         return self.history[-count:]
     
+    def get_usage_history(self, start, end=None, resolution=None):
+        """Get usage history between two Unix timestamps, one point per 1 s, 1 min or 1 h bucket
+        
+        Without a resolution, the finest one that fits the range is used.
+        """
+        return self.history_store.query(start, end, resolution=resolution)
+    
+    def get_usage_summary(self, start, end=None):
+        """Get the mean, minimum and maximum usage between two Unix timestamps"""
+        return self.history_store.aggregate(start, end)
+    
     def register_emergency_callback(self, callback):
         """Register a callback function to be called during critical resource issues
         
@@ -252,8 +334,8 @@ class HardwareMonitor:
                     if critical_alerts:
                         self.handle_critical_resource_issue()
                     
-                    # Save config periodically
-                    self.save_config()
+                    # Save config only after it changed
+                    self.save_config_if_changed()
                     
                     # Sleep for the specified interval
                     time.sleep(interval)
@@ -270,6 +352,9 @@ class HardwareMonitor:
         if self.monitor_thread:
             self.monitor_thread.join(timeout=1)
             self.monitor_thread = None
+        
+        # Write a change still waiting out the debounce delay
+        self.save_config_if_changed(force=True)
     
     def get_system_summary(self):
         """Get a summary of the system hardware"""
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+"""
+Proc Sampler for GlowingGoldenGlobe
+
+This module collects hardware usage for the Hardware Monitor on Linux straight
+from the kernel's text interfaces, without psutil and without sleeping:
+- CPU usage from /proc/stat, as the change in busy and idle time since the
+  previous sample
+- memory from /proc/meminfo (MemTotal and MemAvailable, as psutil computes it)
+- disk usage of one path from statvfs
+- temperatures from /sys/class/thermal
+
+The sampler keeps its state between samples: the files stay open and are read
+again from offset 0, the thermal zones are found once, and the previous CPU
+times are kept so each sample compares against the last one. A sample costs a
+few reads and well under a millisecond.
+"""
+
+import os
+import glob
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger("HardwareMonitor.ProcSampler")
+
+PROC_STAT = "/proc/stat"
+PROC_MEMINFO = "/proc/meminfo"
+THERMAL_ZONES = "/sys/class/thermal/thermal_zone*"
+
+# True where the files the sampler reads exist
+PROC_AVAILABLE = os.path.exists(PROC_STAT) and os.path.exists(PROC_MEMINFO)
+
+# Bytes read from /proc/stat (the aggregate "cpu" line comes first) and /proc/meminfo
+STAT_READ_SIZE = 512
+MEMINFO_READ_SIZE = 2048
+
+
+def _read_cpu_times(fd: int) -> Optional[Tuple[int, int]]:
+    """
+    Read busy and idle jiffies from the aggregate "cpu" line of /proc/stat
+
+    Returns:
+        Optional[Tuple[int, int]]: Total and idle jiffies (None if unreadable)
+    """
+    line = os.pread(fd, STAT_READ_SIZE, 0).split(b"\n", 1)[0]
+    fields = line.split()
+    if not fields or fields[0] != b"cpu":
+        return None
+
+    # user nice system idle iowait irq softirq steal; guest time is already in user
+    times = [int(value) for value in fields[1:9]]
+    idle = times[3] + (times[4] if len(times) > 4 else 0)
+    return sum(times), idle
+
+
+class ProcSampler:
+    """
+    Sleep-free sampler of CPU, memory, disk and temperature readings on Linux
+    """
+
+    def __init__(self, disk_path: str = "/"):
+        """
+        Initialize the sampler
+
+        Args:
+            disk_path: Path whose disk usage is reported
+        """
+        self.disk_path = disk_path
+        self.cpu_count = os.cpu_count() or 1
+
+        self.stat_fd = os.open(PROC_STAT, os.O_RDONLY)
+        self.meminfo_fd = os.open(PROC_MEMINFO, os.O_RDONLY)
+        self.thermal_fds: Dict[str, int] = self._open_thermal_zones()
+
+        # CPU percent is the change since the previous sample
+        self.previous_cpu_times = _read_cpu_times(self.stat_fd)
+        self.cpu_percent = 0.0
+
+        # Statistics
+        self.samples = 0
+
+    def _open_thermal_zones(self) -> Dict[str, int]:
+        """Open the temp file of each thermal zone, keyed by the zone's type"""
+        zones = {}
+        for zone in sorted(glob.glob(THERMAL_ZONES)):
+            name = os.path.basename(zone)
+            try:
+                with open(os.path.join(zone, "type")) as f:
+                    zone_type = f.read().strip() or name
+            except OSError:
+                zone_type = name
+            if zone_type in zones:
+                zone_type = f"{zone_type}_{name}"
+            try:
+                zones[zone_type] = os.open(os.path.join(zone, "temp"), os.O_RDONLY)
+            except OSError as e:
+                logger.debug(f"Skipping thermal zone {name}: {e}")
+        return zones
+
+    def _sample_cpu(self) -> float:
+        """CPU usage since the previous sample, in percent"""
+        current = _read_cpu_times(self.stat_fd)
+        previous, self.previous_cpu_times = self.previous_cpu_times, current
+        if current is None or previous is None:
+            return self.cpu_percent
+
+        total_delta = current[0] - previous[0]
+        if total_delta > 0:
+            idle_delta = current[1] - previous[1]
+            self.cpu_percent = max(0.0, min(100.0, 100.0 * (1.0 - idle_delta / total_delta)))
+        # With no ticks since the previous sample, report the previous value
+        return self.cpu_percent
+
+    def _sample_memory(self) -> Dict[str, Any]:
+        """Total and available memory in bytes, and the percent in use"""
+        values = {}
+        for line in os.pread(self.meminfo_fd, MEMINFO_READ_SIZE, 0).split(b"\n"):
+            key, _, rest = line.partition(b":")
+            if key in (b"MemTotal", b"MemAvailable", b"MemFree"):
+                values[key] = int(rest.split()[0]) * 1024
+                if len(values) == 3:
+                    break
+
+        total = values.get(b"MemTotal", 0)
+        available = values.get(b"MemAvailable", values.get(b"MemFree", 0))
+        return {
+            "memory_total": total,
+            "memory_available": available,
+            "memory_percent": round(100.0 * (total - available) / total, 1) if total else 0.0
+        }
+
+    def _sample_disk(self) -> Dict[str, Any]:
+        """Total and free disk space in bytes, and the percent in use"""
+        try:
+            stats = os.statvfs(self.disk_path)
+        except OSError as e:
+            logger.warning(f"Error reading disk usage of {self.disk_path}: {e}")
+            return {}
+
+        total = stats.f_blocks * stats.f_frsize
+        free = stats.f_bavail * stats.f_frsize
+        used = (stats.f_blocks - stats.f_bfree) * stats.f_frsize
+        return {
+            "disk_total": total,
+            "disk_free": free,
+            "disk_percent": round(100.0 * used / (used + free), 1) if used + free else 0.0
+        }
+
+    def _sample_temperatures(self) -> Dict[str, float]:
+        """Temperature of each thermal zone, in degrees Celsius"""
+        temperatures = {}
+        for zone_type, fd in self.thermal_fds.items():
+            try:
+                temperatures[zone_type] = int(os.pread(fd, 32, 0)) / 1000.0
+            except (OSError, ValueError):
+                # Some zones fail to read while their sensor is powered down
+                continue
+        return temperatures
+
+    def sample(self) -> Dict[str, Any]:
+        """
+        Take a sample without sleeping
+
+        Returns:
+            Dict[str, Any]: cpu_percent, cpu_count, memory and disk totals, free
+                            amounts and percents, and temperatures if any
+                            thermal zones exist
+        """
+        self.samples += 1
+        info = {
+            "cpu_percent": self._sample_cpu(),
+            "cpu_count": self.cpu_count
+        }
+        info.update(self._sample_memory())
+        info.update(self._sample_disk())
+        if self.thermal_fds:
+            info["temperatures"] = self._sample_temperatures()
+        return info
+
+    def close(self):
+        """Close the open files"""
+        if self.stat_fd < 0:
+            return
+        for fd in [self.stat_fd, self.meminfo_fd] + list(self.thermal_fds.values()):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self.stat_fd = self.meminfo_fd = -1
+        self.thermal_fds = {}
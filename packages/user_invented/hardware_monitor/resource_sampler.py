@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+"""
+Resource Sampler for GlowingGoldenGlobe
+
+This module takes system resource samples for the Claude Resource Monitor without
+blocking. CPU usage is computed from the change in CPU times since the previous
+sample instead of waiting out an interval, so a sample costs a few reads and
+sampling can run several times a second.
+
+Per-process CPU usage is also delta-based. The sampler keeps a cached psutil
+Process object per PID and refreshes the PID set incrementally: each tick only
+lists the current PIDs, adds new ones and drops exited ones. CPU times of every
+cached process are read on a slower full-scan interval; between scans only the
+tracked processes (the top consumers of the last scan, plus any registered with
+track_pid) are read. Disk usage, which changes slowly, is read on its own
+interval.
+"""
+
+import time
+import logging
+from typing import Dict, Any, Optional, Set
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger("ClaudeResourceMonitor.Sampler")
+
+# Seconds between reads of every cached process's CPU times
+DEFAULT_PROCESS_SCAN_INTERVAL = 5.0
+
+# Seconds between disk usage reads
+DEFAULT_DISK_INTERVAL = 30.0
+
+# Processes reported in process_details, and followed between full scans
+DEFAULT_TOP_PROCESSES = 5
+
+
+class _TrackedProcess:
+    """Cached process handle with the CPU time of its previous reading"""
+
+    __slots__ = ("process", "cpu_time", "read_at", "cpu_percent", "name")
+
+    def __init__(self, process):
+        self.process = process
+        self.cpu_time: Optional[float] = None
+        self.read_at = 0.0
+        self.cpu_percent = 0.0
+        self.name: Optional[str] = None
+
+
+class ResourceSampler:
+    """
+    Non-blocking, delta-based sampler of system and per-process resource usage
+    """
+
+    def __init__(self, process_scan_interval: float = DEFAULT_PROCESS_SCAN_INTERVAL,
+                 disk_interval: float = DEFAULT_DISK_INTERVAL,
+                 top_processes: int = DEFAULT_TOP_PROCESSES,
+                 disk_path: str = "/"):
+        """
+        Initialize the sampler
+
+        Args:
+            process_scan_interval: Seconds between reads of every process's CPU times
+            disk_interval: Seconds between disk usage reads
+            top_processes: Processes reported in process_details and followed between scans
+            disk_path: Path whose disk usage is reported
+        """
+        self.process_scan_interval = process_scan_interval
+        self.disk_interval = disk_interval
+        self.top_processes = top_processes
+        self.disk_path = disk_path
+
+        self.processes: Dict[int, _TrackedProcess] = {}
+        self.tracked_pids: Set[int] = set()  # Read on every tick
+        self.registered_pids: Set[int] = set()  # Tracked regardless of usage
+
+        self.previous_cpu_times = None
+        self.last_scan = 0.0
+        self.last_disk_read = 0.0
+        self.disk_percent = 0.0
+        self.total_memory = psutil.virtual_memory().total if PSUTIL_AVAILABLE else 0
+
+        # Statistics
+        self.samples = 0
+        self.full_scans = 0
+
+        if PSUTIL_AVAILABLE:
+            # The first readings need previous ones to compare against
+            self.previous_cpu_times = psutil.cpu_times()
+            self._refresh_pids()
+            self._read_processes(self.processes.keys(), time.monotonic())
+
+    def track_pid(self, pid: int):
+        """
+        Read a process on every tick, whatever its usage
+
+        Args:
+            pid: Process ID
+        """
+        self.registered_pids.add(pid)
+        self.tracked_pids.add(pid)
+
+    def untrack_pid(self, pid: int):
+        """
+        Stop reading a registered process on every tick
+
+        Args:
+            pid: Process ID
+        """
+        self.registered_pids.discard(pid)
+
+    def _system_cpu_percent(self) -> float:
+        """CPU usage since the previous sample, from the change in CPU times"""
+        current = psutil.cpu_times()
+        previous, self.previous_cpu_times = self.previous_cpu_times, current
+        if previous is None:
+            return 0.0
+
+        total_delta = sum(current) - sum(previous)
+        if total_delta <= 0:
+            return 0.0
+        idle_delta = (current.idle - previous.idle) + (getattr(current, "iowait", 0) - getattr(previous, "iowait", 0))
+        return max(0.0, min(100.0, 100.0 * (1.0 - idle_delta / total_delta)))
+
+    def _refresh_pids(self):
+        """Add new processes to the cache and drop exited ones"""
+        current = set(psutil.pids())
+        cached = self.processes.keys()
+
+        for pid in cached - current:
+            del self.processes[pid]
+            self.tracked_pids.discard(pid)
+            self.registered_pids.discard(pid)
+
+        for pid in current - cached:
+            try:
+                self.processes[pid] = _TrackedProcess(psutil.Process(pid))
+            except psutil.Error:
+                pass
+
+    def _read_process(self, tracked: _TrackedProcess, now: float) -> bool:
+        """
+        Update a process's CPU percent from the change in its CPU time
+
+        Returns:
+            bool: False if the process is gone
+        """
+        try:
+            times = tracked.process.cpu_times()
+        except psutil.Error:
+            return False
+
+        cpu_time = times.user + times.system
+        if tracked.cpu_time is not None and now > tracked.read_at:
+            tracked.cpu_percent = max(0.0, 100.0 * (cpu_time - tracked.cpu_time) / (now - tracked.read_at))
+        tracked.cpu_time = cpu_time
+        tracked.read_at = now
+        return True
+
+    def _read_processes(self, pids, now: float):
+        """Read the CPU times of the given processes, dropping any that are gone"""
+        for pid in list(pids):
+            tracked = self.processes.get(pid)
+            if tracked is not None and not self._read_process(tracked, now):
+                del self.processes[pid]
+                self.tracked_pids.discard(pid)
+
+    def _process_details(self) -> Dict[str, Dict[str, Any]]:
+        """Top processes by CPU usage, in the ResourceUsage process_details layout"""
+        candidates = [self.processes[pid] for pid in self.tracked_pids if pid in self.processes]
+        candidates.sort(key=lambda tracked: tracked.cpu_percent, reverse=True)
+
+        details = {}
+        for i, tracked in enumerate(candidates[:self.top_processes]):
+            try:
+                if tracked.name is None:
+                    tracked.name = tracked.process.name()
+                memory_percent = 100.0 * tracked.process.memory_info().rss / self.total_memory if self.total_memory else 0.0
+            except psutil.Error:
+                continue
+            details[f"proc_{i+1}"] = {
+                "pid": tracked.process.pid,
+                "name": tracked.name,
+                "cpu_percent": tracked.cpu_percent,
+                "memory_percent": memory_percent
+            }
+        return details
+
+    def sample(self) -> Dict[str, Any]:
+        """
+        Take a sample without blocking
+
+        Returns:
+            Dict[str, Any]: cpu_percent, memory_percent, disk_percent, network_bytes and process_details
+        """
+        if not PSUTIL_AVAILABLE:
+            # Fallback if psutil is not available
+            return {
+                "cpu_percent": 50,
+                "memory_percent": 50,
+                "disk_percent": 50,
+                "network_bytes": 0,
+                "process_details": {}
+            }
+
+        now = time.monotonic()
+        self.samples += 1
+
+        cpu_percent = self._system_cpu_percent()
+        memory_percent = psutil.virtual_memory().percent
+
+        if now - self.last_disk_read >= self.disk_interval or not self.last_disk_read:
+            try:
+                self.disk_percent = psutil.disk_usage(self.disk_path).percent
+            except OSError as e:
+                logger.warning(f"Error reading disk usage of {self.disk_path}: {e}")
+            self.last_disk_read = now
+
+        network_bytes = 0
+        network = psutil.net_io_counters()
+        if network is not None:
+            network_bytes = network.bytes_sent + network.bytes_recv
+
+        self._refresh_pids()
+        if now - self.last_scan >= self.process_scan_interval or not self.last_scan:
+            # Full scan: read every process, then follow the top consumers
+            self._read_processes(self.processes.keys(), now)
+            top = sorted(self.processes.items(), key=lambda item: item[1].cpu_percent, reverse=True)
+            self.tracked_pids = {pid for pid, _ in top[:self.top_processes]} | self.registered_pids
+            self.last_scan = now
+            self.full_scans += 1
+        else:
+            self._read_processes(self.tracked_pids, now)
+
+        return {
+            "cpu_percent": cpu_percent,
+            "memory_percent": memory_percent,
+            "disk_percent": self.disk_percent,
+            "network_bytes": network_bytes,
+            "process_details": self._process_details()
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get sampler statistics
+
+        Returns:
+            Dict[str, Any]: Sample and scan counts, and cached and tracked process counts
+        """
+        return {
+            "samples": self.samples,
+            "full_scans": self.full_scans,
+            "cached_processes": len(self.processes),
+            "tracked_processes": len(self.tracked_pids)
+        }
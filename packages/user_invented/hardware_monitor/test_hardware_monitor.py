@@ -0,0 +1,327 @@
+"""
+Test Script for the Hardware Monitor
+
+This script tests the resource sampler used by the Claude Resource Monitor, the
+/proc sampler used by the Hardware Monitor, and the time-series store that
+keeps the monitors' usage history.
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import proc_sampler
+import resource_sampler
+from proc_sampler import ProcSampler
+from resource_sampler import ResourceSampler
+from timeseries_store import TimeSeriesStore
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Keeps one CPU busy until killed
+BUSY_SCRIPT = "while True: pass"
+
+
+def test_resource_sampler():
+    """Test delta-based process readings, exited process cleanup and the scan interval"""
+    print("\n=== Testing Resource Sampler ===")
+
+    if not resource_sampler.PSUTIL_AVAILABLE:
+        print("✅ Skipped: needs psutil")
+        return True
+
+    busy = subprocess.Popen([sys.executable, "-c", BUSY_SCRIPT])
+    try:
+        # Full scans only on the first sample, so the busy process is read as a tracked one
+        sampler = ResourceSampler(process_scan_interval=3600, disk_interval=3600)
+        sampler.track_pid(busy.pid)
+        sampler.sample()
+
+        time.sleep(0.5)
+        start = time.perf_counter()
+        sample = sampler.sample()
+        elapsed = time.perf_counter() - start
+
+        if not 0.0 <= sample["cpu_percent"] <= 100.0 or sample["memory_percent"] <= 0:
+            print(f"❌ Unexpected system readings: {sample}")
+            return False
+
+        busy_details = [d for d in sample["process_details"].values() if d["pid"] == busy.pid]
+        if not busy_details or busy_details[0]["cpu_percent"] < 50:
+            print(f"❌ Expected the busy process near 100% CPU, got {busy_details}")
+            return False
+
+        print(f"✅ Busy process read at {busy_details[0]['cpu_percent']:.0f}% CPU "
+              f"from the change since the last sample, in {elapsed * 1000:.1f} ms")
+
+        for _ in range(3):
+            sampler.sample()
+        if sampler.get_stats()["full_scans"] != 1:
+            print(f"❌ Expected one full scan within the scan interval, got {sampler.get_stats()}")
+            return False
+
+        print("✅ Samples between full scans read only the tracked processes")
+
+        busy.kill()
+        busy.wait()
+        sample = sampler.sample()
+        if busy.pid in sampler.processes or busy.pid in sampler.tracked_pids or busy.pid in sampler.registered_pids:
+            print("❌ Exited process was kept in the cache")
+            return False
+        if any(d["pid"] == busy.pid for d in sample["process_details"].values()):
+            print("❌ Exited process was reported")
+            return False
+
+        print("✅ Exited process dropped from the cache and tracking")
+        return True
+
+    finally:
+        if busy.poll() is None:
+            busy.kill()
+            busy.wait()
+
+
+def write_file(path: str, content: str):
+    """Rewrite a file in place, so descriptors already open on it see the new content"""
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_proc_sampler():
+    """Test CPU deltas, memory, thermal zone and disk readings from kernel text files"""
+    print("\n=== Testing Proc Sampler ===")
+
+    if not proc_sampler.PROC_AVAILABLE:
+        print("✅ Skipped: needs /proc")
+        return True
+
+    test_dir = tempfile.mkdtemp(prefix="hardware_monitor_test_")
+    paths = (proc_sampler.PROC_STAT, proc_sampler.PROC_MEMINFO, proc_sampler.THERMAL_ZONES)
+    try:
+        # Point the sampler at files the test controls
+        stat_path = os.path.join(test_dir, "stat")
+        meminfo_path = os.path.join(test_dir, "meminfo")
+        write_file(stat_path, "cpu  100 0 100 800 0 0 0 0 0 0\ncpu0 100 0 100 800 0 0 0 0 0 0\n")
+        write_file(meminfo_path, "MemTotal:        1000 kB\nMemFree:          100 kB\nMemAvailable:     250 kB\n")
+        for i, (zone_type, temp) in enumerate([("x86_pkg_temp", "45000"), ("x86_pkg_temp", "47500"), ("acpitz", "")]):
+            zone = os.path.join(test_dir, "thermal", f"thermal_zone{i}")
+            os.makedirs(zone)
+            write_file(os.path.join(zone, "type"), zone_type + "\n")
+            write_file(os.path.join(zone, "temp"), temp)
+        proc_sampler.PROC_STAT = stat_path
+        proc_sampler.PROC_MEMINFO = meminfo_path
+        proc_sampler.THERMAL_ZONES = os.path.join(test_dir, "thermal", "thermal_zone*")
+
+        sampler = ProcSampler(disk_path=test_dir)
+
+        # 400 jiffies since the first reading, half of them idle or iowait
+        write_file(stat_path, "cpu  200 0 200 900 100 0 0 0 0 0\n")
+        readings = [sampler.sample()["cpu_percent"]]
+        # No ticks, then an unreadable line: both keep the last value
+        readings.append(sampler.sample()["cpu_percent"])
+        write_file(stat_path, "intr 0\n")
+        readings.append(sampler.sample()["cpu_percent"])
+        if readings != [50.0, 50.0, 50.0]:
+            print(f"❌ Expected 50% CPU held across empty and unreadable samples, got {readings}")
+            return False
+
+        print("✅ CPU usage read from the change in /proc/stat and held without new ticks")
+
+        sample = sampler.sample()
+        memory = (sample["memory_total"], sample["memory_available"], sample["memory_percent"])
+        if memory != (1024000, 256000, 75.0):
+            print(f"❌ Expected 75% memory in use from MemAvailable, got {memory}")
+            return False
+        write_file(meminfo_path, "MemTotal:        1000 kB\nMemFree:          100 kB\n")
+        if sampler.sample()["memory_percent"] != 90.0:
+            print("❌ MemFree was not used without MemAvailable")
+            return False
+
+        print("✅ Memory read from MemAvailable, falling back to MemFree")
+
+        temperatures = sample["temperatures"]
+        if temperatures != {"x86_pkg_temp": 45.0, "x86_pkg_temp_thermal_zone1": 47.5}:
+            print(f"❌ Unexpected temperatures: {temperatures}")
+            return False
+        if not 0.0 <= sample["disk_percent"] <= 100.0 or sample["disk_total"] <= 0:
+            print(f"❌ Unexpected disk readings: {sample}")
+            return False
+
+        print("✅ Thermal zones keyed by type, unreadable zones skipped, disk usage from statvfs")
+
+        sampler.close()
+        sampler.close()
+        if sampler.stat_fd != -1 or sampler.thermal_fds:
+            print("❌ Files were left open after close")
+            return False
+    finally:
+        proc_sampler.PROC_STAT, proc_sampler.PROC_MEMINFO, proc_sampler.THERMAL_ZONES = paths
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+    # The real kernel files parse too
+    sampler = ProcSampler()
+    try:
+        sampler.sample()
+        start = time.perf_counter()
+        sample = sampler.sample()
+        elapsed = time.perf_counter() - start
+    finally:
+        sampler.close()
+    if not 0.0 <= sample["cpu_percent"] <= 100.0 or not 0.0 < sample["memory_percent"] <= 100.0:
+        print(f"❌ Unexpected readings from /proc: {sample}")
+        return False
+
+    print(f"✅ Sample from /proc took {elapsed * 1000:.2f} ms")
+    return True
+
+
+def test_timeseries_ring():
+    """Test ring wraparound and retention applied when a tier is read"""
+    print("\n=== Testing Time-Series Ring ===")
+
+    test_dir = tempfile.mkdtemp(prefix="hardware_monitor_test_")
+    try:
+        store = TimeSeriesStore(test_dir, fields=["cpu_percent"], tiers=[(1, 10)])
+        base = int(time.time())
+
+        # 25 seconds of samples wrap a 10 slot ring more than twice
+        for age in range(25, 0, -1):
+            store.add({"cpu_percent": age}, timestamp=base - age + 0.5)
+
+        result = store.query(base - 100, base)
+        oldest = int(time.time()) - 9
+        expected = [t for t in range(base - 9, base) if t >= oldest]
+        if result["timestamps"] != expected or result["fields"]["cpu_percent"]["mean"] != [base - t for t in expected]:
+            print(f"❌ Expected the last {len(expected)} seconds, got {result['timestamps']} "
+                  f"with {result['fields']['cpu_percent']['mean']}")
+            return False
+
+        overwritten = store.query(base - 25, base - 15)
+        if overwritten["timestamps"]:
+            print(f"❌ Overwritten buckets were returned: {overwritten['timestamps']}")
+            return False
+
+        # A late sample for a slot that already holds a newer bucket is dropped
+        store.add({"cpu_percent": 999}, timestamp=base - 11 + 0.5)
+        latest = store.query(base - 1, base)["fields"]["cpu_percent"]["mean"]
+        if latest != [1.0]:
+            print(f"❌ Late sample overwrote a newer bucket: {latest}")
+            return False
+
+        print(f"✅ Ring kept the last {len(expected)} of 25 buckets and dropped a late sample")
+        store.close()
+
+        # A slot not yet reused is still out of retention once its bucket is too old
+        store = TimeSeriesStore(test_dir, fields=["cpu_percent"], tiers=[(1, 10)])
+        store.add({"cpu_percent": 50}, timestamp=base - 60 + 0.5)
+        stale = store.query(base - 100, base)
+        if base - 60 in stale["timestamps"]:
+            print(f"❌ Bucket older than the retention was returned: {stale['timestamps']}")
+            return False
+
+        print("✅ Bucket older than the retention left out when read")
+
+        # Samples survive reopening the store
+        store.close()
+        store = TimeSeriesStore(test_dir, fields=["cpu_percent"], tiers=[(1, 10)])
+        if store.query(base - 1, base)["fields"]["cpu_percent"]["mean"] != [1.0]:
+            print("❌ Samples were lost when the store was reopened")
+            return False
+        store.close()
+
+        print("✅ Samples read back after reopening the store")
+        return True
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_timeseries_tiers():
+    """Test downsampling into coarser tiers and picking the tier for a range"""
+    print("\n=== Testing Time-Series Tiers ===")
+
+    test_dir = tempfile.mkdtemp(prefix="hardware_monitor_test_")
+    try:
+        store = TimeSeriesStore(test_dir, fields=["cpu_percent", "memory_percent"], tiers=[(1, 60), (10, 3600)])
+        base = int(time.time() // 10) * 10
+        for second, cpu in enumerate([10, 20, 60]):
+            store.add({"cpu_percent": cpu, "memory_percent": 40}, timestamp=base - 10 + second)
+
+        coarse = store.aggregate(base - 10, base, resolution=10)
+        cpu = coarse["fields"]["cpu_percent"]
+        if coarse["samples"] != 3 or (cpu["mean"], cpu["min"], cpu["max"]) != (30.0, 10.0, 60.0):
+            print(f"❌ Expected 3 samples with mean 30, min 10 and max 60, got {coarse}")
+            return False
+
+        print("✅ Coarser tier holds the count, mean, minimum and maximum of its bucket")
+
+        selections = {
+            "last 30 s": store.query(base - 30, base)["resolution"],
+            "last 30 s in 20 points": store.query(base - 30, base, max_points=20)["resolution"],
+            "last 10 minutes": store.query(base - 600, base)["resolution"]
+        }
+        if selections != {"last 30 s": 1.0, "last 30 s in 20 points": 10.0, "last 10 minutes": 10.0}:
+            print(f"❌ Unexpected tier selection: {selections}")
+            return False
+
+        try:
+            store.query(base - 30, base, resolution=5)
+            print("❌ Query for a missing tier resolution was accepted")
+            return False
+        except ValueError:
+            pass
+        store.close()
+
+        print(f"✅ Finest covering tier picked within max_points: {selections}")
+        return True
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        ("Resource Sampler", test_resource_sampler),
+        ("Proc Sampler", test_proc_sampler),
+        ("Time-Series Ring", test_timeseries_ring),
+        ("Time-Series Tiers", test_timeseries_tiers)
+    ]
+
+    success = True
+    results = []
+
+    print("=== Hardware Monitor Tests ===\n")
+
+    for name, test_func in tests:
+        print(f"\n=== Running Test: {name} ===")
+        try:
+            test_success = test_func()
+            results.append((name, test_success))
+            if not test_success:
+                success = False
+        except Exception as e:
+            print(f"❌ Test failed with exception: {e}")
+            results.append((name, False))
+            success = False
+
+    print("\n=== Test Results ===")
+    for name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {name}")
+
+    return success
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,369 @@
+#!/usr/bin/env python
+"""
+Time-Series Store for GlowingGoldenGlobe
+
+This module keeps resource usage history in compact, fixed-width columnar
+files, shared by the Claude Resource Monitor and the Hardware Monitor.
+
+History is kept in downsampling tiers, by default at 1 second, 1 minute and 1
+hour resolution. Each tier is a ring of fixed-width slots in a memory-mapped
+file, one slot per time bucket, laid out as columns: bucket number, sample
+count, and the sum, minimum and maximum of every field. A sample is added to
+its bucket in every tier as it is written, so the coarser tiers are always up
+to date and no rollup pass is needed.
+
+A tier's retention is its capacity: a slot is reused once its bucket is more
+than the retention period old, so files never grow. With the default tiers
+and four fields, an hour at 1 second, two weeks at 1 minute and a year at 1
+hour take about 3.6 MB.
+
+Range queries read column slices and pick the finest tier that covers the
+range in a bounded number of points, so they take milliseconds however much
+history is kept. One process should write to a store directory at a time.
+"""
+
+import os
+import json
+import math
+import mmap
+import time
+import struct
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+logger = logging.getLogger("ClaudeResourceMonitor.TimeSeries")
+
+# Fields stored by default
+DEFAULT_FIELDS = ("cpu_percent", "memory_percent", "disk_percent", "network_bytes")
+
+# (resolution, retention) of each tier, in seconds
+DEFAULT_TIERS = (
+    (1, 3600),              # 1 second for an hour
+    (60, 14 * 86400),       # 1 minute for two weeks
+    (3600, 365 * 86400)     # 1 hour for a year
+)
+
+# Most points a query returns before a coarser tier is used
+DEFAULT_MAX_POINTS = 1000
+
+# Most buckets an aggregate reads before a coarser tier is used
+DEFAULT_AGGREGATE_POINTS = 4000
+
+_MAGIC = b"GGTS"
+_VERSION = 1
+_HEADER_SIZE = 256
+_HEADER = struct.Struct("<4sHdqH")  # magic, version, resolution, capacity, field count
+
+
+def tier_name(resolution: float) -> str:
+    """
+    Get the short name of a tier resolution, e.g. "1s", "1m" or "1h"
+
+    Args:
+        resolution: Resolution in seconds
+
+    Returns:
+        str: Tier name
+    """
+    for unit, seconds in (("d", 86400), ("h", 3600), ("m", 60)):
+        if resolution >= seconds and resolution % seconds == 0:
+            return f"{int(resolution // seconds)}{unit}"
+    return f"{resolution:g}s"
+
+
+class _Tier:
+    """One downsampling tier: a ring of fixed-width slots in a memory-mapped file"""
+
+    def __init__(self, path: str, resolution: float, retention: float, fields: Sequence[str]):
+        self.path = path
+        self.resolution = float(resolution)
+        self.capacity = max(1, int(math.ceil(retention / resolution)))
+        self.fields = list(fields)
+
+        # Columns: bucket, count, then sum, min and max of each field; 8 bytes each
+        columns = 2 + 3 * len(self.fields)
+        self.size = _HEADER_SIZE + columns * self.capacity * 8
+
+        self.file = self._open()
+        self.mm = mmap.mmap(self.file.fileno(), self.size)
+        self.view = memoryview(self.mm)
+
+        def column(index: int, fmt: str):
+            start = _HEADER_SIZE + index * self.capacity * 8
+            return self.view[start:start + self.capacity * 8].cast(fmt)
+
+        self.buckets = column(0, "q")
+        self.counts = column(1, "q")
+        self.sums = [column(2 + 3 * i, "d") for i in range(len(self.fields))]
+        self.mins = [column(3 + 3 * i, "d") for i in range(len(self.fields))]
+        self.maxs = [column(4 + 3 * i, "d") for i in range(len(self.fields))]
+
+    def _header(self) -> bytes:
+        header = _HEADER.pack(_MAGIC, _VERSION, self.resolution, self.capacity, len(self.fields))
+        return (header + json.dumps(self.fields).encode()).ljust(_HEADER_SIZE, b"\0")
+
+    def _open(self):
+        """Open the tier file, creating it if it is missing or has a different layout"""
+        header = self._header()
+        if len(header) > _HEADER_SIZE:
+            raise ValueError(f"Too many fields for a time-series header: {self.fields}")
+
+        if os.path.exists(self.path):
+            f = open(self.path, "r+b")
+            if f.read(_HEADER_SIZE) == header and os.path.getsize(self.path) == self.size:
+                return f
+            f.close()
+            logger.warning(f"Layout of {self.path} changed (fields, resolution or retention); starting it afresh")
+
+        with open(self.path, "wb") as f:
+            f.write(header)
+            f.truncate(self.size)
+        return open(self.path, "r+b")
+
+    def add(self, bucket: int, values: Sequence[float]):
+        """Add a sample to a bucket"""
+        pos = bucket % self.capacity
+        current = self.buckets[pos]
+        if current > bucket:
+            return  # The slot already holds a newer bucket
+
+        if current != bucket or self.counts[pos] == 0:
+            self.buckets[pos] = bucket
+            self.counts[pos] = 1
+            for i, value in enumerate(values):
+                self.sums[i][pos] = value
+                self.mins[i][pos] = value
+                self.maxs[i][pos] = value
+            return
+
+        self.counts[pos] += 1
+        for i, value in enumerate(values):
+            self.sums[i][pos] += value
+            if value < self.mins[i][pos]:
+                self.mins[i][pos] = value
+            if value > self.maxs[i][pos]:
+                self.maxs[i][pos] = value
+
+    def read(self, first: int, last: int, field_indexes: Sequence[int]) -> Tuple[List[int], List[int], List[tuple]]:
+        """
+        Read the filled slots for buckets first to last, inclusive
+
+        Returns:
+            Tuple: Buckets, counts, and (sums, mins, maxs) per requested field
+        """
+        first = max(first, last - self.capacity + 1)
+        if first > last:
+            return [], [], [([], [], []) for _ in field_indexes]
+
+        # The range is at most two contiguous runs of the ring
+        start = first % self.capacity
+        length = last - first + 1
+        runs = [(start, min(self.capacity, start + length))]
+        if start + length > self.capacity:
+            runs.append((0, start + length - self.capacity))
+
+        def column(col) -> list:
+            values = []
+            for a, b in runs:
+                values.extend(col[a:b].tolist())
+            return values
+
+        buckets = column(self.buckets)
+        counts = column(self.counts)
+        valid = [i for i, (bucket, count) in enumerate(zip(buckets, counts)) if bucket == first + i and count > 0]
+
+        fields = []
+        for index in field_indexes:
+            sums, mins, maxs = column(self.sums[index]), column(self.mins[index]), column(self.maxs[index])
+            fields.append(([sums[i] for i in valid], [mins[i] for i in valid], [maxs[i] for i in valid]))
+        return [buckets[i] for i in valid], [counts[i] for i in valid], fields
+
+    def flush(self):
+        self.mm.flush()
+
+    def close(self):
+        columns = [self.buckets, self.counts] + self.sums + self.mins + self.maxs
+        for col in columns:
+            col.release()
+        self.view.release()
+        self.mm.close()
+        self.file.close()
+
+
+class TimeSeriesStore:
+    """
+    Compact columnar store of resource usage history with downsampling tiers
+    """
+
+    def __init__(self, directory: str, fields: Sequence[str] = DEFAULT_FIELDS,
+                 tiers: Sequence[Tuple[float, float]] = DEFAULT_TIERS):
+        """
+        Initialize the store
+
+        Args:
+            directory: Directory holding one file per tier
+            fields: Names of the numeric fields stored
+            tiers: (resolution, retention) of each tier, in seconds
+        """
+        self.directory = directory
+        self.fields = list(fields)
+        self.field_indexes = {field: i for i, field in enumerate(self.fields)}
+        self.lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self.tiers = [
+            _Tier(os.path.join(directory, f"{tier_name(resolution)}.ts"), resolution, retention, self.fields)
+            for resolution, retention in sorted(tiers)
+        ]
+
+        # Statistics
+        self.samples = 0
+
+    def add(self, values: Dict[str, Any], timestamp: Optional[float] = None):
+        """
+        Add a sample to every tier
+
+        Args:
+            values: Field values; missing fields are stored as 0
+            timestamp: Time of the sample (Unix timestamp, defaults to now)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        row = [float(values.get(field) or 0.0) for field in self.fields]
+
+        with self.lock:
+            for tier in self.tiers:
+                tier.add(int(timestamp // tier.resolution), row)
+            self.samples += 1
+
+    def _select_tier(self, start: float, end: float, resolution: Optional[float], max_points: int) -> _Tier:
+        """Pick the tier for a range: the finest that covers it within max_points"""
+        if resolution is not None:
+            for tier in self.tiers:
+                if tier.resolution == resolution:
+                    return tier
+            raise ValueError(f"No time-series tier with resolution {resolution}")
+
+        oldest_needed = time.time() - start
+        covering = [tier for tier in self.tiers if tier.capacity * tier.resolution >= oldest_needed]
+        for tier in covering:
+            if (end - start) / tier.resolution <= max_points:
+                return tier
+        return covering[-1] if covering else self.tiers[-1]
+
+    def _read(self, tier: _Tier, start: float, end: float, fields: Sequence[str]):
+        """Read a tier's filled buckets overlapping [start, end), within its retention"""
+        oldest = int(time.time() // tier.resolution) - tier.capacity + 1
+        first = max(int(start // tier.resolution), oldest)
+        last = int(math.ceil(end / tier.resolution)) - 1
+        indexes = [self.field_indexes[field] for field in fields]
+        with self.lock:
+            return tier.read(first, last, indexes)
+
+    def query(self, start: float, end: Optional[float] = None, fields: Optional[Sequence[str]] = None,
+              resolution: Optional[float] = None, max_points: int = DEFAULT_MAX_POINTS) -> Dict[str, Any]:
+        """
+        Get the history in a time range, one point per bucket
+
+        Args:
+            start: Start of the range (Unix timestamp)
+            end: End of the range, exclusive (Unix timestamp, defaults to now)
+            fields: Fields to return (None for all)
+            resolution: Tier resolution in seconds (None to pick the finest
+                        tier covering the range in at most max_points points)
+            max_points: Most points returned when picking a tier
+
+        Returns:
+            Dict[str, Any]: "resolution", "timestamps" and "counts" columns, and
+                            "fields" with "mean", "min" and "max" columns per field
+        """
+        end = time.time() if end is None else end
+        fields = self.fields if fields is None else list(fields)
+        tier = self._select_tier(start, end, resolution, max_points)
+        buckets, counts, columns = self._read(tier, start, end, fields)
+
+        return {
+            "resolution": tier.resolution,
+            "timestamps": [bucket * tier.resolution for bucket in buckets],
+            "counts": counts,
+            "fields": {
+                field: {
+                    "mean": [s / c for s, c in zip(sums, counts)],
+                    "min": mins,
+                    "max": maxs
+                }
+                for field, (sums, mins, maxs) in zip(fields, columns)
+            }
+        }
+
+    def aggregate(self, start: float, end: Optional[float] = None, fields: Optional[Sequence[str]] = None,
+                  resolution: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get aggregates over a time range
+
+        Buckets that overlap the range are included whole, so the range edges
+        are accurate to the resolution of the tier used.
+
+        Args:
+            start: Start of the range (Unix timestamp)
+            end: End of the range, exclusive (Unix timestamp, defaults to now)
+            fields: Fields to aggregate (None for all)
+            resolution: Tier resolution in seconds (None to pick one)
+
+        Returns:
+            Dict[str, Any]: "resolution", "samples", and "fields" with "mean",
+                            "min" and "max" per field (None without samples)
+        """
+        end = time.time() if end is None else end
+        fields = self.fields if fields is None else list(fields)
+        tier = self._select_tier(start, end, resolution, DEFAULT_AGGREGATE_POINTS)
+        _, counts, columns = self._read(tier, start, end, fields)
+        samples = sum(counts)
+
+        return {
+            "resolution": tier.resolution,
+            "samples": samples,
+            "fields": {
+                field: {
+                    "mean": sum(sums) / samples if samples else None,
+                    "min": min(mins) if mins else None,
+                    "max": max(maxs) if maxs else None
+                }
+                for field, (sums, mins, maxs) in zip(fields, columns)
+            }
+        }
+
+    def flush(self):
+        """Write changed pages of every tier to disk"""
+        with self.lock:
+            for tier in self.tiers:
+                tier.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics
+
+        Returns:
+            Dict[str, Any]: Samples added, size on disk, and resolution, retention and size per tier
+        """
+        return {
+            "samples": self.samples,
+            "bytes": sum(tier.size for tier in self.tiers),
+            "tiers": {
+                tier_name(tier.resolution): {
+                    "resolution": tier.resolution,
+                    "retention": tier.capacity * tier.resolution,
+                    "bytes": tier.size
+                }
+                for tier in self.tiers
+            }
+        }
+
+    def close(self):
+        """Write changes to disk and close the tier files"""
+        with self.lock:
+            for tier in self.tiers:
+                tier.flush()
+                tier.close()
+            self.tiers = []
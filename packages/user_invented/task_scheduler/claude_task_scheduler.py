@@ -6,14 +6,23 @@ This module provides scheduling capabilities for automated parallel execution in
 Claude Parallel Execution System. It allows tasks to be scheduled for regular execution
 based on time intervals, specific times of day, or specific days of the week.
 
-The scheduler runs as a background thread that monitors scheduled tasks and adds them
-to the Claude Parallel Manager's queue when their scheduled time arrives.
+The scheduler runs as a background thread that keeps the enabled tasks in a heap
+ordered by next run time. It sleeps until the earliest run is due, or until a task
+is added or edited, and then adds the due tasks to the Claude Parallel Manager's
+queue. Runs missed while the scheduler was not running are handled by each task's
+misfire policy.
+
+Task changes are appended to a journal next to the configuration file, which is
+compacted into the file periodically (see ai_managers/task_journal.py), and every
+run is recorded in a run history that can be queried by task and time range.
 """
 
 import os
 import sys
 import time
 import json
+import heapq
+import itertools
 import threading
 import logging
 import datetime
@@ -41,9 +50,23 @@ except ImportError:
     logger.error("Failed to import ClaudeParallelManager")
     ClaudeParallelManager = None
 
+try:
+    from ai_managers.task_journal import TaskJournal
+except ImportError:
+    from task_journal import TaskJournal
+
+# Scheduler constants
+MISFIRE_GRACE_SECONDS = 60  # a run later than this counts as missed
+MAX_CATCH_UP_RUNS = 24  # missed runs replayed by catch-up before the rest are coalesced
+MAX_WAIT_SECONDS = 300  # longest sleep, so wall clock changes are noticed
+
 class ScheduledTask:
     """
     Represents a task scheduled for regular execution.
+    
+    The misfire policy decides what happens to runs missed while the scheduler was
+    not running: coalesce runs the task once, skip drops the missed runs, and
+    catch-up runs the task once for each missed run (up to MAX_CATCH_UP_RUNS).
     """
     
     # Schedule types
@@ -53,8 +76,13 @@ class ScheduledTask:
     MONTHLY = "monthly"    # Run at specific time on specific day of month
     ONCE = "once"          # Run once at a specific time
     
+    # Misfire policies
+    COALESCE = "coalesce"  # Run once for any number of missed runs
+    SKIP = "skip"          # Drop missed runs
+    CATCH_UP = "catch_up"  # Run once for each missed run
+    
     def __init__(self, task_id: str, task_data: Dict[str, Any], schedule_type: str, 
-                 schedule_params: Dict[str, Any]):
+                 schedule_params: Dict[str, Any], misfire_policy: str = COALESCE):
         """
         Initialize a scheduled task.
         
@@ -63,23 +91,29 @@ class ScheduledTask:
             task_data: Task data for execution
             schedule_type: Type of schedule (interval, daily, weekly, monthly, once)
             schedule_params: Parameters for the schedule type
+            misfire_policy: Handling of missed runs (coalesce, skip, catch_up)
         """
         self.task_id = task_id
         self.task_data = task_data
         self.schedule_type = schedule_type
         self.schedule_params = schedule_params
+        self.misfire_policy = misfire_policy
         self.last_run = None
         self.next_run = self._calculate_next_run()
         self.enabled = True
+        self.catch_up_runs = 0
     
-    def _calculate_next_run(self) -> Optional[datetime.datetime]:
+    def _calculate_next_run(self, after: Optional[datetime.datetime] = None) -> Optional[datetime.datetime]:
         """
         Calculate the next time this task should run.
         
+        Args:
+            after: Time the run must follow (None for now, or the last run for interval tasks)
+        
         Returns:
             Next run time as datetime, or None if the task should not run again
         """
-        now = datetime.datetime.now()
+        now = after or datetime.datetime.now()
         
         if self.schedule_type == self.INTERVAL:
             # Run every X minutes/hours
@@ -93,7 +127,7 @@ class ScheduledTask:
             if total_minutes <= 0:
                 total_minutes = 60
             
-            if self.last_run:
+            if self.last_run and after is None:
                 # Calculate next run based on last run
                 return self.last_run + datetime.timedelta(minutes=total_minutes)
             else:
@@ -142,7 +176,7 @@ class ScheduledTask:
                 days_ahead += 7
             
             # If it's the target day and the time has passed, schedule for next week
-            if days_ahead == 0 and now.hour > hour or (now.hour == hour and now.minute >= minute):
+            if days_ahead == 0 and (now.hour > hour or (now.hour == hour and now.minute >= minute)):
                 days_ahead = 7
             
             # Create target datetime
@@ -259,8 +293,13 @@ class ScheduledTask:
         now = datetime.datetime.now()
         return now >= self.next_run
     
-    def mark_executed(self):
-        """Mark the task as executed and calculate the next run time"""
+    def mark_executed(self, next_after: Optional[datetime.datetime] = None):
+        """
+        Mark the task as executed and calculate the next run time.
+        
+        Args:
+            next_after: Time the next run must follow (None to schedule from this run)
+        """
         self.last_run = datetime.datetime.now()
         
         # If this is a one-time task, disable it after execution
@@ -268,7 +307,20 @@ class ScheduledTask:
             self.enabled = False
             self.next_run = None
         else:
-            self.next_run = self._calculate_next_run()
+            self.next_run = self._calculate_next_run(next_after)
+    
+    def mark_skipped(self, now: datetime.datetime):
+        """
+        Drop the missed runs up to now and calculate the next run time.
+        
+        Args:
+            now: Current time
+        """
+        if self.schedule_type == self.ONCE:
+            self.enabled = False
+            self.next_run = None
+        else:
+            self.next_run = self._calculate_next_run(now)
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -282,6 +334,7 @@ class ScheduledTask:
             "task_data": self.task_data,
             "schedule_type": self.schedule_type,
             "schedule_params": self.schedule_params,
+            "misfire_policy": self.misfire_policy,
             "last_run": self.last_run.isoformat() if self.last_run else None,
             "next_run": self.next_run.isoformat() if self.next_run else None,
             "enabled": self.enabled
@@ -302,7 +355,8 @@ class ScheduledTask:
             task_id=data.get("task_id", "unknown"),
             task_data=data.get("task_data", {}),
             schedule_type=data.get("schedule_type", cls.INTERVAL),
-            schedule_params=data.get("schedule_params", {})
+            schedule_params=data.get("schedule_params", {}),
+            misfire_policy=data.get("misfire_policy", cls.COALESCE)
         )
         
         # Restore state
@@ -316,8 +370,17 @@ class ScheduledTask:
             except (ValueError, TypeError):
                 task.last_run = None
         
-        # Calculate next run based on last run
-        task.next_run = task._calculate_next_run()
+        # Keep the saved next run, even if it passed while the scheduler was down, so
+        # the misfire policy can handle it; otherwise calculate it from the last run
+        next_run_str = data.get("next_run")
+        task.next_run = None
+        if next_run_str:
+            try:
+                task.next_run = datetime.datetime.fromisoformat(next_run_str)
+            except (ValueError, TypeError):
+                task.next_run = None
+        if task.next_run is None and not (task.schedule_type == cls.ONCE and task.last_run):
+            task.next_run = task._calculate_next_run()
         
         return task
 
@@ -334,61 +397,80 @@ class ClaudeTaskScheduler:
             config_path: Path to scheduler configuration file
         """
         self.config_path = os.path.join(BASE_DIR, config_path)
+        self.journal = None
         self.tasks = {}  # task_id -> ScheduledTask
         self.running = False
         self.scheduler_thread = None
         self.thread_lock = threading.Lock()
+        self.schedule_changed = threading.Condition(self.thread_lock)
         self.claude_manager = None
         
+        # (next run timestamp, sequence, task_id, next run), earliest first. Entries
+        # whose next run no longer matches the task are stale and skipped when popped.
+        self.run_heap = []
+        self.run_sequence = itertools.count()
+        
         # Load tasks
         self._load_tasks()
+        with self.thread_lock:
+            for task in self.tasks.values():
+                self._schedule_task(task)
         
         logger.info(f"Task Scheduler initialized with {len(self.tasks)} tasks")
     
     def _load_tasks(self):
-        """Load scheduled tasks from file"""
-        if os.path.exists(self.config_path):
+        """Load scheduled tasks from the configuration file and its journal"""
+        # Every task change goes through the journal, so a scheduler without one
+        # would silently lose them; let the error reach the caller
+        try:
+            self.journal = TaskJournal(
+                self.config_path,
+                encode_snapshot=lambda records: {
+                    "tasks": list(records.values()),
+                    "updated_at": datetime.datetime.now().isoformat()
+                },
+                decode_snapshot=lambda data: {
+                    task_data.get("task_id", "unknown"): task_data for task_data in data.get("tasks", [])
+                }
+            )
+        except Exception as e:
+            logger.error(f"Error opening task journal for {self.config_path}: {e}")
+            raise
+        
+        # Create ScheduledTask instances
+        for task_data in self.journal.get_records().values():
             try:
-                with open(self.config_path, 'r') as f:
-                    data = json.load(f)
-                
-                # Load task list
-                task_list = data.get("tasks", [])
-                
-                # Create ScheduledTask instances
-                for task_data in task_list:
-                    try:
-                        task = ScheduledTask.from_dict(task_data)
-                        self.tasks[task.task_id] = task
-                    except Exception as e:
-                        logger.error(f"Error loading task: {e}")
-                
-                logger.info(f"Loaded {len(self.tasks)} scheduled tasks")
-                
+                task = ScheduledTask.from_dict(task_data)
+                self.tasks[task.task_id] = task
             except Exception as e:
-                logger.error(f"Error loading tasks: {e}")
+                logger.error(f"Error loading task: {e}")
+        
+        logger.info(f"Loaded {len(self.tasks)} scheduled tasks")
     
     def _save_tasks(self):
-        """Save scheduled tasks to file"""
+        """Write all scheduled tasks to the configuration file and empty the journal"""
         try:
-            # Convert tasks to list of dictionaries
-            task_list = [task.to_dict() for task in self.tasks.values()]
-            
-            # Create data structure
-            data = {
-                "tasks": task_list,
-                "updated_at": datetime.datetime.now().isoformat()
-            }
-            
-            # Save to file
-            with open(self.config_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            with self.thread_lock:
+                records = {task_id: task.to_dict() for task_id, task in self.tasks.items()}
+            self.journal.reset(records)
             
-            logger.info(f"Saved {len(task_list)} scheduled tasks")
+            logger.info(f"Saved {len(records)} scheduled tasks")
             
         except Exception as e:
             logger.error(f"Error saving tasks: {e}")
     
+    def _journal_task(self, task: ScheduledTask):
+        """
+        Append a task's current state to the journal.
+        
+        Args:
+            task: The changed task
+        """
+        try:
+            self.journal.put(task.task_id, task.to_dict())
+        except Exception as e:
+            logger.error(f"Error journaling task {task.task_id}: {e}")
+    
     def start(self, claude_manager: Optional[ClaudeParallelManager] = None):
         """
         Start the scheduler.
@@ -419,7 +501,9 @@ class ClaudeTaskScheduler:
             return False
         
         # Signal thread to stop
-        self.running = False
+        with self.schedule_changed:
+            self.running = False
+            self.schedule_changed.notify_all()
         
         # Wait for thread to finish
         if self.scheduler_thread and self.scheduler_thread.is_alive():
@@ -431,50 +515,138 @@ class ClaudeTaskScheduler:
         logger.info("Task Scheduler stopped")
         return True
     
+    def _schedule_task(self, task: ScheduledTask):
+        """
+        Add a task's next run to the heap and wake the scheduler loop.
+        
+        The caller must hold thread_lock.
+        
+        Args:
+            task: The task to schedule
+        """
+        if task.enabled and task.next_run:
+            heapq.heappush(self.run_heap, (task.next_run.timestamp(), next(self.run_sequence),
+                                           task.task_id, task.next_run))
+        
+        # Drop stale entries left behind by edits and removals
+        if len(self.run_heap) > 2 * len(self.tasks) + 64:
+            self.run_heap = [entry for entry in self.run_heap if self._is_current(entry)]
+            heapq.heapify(self.run_heap)
+        
+        self.schedule_changed.notify_all()
+    
+    def _is_current(self, entry: tuple) -> bool:
+        """Check whether a heap entry is still the next run of its task"""
+        task = self.tasks.get(entry[2])
+        return task is not None and task.enabled and task.next_run == entry[3]
+    
+    def _pop_due_tasks(self) -> List[tuple]:
+        """
+        Pop the tasks whose next run has arrived.
+        
+        The caller must hold thread_lock.
+        
+        Returns:
+            List of (task, scheduled run time) tuples
+        """
+        now = time.time()
+        due = []
+        while self.run_heap and self.run_heap[0][0] <= now:
+            entry = heapq.heappop(self.run_heap)
+            if self._is_current(entry):
+                due.append((self.tasks[entry[2]], entry[3]))
+        return due
+    
     def _scheduler_loop(self):
         """Main scheduler loop"""
         logger.info("Scheduler loop started")
         
-        check_interval = 30  # Check every 30 seconds
-        
-        while self.running:
-            try:
-                # Get current time
-                now = datetime.datetime.now()
-                logger.debug(f"Scheduler check at {now.isoformat()}")
-                
-                # Check for tasks to execute
+        while True:
+            with self.schedule_changed:
                 due_tasks = []
+                while self.running:
+                    due_tasks = self._pop_due_tasks()
+                    if due_tasks:
+                        break
+                    
+                    # Sleep until the earliest run, or until a task is added or edited
+                    timeout = MAX_WAIT_SECONDS
+                    if self.run_heap:
+                        timeout = min(timeout, max(0.0, self.run_heap[0][0] - time.time()))
+                    self.schedule_changed.wait(timeout)
                 
-                with self.thread_lock:
-                    for task_id, task in list(self.tasks.items()):
-                        if task.is_due():
-                            due_tasks.append(task)
-                
-                # Execute due tasks
-                for task in due_tasks:
-                    logger.info(f"Task due for execution: {task.task_id}")
-                    self._execute_task(task)
-                
-                # Save tasks periodically
-                if due_tasks:
-                    self._save_tasks()
-                
-            except Exception as e:
-                logger.error(f"Error in scheduler loop: {e}")
-            
-            # Sleep until next check
-            for _ in range(check_interval):
                 if not self.running:
                     break
-                time.sleep(1)
+            
+            # Execute due tasks
+            for task, scheduled_run in due_tasks:
+                try:
+                    self._run_due_task(task, scheduled_run)
+                except Exception as e:
+                    logger.error(f"Error in scheduler loop: {e}")
     
-    def _execute_task(self, task: ScheduledTask):
+    def _run_due_task(self, task: ScheduledTask, scheduled_run: datetime.datetime):
         """
-        Execute a scheduled task.
+        Execute a due task according to its misfire policy and schedule its next run.
+        
+        Args:
+            task: The due task
+            scheduled_run: The run time that arrived
+        """
+        now = datetime.datetime.now()
+        lateness = (now - scheduled_run).total_seconds()
+        missed = lateness > MISFIRE_GRACE_SECONDS
+        run_details = {"scheduled_for": scheduled_run.isoformat(), "lateness_seconds": lateness}
+        
+        if missed and task.misfire_policy == ScheduledTask.SKIP:
+            logger.info(f"Skipping missed run of task {task.task_id} scheduled for {scheduled_run.isoformat()}")
+            task.mark_skipped(now)
+            status = "skipped"
+        else:
+            logger.info(f"Task due for execution: {task.task_id} ({lateness * 1000:.0f} ms late)")
+            execution_id = self._execute_task(task)
+            status = "queued" if execution_id else "failed"
+            run_details["execution_id"] = execution_id
+            
+            if missed and task.misfire_policy == ScheduledTask.CATCH_UP and task.catch_up_runs < MAX_CATCH_UP_RUNS:
+                # Schedule the following missed run rather than the next one from now
+                task.catch_up_runs += 1
+                task.mark_executed(next_after=scheduled_run)
+            else:
+                if missed and task.misfire_policy == ScheduledTask.CATCH_UP:
+                    logger.warning(f"Task {task.task_id} caught up {MAX_CATCH_UP_RUNS} runs, coalescing the rest")
+                task.catch_up_runs = 0
+                task.mark_executed()
+        
+        with self.thread_lock:
+            if self.tasks.get(task.task_id) is not task:
+                return
+            self._schedule_task(task)
+            
+            # Journal under the lock so a concurrent remove_task cannot delete in between
+            try:
+                self.journal.update(task.task_id, {
+                    "last_run": task.last_run.isoformat() if task.last_run else None,
+                    "next_run": task.next_run.isoformat() if task.next_run else None,
+                    "enabled": task.enabled
+                })
+            except Exception as e:
+                logger.error(f"Error journaling run of task {task.task_id}: {e}")
+        
+        try:
+            self.journal.record_run(task.task_id, now.timestamp(), status, details=run_details)
+        except Exception as e:
+            logger.error(f"Error journaling run of task {task.task_id}: {e}")
+    
+    def _execute_task(self, task: ScheduledTask) -> Optional[str]:
+        """
+        Add a scheduled task to the Claude Parallel Manager's queue.
         
         Args:
             task: The task to execute
+            
+        Returns:
+            Execution ID from the Claude Parallel Manager, or None if the task could not be queued
         """
         logger.info(f"Executing scheduled task: {task.task_id}")
         
@@ -482,7 +654,7 @@ class ClaudeTaskScheduler:
             # Check if Claude Manager is available
             if not self.claude_manager:
                 logger.error("Cannot execute task: Claude Parallel Manager not available")
-                return
+                return None
             
             # Extract task data
             script_path = task.task_data.get("script_path")
@@ -498,17 +670,17 @@ class ClaudeTaskScheduler:
                     priority=priority
                 )
                 logger.info(f"Scheduled task {task.task_id} added to queue with execution ID: {result_task_id}")
+                return result_task_id
             else:
                 logger.error(f"Cannot execute task {task.task_id}: Script not found or not specified")
             
-            # Mark task as executed
-            task.mark_executed()
-            
         except Exception as e:
             logger.error(f"Error executing scheduled task {task.task_id}: {e}")
+        
+        return None
     
     def add_task(self, task_data: Dict[str, Any], schedule_type: str, 
-                 schedule_params: Dict[str, Any]) -> str:
+                 schedule_params: Dict[str, Any], misfire_policy: str = ScheduledTask.COALESCE) -> str:
         """
         Add a new scheduled task.
         
@@ -516,6 +688,7 @@ class ClaudeTaskScheduler:
             task_data: Task data for execution
             schedule_type: Type of schedule (interval, daily, weekly, monthly, once)
             schedule_params: Parameters for the schedule type
+            misfire_policy: Handling of missed runs (coalesce, skip, catch_up)
             
         Returns:
             Task ID of the added task
@@ -528,15 +701,17 @@ class ClaudeTaskScheduler:
             task_id=task_id,
             task_data=task_data,
             schedule_type=schedule_type,
-            schedule_params=schedule_params
+            schedule_params=schedule_params,
+            misfire_policy=misfire_policy
         )
         
         # Add to tasks dictionary
         with self.thread_lock:
             self.tasks[task_id] = task
+            self._schedule_task(task)
         
         # Save tasks
-        self._save_tasks()
+        self._journal_task(task)
         
         logger.info(f"Added scheduled task: {task_id}")
         return task_id
@@ -556,7 +731,7 @@ class ClaudeTaskScheduler:
                 del self.tasks[task_id]
                 
                 # Save tasks
-                self._save_tasks()
+                self.journal.delete(task_id)
                 
                 logger.info(f"Removed scheduled task: {task_id}")
                 return True
@@ -577,10 +752,16 @@ class ClaudeTaskScheduler:
         """
         with self.thread_lock:
             if task_id in self.tasks:
-                self.tasks[task_id].enabled = enabled
+                task = self.tasks[task_id]
+                task.enabled = enabled
+                
+                # Runs that passed while the task was disabled are not missed runs
+                if enabled and (task.next_run is None or task.next_run <= datetime.datetime.now()):
+                    task.next_run = task._calculate_next_run()
+                self._schedule_task(task)
                 
                 # Save tasks
-                self._save_tasks()
+                self._journal_task(task)
                 
                 logger.info(f"{'Enabled' if enabled else 'Disabled'} scheduled task: {task_id}")
                 return True
@@ -590,7 +771,8 @@ class ClaudeTaskScheduler:
     
     def update_task(self, task_id: str, task_data: Optional[Dict[str, Any]] = None,
                    schedule_type: Optional[str] = None, 
-                   schedule_params: Optional[Dict[str, Any]] = None) -> bool:
+                   schedule_params: Optional[Dict[str, Any]] = None,
+                   misfire_policy: Optional[str] = None) -> bool:
         """
         Update a scheduled task.
         
@@ -599,6 +781,7 @@ class ClaudeTaskScheduler:
             task_data: New task data (None to keep existing)
             schedule_type: New schedule type (None to keep existing)
             schedule_params: New schedule parameters (None to keep existing)
+            misfire_policy: New misfire policy (None to keep existing)
             
         Returns:
             True if the task was updated, False otherwise
@@ -618,11 +801,15 @@ class ClaudeTaskScheduler:
                 if schedule_params is not None:
                     task.schedule_params = schedule_params
                 
+                if misfire_policy is not None:
+                    task.misfire_policy = misfire_policy
+                
                 # Recalculate next run time
                 task.next_run = task._calculate_next_run()
+                self._schedule_task(task)
                 
                 # Save tasks
-                self._save_tasks()
+                self._journal_task(task)
                 
                 logger.info(f"Updated scheduled task: {task_id}")
                 return True
@@ -690,6 +877,29 @@ class ClaudeTaskScheduler:
         
         return next_task.to_dict() if next_task else None
     
+    def get_run_history(self, task_id: Optional[str] = None,
+                        start: Optional[datetime.datetime] = None,
+                        end: Optional[datetime.datetime] = None,
+                        limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        """
+        Get recorded runs of scheduled tasks, newest first.
+        
+        Args:
+            task_id: Only runs of this task (None for all tasks)
+            start: Only runs at or after this time (None for no lower bound)
+            end: Only runs before this time (None for no upper bound)
+            limit: Maximum number of runs (None for no limit)
+            
+        Returns:
+            List of runs with task_id, started_at, status and details
+        """
+        return self.journal.get_run_history(
+            task_id=task_id,
+            start=start.timestamp() if start else None,
+            end=end.timestamp() if end else None,
+            limit=limit
+        )
+    
     def add_future_metrics_visualization_task(self) -> str:
         """
         Add a special task for metrics visualization scheduled 2 months in the future.